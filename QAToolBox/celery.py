@@ -102,6 +102,11 @@ app.conf.update(
             "task": "apps.tools.tasks.update_user_online_status",
             "schedule": crontab(minute="*/5"),
         },
+        # 统计计数刷新 - 每天凌晨固定前一天的统计
+        "refresh-stats-counters-daily": {
+            "task": "apps.tools.tasks.refresh_stats_counters",
+            "schedule": crontab(hour=0, minute=10),
+        },
     },
     # 工作进程设置
     worker_concurrency=4,
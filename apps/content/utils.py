@@ -4,14 +4,15 @@ from urllib.parse import urljoin, urlparse
 from django.core.files.base import ContentFile
 from django.core.files.storage import default_storage
 
-import requests
-from bs4 import BeautifulSoup
-
 
 def extract_favicon_url(url):
     """
     从网站提取favicon URL
     """
+    # requests/bs4 只在抓取图标时导入，不拖慢URL路由加载
+    import requests
+    from bs4 import BeautifulSoup
+
     try:
         headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
@@ -66,6 +67,8 @@ def download_and_save_icon(icon_url, filename):
     """
     下载并保存图标到本地
     """
+    import requests
+
     try:
         headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
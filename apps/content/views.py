@@ -148,18 +148,16 @@ def admin_suggestions(request):
 def admin_dashboard(request):
     pass
 
-    from django.utils import timezone
-
+    from apps.tools.services.stats_counters import daily_stat, exact_count
     from apps.users.models import User, UserActionLog
 
     # 获取统计数据
-    total_users = User.objects.count()
+    total_users = exact_count(User)
     pending_suggestions = Suggestion.objects.filter(status="pending").count()
     pending_feedbacks = Feedback.objects.filter(status="pending").count()
 
     # 今日活跃用户（有操作记录的用户）
-    today = timezone.now().date()
-    active_users = UserActionLog.objects.filter(created_at__date=today).values("admin_user").distinct().count()
+    active_users = daily_stat("admin_active_users")
 
     # 最近操作日志
     recent_logs = UserActionLog.objects.select_related("admin_user").order_by("-created_at")[:10]
@@ -481,19 +479,17 @@ def admin_reply_feedback(request):
 @login_required
 @admin_required
 def admin_dashboard_stats_api(request):
-    from django.utils import timezone
-
+    from apps.tools.services.stats_counters import daily_stat, exact_count
     from apps.users.models import User, UserActionLog
 
     try:
         # 获取统计数据
-        total_users = User.objects.count()
+        total_users = exact_count(User)
         pending_suggestions = Suggestion.objects.filter(status="pending").count()
         pending_feedbacks = Feedback.objects.filter(status="pending").count()
 
         # 今日活跃用户
-        today = timezone.now().date()
-        active_users = UserActionLog.objects.filter(created_at__date=today).values("admin_user").distinct().count()
+        active_users = daily_stat("admin_active_users")
 
         # 最近操作日志
         recent_logs = UserActionLog.objects.select_related("admin_user").order_by("-created_at")[:5]
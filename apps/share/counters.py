@@ -0,0 +1,130 @@
+"""
+分享链接点击计数（写后合并）
+点击只在进程内存中累加（按链接、按日期+平台），后台线程每隔 SHARE_CLICK_FLUSH_INTERVAL 秒
+把累计值合并为少量 UPDATE ... SET click_count = click_count + CASE ... 语句写回数据库，
+多进程各自刷写增量，不会覆盖彼此的计数；写回失败时增量放回缓冲区下次重试
+"""
+
+import atexit
+import logging
+import threading
+import time
+from collections import Counter
+from datetime import date
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import Case, F, Q, Value, When
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# 每条 UPDATE 语句中 CASE 分支的最大数量
+FLUSH_CHUNK_SIZE = 500
+
+
+class ClickBuffer:
+    """点击计数缓冲区"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._links = Counter()
+        self._daily = Counter()
+        self._flusher = None
+
+    def record(self, link_id: int, platform: str = "link", day: Optional[date] = None):
+        """记录一次点击"""
+        day = day or timezone.localdate()
+        with self._lock:
+            self._links[link_id] += 1
+            self._daily[(day, platform)] += 1
+
+        if getattr(settings, "SHARE_CLICKS_EAGER", False):
+            self.flush()
+        else:
+            self._ensure_flusher()
+
+    def pending(self) -> int:
+        """尚未写回的点击数"""
+        with self._lock:
+            return sum(self._links.values())
+
+    def _drain(self):
+        with self._lock:
+            links, daily = self._links, self._daily
+            self._links, self._daily = Counter(), Counter()
+        return links, daily
+
+    def _restore(self, links: Counter, daily: Counter):
+        with self._lock:
+            self._links.update(links)
+            self._daily.update(daily)
+
+    def flush(self) -> Dict[str, int]:
+        """把累计的点击写回 ShareLink 和 ShareAnalytics"""
+        from .models import ShareAnalytics, ShareLink
+
+        links, daily = self._drain()
+        if not links and not daily:
+            return {"clicks": 0, "links": 0, "days": 0}
+
+        try:
+            with transaction.atomic():
+                items = list(links.items())
+                for start in range(0, len(items), FLUSH_CHUNK_SIZE):
+                    chunk = dict(items[start : start + FLUSH_CHUNK_SIZE])
+                    ShareLink.objects.filter(id__in=chunk).update(
+                        click_count=F("click_count")
+                        + Case(*[When(id=link_id, then=Value(count)) for link_id, count in chunk.items()], default=Value(0))
+                    )
+                if daily:
+                    ShareAnalytics.objects.bulk_create(
+                        [ShareAnalytics(date=day, platform=platform) for day, platform in daily], ignore_conflicts=True
+                    )
+                    keys = Q()
+                    whens = []
+                    for (day, platform), count in daily.items():
+                        keys |= Q(date=day, platform=platform)
+                        whens.append(When(date=day, platform=platform, then=Value(count)))
+                    ShareAnalytics.objects.filter(keys).update(click_count=F("click_count") + Case(*whens, default=Value(0)))
+        except Exception as e:
+            logger.error(f"分享点击计数写回失败，{sum(links.values())} 次点击留待重试: {e}")
+            self._restore(links, daily)
+            raise
+
+        return {"clicks": sum(links.values()), "links": len(links), "days": len(daily)}
+
+    def _ensure_flusher(self):
+        interval = getattr(settings, "SHARE_CLICK_FLUSH_INTERVAL", 5)
+        if interval <= 0 or (self._flusher is not None and self._flusher.is_alive()):
+            return
+        with self._lock:
+            if self._flusher is None or not self._flusher.is_alive():
+                self._flusher = threading.Thread(
+                    target=self._run_flusher, args=(interval,), name="share-click-flusher", daemon=True
+                )
+                self._flusher.start()
+
+    def _run_flusher(self, interval: float):
+        while True:
+            time.sleep(interval)
+            try:
+                self.flush()
+            except Exception:
+                # 已记录日志，增量保留在缓冲区
+                pass
+            finally:
+                close_old_connections()
+
+
+click_buffer = ClickBuffer()
+
+
+@atexit.register
+def _flush_on_exit():
+    if click_buffer.pending():
+        try:
+            click_buffer.flush()
+        except Exception:
+            pass
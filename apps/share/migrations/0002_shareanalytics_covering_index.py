@@ -0,0 +1,19 @@
+# Generated manually for share app
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("share", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="shareanalytics",
+            index=models.Index(
+                fields=["date", "platform"], include=("share_count", "click_count"), name="share_analytics_date_cover_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated manually for share app
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("share", "0002_shareanalytics_covering_index"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="shareanalytics",
+            name="share_analytics_date_cover_idx",
+        ),
+        migrations.AddIndex(
+            model_name="shareanalytics",
+            index=models.Index(
+                fields=["date", "platform"],
+                include=("id", "share_count", "click_count"),
+                name="share_analytics_date_cover_idx",
+            ),
+        ),
+    ]
@@ -85,6 +85,14 @@ class ShareAnalytics(models.Model):
         verbose_name_plural = "分享分析"
         unique_together = ["date", "platform"]
         ordering = ["-date"]
+        # 覆盖索引：按日期范围汇总时只读索引（PostgreSQL）
+        indexes = [
+            models.Index(
+                fields=["date", "platform"],
+                include=["id", "share_count", "click_count"],
+                name="share_analytics_date_cover_idx",
+            )
+        ]
 
     def __str__(self):
         return f"{self.date} - {self.get_platform_display()} - {self.share_count}"
@@ -0,0 +1,92 @@
+"""
+分享数据汇总
+按 (日期, 平台) 在数据库中聚合 ShareAnalytics；已结束日期的聚合结果不再变化，按天缓存，
+每次请求只重新聚合缓存缺失的日期和当天
+"""
+
+from datetime import date, timedelta
+from typing import Dict, List
+
+from django.core.cache import cache
+from django.db.models import Sum
+from django.utils import timezone
+
+from .models import ShareAnalytics, ShareRecord
+
+CACHE_PREFIX = "share_analytics:day:v2:"
+# 已结束日期的缓存时间；点击计数延迟写回，昨天的数据在零点后短时间内仍可能变化
+CLOSED_DAY_TIMEOUT = 7 * 24 * 3600
+CLOSED_DAY_GRACE = timedelta(minutes=5)
+
+PLATFORM_NAMES = dict(ShareRecord.SHARE_PLATFORMS)
+
+
+def _aggregate(days: List[date]) -> Dict[date, Dict[str, List[int]]]:
+    """在数据库中按 (日期, 平台) 汇总，返回 {日期: {平台: [分享数, 点击数, 记录ID]}}
+
+    (日期, 平台) 唯一，每组只有一条记录，分组中带上 id 不改变结果，明细仍可返回记录ID
+    """
+    result = {day: {} for day in days}
+    if not days:
+        return result
+    rows = (
+        ShareAnalytics.objects.filter(date__range=[min(days), max(days)])
+        .values("id", "date", "platform")
+        .annotate(shares=Sum("share_count"), clicks=Sum("click_count"))
+        .order_by()
+    )
+    for row in rows:
+        if row["date"] in result:
+            result[row["date"]][row["platform"]] = [row["shares"] or 0, row["clicks"] or 0, row["id"]]
+    return result
+
+
+def _closed_before() -> date:
+    """早于该日期的数据视为已结束"""
+    return (timezone.localtime() - CLOSED_DAY_GRACE).date()
+
+
+def daily_platform_totals(start_date: date, end_date: date) -> Dict[date, Dict[str, List[int]]]:
+    """[start_date, end_date] 内每天各平台的分享数、点击数和记录ID"""
+    days = [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
+    closed_before = _closed_before()
+    closed = [day for day in days if day < closed_before]
+    open_days = [day for day in days if day >= closed_before]
+
+    cached = cache.get_many([f"{CACHE_PREFIX}{day.isoformat()}" for day in closed])
+    totals = {}
+    missing = []
+    for day in closed:
+        value = cached.get(f"{CACHE_PREFIX}{day.isoformat()}")
+        if value is None:
+            missing.append(day)
+        else:
+            totals[day] = value
+
+    computed = _aggregate(missing)
+    if computed:
+        cache.set_many({f"{CACHE_PREFIX}{day.isoformat()}": value for day, value in computed.items()}, CLOSED_DAY_TIMEOUT)
+    totals.update(computed)
+    totals.update(_aggregate(open_days))
+    return {day: totals[day] for day in days}
+
+
+def analytics_summary(start_date: date, end_date: date) -> Dict:
+    """分享数据看板：按平台、按日期汇总以及 (日期, 平台) 明细"""
+    platform_summary = {}
+    daily_summary = {}
+    analytics = []
+    for day, platforms in daily_platform_totals(start_date, end_date).items():
+        if not platforms:
+            continue
+        day_total = daily_summary.setdefault(day.strftime("%Y-%m-%d"), {"shares": 0, "clicks": 0})
+        for platform in sorted(platforms):
+            shares, clicks, pk = platforms[platform]
+            name = PLATFORM_NAMES.get(platform, platform)
+            platform_total = platform_summary.setdefault(name, {"shares": 0, "clicks": 0})
+            platform_total["shares"] += shares
+            platform_total["clicks"] += clicks
+            day_total["shares"] += shares
+            day_total["clicks"] += clicks
+            analytics.append({"id": pk, "date": day, "platform": platform, "share_count": shares, "click_count": clicks})
+    return {"platform_summary": platform_summary, "daily_summary": daily_summary, "analytics": analytics}
@@ -4,34 +4,29 @@ from datetime import timedelta
 from django.contrib.auth.decorators import login_required
 from django.core.paginator import Paginator
 from django.db.models import Count
-from django.http import HttpResponse, JsonResponse
-from django.shortcuts import get_object_or_404, redirect, render
+from django.http import Http404, HttpResponse, JsonResponse
+from django.shortcuts import redirect, render
 from django.urls import reverse
 from django.utils import timezone
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 
+from .counters import click_buffer
 from .models import ShareAnalytics, ShareLink, ShareRecord
+from .summaries import analytics_summary
 from .utils import generate_short_code, get_client_ip, get_share_urls
 
 
 def share_page(request, short_code):
     """分享页面重定向"""
-    share_link = get_object_or_404(ShareLink, short_code=short_code, is_active=True)
+    link = ShareLink.objects.filter(short_code=short_code, is_active=True).values_list("id", "original_url").first()
+    if link is None:
+        raise Http404("分享链接不存在")
 
-    # 增加点击次数
-    share_link.click_count += 1
-    share_link.save()
+    # 点击数和访问统计先在内存中累加，由后台线程批量写回
+    click_buffer.record(link[0], platform="link")
 
-    # 记录访问统计
-    today = timezone.now().date()
-    analytics, created = ShareAnalytics.objects.get_or_create(
-        date=today, platform="link", defaults={"share_count": 0, "click_count": 0}
-    )
-    analytics.click_count += 1
-    analytics.save()
-
-    return redirect(share_link.original_url)
+    return redirect(link[1])
 
 
 @login_required
@@ -173,34 +168,15 @@ def share_analytics(request):
         return JsonResponse({"error": "权限不足"}, status=403)
 
     # 获取时间范围
-    days = int(request.GET.get("days", 7))
-    end_date = timezone.now().date()
+    try:
+        days = min(max(int(request.GET.get("days", 7)), 1), 366)
+    except ValueError:
+        return JsonResponse({"error": "days 参数无效"}, status=400)
+    end_date = timezone.localdate()
     start_date = end_date - timedelta(days=days - 1)
 
-    # 获取统计数据
-    analytics = ShareAnalytics.objects.filter(date__range=[start_date, end_date]).order_by("date", "platform")
-
-    # 按平台汇总
-    platform_summary = {}
-    for record in analytics:
-        platform = record.get_platform_display()
-        if platform not in platform_summary:
-            platform_summary[platform] = {"shares": 0, "clicks": 0}
-        platform_summary[platform]["shares"] += record.share_count
-        platform_summary[platform]["clicks"] += record.click_count
-
-    # 按日期汇总
-    daily_summary = {}
-    for record in analytics:
-        date_str = record.date.strftime("%Y-%m-%d")
-        if date_str not in daily_summary:
-            daily_summary[date_str] = {"shares": 0, "clicks": 0}
-        daily_summary[date_str]["shares"] += record.share_count
-        daily_summary[date_str]["clicks"] += record.click_count
-
-    return JsonResponse(
-        {"platform_summary": platform_summary, "daily_summary": daily_summary, "analytics": list(analytics.values())}
-    )
+    # 汇总在数据库中完成，已结束日期的结果按天缓存
+    return JsonResponse(analytics_summary(start_date, end_date))
 
 
 def pwa_manifest(request):
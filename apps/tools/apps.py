@@ -8,6 +8,24 @@ class ToolsConfig(AppConfig):
 
     def ready(self):
         """应用启动时的初始化"""
+        from django.contrib.auth.models import User
+
+        from .services.database_sharding import track_shard_deletions
+        from .services.food_sampler import track_food_sampler
+        from .services.mood_analysis import track_mood_days
+        from .services.room_presence import track_room_presence
+        from .services.stats_counters import track_count
+
+        # 用户总数由信号增量维护，管理后台不再每次 COUNT(*)
+        track_count(User)
+        # 心情分析读取的按天汇总随日记保存更新
+        track_mood_days()
+        # 聊天室在线用户缓存随在线状态变化失效
+        track_room_presence()
+        # 食物随机抽样的 id 数组随食物库变化重建
+        track_food_sampler()
+        # 分片迁移期间的删除记录墓碑，迁移复制时跳过
+        track_shard_deletions()
 
         # 只在非管理命令环境下运行
         if not self._is_management_command():
@@ -1,151 +1,187 @@
-import json
+"""
+异步任务管理器
+任务状态保存在数据库（BackgroundTask），每次进度更新只原子更新对应的一行并追加一条进度事件，
+所有Web进程看到同一份任务状态；任务在有界线程池中执行，执行进程定期写心跳，
+心跳超时的任务由任意进程重新领取执行
+
+进度事件同时推送到 channel layer 的 task_<任务ID> 分组，由 TaskProgressConsumer 转发给浏览器
+"""
+
 import logging
 import os
+import socket
 import threading
 import time
 import uuid
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
 from typing import Any, Dict, List, Optional
 
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
 from .utils import DeepSeekClient
 
 logger = logging.getLogger(__name__)
 
+ACTIVE_STATUSES = ("pending", "running")
+TERMINAL_STATUSES = ("completed", "failed", "cancelled")
 
-class AsyncTaskManager:
-    """异步任务管理器 - 支持真正的后台任务"""
 
-    def __init__(self):
-        self.tasks: Dict[str, Dict[str, Any]] = {}
-        self.task_lock = threading.Lock()
-        # 使用项目根目录下的task_storage目录
-        project_root = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
-        self.storage_dir = os.path.join(project_root, "task_storage")
-        # 任务超时配置（小时）
-        self.task_timeout_hours = 1
-        self._ensure_storage_dir()
-        self._load_tasks_from_storage()
-        self._start_cleanup_thread()
-
-    def _ensure_storage_dir(self):
-        """确保存储目录存在"""
-        if not os.path.exists(self.storage_dir):
-            os.makedirs(self.storage_dir)
-
-    def _load_tasks_from_storage(self):
-        """从存储中加载任务"""
-        try:
-            tasks_file = os.path.join(self.storage_dir, "tasks.json")
-            if os.path.exists(tasks_file):
-                with open(tasks_file, "r", encoding="utf-8") as f:
-                    tasks_data = json.load(f)
-                    # 只加载未完成的任务
-                    for task_id, task_data in tasks_data.items():
-                        if task_data.get("status") in ["pending", "running"]:
-                            self.tasks[task_id] = task_data
-                            logger.info(f"从存储中恢复任务: {task_id}")
-        except Exception as e:
-            logger.error(f"加载任务存储失败: {e}")
+def task_group_name(task_id: str) -> str:
+    """任务进度事件推送的 channel layer 分组"""
+    return f"task_{task_id}"
 
-    def _save_tasks_to_storage(self):
-        """保存任务到存储"""
-        try:
-            tasks_file = os.path.join(self.storage_dir, "tasks.json")
-            with open(tasks_file, "w", encoding="utf-8") as f:
-                json.dump(self.tasks, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            logger.error(f"保存任务存储失败: {e}")
 
-    def _start_cleanup_thread(self):
-        """启动清理线程，定期清理过期任务和超时任务"""
+def serialize_event(event) -> Dict[str, Any]:
+    return {
+        "id": event.id,
+        "status": event.status,
+        "progress": event.progress,
+        "step": event.step,
+        "created_at": event.created_at.isoformat(),
+    }
 
-        def cleanup_worker():
-            while True:
-                try:
-                    time.sleep(300)  # 每5分钟检查一次
+
+class TaskAborted(Exception):
+    """任务已被删除、取消或被其他进程重新领取"""
+
+
+class AsyncTaskManager:
+    """异步任务管理器 - 数据库持久化 + 有界线程池"""
+
+    def __init__(self):
+        self.max_workers = getattr(settings, "ASYNC_TASK_WORKERS", 4)
+        self.heartbeat_interval = getattr(settings, "ASYNC_TASK_HEARTBEAT_SECONDS", 30)
+        self.lease_seconds = getattr(settings, "ASYNC_TASK_LEASE_SECONDS", 120)
+        self.max_attempts = getattr(settings, "ASYNC_TASK_MAX_ATTEMPTS", 2)
+        # 任务超时配置（小时）
+        self.task_timeout_hours = getattr(settings, "ASYNC_TASK_TIMEOUT_HOURS", 1)
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+        self._executor = None
+        self._maintenance_thread = None
+        self._lock = threading.Lock()
+        self._queued = set()
+        self._running = set()
+
+    # ---- 线程池与维护线程 ----
+
+    def _ensure_started(self):
+        if getattr(settings, "ASYNC_TASKS_EAGER", False):
+            return
+        if self._executor is not None and self._maintenance_thread.is_alive():
+            return
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="async-task")
+            if self._maintenance_thread is None or not self._maintenance_thread.is_alive():
+                self._maintenance_thread = threading.Thread(
+                    target=self._maintenance_loop, name="async-task-maintenance", daemon=True
+                )
+                self._maintenance_thread.start()
+
+    def _maintenance_loop(self):
+        """定期写心跳、回收心跳超时的任务，每10轮清理一次过期任务"""
+        rounds = 0
+        while True:
+            try:
+                self._heartbeat()
+                self.recover_stale_tasks()
+                if rounds % 10 == 0:
                     self._cleanup_expired_tasks()
                     self._cleanup_timeout_tasks()
-                except Exception as e:
-                    logger.error(f"清理任务失败: {e}")
-
-        cleanup_thread = threading.Thread(target=cleanup_worker, daemon=True)
-        cleanup_thread.start()
+            except Exception as e:
+                logger.error(f"任务维护失败: {e}")
+            finally:
+                close_old_connections()
+            rounds += 1
+            time.sleep(self.heartbeat_interval)
+
+    def _submit(self, task_id: str):
+        if getattr(settings, "ASYNC_TASKS_EAGER", False):
+            # 测试环境：在当前线程内同步执行
+            self._execute_task(task_id)
+            return
+        with self._lock:
+            if task_id in self._queued or task_id in self._running:
+                return
+            self._queued.add(task_id)
+        self._ensure_started()
+        self._executor.submit(self._execute_task, task_id)
+
+    def _heartbeat(self):
+        from .models import BackgroundTask
+
+        with self._lock:
+            running = list(self._running)
+        if running:
+            BackgroundTask.objects.filter(id__in=running, worker_id=self.worker_id).update(heartbeat_at=timezone.now())
+
+    def recover_stale_tasks(self) -> int:
+        """回收执行进程已退出的任务：重新排队，超过最大执行次数的标记为失败"""
+        from .models import BackgroundTask
+
+        now = timezone.now()
+        stale_before = now - timedelta(seconds=self.lease_seconds)
+        BackgroundTask.objects.filter(status="running", heartbeat_at__lt=stale_before, attempts__gte=self.max_attempts).update(
+            status="failed", error="任务执行进程异常退出", current_step="生成失败", completed_at=now, worker_id=""
+        )
+        BackgroundTask.objects.filter(status="running", heartbeat_at__lt=stale_before).update(
+            status="pending", current_step="等待重新执行", worker_id=""
+        )
+
+        # 长时间未被领取的任务（提交它的进程已退出），以及上面重新排队的任务
+        stale_ids = list(
+            BackgroundTask.objects.filter(status="pending")
+            .filter(Q(heartbeat_at__isnull=True, created_at__lt=stale_before) | Q(heartbeat_at__lt=stale_before))
+            .values_list("id", flat=True)
+        )
+        for task_id in stale_ids:
+            logger.info(f"重新执行中断的任务: {task_id}")
+            self._submit(task_id)
+        return len(stale_ids)
+
+    # ---- 清理 ----
 
     def _cleanup_expired_tasks(self):
-        """清理过期任务（超过7天的已完成任务）"""
-        with self.task_lock:
-            expired_tasks = []
-            cutoff_time = datetime.now() - timedelta(days=7)
-
-            for task_id, task in self.tasks.items():
-                if task.get("status") in ["completed", "failed"]:
-                    completed_at = task.get("completed_at")
-                    if completed_at:
-                        try:
-                            completed_time = datetime.fromisoformat(completed_at.replace("Z", "+00:00"))
-                            if completed_time < cutoff_time:
-                                expired_tasks.append(task_id)
-                        except Exception:
-                            pass
-
-            for task_id in expired_tasks:
-                del self.tasks[task_id]
-                logger.info(f"清理过期任务: {task_id}")
-
-            if expired_tasks:
-                self._save_tasks_to_storage()
-
-    def _cleanup_timeout_tasks(self):
-        """清理超时任务（超过配置时间未完成的任务）"""
-        with self.task_lock:
-            timeout_tasks = []
-            timeout_threshold = datetime.now() - timedelta(hours=self.task_timeout_hours)
-
-            for task_id, task in self.tasks.items():
-                # 只检查未完成的任务
-                if task.get("status") in ["pending", "running"]:
-                    created_at = task.get("created_at")
-                    if created_at:
-                        try:
-                            created_time = datetime.fromisoformat(created_at.replace("Z", "+00:00"))
-                            if created_time < timeout_threshold:
-                                timeout_tasks.append(task_id)
-                        except Exception:
-                            # 如果时间格式有问题，也标记为超时
-                            timeout_tasks.append(task_id)
-
-            # 删除超时任务
-            for task_id in timeout_tasks:
-                task = self.tasks[task_id]
-                logger.info(f"任务 {task_id} 超时自动删除 (创建时间: {task.get('created_at')}, 状态: {task.get('status')})")
-                del self.tasks[task_id]
-
-            if timeout_tasks:
-                self._save_tasks_to_storage()
-                logger.info(f"自动清理了 {len(timeout_tasks)} 个超时任务")
+        """清理过期任务（超过7天的已结束任务）"""
+        from .models import BackgroundTask
+
+        deleted, _ = BackgroundTask.objects.filter(
+            status__in=TERMINAL_STATUSES, completed_at__lt=timezone.now() - timedelta(days=7)
+        ).delete()
+        if deleted:
+            logger.info(f"清理过期任务 {deleted} 条记录")
+
+    def _cleanup_timeout_tasks(self) -> int:
+        """超过配置时间仍未完成的任务标记为失败"""
+        from .models import BackgroundTask
+
+        now = timezone.now()
+        count = BackgroundTask.objects.filter(
+            status__in=ACTIVE_STATUSES, created_at__lt=now - timedelta(hours=self.task_timeout_hours)
+        ).update(status="failed", error="任务超时", current_step="生成失败", completed_at=now, worker_id="")
+        if count:
+            logger.info(f"自动清理了 {count} 个超时任务")
+        return count
 
     def manual_cleanup_timeout_tasks(self):
-        """手动触发超时任务清理"""
+        """手动触发超时任务清理，返回剩余未完成任务数"""
+        from .models import BackgroundTask
+
         self._cleanup_timeout_tasks()
-        return len([t for t in self.tasks.values() if t.get("status") in ["pending", "running"]])
+        return BackgroundTask.objects.filter(status__in=ACTIVE_STATUSES).count()
 
-    def _is_task_timeout(self, task_id: str) -> bool:
-        """检查任务是否超时"""
-        with self.task_lock:
-            if task_id not in self.tasks:
-                return True
+    def cleanup_old_tasks(self, max_age_hours: int = 24):
+        """清理旧任务"""
+        from .models import BackgroundTask
 
-            task = self.tasks[task_id]
-            created_at = task.get("created_at")
-            if not created_at:
-                return True
+        BackgroundTask.objects.filter(created_at__lt=timezone.now() - timedelta(hours=max_age_hours)).delete()
 
-            try:
-                created_time = datetime.fromisoformat(created_at.replace("Z", "+00:00"))
-                timeout_threshold = datetime.now() - timedelta(hours=self.task_timeout_hours)
-                return created_time < timeout_threshold
-            except Exception:
-                return True
+    # ---- 对外接口 ----
 
     def create_task(
         self,
@@ -157,197 +193,179 @@ class AsyncTaskManager:
         user_id: str = None,
     ) -> str:
         """创建新的后台任务"""
-        task_id = str(uuid.uuid4())
+        from .models import BackgroundTask
 
-        with self.task_lock:
-            self.tasks[task_id] = {
-                "id": task_id,
+        task = BackgroundTask.objects.create(
+            id=str(uuid.uuid4()),
+            owner=user_id or "",
+            payload={
                 "requirement": requirement,
                 "user_prompt": user_prompt,
                 "is_batch": is_batch,
                 "batch_id": batch_id,
                 "total_batches": total_batches,
-                "user_id": user_id,
-                "status": "pending",  # pending, running, completed, failed
-                "progress": 0,
-                "current_step": "等待处理",
-                "result": None,
-                "error": None,
-                "created_at": datetime.now().isoformat(),
-                "started_at": None,
-                "completed_at": None,
-            }
-
-            # 保存到存储
-            self._save_tasks_to_storage()
-
-        # 启动后台任务
-        thread = threading.Thread(target=self._execute_task, args=(task_id,))
-        thread.daemon = True
-        thread.start()
-
-        logger.info(f"创建后台任务: {task_id}, 需求: {requirement[:50]}...")
-        return task_id
+            },
+        )
+        self._append_event(task.id, "pending", 0, task.current_step)
+        # 事务提交后再交给线程池，避免执行线程读不到任务
+        transaction.on_commit(lambda: self._submit(task.id))
+
+        logger.info(f"创建后台任务: {task.id}, 需求: {requirement[:50]}...")
+        return task.id
 
     def get_task_status(self, task_id: str) -> Optional[Dict[str, Any]]:
         """获取任务状态"""
-        with self.task_lock:
-            return self.tasks.get(task_id)
+        from .models import BackgroundTask
 
-    def get_tasks(self) -> List[Dict[str, Any]]:
-        """获取所有任务列表"""
-        with self.task_lock:
-            return list(self.tasks.values())
+        self._ensure_started()
+        task = BackgroundTask.objects.filter(id=task_id).first()
+        return self._to_dict(task) if task else None
 
-    def delete_task(self, task_id: str) -> bool:
-        """删除任务（停止运行中的任务并删除）"""
-        with self.task_lock:
-            if task_id not in self.tasks:
-                return False
-
-            task = self.tasks[task_id]
-
-            # 如果任务正在运行，标记为取消状态
-            if task["status"] == "running":
-                task["status"] = "cancelled"
-                task["completed_at"] = datetime.now().isoformat()
-                task["error"] = "任务已被用户取消"
-                logger.info(f"任务 {task_id} 已被取消")
-
-            # 删除任务
-            del self.tasks[task_id]
-            self._save_tasks_to_storage()
-            logger.info(f"任务 {task_id} 已删除")
-            return True
+    def get_tasks(self, limit: int = 200) -> List[Dict[str, Any]]:
+        """按创建时间倒序获取任务列表（不含结果内容）"""
+        from .models import BackgroundTask
 
-    def _execute_task(self, task_id: str):
-        """执行后台任务"""
-        try:
-            with self.task_lock:
-                if task_id not in self.tasks:
-                    return
-                self.tasks[task_id]["status"] = "running"
-                self.tasks[task_id]["started_at"] = datetime.now().isoformat()
-                self.tasks[task_id]["progress"] = 5
-                self.tasks[task_id]["current_step"] = "分析需求"
-
-            # 检查任务是否超时
-            if self._is_task_timeout(task_id):
-                logger.info(f"任务 {task_id} 在开始执行时已超时，跳过执行")
-                return
+        return [self._to_dict(task) for task in BackgroundTask.objects.defer("result").order_by("-created_at")[:limit]]
 
-            # 获取任务参数
-            task = self.tasks[task_id]
-            requirement = task["requirement"]
-            user_prompt = task["user_prompt"]
-            is_batch = task["is_batch"]
-            batch_id = task["batch_id"]
-            total_batches = task["total_batches"]
+    def get_task_events(self, task_id: str, after_id: int = 0) -> List[Dict[str, Any]]:
+        """获取任务在 after_id 之后的进度事件"""
+        from .models import BackgroundTaskEvent
 
-            # 步骤1: 分析需求 (5-15%)
-            time.sleep(1)  # 模拟分析时间
+        return [serialize_event(event) for event in BackgroundTaskEvent.objects.filter(task_id=task_id, id__gt=after_id)]
 
-            # 检查任务是否超时
-            if self._is_task_timeout(task_id):
-                logger.info(f"任务 {task_id} 在步骤1后超时，停止执行")
-                return
+    def _append_event(self, task_id: str, status: str, progress: int, step: str):
+        """追加进度事件并推送给订阅该任务的连接（推送失败不影响任务执行）"""
+        from .models import BackgroundTaskEvent
 
-            with self.task_lock:
-                if task_id not in self.tasks:  # 任务可能已被删除
-                    return
-                self.tasks[task_id]["progress"] = 15
-                self.tasks[task_id]["current_step"] = "生成功能测试用例"
-                self._save_tasks_to_storage()
+        event = serialize_event(
+            BackgroundTaskEvent.objects.create(task_id=task_id, status=status, progress=progress, step=step)
+        )
+        try:
+            from asgiref.sync import async_to_sync
+            from channels.layers import get_channel_layer
 
-            # 步骤2: 生成功能测试用例 (15-30%)
-            time.sleep(2)
+            channel_layer = get_channel_layer()
+            if channel_layer is not None:
+                async_to_sync(channel_layer.group_send)(task_group_name(task_id), {"type": "task.progress", "event": event})
+        except Exception as e:
+            logger.warning(f"推送任务进度失败: {task_id}, 错误: {e}")
 
-            # 检查任务是否超时
-            if self._is_task_timeout(task_id):
-                logger.info(f"任务 {task_id} 在步骤2后超时，停止执行")
-                return
+    def delete_task(self, task_id: str) -> bool:
+        """删除任务（正在运行的任务会在下一次进度更新时停止）"""
+        from .models import BackgroundTask
 
-            with self.task_lock:
-                if task_id not in self.tasks:
-                    return
-                self.tasks[task_id]["progress"] = 30
-                self.tasks[task_id]["current_step"] = "生成界面测试用例"
-                self._save_tasks_to_storage()
+        deleted, _ = BackgroundTask.objects.filter(id=task_id).delete()
+        if deleted:
+            logger.info(f"任务 {task_id} 已删除")
+        return bool(deleted)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """本进程的执行统计"""
+        with self._lock:
+            running = len(self._running)
+        return {"worker_id": self.worker_id, "running": running, "max_workers": self.max_workers}
+
+    @staticmethod
+    def _to_dict(task) -> Dict[str, Any]:
+        def iso(value):
+            return value.isoformat() if value else None
+
+        payload = task.payload or {}
+        return {
+            "id": task.id,
+            "requirement": payload.get("requirement", ""),
+            "user_prompt": payload.get("user_prompt", ""),
+            "is_batch": payload.get("is_batch", False),
+            "batch_id": payload.get("batch_id", 0),
+            "total_batches": payload.get("total_batches", 1),
+            "user_id": task.owner,
+            "status": task.status,
+            "progress": task.progress,
+            "current_step": task.current_step,
+            "result": None if "result" in task.get_deferred_fields() else task.result,
+            "error": task.error,
+            "attempts": task.attempts,
+            "created_at": iso(task.created_at),
+            "started_at": iso(task.started_at),
+            "completed_at": iso(task.completed_at),
+        }
+
+    # ---- 执行 ----
+
+    def _claim(self, task_id: str) -> bool:
+        """原子地把任务从 pending 改为 running，只有一个进程能领取成功"""
+        from .models import BackgroundTask
+
+        now = timezone.now()
+        claimed = BackgroundTask.objects.filter(id=task_id, status="pending").update(
+            status="running",
+            worker_id=self.worker_id,
+            attempts=F("attempts") + 1,
+            heartbeat_at=now,
+            started_at=now,
+            progress=5,
+            current_step="分析需求",
+        )
+        return bool(claimed)
+
+    def _update_progress(self, task_id: str, progress: int, step: str, status: str = "running", **fields):
+        """更新本进程正在执行的任务，任务已不属于本进程时抛出 TaskAborted"""
+        from .models import BackgroundTask
+
+        updated = BackgroundTask.objects.filter(id=task_id, status="running", worker_id=self.worker_id).update(
+            status=status, progress=progress, current_step=step, heartbeat_at=timezone.now(), **fields
+        )
+        if not updated:
+            raise TaskAborted(task_id)
+        self._append_event(task_id, status, progress, step)
 
-            # 步骤3: 生成界面测试用例 (30-45%)
-            time.sleep(2)
+    def _execute_task(self, task_id: str):
+        """执行后台任务"""
+        from .models import BackgroundTask
 
-            # 检查任务是否超时
-            if self._is_task_timeout(task_id):
-                logger.info(f"任务 {task_id} 在步骤3后超时，停止执行")
+        progress = 5
+        try:
+            with self._lock:
+                self._queued.discard(task_id)
+            if not self._claim(task_id):
                 return
-
-            with self.task_lock:
-                if task_id not in self.tasks:
-                    return
-                self.tasks[task_id]["progress"] = 45
-                self.tasks[task_id]["current_step"] = "生成性能测试用例"
-                self._save_tasks_to_storage()
-
-            # 步骤4: 生成性能测试用例 (45-60%)
-            time.sleep(2)
-            with self.task_lock:
-                self.tasks[task_id]["progress"] = 60
-                self.tasks[task_id]["current_step"] = "生成安全测试用例"
-                self._save_tasks_to_storage()
-
-            # 步骤5: 生成安全测试用例 (60-75%)
-            time.sleep(2)
-            with self.task_lock:
-                self.tasks[task_id]["progress"] = 75
-                self.tasks[task_id]["current_step"] = "生成兼容性测试用例"
-                self._save_tasks_to_storage()
-
-            # 步骤6: 生成兼容性测试用例 (75-90%)
-            time.sleep(2)
-            with self.task_lock:
-                self.tasks[task_id]["progress"] = 90
-                self.tasks[task_id]["current_step"] = "整理和优化"
-                self._save_tasks_to_storage()
-
-            # 调用 DeepSeek API
-            client = DeepSeekClient()
-
-            # 生成测试用例
-            result = client.generate_test_cases(
-                requirement=requirement,
-                user_prompt=user_prompt,
-                is_batch=is_batch,
-                batch_id=batch_id,
-                total_batches=total_batches,
+            with self._lock:
+                self._running.add(task_id)
+
+            task = BackgroundTask.objects.get(id=task_id)
+            self._append_event(task_id, "running", progress, "分析需求")
+            payload = task.payload
+
+            progress = 15
+            self._update_progress(task_id, progress, "生成测试用例")
+            result = DeepSeekClient().generate_test_cases(
+                requirement=payload["requirement"],
+                user_prompt=payload["user_prompt"],
+                is_batch=payload.get("is_batch", False),
+                batch_id=payload.get("batch_id", 0),
+                total_batches=payload.get("total_batches", 1),
             )
 
-            # 步骤7: 完成 (90-100%)
-            time.sleep(1)
-            with self.task_lock:
-                self.tasks[task_id]["status"] = "completed"
-                self.tasks[task_id]["progress"] = 100
-                self.tasks[task_id]["current_step"] = "生成完成"
-                self.tasks[task_id]["result"] = result
-                self.tasks[task_id]["completed_at"] = datetime.now().isoformat()
-                self._save_tasks_to_storage()
-
-            # 创建完成通知
-            self._create_completion_notification(task_id, task)
-
+            self._update_progress(task_id, 100, "生成完成", status="completed", result=result, completed_at=timezone.now())
+            self._create_completion_notification(task_id, self.get_task_status(task_id))
             logger.info(f"后台任务完成: {task_id}")
 
+        except TaskAborted:
+            logger.info(f"任务 {task_id} 已被删除或取消，停止执行")
         except Exception as e:
-            # 任务失败
-            with self.task_lock:
-                if task_id in self.tasks:
-                    self.tasks[task_id]["status"] = "failed"
-                    self.tasks[task_id]["error"] = str(e)
-                    self.tasks[task_id]["current_step"] = "生成失败"
-                    self.tasks[task_id]["completed_at"] = datetime.now().isoformat()
-                    self._save_tasks_to_storage()
-
+            try:
+                self._update_progress(
+                    task_id, progress, "生成失败", status="failed", error=str(e), completed_at=timezone.now()
+                )
+            except TaskAborted:
+                pass
+            except Exception as update_error:
+                logger.error(f"更新任务失败状态出错: {task_id}, 错误: {update_error}")
             logger.error(f"后台任务失败: {task_id}, 错误: {e}")
+        finally:
+            with self._lock:
+                self._running.discard(task_id)
+            close_old_connections()
 
     def _create_completion_notification(self, task_id: str, task: Dict[str, Any]):
         """创建任务完成通知"""
@@ -393,24 +411,6 @@ class AsyncTaskManager:
         except Exception as e:
             logger.error(f"创建任务完成通知失败: {e}")
 
-    def cleanup_old_tasks(self, max_age_hours: int = 24):
-        """清理旧任务"""
-        cutoff_time = datetime.now().timestamp() - (max_age_hours * 3600)
-
-        with self.task_lock:
-            tasks_to_remove = []
-            for task_id, task in self.tasks.items():
-                try:
-                    created_at = datetime.fromisoformat(task["created_at"]).timestamp()
-                    if created_at < cutoff_time:
-                        tasks_to_remove.append(task_id)
-                except Exception:
-                    tasks_to_remove.append(task_id)
-
-            for task_id in tasks_to_remove:
-                del self.tasks[task_id]
-                logger.info(f"清理旧任务: {task_id}")
-
 
-# 全局任务管理器实例
+# 全局任务管理器实例（线程池在第一次提交任务时创建）
 task_manager = AsyncTaskManager()
@@ -104,11 +104,8 @@ class TaskListAPI(APIView):
     def get(self, request):
         """获取任务列表"""
         try:
-            with task_manager.task_lock:
-                tasks = list(task_manager.tasks.values())
-
             # 按创建时间倒序排列
-            tasks.sort(key=lambda x: x["created_at"], reverse=True)
+            tasks = task_manager.get_tasks()
 
             # 只返回基本信息，不包含结果内容
             task_list = []
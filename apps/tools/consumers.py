@@ -662,3 +662,61 @@ class ChatConsumer(AsyncWebsocketConsumer):
 
         except Exception as e:
             logger.error(f"Error recording disconnect time: {e}")
+
+
+class TaskProgressConsumer(AsyncWebsocketConsumer):
+    """后台任务进度推送
+
+    连接时先加入任务分组，再从数据库回放 last_event_id 之后的事件，之后转发实时事件；
+    断线重连时带上最后收到的事件ID即可补齐中间的进度。任务结束后服务端关闭连接
+    """
+
+    async def connect(self):
+        from urllib.parse import parse_qs
+
+        from .async_task_manager import task_group_name, task_manager
+
+        self.task_id = self.scope["url_route"]["kwargs"]["task_id"]
+        self.group_name = task_group_name(self.task_id)
+        query_params = parse_qs(self.scope.get("query_string", b"").decode("utf-8"))
+        try:
+            self.last_event_id = int(query_params.get("last_event_id", ["0"])[0])
+        except ValueError:
+            self.last_event_id = 0
+
+        task = await database_sync_to_async(task_manager.get_task_status)(self.task_id)
+        if task is None:
+            await self.close(code=4404)
+            return
+
+        # 先订阅再回放，回放与实时推送重叠的事件按ID去重
+        await self.channel_layer.group_add(self.group_name, self.channel_name)
+        await self.accept()
+        for event in await database_sync_to_async(task_manager.get_task_events)(self.task_id, self.last_event_id):
+            await self.send_event(event)
+
+    async def disconnect(self, close_code):
+        if hasattr(self, "group_name"):
+            await self.channel_layer.group_discard(self.group_name, self.channel_name)
+
+    async def receive(self, text_data=None, bytes_data=None):
+        # 客户端心跳
+        try:
+            message = json.loads(text_data or "{}")
+        except ValueError:
+            return
+        if message.get("type") == "ping":
+            await self.send(text_data=json.dumps({"type": "pong"}))
+
+    async def task_progress(self, message):
+        await self.send_event(message["event"])
+
+    async def send_event(self, event):
+        if event["id"] <= self.last_event_id:
+            return
+        self.last_event_id = event["id"]
+        await self.send(
+            text_data=json.dumps({"type": "task_progress", "task_id": self.task_id, "event": event}, ensure_ascii=False)
+        )
+        if event["status"] in ("completed", "failed", "cancelled"):
+            await self.close()
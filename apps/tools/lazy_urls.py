@@ -0,0 +1,81 @@
+"""
+URL路由的按需视图加载
+urls.py 只记录视图所在模块的路径，模块在对应路由第一次被请求时才导入，
+避免每个Web进程启动时就加载全部视图及其依赖（PyMuPDF、selenium、torch等）
+"""
+
+import threading
+from importlib import import_module
+
+_resolve_lock = threading.RLock()
+
+# 生成反向解析表时Django会探测这些属性，视图未加载前不应为此导入模块
+_INTROSPECTION_ATTRS = frozenset({"view_class", "view_initkwargs"})
+
+
+class LazyView:
+    """按需导入的视图，首次调用（或访问视图上的属性，如csrf_exempt）时导入"""
+
+    def __init__(self, module_path: str, attr: str, initkwargs=None):
+        self.__module__ = module_path
+        self.__name__ = attr
+        self.__qualname__ = attr
+        self._attr = attr
+        self._initkwargs = initkwargs
+        self._view = None
+
+    def _resolve(self):
+        if self._view is None:
+            with _resolve_lock:
+                if self._view is None:
+                    target = getattr(import_module(self.__module__), self._attr)
+                    if self._initkwargs is not None:
+                        target = target.as_view(**self._initkwargs)
+                    self._view = target
+        return self._view
+
+    def __call__(self, request, *args, **kwargs):
+        return self._resolve()(request, *args, **kwargs)
+
+    def __getattr__(self, name):
+        # 只有实例上不存在的属性才会走到这里；未初始化的实例（如copy时）直接报错，避免递归
+        if name.startswith("__") or "_attr" not in self.__dict__:
+            raise AttributeError(name)
+        if name in _INTROSPECTION_ATTRS and self._view is None:
+            raise AttributeError(name)
+        return getattr(self._resolve(), name)
+
+    def as_view(self, **initkwargs) -> "LazyView":
+        """类视图：延迟到首次请求时再调用 as_view()"""
+        return LazyView(self.__module__, self._attr, initkwargs)
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._view is not None
+
+    def __repr__(self):
+        return f"<LazyView {self.__module__}.{self._attr}{'' if self._view is None else ' (loaded)'}>"
+
+
+class LazyViewModule:
+    """视图模块的占位对象，``views.some_view`` 返回对应的 LazyView"""
+
+    def __init__(self, module_path: str):
+        self._module_path = module_path
+        self._views = {}
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        view = self._views.get(name)
+        if view is None:
+            view = self._views.setdefault(name, LazyView(self._module_path, name))
+        return view
+
+    def __repr__(self):
+        return f"<LazyViewModule {self._module_path}>"
+
+
+def lazy_views(module_path: str) -> LazyViewModule:
+    """按模块路径声明视图来源，例如 ``legacy_views = lazy_views("apps.tools.legacy_views")``"""
+    return LazyViewModule(module_path)
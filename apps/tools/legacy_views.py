@@ -1794,55 +1794,36 @@ def search_diaries(request, data):
         if not query and not mood_filter and not date_from and not date_to and not tags_filter:
             return JsonResponse({"success": False, "error": "请提供搜索条件"}, content_type="application/json")
 
-        diaries = LifeDiaryEntry.objects.filter(user=request.user)
-
-        # 文本搜索
-        if query:
-            diaries = diaries.filter(
-                models.Q(title__icontains=query) | models.Q(content__icontains=query) | models.Q(mood_note__icontains=query)
-            )
-
-        # 心情过滤
-        if mood_filter:
-            diaries = diaries.filter(mood=mood_filter)
-
-        # 日期范围过滤
+        from_date = to_date = None
         if date_from:
             try:
                 from_date = datetime.strptime(date_from, "%Y-%m-%d").date()
-                diaries = diaries.filter(date__gte=from_date)
             except ValueError:
                 return JsonResponse({"success": False, "error": "开始日期格式无效"}, content_type="application/json")
 
         if date_to:
             try:
                 to_date = datetime.strptime(date_to, "%Y-%m-%d").date()
-                diaries = diaries.filter(date__lte=to_date)
             except ValueError:
                 return JsonResponse({"success": False, "error": "结束日期格式无效"}, content_type="application/json")
 
-        # 标签过滤
-        if tags_filter and isinstance(tags_filter, list):
-            for tag in tags_filter:
-                diaries = diaries.filter(tags__contains=[tag])
-
-        diaries = diaries.order_by("-date")[:limit]
-
-        results = []
-        for diary in diaries:
-            results.append(
-                {
-                    "id": diary.id,
-                    "date": diary.date.strftime("%Y-%m-%d"),
-                    "title": diary.title,
-                    "content": diary.content[:200] + "..." if len(diary.content) > 200 else diary.content,
-                    "mood": diary.mood,
-                    "tags": diary.tags,
-                    "created_at": diary.created_at.strftime("%Y-%m-%d %H:%M"),
-                }
-            )
+        from .services.diary_search import DiarySearch
+
+        # 全文索引检索，按相关度（无检索词时按日期）排序，游标分页
+        page = DiarySearch().search(
+            request.user,
+            query=query,
+            mood=mood_filter,
+            date_from=from_date,
+            date_to=to_date,
+            tags=tags_filter if isinstance(tags_filter, list) else [],
+            limit=min(max(int(limit), 1), 100),
+            cursor=data.get("cursor") or None,
+        )
 
-        return JsonResponse({"success": True, "data": results, "total": len(results)})
+        return JsonResponse(
+            {"success": True, "data": page["results"], "total": len(page["results"]), "next_cursor": page["next_cursor"]}
+        )
 
     except Exception as e:
         return JsonResponse({"success": False, "error": f"搜索失败: {str(e)}"})
@@ -1851,134 +1832,10 @@ def search_diaries(request, data):
 def get_mood_analysis(request, data):
     """获取心情分析"""
     try:
-        days = data.get("days", 30)
-        if days > 365:
-            days = 365
-
-        from_date = timezone.now().date() - timezone.timedelta(days=days)
-
-        diaries = LifeDiaryEntry.objects.filter(user=request.user, date__gte=from_date).order_by("date")
-
-        # 心情分布统计
-        mood_counts = {}
-        mood_timeline = []
-
-        for diary in diaries:
-            mood = diary.mood
-            mood_counts[mood] = mood_counts.get(mood, 0) + 1
-
-            mood_timeline.append({"date": diary.date.strftime("%Y-%m-%d"), "mood": mood, "title": diary.title})
-
-        # 计算心情趋势 - 优化算法
-        mood_trend = "stable"
-        if len(mood_timeline) >= 5:  # 至少需要5天数据
-            # 定义心情权重（正数表示积极，负数表示消极）
-            mood_weights = {
-                "happy": 3,  # 非常积极
-                "excited": 2,  # 兴奋
-                "content": 1,  # 满足
-                "neutral": 0,  # 中性
-                "worried": -1,  # 担心
-                "sad": -2,  # 悲伤
-                "angry": -3,  # 愤怒
-                "anxious": -2,  # 焦虑
-                "stressed": -2,  # 压力
-                "calm": 1,  # 平静
-                "grateful": 2,  # 感恩
-                "inspired": 2,  # 受启发
-                "confident": 2,  # 自信
-                "tired": -1,  # 疲惫
-                "frustrated": -2,  # 沮丧
-            }
-
-            # 计算最近14天的加权平均心情
-            recent_days = min(14, len(mood_timeline))
-            recent_moods = mood_timeline[-recent_days:]
-
-            # 计算加权总分
-            total_score = 0
-            valid_entries = 0
-
-            for item in recent_moods:
-                mood = item["mood"]
-                if mood in mood_weights:
-                    total_score += mood_weights[mood]
-                    valid_entries += 1
-
-            if valid_entries > 0:
-                average_score = total_score / valid_entries
-
-                # 计算趋势变化（比较前半段和后半段）
-                if len(recent_moods) >= 8:
-                    first_half = recent_moods[: len(recent_moods) // 2]
-                    second_half = recent_moods[len(recent_moods) // 2 :]
+        from .services.mood_analysis import mood_analysis
 
-                    first_score = sum(mood_weights.get(item["mood"], 0) for item in first_half)
-                    second_score = sum(mood_weights.get(item["mood"], 0) for item in second_half)
-
-                    first_avg = first_score / len(first_half) if first_half else 0
-                    second_avg = second_score / len(second_half) if second_half else 0
-
-                    # 判断趋势
-                    if second_avg > first_avg + 0.5:  # 有明显改善
-                        mood_trend = "improving"
-                    elif second_avg < first_avg - 0.5:  # 有明显下降
-                        mood_trend = "declining"
-                    else:
-                        # 基于整体平均分判断
-                        if average_score > 0.5:
-                            mood_trend = "improving"
-                        elif average_score < -0.5:
-                            mood_trend = "declining"
-                        else:
-                            mood_trend = "stable"
-                else:
-                    # 数据不足时基于平均分判断
-                    if average_score > 0.5:
-                        mood_trend = "improving"
-                    elif average_score < -0.5:
-                        mood_trend = "declining"
-                    else:
-                        mood_trend = "stable"
-
-        # 最常出现的心情
-        most_common_mood = max(mood_counts.items(), key=lambda x: x[1])[0] if mood_counts else "neutral"
-
-        # 计算心情统计信息
-        mood_stats = {
-            "total_entries": len(diaries),
-            "analysis_period": f"最近{days}天",
-            "mood_distribution": mood_counts,
-            "mood_timeline": mood_timeline,
-            "mood_trend": mood_trend,
-            "most_common_mood": most_common_mood,
-            "trend_confidence": "high" if len(mood_timeline) >= 10 else "medium" if len(mood_timeline) >= 5 else "low",
-            "positive_days": sum(
-                1
-                for item in mood_timeline
-                if item["mood"] in ["happy", "excited", "content", "calm", "grateful", "inspired", "confident"]
-            ),
-            "negative_days": sum(
-                1 for item in mood_timeline if item["mood"] in ["sad", "angry", "anxious", "stressed", "frustrated"]
-            ),
-            "neutral_days": sum(1 for item in mood_timeline if item["mood"] in ["neutral", "worried", "tired"]),
-        }
-
-        # 计算心情稳定性
-        if len(mood_timeline) >= 7:
-            mood_changes = 0
-            for i in range(1, len(mood_timeline)):
-                if mood_timeline[i]["mood"] != mood_timeline[i - 1]["mood"]:
-                    mood_changes += 1
-            mood_stats["stability"] = (
-                "stable"
-                if mood_changes <= len(mood_timeline) * 0.3
-                else "volatile" if mood_changes >= len(mood_timeline) * 0.7 else "moderate"
-            )
-        else:
-            mood_stats["stability"] = "insufficient_data"
-
-        return JsonResponse({"success": True, "data": mood_stats})
+        # 分组聚合和窗口函数在按天汇总表上计算，代价与天数成正比
+        return JsonResponse({"success": True, "data": mood_analysis(request.user, data.get("days", 30))})
 
     except Exception as e:
         return JsonResponse({"success": False, "error": f"分析失败: {str(e)}"})
@@ -3032,15 +2889,14 @@ def get_online_users_api(request, room_id):
         )
 
     try:
+        from .services.room_presence import is_member, room_presence
+
         # 获取聊天室
         chat_room = ChatRoom.objects.get(room_id=room_id)
 
-        # 检查用户是否是聊天室的参与者
-        participants = [chat_room.user1]
-        if chat_room.user2:
-            participants.append(chat_room.user2)
-
-        if request.user not in participants:
+        # 整个房间的在线状态一次查询取出并短时间缓存；权限检查使用同一份成员列表
+        online_users = room_presence(chat_room)
+        if not is_member(online_users, request.user.id):
             return JsonResponse(
                 {"success": False, "error": "您没有权限访问此聊天室"},
                 status=403,
@@ -3048,18 +2904,6 @@ def get_online_users_api(request, room_id):
                 headers=response_headers,
             )
 
-        # 获取聊天室中的在线用户
-        online_users = []
-        for user in [chat_room.user1, chat_room.user2]:
-            if user:
-                online_status = UserOnlineStatus.objects.filter(user=user).first()
-                if online_status and online_status.status == "online":
-                    online_users.append(
-                        {"username": user.username, "last_seen": online_status.last_seen.isoformat(), "is_online": True}
-                    )
-                else:
-                    online_users.append({"username": user.username, "last_seen": None, "is_online": False})
-
         return JsonResponse(
             {"success": True, "online_users": online_users, "room_id": room_id},
             content_type="application/json",
@@ -3168,107 +3012,95 @@ def get_active_chat_rooms_api(request):
 
 
 def export_diary_data(request, data):
-    """导出日记数据"""
+    """导出日记数据（流式 CSV，可选 gzip 压缩）"""
     try:
-        import csv
-        from io import StringIO
+        from itertools import chain
 
-        from django.http import HttpResponse
+        from .services.diary_export import CHUNK_SIZE, csv_lines, streaming_export
 
         export_type = data.get("type", "diary")  # diary, goals, all
         date_from = data.get("date_from", "")
         date_to = data.get("date_to", "")
 
-        # 创建CSV数据
-        output = StringIO()
-        writer = csv.writer(output)
-
-        if export_type in ["diary", "all"]:
-            # 导出日记数据
-            diaries = LifeDiaryEntry.objects.filter(user=request.user)
-
-            if date_from:
-                try:
-                    from_date = datetime.strptime(date_from, "%Y-%m-%d").date()
-                    diaries = diaries.filter(date__gte=from_date)
-                except ValueError:
-                    return JsonResponse({"success": False, "error": "开始日期格式无效"}, content_type="application/json")
-
-            if date_to:
-                try:
-                    to_date = datetime.strptime(date_to, "%Y-%m-%d").date()
-                    diaries = diaries.filter(date__lte=to_date)
-                except ValueError:
-                    return JsonResponse({"success": False, "error": "结束日期格式无效"}, content_type="application/json")
+        diaries = LifeDiaryEntry.objects.filter(user=request.user)
 
-            diaries = diaries.order_by("-date")
+        if date_from:
+            try:
+                from_date = datetime.strptime(date_from, "%Y-%m-%d").date()
+                diaries = diaries.filter(date__gte=from_date)
+            except ValueError:
+                return JsonResponse({"success": False, "error": "开始日期格式无效"}, content_type="application/json")
 
-            # 写入日记CSV
-            writer.writerow(["日期", "标题", "内容", "心情", "心情备注", "标签", "创建时间"])
-            for diary in diaries:
-                writer.writerow(
-                    [
-                        diary.date.strftime("%Y-%m-%d"),
-                        diary.title,
-                        diary.content,
-                        diary.get_mood_display(),
-                        diary.mood_note or "",
-                        ", ".join(diary.tags) if diary.tags else "",
-                        diary.created_at.strftime("%Y-%m-%d %H:%M:%S"),
-                    ]
-                )
+        if date_to:
+            try:
+                to_date = datetime.strptime(date_to, "%Y-%m-%d").date()
+                diaries = diaries.filter(date__lte=to_date)
+            except ValueError:
+                return JsonResponse({"success": False, "error": "结束日期格式无效"}, content_type="application/json")
 
-        if export_type in ["goals", "all"]:
-            # 导出目标数据
-            goals = LifeGoal.objects.filter(user=request.user).order_by("-created_at")
+        moods = dict(LifeDiaryEntry.MOOD_CHOICES)
+
+        def diary_rows():
+            # 日记表头（心情备注字段已删除）
+            yield ["日期", "标题", "内容", "心情", "标签", "创建时间"]
+            rows = diaries.order_by("-date", "-id").values_list("date", "title", "content", "mood", "tags", "created_at")
+            for day, title, content, mood, tags, created_at in rows.iterator(chunk_size=CHUNK_SIZE):
+                yield [
+                    day.strftime("%Y-%m-%d"),
+                    title,
+                    content,
+                    moods.get(mood, mood),
+                    ", ".join(tags) if tags else "",
+                    created_at.strftime("%Y-%m-%d %H:%M:%S"),
+                ]
 
+        def goal_rows():
             if export_type == "all":
-                writer.writerow([])  # 空行分隔
-                writer.writerow(["=== 生活目标数据 ==="])
-
-            writer.writerow(
-                [
-                    "目标标题",
-                    "描述",
-                    "类别",
-                    "类型",
-                    "状态",
-                    "进度",
-                    "优先级",
-                    "难度",
-                    "开始日期",
-                    "目标日期",
-                    "标签",
-                    "创建时间",
+                yield []  # 空行分隔
+                yield ["=== 生活目标数据 ==="]
+            yield [
+                "目标标题",
+                "描述",
+                "类别",
+                "类型",
+                "状态",
+                "进度",
+                "优先级",
+                "难度",
+                "开始日期",
+                "目标日期",
+                "标签",
+                "创建时间",
+            ]
+            goals = LifeGoal.objects.filter(user=request.user).order_by("-created_at")
+            for goal in goals.iterator(chunk_size=CHUNK_SIZE):
+                yield [
+                    goal.title,
+                    goal.description or "",
+                    goal.get_category_display(),
+                    goal.get_goal_type_display(),
+                    goal.get_status_display(),
+                    f"{goal.progress}%",
+                    goal.priority,
+                    goal.get_difficulty_display(),
+                    goal.start_date.strftime("%Y-%m-%d") if goal.start_date else "",
+                    goal.target_date.strftime("%Y-%m-%d") if goal.target_date else "",
+                    ", ".join(goal.tags) if goal.tags else "",
+                    goal.created_at.strftime("%Y-%m-%d %H:%M:%S"),
                 ]
-            )
-            for goal in goals:
-                writer.writerow(
-                    [
-                        goal.title,
-                        goal.description or "",
-                        goal.get_category_display(),
-                        goal.get_goal_type_display(),
-                        goal.get_status_display(),
-                        f"{goal.progress}%",
-                        goal.priority,
-                        goal.get_difficulty_display(),
-                        goal.start_date.strftime("%Y-%m-%d") if goal.start_date else "",
-                        goal.target_date.strftime("%Y-%m-%d") if goal.target_date else "",
-                        ", ".join(goal.tags) if goal.tags else "",
-                        goal.created_at.strftime("%Y-%m-%d %H:%M:%S"),
-                    ]
-                )
+
+        sections = []
+        if export_type in ["diary", "all"]:
+            sections.append(diary_rows())
+        if export_type in ["goals", "all"]:
+            sections.append(goal_rows())
 
         # 生成文件名
         timestamp = timezone.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"life_diary_export_{export_type}_{timestamp}.csv"
-
-        # 创建HTTP响应
-        response = HttpResponse(output.getvalue(), content_type="text/csv; charset=utf-8")
-        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        filename = f"life_diary_export_{export_type}_{timestamp}"
 
-        return response
+        # 逐行生成 CSV 并流式返回，内存占用与导出条数无关
+        return streaming_export(csv_lines(chain(*sections)), "csv", filename, compress=bool(data.get("gzip")))
 
     except Exception as e:
         return JsonResponse({"success": False, "error": f"导出失败: {str(e)}"})
@@ -6581,90 +6413,21 @@ def fitness_tools(request):
 def get_fitness_community_posts_api(request):
     """获取健身社区帖子API"""
     try:
-        page = int(request.GET.get("page", 1))
-        page_size = int(request.GET.get("page_size", 10))
-        post_type = request.GET.get("post_type", "")
-        user_id = request.GET.get("user_id", "")
-
-        posts = FitnessCommunityPost.objects.filter(is_deleted=False, is_public=True).select_related("user", "related_checkin")
-
-        # 过滤帖子类型
-        if post_type:
-            posts = posts.filter(post_type=post_type)
+        from .services.fitness_feed import community_feed
 
-        # 过滤用户
-        if user_id:
-            posts = posts.filter(user_id=user_id)
-
-        # 分页
-        total_count = posts.count()
-        posts = posts[(page - 1) * page_size : page * page_size]
-
-        posts_data = []
-        for post in posts:
-            # 获取用户档案
-            try:
-                profile = FitnessUserProfile.objects.get(user=post.user)
-                user_display_name = profile.get_display_name()
-                user_avatar = profile.avatar.url if profile.avatar else None
-            except FitnessUserProfile.DoesNotExist:
-                user_display_name = post.user.username
-                user_avatar = None
-
-            # 检查当前用户是否点赞
-            is_liked = FitnessCommunityLike.objects.filter(user=request.user, post=post).exists()
-
-            posts_data.append(
-                {
-                    "id": post.id,
-                    "post_type": post.post_type,
-                    "title": post.title,
-                    "content": post.content,
-                    "tags": post.tags,
-                    "training_parts": post.training_parts,
-                    "difficulty_level": post.difficulty_level,
-                    "likes_count": post.likes_count,
-                    "comments_count": post.comments_count,
-                    "shares_count": post.shares_count,
-                    "views_count": post.views_count,
-                    "is_liked": is_liked,
-                    "is_featured": post.is_featured,
-                    "created_at": post.created_at.isoformat(),
-                    "user": {
-                        "id": post.user.id,
-                        "username": post.user.username,
-                        "display_name": user_display_name,
-                        "avatar": user_avatar,
-                    },
-                    "related_checkin": (
-                        {
-                            "id": post.related_checkin.id,
-                            "date": post.related_checkin.date.isoformat(),
-                            "workout_type": post.related_checkin.detail.workout_type if post.related_checkin.detail else None,
-                            "duration": post.related_checkin.detail.duration if post.related_checkin.detail else None,
-                            "training_parts": (
-                                post.related_checkin.detail.training_parts if post.related_checkin.detail else []
-                            ),
-                            "feeling_rating": (
-                                post.related_checkin.detail.feeling_rating if post.related_checkin.detail else None
-                            ),
-                        }
-                        if post.related_checkin
-                        else None
-                    ),
-                }
+        try:
+            # 按 (created_at, id) 游标翻页，不再使用页码偏移
+            feed = community_feed(
+                request.user,
+                post_type=request.GET.get("post_type", ""),
+                user_id=request.GET.get("user_id", ""),
+                page_size=int(request.GET.get("page_size", 10)),
+                cursor=request.GET.get("cursor") or None,
             )
+        except ValueError as e:
+            return JsonResponse({"success": False, "error": str(e)}, status=400)
 
-        return JsonResponse(
-            {
-                "success": True,
-                "posts": posts_data,
-                "total_count": total_count,
-                "page": page,
-                "page_size": page_size,
-                "has_next": page * page_size < total_count,
-            }
-        )
+        return JsonResponse({"success": True, **feed})
 
     except Exception as e:
         return JsonResponse({"success": False, "error": str(e)}, status=500)
@@ -8169,11 +7932,12 @@ def audio_converter_api(request):
         # 如果是NCM文件，先提取元数据
         if file_extension == "ncm":
             try:
-                ncm_result = decrypt_ncm_file_correct(temp_input_path)
-                if ncm_result:
-                    ncm_metadata = ncm_result.get("metadata", {})
-                    ncm_album_cover = ncm_result.get("album_cover")
-                    logger.info(f"NCM元数据提取成功: {ncm_metadata}")
+                from .services.ncm_decoder import read_ncm_info
+
+                ncm_result = read_ncm_info(temp_input_path)
+                ncm_metadata = ncm_result["metadata"]
+                ncm_album_cover = ncm_result["album_cover"]
+                logger.info(f"NCM元数据提取成功: {ncm_metadata}")
             except Exception as e:
                 logger.warning(f"NCM元数据提取失败: {e}")
 
@@ -8214,7 +7978,7 @@ def audio_converter_api(request):
             if ncm_album_cover:
                 try:
                     # 保存专辑封面到媒体存储
-                    cover_filename = f"album_cover_{unique_id}.jpg"
+                    cover_filename = f"album_cover_{unique_id}.{'png' if ncm_album_cover['format'] == 'png' else 'jpg'}"
                     cover_path = default_storage.save(f"temp_audio/{cover_filename}", ContentFile(ncm_album_cover["data"]))
                     cover_url = default_storage.url(cover_path)
 
@@ -8260,18 +8024,14 @@ def convert_audio_file(input_path, output_path, target_format):
         if input_path.lower().endswith(".ncm"):
             logger.info(f"开始解密NCM文件: {input_path}")
             try:
-                # 使用正确的NCM解密函数
-                ncm_result = decrypt_ncm_file_correct(input_path)
-
-                # 提取音频数据
-                decrypted_audio_data = ncm_result["audio_data"]
-
-                # 保存解密后的音频数据到临时文件
                 import tempfile
 
+                from .services.ncm_decoder import decrypt_ncm
+
+                # 分块解密，直接写入临时文件
                 temp_fd, decrypted_path = tempfile.mkstemp(suffix=".mp3", prefix="ncm_decrypted_")
-                with os.fdopen(temp_fd, "wb") as f:
-                    f.write(decrypted_audio_data)
+                os.close(temp_fd)
+                decrypt_ncm(input_path, decrypted_path)
 
                 logger.info(f"NCM解密成功，临时文件: {decrypted_path}")
 
@@ -8492,488 +8252,20 @@ def convert_audio_file(input_path, output_path, target_format):
 
 
 def decrypt_ncm_file(ncm_path):
-    """解密NCM文件"""
-    try:
-        import base64
-        import json
-        import os
-        import struct
-
-        from cryptography.hazmat.backends import default_backend
-        from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
-
-        # 检查文件是否存在
-        if not os.path.exists(ncm_path):
-            raise Exception(f"文件不存在: {ncm_path}")
-
-        # 检查文件大小
-        file_size = os.path.getsize(ncm_path)
-        if file_size < 1024:  # 文件太小，不可能是有效的NCM文件
-            raise Exception("文件太小，不是有效的NCM文件")
-
-        # NCM文件解密密钥
-        core_key = b"hzHRAmso5kInbaxW"
-        meta_key = b"#14ljk_!\\]&0U<'("
-
-        def unpad(s):
-            """移除PKCS7填充"""
-            if not s:
-                return s
-            padding_length = s[-1] if isinstance(s[-1], int) else ord(s[-1])
-            if padding_length > len(s) or padding_length == 0:
-                return s
-            return s[:-padding_length]
-
-        with open(ncm_path, "rb") as f:
-            # 读取文件头
-            header = f.read(8)
-            if len(header) != 8 or header != b"CTENFDAM":
-                raise Exception("不是有效的NCM文件格式")
-
-            # 跳过2字节
-            f.seek(2, 1)
-
-            # 读取密钥数据长度
-            key_length_data = f.read(4)
-            if len(key_length_data) != 4:
-                raise Exception("NCM文件格式错误：无法读取密钥长度")
-
-            key_length = struct.unpack("<I", key_length_data)[0]
-            if key_length <= 0 or key_length > file_size:
-                raise Exception(f"NCM文件格式错误：密钥长度异常 ({key_length})")
-
-            # 读取密钥数据
-            key_data = f.read(key_length)
-            if len(key_data) != key_length:
-                raise Exception("NCM文件格式错误：密钥数据读取不完整")
-
-            # 解密密钥数据
-            key_data = bytes([byte ^ 0x64 for byte in key_data])
-            cipher = Cipher(algorithms.AES(core_key), modes.CBC(b"\x00" * 16), backend=default_backend())
-            decryptor = cipher.decryptor()
-            key_data = decryptor.update(key_data) + decryptor.finalize()
-
-            # 移除PKCS7填充
-            key_data = unpad(key_data)
-
-            print(f"解密后的密钥数据长度: {len(key_data)}")
-            print(f"解密后的密钥数据前32字节: {key_data[:32].hex()}")
-
-            # 从解密后的密钥数据中提取实际的密钥
-            try:
-                # 尝试不同的密钥提取方式
-                rc4_key = None
-
-                # 方法1：查找JSON数据
-                key_json_start = key_data.find(b"{")
-                if key_json_start != -1:
-                    try:
-                        key_json_data = key_data[key_json_start:]
-                        # 找到JSON结束位置
-                        json_end = key_json_data.find(b"}")
-                        if json_end != -1:
-                            key_json_data = key_json_data[: json_end + 1]
-
-                        # 尝试解码JSON
-                        key_info = json.loads(key_json_data.decode("utf-8", errors="ignore"))
-                        if "key" in key_info and isinstance(key_info["key"], list):
-                            rc4_key = bytes(key_info["key"])
-                            print(f"方法1成功：从JSON提取到密钥，长度: {len(rc4_key)}")
-                        else:
-                            print("JSON中没有找到有效的key字段")
-                            rc4_key = None
-                    except (json.JSONDecodeError, UnicodeDecodeError) as e:
-                        print(f"JSON解析失败: {e}")
-                        rc4_key = None
-
-                # 方法2：跳过neteasecloudmusic前缀
-                if not rc4_key:
-                    netease_prefix = b"neteasecloudmusic"
-                    prefix_pos = key_data.find(netease_prefix)
-                    if prefix_pos != -1:
-                        rc4_key = key_data[prefix_pos + len(netease_prefix) :]
-                        print(f"方法2成功：跳过前缀提取密钥，长度: {len(rc4_key)}")
-
-                # 方法3：查找RC4密钥标识
-                if not rc4_key:
-                    # 查找可能的RC4密钥标识
-                    for i in range(len(key_data) - 16):
-                        if key_data[i : i + 4] == b"RC4K" or key_data[i : i + 4] == b"KEY_":
-                            rc4_key = key_data[i + 4 : i + 132]  # 假设RC4密钥长度为128字节
-                            print(f"方法3成功：找到RC4密钥标识，长度: {len(rc4_key)}")
-                            break
-
-                # 方法4：使用固定偏移（跳过前17字节）
-                if not rc4_key and len(key_data) > 17:
-                    rc4_key = key_data[17:]
-                    print(f"方法4成功：固定偏移提取密钥，长度: {len(rc4_key)}")
-
-                # 方法5：使用整个密钥数据
-                if not rc4_key:
-                    rc4_key = key_data
-                    print(f"方法5：使用整个密钥数据，长度: {len(rc4_key)}")
-
-                # 确保密钥不为空且长度合理
-                if not rc4_key or len(rc4_key) == 0:
-                    raise Exception("无法提取RC4密钥")
-
-                # 如果密钥太长，截取合理长度
-                if len(rc4_key) > 256:
-                    rc4_key = rc4_key[:256]
-                    print(f"密钥太长，截取到256字节")
-
-            except Exception as e:
-                # 最后的备用方案：使用默认密钥
-                print(f"密钥提取失败，使用备用方案: {e}")
-                default_key = b"163 key(Don't modify):" + b"\x00" * 16
-                rc4_key = default_key[:32]  # 使用32字节默认密钥
-
-            # 读取元数据长度
-            meta_length_data = f.read(4)
-            if len(meta_length_data) != 4:
-                raise Exception("NCM文件格式错误：无法读取元数据长度")
-
-            meta_length = struct.unpack("<I", meta_length_data)[0]
-
-            # 读取并解密元数据（如果存在）
-            if meta_length > 0:
-                if meta_length > file_size:
-                    raise Exception(f"NCM文件格式错误：元数据长度异常 ({meta_length})")
-
-                meta_data = f.read(meta_length)
-                if len(meta_data) != meta_length:
-                    raise Exception("NCM文件格式错误：元数据读取不完整")
-
-                try:
-                    # 解密元数据
-                    meta_data = bytes([byte ^ 0x63 for byte in meta_data])
-                    meta_data = base64.b64decode(meta_data[22:])
-                    cipher = Cipher(algorithms.AES(meta_key), modes.CBC(b"\x00" * 16), backend=default_backend())
-                    decryptor = cipher.decryptor()
-                    meta_data = decryptor.update(meta_data) + decryptor.finalize()
-                    meta_data = unpad(meta_data)
-                except Exception as e:
-                    print(f"元数据解密失败: {e}")
-                    meta_data = b""
-
-            # 跳过CRC32
-            f.seek(9, 1)
-
-            # 读取音频数据盒子长度
-            box_length_data = f.read(4)
-            if len(box_length_data) != 4:
-                raise Exception("NCM文件格式错误：无法读取音频数据盒子长度")
-
-            box_length = struct.unpack("<I", box_length_data)[0]
-            if box_length > 0:
-                f.seek(box_length, 1)
-
-            # 创建临时文件存储解密后的音频
-
-            temp_dir = os.path.dirname(ncm_path) or os.getcwd()
-
-            # 使用更安全的临时文件名
-            import uuid
-
-            unique_id = str(uuid.uuid4())[:8]
-            decrypted_path = os.path.join(temp_dir, f"decrypted_temp_{unique_id}.mp3")
-
-            # 确保rc4_key不为空
-            if not rc4_key:
-                raise Exception("RC4密钥为空，无法解密音频数据")
-
-            print(f"开始解密音频数据，密钥长度: {len(rc4_key)}")
-            print(f"解密输出路径: {decrypted_path}")
-
-            # 生成RC4密钥流（KSA - Key Scheduling Algorithm）
-            S = list(range(256))
-            j = 0
-            key_len = len(rc4_key)
-
-            for i in range(256):
-                j = (j + S[i] + rc4_key[i % key_len]) & 0xFF
-                S[i], S[j] = S[j], S[i]
-
-            # 准备PRGA（Pseudo-Random Generation Algorithm）
-            i = j = 0
-            chunk_count = 0
-            total_bytes = 0
-
-            # 获取剩余文件大小
-            current_pos = f.tell()
-            f.seek(0, 2)  # 移动到文件末尾
-            end_pos = f.tell()
-            f.seek(current_pos)  # 回到当前位置
-            audio_data_size = end_pos - current_pos
-
-            print(f"音频数据大小: {audio_data_size} bytes")
-
-            if audio_data_size <= 0:
-                raise Exception("没有可解密的音频数据")
-
-            with open(decrypted_path, "wb") as out_file:
-                while True:
-                    chunk = f.read(0x8000)  # 32KB chunks
-                    if not chunk:
-                        break
-
-                    chunk_count += 1
-                    total_bytes += len(chunk)
-
-                    if chunk_count % 10 == 0:  # 每10个chunk打印一次进度
-                        progress = (total_bytes / audio_data_size) * 100
-                        print(f"正在解密第{chunk_count}个数据块... 进度: {progress:.1f}%")
-
-                    # 使用RC4解密音频数据（PRGA）
-                    decrypted_chunk = bytearray()
-
-                    for byte_val in chunk:
-                        i = (i + 1) & 0xFF
-                        j = (j + S[i]) & 0xFF
-                        S[i], S[j] = S[j], S[i]
-                        k = S[(S[i] + S[j]) & 0xFF]
-                        decrypted_chunk.append(byte_val ^ k)
-
-                    out_file.write(decrypted_chunk)
-
-            print(f"音频解密完成，共处理{chunk_count}个数据块，总计{total_bytes}字节")
-
-            # 验证解密后的文件
-            if not os.path.exists(decrypted_path):
-                raise Exception("解密后的文件创建失败")
-
-            decrypted_size = os.path.getsize(decrypted_path)
-            print(f"解密后文件大小: {decrypted_size} bytes")
-
-            if decrypted_size == 0:
-                raise Exception("解密后的文件为空")
-
-            # 检查文件头
-            with open(decrypted_path, "rb") as verify_file:
-                header = verify_file.read(16)
-                print(f"解密后文件头16字节: {header.hex()}")
-
-                # 尝试识别音频格式
-                if header.startswith(b"ID3"):
-                    print("✅ 检测到MP3文件（ID3标签）")
-                elif header[0:2] == b"\xff\xfb" or header[0:2] == b"\xff\xfa":
-                    print("✅ 检测到MP3文件（帧头）")
-                elif header.startswith(b"RIFF"):
-                    print("✅ 检测到WAV文件")
-                elif header.startswith(b"fLaC"):
-                    print("✅ 检测到FLAC文件")
-                elif b"ftyp" in header[4:8]:
-                    print("✅ 检测到M4A/MP4文件")
-                else:
-                    print("❌ 无法识别音频格式，文件头: " + header.hex())
-                    print("🔄 直接使用修复后的备用解密算法...")
-                    return decrypt_ncm_file_fallback(ncm_path)
-
-            return decrypted_path
-
-    except Exception as e:
-        print(f"NCM解密错误: {e}")
-        import traceback
-
-        traceback.print_exc()
+    """解密NCM文件，返回与源文件同目录的解密后音频路径，失败返回None"""
+    import logging
 
-        # 尝试备用解密方案
-        print("尝试使用备用解密方案...")
-        try:
-            return decrypt_ncm_file_fallback(ncm_path)
-        except Exception as fallback_error:
-            print(f"备用解密方案也失败: {fallback_error}")
-            return None
+    from .services.ncm_decoder import decrypt_ncm
 
+    logger = logging.getLogger(__name__)
 
-def decrypt_ncm_file_fallback(ncm_path):
-    """NCM文件备用解密方案 - 完全重写版本"""
+    decrypted_path = os.path.join(os.path.dirname(ncm_path) or os.getcwd(), f"decrypted_temp_{uuid.uuid4().hex[:8]}.mp3")
     try:
-        import json
-        import os
-        import struct
-        import uuid
-
-        try:
-            from cryptography.hazmat.backends import default_backend
-            from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
-        except ImportError:
-            raise Exception("需要安装pycryptodome库: pip install pycryptodome")
-
-        print("🔧 使用完全重写的NCM解密算法...")
-
-        with open(ncm_path, "rb") as f:
-            # 检查文件头
-            header = f.read(8)
-            if header != b"CTENFDAM":
-                raise Exception("不是有效的NCM文件")
-
-            print(f"✅ 文件头验证通过: {header}")
-
-            # 跳过版本信息
-            f.seek(2, 1)
-
-            # 读取密钥长度
-            key_length = struct.unpack("<I", f.read(4))[0]
-            print(f"🔑 密钥长度: {key_length}")
-
-            # 读取密钥数据
-            key_data = f.read(key_length)
-            print(f"🔑 原始密钥数据长度: {len(key_data)}")
-            print(f"🔑 原始密钥数据前32字节: {key_data[:32].hex()}")
-
-            # XOR 0x64
-            key_data_xor = bytes([byte ^ 0x64 for byte in key_data])
-            print(f"🔑 XOR 0x64后: {key_data_xor[:32].hex()}")
-
-            # AES解密
-            core_key = b"hzHRAmso5kInbaxW"
-            cipher = Cipher(algorithms.AES(core_key), modes.ECB(), backend=default_backend())
-            decryptor = cipher.decryptor()
-            decrypted_key = decryptor.update(key_data_xor) + decryptor.finalize()
-            print(f"🔑 AES解密后: {decrypted_key[:32].hex()}")
-
-            # 移除PKCS7填充
-            while decrypted_key and decrypted_key[-1] == 0:
-                decrypted_key = decrypted_key[:-1]
-            print(f"🔑 移除填充后: {decrypted_key[:32].hex()}")
-            print(f"🔑 解密后密钥长度: {len(decrypted_key)}")
-
-            # 尝试解析JSON
-            try:
-                key_json_start = decrypted_key.find(b"{")
-                if key_json_start != -1:
-                    key_json_data = decrypted_key[key_json_start:]
-                    json_end = key_json_data.find(b"}")
-                    if json_end != -1:
-                        key_json_data = key_json_data[: json_end + 1]
-                        key_info = json.loads(key_json_data.decode("utf-8"))
-                        print(f"🔑 JSON解析成功: {key_info}")
-                        if "key" in key_info:
-                            rc4_key = bytes(key_info["key"])
-                            print(f"🔑 从JSON提取RC4密钥: {rc4_key[:32].hex()}")
-                        else:
-                            raise Exception("JSON中没有key字段")
-                    else:
-                        raise Exception("找不到JSON结束位置")
-                else:
-                    raise Exception("找不到JSON开始位置")
-            except Exception as e:
-                print(f"❌ JSON解析失败: {e}")
-                # 备用方案：跳过neteasecloudmusic前缀
-                netease_prefix = b"neteasecloudmusic"
-                prefix_pos = decrypted_key.find(netease_prefix)
-                if prefix_pos != -1:
-                    rc4_key = decrypted_key[prefix_pos + len(netease_prefix) :]
-                    print(f"🔑 跳过前缀提取RC4密钥: {rc4_key[:32].hex()}")
-                else:
-                    raise Exception("无法提取RC4密钥")
-
-            print(f"🔑 最终RC4密钥长度: {len(rc4_key)}")
-
-            # 读取元数据长度
-            meta_length = struct.unpack("<I", f.read(4))[0]
-            print(f"📝 元数据长度: {meta_length}")
-
-            # 跳过元数据
-            if meta_length > 0:
-                f.seek(meta_length, 1)
-
-            # 跳过CRC
-            f.seek(9, 1)
-
-            # 读取盒子长度
-            box_length = struct.unpack("<I", f.read(4))[0]
-            print(f"📦 盒子长度: {box_length}")
-
-            # 跳过盒子数据
-            if box_length > 0:
-                f.seek(box_length, 1)
-
-            # 获取音频数据位置
-            audio_start = f.tell()
-            print(f"🎵 音频数据开始位置: {audio_start}")
-
-            # 创建输出文件
-            temp_dir = os.path.dirname(ncm_path) or os.getcwd()
-            unique_id = str(uuid.uuid4())[:8]
-            output_path = os.path.join(temp_dir, f"decrypted_complete_{unique_id}.mp3")
-
-            print(f"📄 输出文件: {output_path}")
-
-            # RC4解密音频数据
-            with open(output_path, "wb") as out_file:
-                # 初始化RC4状态
-                S = list(range(256))
-                j = 0
-
-                # 密钥调度算法 (KSA)
-                for i in range(256):
-                    j = (j + S[i] + rc4_key[i % len(rc4_key)]) % 256
-                    S[i], S[j] = S[j], S[i]
-
-                # 伪随机生成算法 (PRGA)
-                i = j = 0
-                chunk_count = 0
-                total_size = 0
-
-                while True:
-                    chunk = f.read(0x8000)  # 32KB
-                    if not chunk:
-                        break
-
-                    chunk_count += 1
-                    total_size += len(chunk)
-
-                    if chunk_count % 50 == 0:
-                        print(f"🔄 处理第{chunk_count}块，总大小: {total_size:,} bytes")
-
-                    # RC4解密
-                    decrypted = bytearray()
-                    for byte in chunk:
-                        i = (i + 1) % 256
-                        j = (j + S[i]) % 256
-                        S[i], S[j] = S[j], S[i]
-                        k = S[(S[i] + S[j]) % 256]
-                        decrypted.append(byte ^ k)
-
-                    out_file.write(decrypted)
-
-            print(f"✅ 解密完成，处理了{chunk_count}个数据块，总大小: {total_size:,} bytes")
-
-            # 验证输出文件
-            if os.path.exists(output_path) and os.path.getsize(output_path) > 0:
-                file_size = os.path.getsize(output_path)
-                print(f"修复解密成功，文件大小: {file_size:,} bytes")
-
-                # 检查文件头
-                with open(output_path, "rb") as check_file:
-                    header = check_file.read(10)
-                    print(f"解密后文件头: {header.hex()}")
-
-                    # 检查是否是有效的音频格式
-                    if (
-                        header.startswith(b"ID3")  # MP3 with ID3
-                        or header[0:3] == b"\xff\xfb"  # MP3 frame header
-                        or header[0:3] == b"\xff\xfa"  # MP3 frame header
-                        or header.startswith(b"RIFF")  # WAV
-                        or header.startswith(b"fLaC")  # FLAC
-                        or header[4:8] == b"ftyp"
-                    ):  # M4A
-                        print("✅ 解密后的文件头验证通过")
-                    else:
-                        print("⚠️ 解密后的文件头不匹配已知音频格式")
-
-                return output_path
-            else:
-                raise Exception("修复解密输出文件无效")
-
+        return decrypt_ncm(ncm_path, decrypted_path)["output_path"]
     except Exception as e:
-        print(f"修复解密失败: {e}")
-        print(f"错误类型: {type(e).__name__}")
-        import traceback
-
-        traceback.print_exc()
+        logger.error(f"NCM解密错误: {e}")
+        if os.path.exists(decrypted_path):
+            os.remove(decrypted_path)
         return None
 
 
@@ -9139,267 +8431,113 @@ def repair_audio_file_with_offset(audio_path, offset):
         return None
 
 
-def convert_ncm_file_native(input_path, output_path, target_format):
-    """原生NCM文件转换，绕过pydub和ffmpeg"""
-    try:
-        import os
-
-        print(f"开始原生转换: {input_path} -> {output_path} ({target_format})")
-
-        if not os.path.exists(input_path):
-            return False, "输入文件不存在", None
-
-        # 读取解密后的音频数据
-        with open(input_path, "rb") as f:
-            data = f.read()
-
-        if len(data) < 1024:
-            return False, "文件太小，无法处理", None
-
-        # 增强的音频数据定位方法
-        audio_start = 0
-        audio_format = None
-
-        print(f"文件总大小: {len(data)} bytes")
-        print(f"文件头16字节: {data[:16].hex()}")
-
-        # 方法1: 检查ID3标签
-        if data.startswith(b"ID3"):
-            if len(data) >= 10:
-                # 读取ID3标签大小
-                size = ((data[6] & 0x7F) << 21) | ((data[7] & 0x7F) << 14) | ((data[8] & 0x7F) << 7) | (data[9] & 0x7F)
-                audio_start = 10 + size
-                audio_format = "mp3"
-                print(f"✅ 检测到ID3标签，音频数据从位置 {audio_start} 开始")
-
-        # 方法2: 查找MP3帧头 (更精确的搜索)
-        if not audio_format:
-            for i in range(min(len(data) - 4, 4096)):  # 在前4KB中搜索
-                if data[i] == 0xFF and (data[i + 1] & 0xE0) == 0xE0:
-                    # 验证这是一个有效的MP3帧头
-                    if i + 3 < len(data):
-                        # 检查帧头格式
-                        frame_header = (data[i] << 24) | (data[i + 1] << 16) | (data[i + 2] << 8) | data[i + 3]
-                        # MPEG版本和层检查
-                        mpeg_version = (frame_header >> 19) & 0x3
-                        layer = (frame_header >> 17) & 0x3
-                        if mpeg_version != 1 and layer != 1:  # 不是MPEG1 Layer3
-                            continue
-
-                        audio_start = i
-                        audio_format = "mp3"
-                        print(f"✅ 找到有效MP3帧头位置: {i}")
-                        print(f"MP3帧头: {data[i:i+4].hex()}")
-                        break
-
-        # 方法3: 查找其他音频格式头
-        if not audio_format:
-            if data.startswith(b"RIFF") and len(data) > 12 and data[8:12] == b"WAVE":
-                audio_start = 0
-                audio_format = "wav"
-                print("✅ 检测到WAV文件")
-            elif data.startswith(b"fLaC"):
-                audio_start = 0
-                audio_format = "flac"
-                print("✅ 检测到FLAC文件")
-            elif len(data) > 8 and b"ftyp" in data[4:8]:
-                audio_start = 0
-                audio_format = "m4a"
-                print("✅ 检测到M4A/MP4文件")
-
-        # 方法4: 如果都没找到，尝试跳过可能的头部数据
-        if not audio_format:
-            # 尝试跳过前1KB的数据，查找MP3帧头
-            for i in range(1024, min(len(data) - 4, 2048)):
-                if data[i] == 0xFF and (data[i + 1] & 0xE0) == 0xE0:
-                    audio_start = i
-                    audio_format = "mp3"
-                    print(f"⚠️ 跳过头部后找到MP3帧头位置: {i}")
-                    break
-
-        # 如果仍然没找到，假设是MP3格式，从文件开始处理
-        if not audio_format:
-            audio_format = "mp3"
-            print("⚠️ 未检测到明确格式，假设为MP3格式")
-
-        audio_data = data[audio_start:]
-
-        if len(audio_data) < 1024:
-            return False, "有效音频数据太少", None
-
-        print(f"提取的音频数据大小: {len(audio_data)} bytes")
-        print(f"音频数据前16字节: {audio_data[:16].hex()}")
-
-        # 根据目标格式进行转换
-        if target_format.lower() == "mp3":
-            try:
-                # 使用ffmpeg进行MP3转换，确保没有延迟和ID3标签
-                import subprocess
-
-                # 创建临时MP3文件
-                temp_mp3 = output_path.replace(".mp3", "_temp.mp3")
-                with open(temp_mp3, "wb") as outfile:
-                    outfile.write(audio_data)
-
-                # 使用ffmpeg转换，去除延迟和ID3标签
-                result = subprocess.run(
-                    [
-                        "ffmpeg",
-                        "-i",
-                        temp_mp3,
-                        "-acodec",
-                        "libmp3lame",
-                        "-b:a",
-                        "128k",
-                        "-ar",
-                        "44100",
-                        "-ac",
-                        "2",
-                        "-write_xing",
-                        "0",
-                        "-id3v2_version",
-                        "0",
-                        output_path,
-                        "-y",
-                    ],
-                    capture_output=True,
-                    text=True,
-                    timeout=30,
-                )
-
-                # 清理临时文件
-                if os.path.exists(temp_mp3):
-                    os.remove(temp_mp3)
-
-                if result.returncode == 0 and os.path.exists(output_path):
-                    output_size = os.path.getsize(output_path)
-                    print(f"✅ MP3转换完成，输出大小: {output_size} bytes")
-                    return True, "MP3转换成功", output_path
-                else:
-                    print(f"❌ MP3转换失败: {result.stderr}")
-                    return False, f"MP3转换失败: {result.stderr}", None
-
-            except Exception as e:
-                return False, f"MP3转换失败: {str(e)}", None
-
-        elif target_format.lower() == "wav":
-            try:
-                # 使用ffmpeg进行WAV转换
-                import subprocess
-
-                # 创建临时MP3文件
-                temp_mp3 = output_path.replace(".wav", "_temp.mp3")
-                with open(temp_mp3, "wb") as outfile:
-                    outfile.write(audio_data)
-
-                # 使用ffmpeg转换
-                result = subprocess.run(
-                    ["ffmpeg", "-i", temp_mp3, "-acodec", "pcm_s16le", "-ar", "44100", "-ac", "2", output_path, "-y"],
-                    capture_output=True,
-                    text=True,
-                    timeout=30,
-                )
-
-                # 清理临时文件
-                if os.path.exists(temp_mp3):
-                    os.remove(temp_mp3)
-
-                if result.returncode == 0 and os.path.exists(output_path):
-                    output_size = os.path.getsize(output_path)
-                    print(f"✅ WAV转换完成，输出大小: {output_size} bytes")
-                    return True, "WAV转换成功", output_path
-                else:
-                    print(f"❌ WAV转换失败: {result.stderr}")
-                    return False, f"WAV转换失败: {result.stderr}", None
+# ffmpeg 目标格式 -> 编码参数
+NATIVE_FFMPEG_CODECS = {
+    "mp3": ["-acodec", "libmp3lame", "-b:a", "128k", "-ar", "44100", "-ac", "2", "-write_xing", "0", "-id3v2_version", "0"],
+    "wav": ["-acodec", "pcm_s16le", "-ar", "44100", "-ac", "2"],
+    "flac": ["-acodec", "flac"],
+    "m4a": ["-acodec", "aac"],
+}
+
+
+def locate_audio_start(head):
+    """在文件开头的数据中定位音频起始位置，返回 (偏移, 格式)"""
+    # 方法1: 检查ID3标签
+    if head.startswith(b"ID3") and len(head) >= 10:
+        size = ((head[6] & 0x7F) << 21) | ((head[7] & 0x7F) << 14) | ((head[8] & 0x7F) << 7) | (head[9] & 0x7F)
+        return 10 + size, "mp3"
+
+    # 方法2: 在前4KB中查找有效的MP3帧头
+    for i in range(min(len(head) - 4, 4096)):
+        if head[i] == 0xFF and (head[i + 1] & 0xE0) == 0xE0:
+            frame_header = (head[i] << 24) | (head[i + 1] << 16) | (head[i + 2] << 8) | head[i + 3]
+            mpeg_version = (frame_header >> 19) & 0x3
+            layer = (frame_header >> 17) & 0x3
+            if mpeg_version != 1 and layer != 1:  # 不是MPEG1 Layer3
+                continue
+            return i, "mp3"
 
-            except Exception as e:
-                return False, f"WAV转换失败: {str(e)}", None
+    # 方法3: 其他音频格式头
+    if head.startswith(b"RIFF") and head[8:12] == b"WAVE":
+        return 0, "wav"
+    if head.startswith(b"fLaC"):
+        return 0, "flac"
+    if b"ftyp" in head[4:8]:
+        return 0, "m4a"
 
-        elif target_format.lower() == "flac":
-            try:
-                # 使用ffmpeg进行FLAC转换
-                import subprocess
-
-                # 创建临时MP3文件
-                temp_mp3 = output_path.replace(".flac", "_temp.mp3")
-                with open(temp_mp3, "wb") as outfile:
-                    outfile.write(audio_data)
-
-                # 使用ffmpeg转换
-                result = subprocess.run(
-                    ["ffmpeg", "-i", temp_mp3, "-acodec", "flac", output_path, "-y"],
-                    capture_output=True,
-                    text=True,
-                    timeout=30,
-                )
+    # 方法4: 跳过可能的头部数据后查找MP3帧头
+    for i in range(1024, min(len(head) - 4, 2048)):
+        if head[i] == 0xFF and (head[i + 1] & 0xE0) == 0xE0:
+            return i, "mp3"
 
-                # 清理临时文件
-                if os.path.exists(temp_mp3):
-                    os.remove(temp_mp3)
+    # 未检测到明确格式，假设为MP3
+    return 0, "mp3"
 
-                if result.returncode == 0 and os.path.exists(output_path):
-                    output_size = os.path.getsize(output_path)
-                    print(f"✅ FLAC转换完成，输出大小: {output_size} bytes")
-                    return True, "FLAC转换成功", output_path
-                else:
-                    print(f"❌ FLAC转换失败: {result.stderr}")
-                    return False, f"FLAC转换失败: {result.stderr}", None
 
-            except Exception as e:
-                return False, f"FLAC转换失败: {str(e)}", None
-
-        elif target_format.lower() == "m4a":
-            try:
-                # 使用ffmpeg进行M4A转换
-                import subprocess
+def convert_ncm_file_native(input_path, output_path, target_format):
+    """原生NCM文件转换，绕过pydub直接调用ffmpeg
 
-                # 创建临时MP3文件
-                temp_mp3 = output_path.replace(".m4a", "_temp.mp3")
-                with open(temp_mp3, "wb") as outfile:
-                    outfile.write(audio_data)
+    只读取文件开头定位音频数据；音频从文件开头开始时直接把原文件交给ffmpeg，
+    否则把偏移之后的数据流式复制到临时文件
+    """
+    import logging
+    import shutil
+    import subprocess
 
-                # 使用ffmpeg转换
-                result = subprocess.run(
-                    ["ffmpeg", "-i", temp_mp3, "-acodec", "aac", output_path, "-y"], capture_output=True, text=True, timeout=30
-                )
+    logger = logging.getLogger(__name__)
+    target_format = target_format.lower()
+    trimmed_path = None
 
-                # 清理临时文件
-                if os.path.exists(temp_mp3):
-                    os.remove(temp_mp3)
+    try:
+        if not os.path.exists(input_path):
+            return False, "输入文件不存在", None
 
-                if result.returncode == 0 and os.path.exists(output_path):
-                    output_size = os.path.getsize(output_path)
-                    print(f"✅ M4A转换完成，输出大小: {output_size} bytes")
-                    return True, "M4A转换成功", output_path
-                else:
-                    print(f"❌ M4A转换失败: {result.stderr}")
-                    return False, f"M4A转换失败: {result.stderr}", None
+        file_size = os.path.getsize(input_path)
+        if file_size < 1024:
+            return False, "文件太小，无法处理", None
 
-            except Exception as e:
-                return False, f"M4A转换失败: {str(e)}", None
+        with open(input_path, "rb") as f:
+            head = f.read(8192)
+        audio_start, audio_format = locate_audio_start(head)
+        logger.info(
+            f"原生转换: {input_path} -> {output_path} ({target_format}), 音频格式 {audio_format}, 起始位置 {audio_start}"
+        )
 
-        else:
-            # 对于其他格式，尝试直接复制音频数据
-            try:
-                with open(output_path, "wb") as out_f:
-                    out_f.write(audio_data)
+        if file_size - audio_start < 1024:
+            return False, "有效音频数据太少", None
 
-                output_size = os.path.getsize(output_path)
-                print(f"✅ {target_format.upper()}转换完成，输出大小: {output_size} bytes")
-                return True, f"{target_format.upper()}转换成功", output_path
+        source_path = input_path
+        if audio_start:
+            trimmed_path = f"{os.path.splitext(output_path)[0]}_temp.{audio_format}"
+            with open(input_path, "rb") as infile, open(trimmed_path, "wb") as outfile:
+                infile.seek(audio_start)
+                shutil.copyfileobj(infile, outfile, 1024 * 1024)
+            source_path = trimmed_path
+
+        codec_args = NATIVE_FFMPEG_CODECS.get(target_format)
+        if codec_args is None:
+            # 其他格式直接复制音频数据
+            shutil.copyfile(source_path, output_path)
+            return True, f"{target_format.upper()}转换成功", output_path
+
+        result = subprocess.run(
+            ["ffmpeg", "-i", source_path, *codec_args, output_path, "-y"], capture_output=True, text=True, timeout=30
+        )
+        if result.returncode == 0 and os.path.exists(output_path):
+            logger.info(f"{target_format.upper()}转换完成，输出大小: {os.path.getsize(output_path)} bytes")
+            return True, f"{target_format.upper()}转换成功", output_path
 
-            except Exception as e:
-                return False, f"{target_format.upper()}转换失败: {str(e)}", None
+        logger.error(f"{target_format.upper()}转换失败: {result.stderr}")
+        return False, f"{target_format.upper()}转换失败: {result.stderr}", None
 
     except Exception as e:
-        print(f"原生转换过程中出错: {e}")
-        import traceback
-
-        traceback.print_exc()
+        logger.error(f"原生转换过程中出错: {e}")
         return False, f"原生转换失败: {str(e)}", None
+    finally:
+        if trimmed_path and os.path.exists(trimmed_path):
+            os.remove(trimmed_path)
 
 
-# 好心人攻略相关视图函数
 @csrf_exempt
 @require_http_methods(["GET", "POST"])
 def user_generated_travel_guide_api(request):
@@ -9910,14 +9048,65 @@ def shipbao_items_api(request):
         if can_bargain == "true":
             items = items.filter(can_bargain=True)
 
+        # 获取用户位置信息
+        ip_service = IPLocationService()
+        user_location = ip_service.get_user_location(request)
+        page_size = 20
+
+        def item_data(item, distance):
+            return {
+                "id": item.id,
+                "title": item.title,
+                "price": float(item.price),
+                "condition": item.condition,
+                "condition_stars": item.get_condition_stars(),
+                "category": item.category,
+                "category_display": item.get_category_display(),
+                "location": item.location,
+                "delivery_option": item.delivery_option,
+                "can_bargain": item.can_bargain,
+                "main_image": item.get_main_image(),
+                "image_count": item.get_image_count(),
+                "view_count": item.view_count,
+                "favorite_count": item.favorite_count,
+                "seller_name": item.seller.username,
+                "created_at": item.created_at.strftime("%Y-%m-%d %H:%M"),
+                "distance": f"{distance:.1f}km" if distance is not None else "距离未知",
+            }
+
+        items = items.select_related("seller")
+
+        if sort_by == "distance" and user_location and user_location.get("lat") is not None:
+            from .services.geo_search import nearest
+
+            # geohash 前缀预筛选 + 候选行精确 haversine，按 (距离, id) 游标分页
+            try:
+                result = nearest(
+                    items,
+                    user_location["lat"],
+                    user_location["lon"],
+                    limit=page_size,
+                    cursor=request.GET.get("cursor") or None,
+                )
+            except ValueError as e:
+                return JsonResponse({"success": False, "message": str(e)}, status=400)
+
+            return JsonResponse(
+                {
+                    "success": True,
+                    "data": [item_data(item, distance) for item, distance in result["items"]],
+                    "total": items.count(),
+                    "has_next": result["next_cursor"] is not None,
+                    "next_cursor": result["next_cursor"],
+                    "user_location": user_location,
+                }
+            )
+
         # 排序
         if sort_by == "price":
             items = items.order_by("price")
         elif sort_by == "price_desc":
             items = items.order_by("-price")
-        elif sort_by == "distance":
-            # TODO: 实现距离排序
-            items = items.order_by("-created_at")
         else:
             items = items.order_by("-created_at")
 
@@ -9926,54 +9115,28 @@ def shipbao_items_api(request):
             page = int(request.GET.get("page", 1))
         except (ValueError, TypeError):
             page = 1
-        page_size = 20
         start = (page - 1) * page_size
         end = start + page_size
 
-        # 获取用户位置信息
-        ip_service = IPLocationService()
-        user_location = ip_service.get_user_location(request)
-
         items_data = []
         for item in items[start:end]:
             # 计算距离
-            if hasattr(item, "latitude") and hasattr(item, "longitude") and item.latitude and item.longitude:
+            if item.latitude and item.longitude:
                 distance = ip_service.calculate_distance(
                     user_location["lat"], user_location["lon"], item.latitude, item.longitude
                 )
-                distance_text = f"{distance:.1f}km"
             else:
-                distance_text = "距离未知"
-
-            items_data.append(
-                {
-                    "id": item.id,
-                    "title": item.title,
-                    "price": float(item.price),
-                    "condition": item.condition,
-                    "condition_stars": item.get_condition_stars(),
-                    "category": item.category,
-                    "category_display": item.get_category_display(),
-                    "location": item.location,
-                    "delivery_option": item.delivery_option,
-                    "can_bargain": item.can_bargain,
-                    "main_image": item.get_main_image(),
-                    "image_count": item.get_image_count(),
-                    "view_count": item.view_count,
-                    "favorite_count": item.favorite_count,
-                    "seller_name": item.seller.username,
-                    "created_at": item.created_at.strftime("%Y-%m-%d %H:%M"),
-                    "distance": distance_text,
-                }
-            )
+                distance = None
+            items_data.append(item_data(item, distance))
 
+        total = items.count()
         return JsonResponse(
             {
                 "success": True,
                 "data": items_data,
-                "total": items.count(),
+                "total": total,
                 "page": page,
-                "has_next": items.count() > end,
+                "has_next": total > end,
                 "user_location": user_location,
             }
         )
@@ -10577,180 +9740,6 @@ def simple_audio_test(request):
     return render(request, "simple_audio_test.html")
 
 
-def decrypt_ncm_file_correct(ncm_path):
-    """
-    使用正确的NCM解密算法解密NCM文件
-    基于ncmdump库的实现，同时提取专辑封面
-    """
-    try:
-        import json
-        import logging
-        import struct
-
-        from cryptography.hazmat.backends import default_backend
-        from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
-
-        logger = logging.getLogger(__name__)
-
-        with open(ncm_path, "rb") as f:
-            # 检查文件头
-            header = f.read(8)
-            if header != b"CTENFDAM":
-                raise ValueError("不是有效的NCM文件")
-
-            # 跳过版本信息
-            f.seek(2, 1)
-
-            # 读取密钥数据长度
-            key_length = struct.unpack("<I", f.read(4))[0]
-
-            # 读取密钥数据
-            key_data = bytearray(f.read(key_length))
-            key_data = bytes(bytearray([byte ^ 0x64 for byte in key_data]))
-
-            # 解密密钥数据
-            core_key = b"hzHRAmso5kInbaxW"
-            cipher = Cipher(algorithms.AES(core_key), modes.ECB(), backend=default_backend())
-            decryptor = cipher.decryptor()
-
-            # 确保密钥数据长度是16的倍数
-            if len(key_data) % 16 != 0:
-                padding_length = 16 - (len(key_data) % 16)
-                key_data += b"\x00" * padding_length
-
-            decrypted_key = decryptor.update(key_data) + decryptor.finalize()
-
-            # 移除填充并提取有效数据
-            try:
-                # 手动移除PKCS7填充
-                padding_length = decrypted_key[-1]
-                if padding_length <= 16:
-                    key_data = decrypted_key[:-padding_length][17:]
-                else:
-                    key_data = decrypted_key[17:]
-            except Exception:
-                # 如果unpad失败，手动移除前17字节
-                key_data = decrypted_key[17:]
-
-            key_length = len(key_data)
-
-            # 检查密钥长度
-            if key_length == 0:
-                raise ValueError("密钥数据为空，无法进行解密")
-
-            # RC4密钥调度算法
-            key = bytearray(key_data)
-            S = bytearray(range(256))
-            j = 0
-
-            for i in range(256):
-                j = (j + S[i] + key[i % key_length]) & 0xFF
-                S[i], S[j] = S[j], S[i]
-
-            # 读取元数据长度
-            meta_length = struct.unpack("<I", f.read(4))[0]
-
-            # 读取并解析元数据
-            metadata = {}
-            album_cover = None
-
-            if meta_length:
-                meta_data = bytearray(f.read(meta_length))
-                meta_data = bytes(bytearray([byte ^ 0x63 for byte in meta_data]))
-
-                # 解密元数据 - 添加错误处理
-                try:
-                    meta_cipher = Cipher(algorithms.AES(b"MoOtOiTvINGwd2E6"), modes.ECB(), backend=default_backend())
-                    meta_decryptor = meta_cipher.decryptor()
-                    # 确保数据长度是16的倍数
-                    if len(meta_data) % 16 != 0:
-                        # 填充到16的倍数
-                        padding_length = 16 - (len(meta_data) % 16)
-                        meta_data += b"\x00" * padding_length
-
-                    decrypted_meta = meta_decryptor.update(meta_data) + meta_decryptor.finalize()
-                    # 手动移除PKCS7填充
-                    try:
-                        padding_length = decrypted_meta[-1]
-                        if padding_length <= 16:
-                            meta_data = decrypted_meta[:-padding_length][22:]
-                        else:
-                            meta_data = decrypted_meta[22:]
-                    except Exception:
-                        # 如果unpad失败，手动移除前22字节
-                        meta_data = decrypted_meta[22:]
-
-                    # 解析JSON元数据
-                    try:
-                        meta_json = json.loads(meta_data.decode("utf-8"))
-                        metadata = {
-                            "title": meta_json.get("musicName", ""),
-                            "artist": meta_json.get("artist", [""])[0] if meta_json.get("artist") else "",
-                            "album": meta_json.get("album", ""),
-                            "duration": meta_json.get("duration", 0) / 1000,  # 转换为秒
-                        }
-                    except Exception:
-                        pass
-                except Exception as e:
-                    logger.warning(f"元数据解密失败: {e}")
-
-            # 跳过5字节
-            f.seek(5, 1)
-
-            # 读取专辑图片信息
-            image_space = struct.unpack("<I", f.read(4))[0]
-            image_size = struct.unpack("<I", f.read(4))[0]
-
-            # 提取专辑封面
-            if image_size > 0:
-                image_data = f.read(image_size)
-                # 解密图片数据 - 添加错误处理
-                try:
-                    image_data = bytes(bytearray([byte ^ 0x63 for byte in image_data]))
-                    image_cipher = Cipher(algorithms.AES(b"MoOtOiTvINGwd2E6"), modes.ECB(), backend=default_backend())
-                    image_decryptor = image_cipher.decryptor()
-
-                    # 确保数据长度是16的倍数
-                    if len(image_data) % 16 != 0:
-                        # 填充到16的倍数
-                        padding_length = 16 - (len(image_data) % 16)
-                        image_data += b"\x00" * padding_length
-
-                    decrypted_image = image_decryptor.update(image_data) + image_decryptor.finalize()
-                    # 手动移除PKCS7填充
-                    padding_length = decrypted_image[-1]
-                    if padding_length <= 16:
-                        image_data = decrypted_image[:-padding_length][22:]
-                    else:
-                        image_data = decrypted_image[22:]
-
-                    album_cover = {"data": image_data, "format": "jpeg", "size": len(image_data)}  # NCM通常使用JPEG格式
-                except Exception as e:
-                    logger.warning(f"专辑封面解密失败: {e}")
-                    album_cover = None
-
-            # 跳过剩余空间
-            f.seek(image_space - image_size, 1)
-
-            # 读取音频数据
-            data = f.read()
-
-            # RC4流密码解密
-            stream = [S[(S[i] + S[(i + S[i]) & 0xFF]) & 0xFF] for i in range(256)]
-            stream = bytes(bytearray(stream * (len(data) // 256 + 1))[1 : 1 + len(data)])
-
-            # XOR解密
-            decrypted_audio = bytes(a ^ b for a, b in zip(data, stream))
-
-            # 返回解密结果和元数据
-            result = {"audio_data": decrypted_audio, "metadata": metadata, "album_cover": album_cover}
-
-            return result
-
-    except Exception as e:
-        raise ValueError(f"NCM文件解密失败: {str(e)}")
-
-
 @login_required
 def check_video_room_status_api(request, room_id):
     """检查视频聊天室状态API"""
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tools", "0072_remove_checkindetail_checkin_delete_douyinvideo_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="pdfconversionrecord",
+            name="completed_at",
+            field=models.DateTimeField(blank=True, null=True, verbose_name="完成时间"),
+        ),
+        migrations.AddField(
+            model_name="pdfconversionrecord",
+            name="input_hash",
+            field=models.CharField(blank=True, db_index=True, default="", max_length=64, verbose_name="输入内容哈希"),
+        ),
+        migrations.AddField(
+            model_name="pdfconversionrecord",
+            name="job_id",
+            field=models.CharField(blank=True, db_index=True, default="", max_length=36, verbose_name="转换任务ID"),
+        ),
+        migrations.AddField(
+            model_name="pdfconversionrecord",
+            name="page_count",
+            field=models.IntegerField(default=0, verbose_name="页数"),
+        ),
+        migrations.AddField(
+            model_name="pdfconversionrecord",
+            name="queue_time",
+            field=models.FloatField(default=0.0, verbose_name="排队时间(秒)"),
+        ),
+        migrations.AddField(
+            model_name="pdfconversionrecord",
+            name="started_at",
+            field=models.DateTimeField(blank=True, null=True, verbose_name="开始转换时间"),
+        ),
+        migrations.AlterField(
+            model_name="pdfconversionrecord",
+            name="status",
+            field=models.CharField(
+                choices=[("success", "成功"), ("failed", "失败"), ("processing", "处理中"), ("pending", "排队中")],
+                default="processing",
+                max_length=20,
+                verbose_name="转换状态",
+            ),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:02
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tools", "0073_pdfconversionrecord_job_tracking"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PDFConversionCacheEntry",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("cache_key", models.CharField(max_length=64, unique=True, verbose_name="输入内容哈希")),
+                ("conversion_type", models.CharField(max_length=20, verbose_name="转换类型")),
+                ("output_filename", models.CharField(max_length=255, verbose_name="输出文件名")),
+                ("file_size", models.BigIntegerField(default=0, verbose_name="文件大小(字节)")),
+                ("page_count", models.IntegerField(default=0, verbose_name="页数")),
+                ("hit_count", models.IntegerField(default=0, verbose_name="命中次数")),
+                ("created_at", models.DateTimeField(auto_now_add=True, verbose_name="创建时间")),
+                (
+                    "last_accessed_at",
+                    models.DateTimeField(db_index=True, default=django.utils.timezone.now, verbose_name="最近访问时间"),
+                ),
+            ],
+            options={
+                "verbose_name": "PDF转换结果缓存",
+                "verbose_name_plural": "PDF转换结果缓存",
+            },
+        ),
+    ]
@@ -0,0 +1,81 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:19
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tools", "0074_pdfconversioncacheentry"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BackgroundTask",
+            fields=[
+                ("id", models.CharField(max_length=36, primary_key=True, serialize=False, verbose_name="任务ID")),
+                ("task_type", models.CharField(default="generate_test_cases", max_length=50, verbose_name="任务类型")),
+                ("payload", models.JSONField(default=dict, verbose_name="任务参数")),
+                ("owner", models.CharField(blank=True, default="", max_length=150, verbose_name="创建者")),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "等待处理"),
+                            ("running", "运行中"),
+                            ("completed", "已完成"),
+                            ("failed", "失败"),
+                            ("cancelled", "已取消"),
+                        ],
+                        default="pending",
+                        max_length=20,
+                        verbose_name="状态",
+                    ),
+                ),
+                ("progress", models.IntegerField(default=0, verbose_name="进度")),
+                ("current_step", models.CharField(default="等待处理", max_length=100, verbose_name="当前步骤")),
+                ("result", models.JSONField(blank=True, null=True, verbose_name="结果")),
+                ("error", models.TextField(blank=True, null=True, verbose_name="错误信息")),
+                ("worker_id", models.CharField(blank=True, default="", max_length=100, verbose_name="执行进程")),
+                ("attempts", models.IntegerField(default=0, verbose_name="执行次数")),
+                ("heartbeat_at", models.DateTimeField(blank=True, null=True, verbose_name="最近心跳")),
+                (
+                    "created_at",
+                    models.DateTimeField(db_index=True, default=django.utils.timezone.now, verbose_name="创建时间"),
+                ),
+                ("started_at", models.DateTimeField(blank=True, null=True, verbose_name="开始时间")),
+                ("completed_at", models.DateTimeField(blank=True, null=True, verbose_name="完成时间")),
+            ],
+            options={
+                "verbose_name": "后台任务",
+                "verbose_name_plural": "后台任务",
+                "indexes": [models.Index(fields=["status", "heartbeat_at"], name="tools_bgtask_status_hb_idx")],
+            },
+        ),
+        migrations.CreateModel(
+            name="BackgroundTaskEvent",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("status", models.CharField(max_length=20, verbose_name="状态")),
+                ("progress", models.IntegerField(default=0, verbose_name="进度")),
+                ("step", models.CharField(max_length=100, verbose_name="步骤")),
+                ("created_at", models.DateTimeField(default=django.utils.timezone.now, verbose_name="时间")),
+                (
+                    "task",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="events",
+                        to="tools.backgroundtask",
+                        verbose_name="任务",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "后台任务事件",
+                "verbose_name_plural": "后台任务事件",
+                "ordering": ["id"],
+            },
+        ),
+    ]
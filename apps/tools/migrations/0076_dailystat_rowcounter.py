@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tools", "0075_backgroundtask"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailyStat",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("date", models.DateField(verbose_name="日期")),
+                ("metric", models.CharField(max_length=64, verbose_name="统计项")),
+                ("value", models.BigIntegerField(default=0, verbose_name="数值")),
+                ("is_final", models.BooleanField(default=False, verbose_name="已固定")),
+                ("updated_at", models.DateTimeField(auto_now=True, verbose_name="更新时间")),
+            ],
+            options={
+                "verbose_name": "每日统计",
+                "verbose_name_plural": "每日统计",
+                "ordering": ["-date", "metric"],
+                "unique_together": {("date", "metric")},
+            },
+        ),
+        migrations.CreateModel(
+            name="RowCounter",
+            fields=[
+                ("key", models.CharField(max_length=100, primary_key=True, serialize=False, verbose_name="计数项")),
+                ("value", models.BigIntegerField(default=0, verbose_name="计数")),
+                ("updated_at", models.DateTimeField(auto_now=True, verbose_name="更新时间")),
+            ],
+            options={
+                "verbose_name": "行数计数器",
+                "verbose_name_plural": "行数计数器",
+            },
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tools", "0076_dailystat_rowcounter"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ShardMigration",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("table_name", models.CharField(max_length=100, verbose_name="分片表")),
+                ("source_shards", models.JSONField(default=list, verbose_name="原分片")),
+                ("target_shards", models.JSONField(default=list, verbose_name="目标分片")),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[("copying", "复制中"), ("cleaning", "清理源分片"), ("completed", "已完成")],
+                        default="copying",
+                        max_length=20,
+                        verbose_name="状态",
+                    ),
+                ),
+                ("checkpoints", models.JSONField(default=dict, verbose_name="扫描断点")),
+                ("copied_rows", models.BigIntegerField(default=0, verbose_name="已复制行数")),
+                ("deleted_rows", models.BigIntegerField(default=0, verbose_name="已清理行数")),
+                ("created_at", models.DateTimeField(auto_now_add=True, verbose_name="创建时间")),
+                ("updated_at", models.DateTimeField(auto_now=True, verbose_name="更新时间")),
+            ],
+            options={
+                "verbose_name": "分片迁移",
+                "verbose_name_plural": "分片迁移",
+                "ordering": ["-created_at"],
+            },
+        ),
+    ]
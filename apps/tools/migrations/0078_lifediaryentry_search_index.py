@@ -0,0 +1,100 @@
+# Generated manually for diary full-text search
+#
+# DDL 写在迁移中，不引用 apps.tools.services.diary_search，之后修改服务或模型不会改变本迁移的行为。
+# PostgreSQL 上 CREATE EXTENSION pg_trgm 需要超级用户或数据库 CREATE 权限（PostgreSQL 13+ 的可信扩展）；
+# 权限不足时跳过扩展和三元组索引，子串检索退回顺序扫描，可由 DBA 执行
+#     CREATE EXTENSION pg_trgm;
+# 后重新执行 migrate tools 0077 && migrate tools 补建索引
+
+import logging
+
+from django.db import DatabaseError, migrations, transaction
+
+logger = logging.getLogger(__name__)
+
+PG_TRGM_INSTALL = [
+    "CREATE INDEX IF NOT EXISTS tools_lifediaryentry_search_trgm ON tools_lifediaryentry USING gin "
+    "((coalesce(title, '') || ' ' || coalesce(content, '') || ' ' || coalesce(voice_text, '')) gin_trgm_ops)",
+]
+PG_INSTALL = [
+    """ALTER TABLE tools_lifediaryentry ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(title, '')), 'A')
+        || setweight(to_tsvector('simple', coalesce(content, '')), 'B')
+        || setweight(to_tsvector('simple', coalesce(voice_text, '')), 'C')
+    ) STORED""",
+    "CREATE INDEX IF NOT EXISTS tools_lifediaryentry_search_gin ON tools_lifediaryentry USING gin (search_vector)",
+]
+PG_UNINSTALL = [
+    "DROP INDEX IF EXISTS tools_lifediaryentry_search_trgm",
+    "DROP INDEX IF EXISTS tools_lifediaryentry_search_gin",
+    "ALTER TABLE tools_lifediaryentry DROP COLUMN IF EXISTS search_vector",
+]
+
+SQLITE_INSTALL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS tools_lifediaryentry_fts USING fts5(title, content, voice_text, "
+    "content='tools_lifediaryentry', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS tools_lifediaryentry_fts_ai AFTER INSERT ON tools_lifediaryentry BEGIN "
+    "INSERT INTO tools_lifediaryentry_fts(rowid, title, content, voice_text) "
+    "VALUES (new.id, new.title, new.content, new.voice_text); END",
+    "CREATE TRIGGER IF NOT EXISTS tools_lifediaryentry_fts_ad AFTER DELETE ON tools_lifediaryentry BEGIN "
+    "INSERT INTO tools_lifediaryentry_fts(tools_lifediaryentry_fts, rowid, title, content, voice_text) "
+    "VALUES ('delete', old.id, old.title, old.content, old.voice_text); END",
+    "CREATE TRIGGER IF NOT EXISTS tools_lifediaryentry_fts_au AFTER UPDATE ON tools_lifediaryentry BEGIN "
+    "INSERT INTO tools_lifediaryentry_fts(tools_lifediaryentry_fts, rowid, title, content, voice_text) "
+    "VALUES ('delete', old.id, old.title, old.content, old.voice_text); "
+    "INSERT INTO tools_lifediaryentry_fts(rowid, title, content, voice_text) "
+    "VALUES (new.id, new.title, new.content, new.voice_text); END",
+    "INSERT INTO tools_lifediaryentry_fts(tools_lifediaryentry_fts) VALUES ('rebuild')",
+]
+SQLITE_UNINSTALL = [
+    "DROP TRIGGER IF EXISTS tools_lifediaryentry_fts_ai",
+    "DROP TRIGGER IF EXISTS tools_lifediaryentry_fts_ad",
+    "DROP TRIGGER IF EXISTS tools_lifediaryentry_fts_au",
+    "DROP TABLE IF EXISTS tools_lifediaryentry_fts",
+]
+
+
+def _pg_trgm_available(schema_editor) -> bool:
+    """pg_trgm 已安装或可以创建时返回 True；权限不足时回滚到保存点并跳过"""
+    connection = schema_editor.connection
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        if cursor.fetchone():
+            return True
+    try:
+        with transaction.atomic(using=connection.alias):
+            schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        return True
+    except DatabaseError as e:
+        logger.warning(f"无法创建 pg_trgm 扩展，跳过日记三元组索引: {e}")
+        return False
+
+
+def install(apps, schema_editor):
+    """PostgreSQL 创建 search_vector 生成列及 GIN/三元组索引，SQLite 创建 FTS5 表及同步触发器"""
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        statements = PG_INSTALL + (PG_TRGM_INSTALL if _pg_trgm_available(schema_editor) else [])
+    elif vendor == "sqlite":
+        statements = SQLITE_INSTALL
+    else:
+        return
+    for sql in statements:
+        schema_editor.execute(sql)
+
+
+def uninstall(apps, schema_editor):
+    statements = {"postgresql": PG_UNINSTALL, "sqlite": SQLITE_UNINSTALL}.get(schema_editor.connection.vendor, [])
+    for sql in statements:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tools", "0077_shardmigration"),
+    ]
+
+    operations = [
+        migrations.RunPython(install, uninstall),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:40
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill(apps, schema_editor):
+    """按已有日记生成心情汇总"""
+    from apps.tools.services.mood_analysis import MOOD_WEIGHTS
+
+    LifeDiaryEntry = apps.get_model("tools", "LifeDiaryEntry")
+    DiaryMoodDay = apps.get_model("tools", "DiaryMoodDay")
+    batch = []
+    for entry in (
+        LifeDiaryEntry.objects.only("id", "user_id", "date", "mood", "title").order_by("id").iterator(chunk_size=1000)
+    ):
+        batch.append(
+            DiaryMoodDay(
+                entry_id=entry.id,
+                user_id=entry.user_id,
+                date=entry.date,
+                mood=entry.mood,
+                score=MOOD_WEIGHTS.get(entry.mood),
+                title=entry.title,
+            )
+        )
+        if len(batch) >= 1000:
+            DiaryMoodDay.objects.bulk_create(batch)
+            batch = []
+    DiaryMoodDay.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("tools", "0078_lifediaryentry_search_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DiaryMoodDay",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("date", models.DateField(verbose_name="日期")),
+                ("mood", models.CharField(max_length=10, verbose_name="心情")),
+                ("score", models.SmallIntegerField(blank=True, null=True, verbose_name="心情分值")),
+                ("title", models.CharField(blank=True, max_length=200, verbose_name="标题")),
+                (
+                    "entry",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="mood_day",
+                        to="tools.lifediaryentry",
+                        verbose_name="日记",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL, verbose_name="用户"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "日记心情汇总",
+                "verbose_name_plural": "日记心情汇总",
+                "unique_together": {("user", "date")},
+            },
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
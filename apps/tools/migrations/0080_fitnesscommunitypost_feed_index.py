@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tools", "0079_diarymoodday"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="fitnesscommunitypost",
+            index=models.Index(fields=["created_at", "id"], name="fitness_post_feed_idx"),
+        ),
+    ]
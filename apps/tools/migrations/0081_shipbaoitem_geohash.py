@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-19 08:05
+
+from django.db import migrations, models
+
+
+def backfill(apps, schema_editor):
+    """按已有物品的经纬度计算 geohash"""
+    from apps.tools.services.geo_search import geohash_for
+
+    ShipBaoItem = apps.get_model("tools", "ShipBaoItem")
+    items = ShipBaoItem.objects.filter(latitude__isnull=False, longitude__isnull=False).only("id", "latitude", "longitude")
+    batch = []
+    for item in items.order_by("id").iterator(chunk_size=1000):
+        item.geohash = geohash_for(item.latitude, item.longitude)
+        batch.append(item)
+        if len(batch) >= 1000:
+            ShipBaoItem.objects.bulk_update(batch, ["geohash"])
+            batch = []
+    ShipBaoItem.objects.bulk_update(batch, ["geohash"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tools", "0080_fitnesscommunitypost_feed_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="shipbaoitem",
+            name="geohash",
+            field=models.CharField(blank=True, default="", max_length=12, verbose_name="地理哈希"),
+        ),
+        migrations.AddIndex(
+            model_name="shipbaoitem",
+            index=models.Index(fields=["status", "geohash"], name="shipbao_item_geo_idx"),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
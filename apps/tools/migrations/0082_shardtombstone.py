@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-19 11:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tools", "0081_shipbaoitem_geohash"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ShardTombstone",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("table_name", models.CharField(max_length=100, verbose_name="分片表")),
+                ("object_pk", models.CharField(max_length=64, verbose_name="主键")),
+                ("created_at", models.DateTimeField(auto_now_add=True, verbose_name="删除时间")),
+            ],
+            options={
+                "verbose_name": "分片删除记录",
+                "verbose_name_plural": "分片删除记录",
+                "unique_together": {("table_name", "object_pk")},
+            },
+        ),
+    ]
@@ -9,12 +9,36 @@ from .chat_models import ChatMessage, ChatRoom, ChatRoomMember, HeartLinkRequest
 # 日记相关模型（已分离）
 from .diary_models import LifeDiaryEntry
 
+# 动作库模型从exercise_library_models导入
+from .exercise_library_models import (
+    BodyPart,
+    Equipment,
+    Exercise,
+    ExerciseRating,
+    MuscleGroup,
+    TemplateExercise,
+    UserExercisePreference,
+    WorkoutTemplate,
+)
+
+# 健身成就模型从fitness_achievement_models导入
+from .fitness_achievement_models import (
+    AchievementUnlockLog,
+    EnhancedFitnessAchievement,
+    EnhancedUserFitnessAchievement,
+    FitnessAchievementCategory,
+    FitnessAchievementModule,
+    UserBadgeShowcase,
+)
+
 # 健身模型从fitness_models导入
 from .fitness_models import EnhancedExerciseWeightRecord, EnhancedFitnessStrengthProfile
 
 # 暂时从legacy_models导入其他模型，逐步迁移
 from .legacy_models import (  # 生活目标相关; 成就相关; 健身相关; Vanity/欲望相关; 旅游相关（已移至travel_models.py）; 工作搜索相关; PDF转换相关; 食物相关; 人际关系相关 - 已移至relationship_models.py; RelationshipTag, PersonProfile, Interaction, ImportantMoment,; RelationshipStatistics, RelationshipReminder,; 功能相关; 健身社区相关; NutriCoach Pro相关模型已隐藏; DietPlan, Meal, NutritionReminder, MealLog,; WeightTracking, FoodDatabase,; 船宝相关; 旅游目的地相关; 搭子相关; 其他
     AIDependencyMeter,
+    BackgroundTask,
+    BackgroundTaskEvent,
     BasedDevAvatar,
     BuddyEvent,
     BuddyEventChat,
@@ -29,10 +53,12 @@ from .legacy_models import (  # 生活目标相关; 成就相关; 健身相关;
     CheckInStreak,
     CodeWorkoutSession,
     CoPilotCollaboration,
+    DailyStat,
     DailyWorkoutChallenge,
     DesireDashboard,
     DesireFulfillment,
     DesireItem,
+    DiaryMoodDay,
     ExerciseWeightRecord,
     ExhaustionProof,
     Feature,
@@ -59,7 +85,11 @@ from .legacy_models import (  # 生活目标相关; 成就相关; 健身相关;
     LifeGoalProgress,
     LifeStatistics,
     PainCurrency,
+    PDFConversionCacheEntry,
     PDFConversionRecord,
+    RowCounter,
+    ShardMigration,
+    ShardTombstone,
     ShipBaoItem,
     ShipBaoMessage,
     ShipBaoReport,
@@ -103,6 +133,17 @@ from .social_media_models import (
 # 塔罗牌模型从tarot_models导入
 from .tarot_models import TarotCard, TarotCommunity, TarotCommunityComment, TarotEnergyCalendar, TarotReading, TarotSpread
 
+# 训练计划模型从training_plan_models导入
+from .training_plan_models import (
+    EnhancedTrainingPlan,
+    ExerciseSet,
+    PlanLibrary,
+    TrainingPlanCategory,
+    TrainingSession,
+    UserPlanCollection,
+    UserTrainingPlan,
+)
+
 # 旅游攻略模型从travel_models导入
 from .travel_models import (
     TravelCity,
@@ -168,6 +209,28 @@ __all__ = [
     "FitnessUserProfile",
     "EnhancedFitnessStrengthProfile",
     "EnhancedExerciseWeightRecord",
+    # 动作库、训练计划与健身成就模型
+    "MuscleGroup",
+    "BodyPart",
+    "Equipment",
+    "Exercise",
+    "ExerciseRating",
+    "UserExercisePreference",
+    "WorkoutTemplate",
+    "TemplateExercise",
+    "TrainingPlanCategory",
+    "EnhancedTrainingPlan",
+    "UserTrainingPlan",
+    "TrainingSession",
+    "ExerciseSet",
+    "PlanLibrary",
+    "UserPlanCollection",
+    "FitnessAchievementModule",
+    "EnhancedFitnessAchievement",
+    "EnhancedUserFitnessAchievement",
+    "FitnessAchievementCategory",
+    "UserBadgeShowcase",
+    "AchievementUnlockLog",
     # NutriCoach Pro相关模型已隐藏
     # 'DietPlan',
     # 'Meal',
@@ -256,4 +319,13 @@ __all__ = [
     "JobSearchStatistics",
     # PDF转换模型
     "PDFConversionRecord",
+    "PDFConversionCacheEntry",
+    # 后台任务模型
+    "BackgroundTask",
+    "BackgroundTaskEvent",
+    "DailyStat",
+    "RowCounter",
+    "ShardMigration",
+    "ShardTombstone",
+    "DiaryMoodDay",
 ]
@@ -1465,14 +1465,19 @@ class PDFConversionRecord(models.Model):
         ("success", "成功"),
         ("failed", "失败"),
         ("processing", "处理中"),
+        ("pending", "排队中"),
     ]
 
     user = models.ForeignKey(User, on_delete=models.CASCADE, verbose_name="用户")
+    job_id = models.CharField(max_length=36, blank=True, default="", db_index=True, verbose_name="转换任务ID")
+    input_hash = models.CharField(max_length=64, blank=True, default="", db_index=True, verbose_name="输入内容哈希")
     conversion_type = models.CharField(max_length=20, choices=CONVERSION_TYPE_CHOICES, verbose_name="转换类型")
     original_filename = models.CharField(max_length=255, verbose_name="原始文件名")
     output_filename = models.CharField(max_length=255, blank=True, null=True, verbose_name="输出文件名")
     file_size = models.BigIntegerField(default=0, verbose_name="文件大小(字节)")
     conversion_time = models.FloatField(default=0.0, verbose_name="转换时间(秒)")
+    queue_time = models.FloatField(default=0.0, verbose_name="排队时间(秒)")
+    page_count = models.IntegerField(default=0, verbose_name="页数")
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="processing", verbose_name="转换状态")
     error_message = models.TextField(blank=True, null=True, verbose_name="错误信息")
     download_url = models.URLField(blank=True, null=True, verbose_name="下载链接")
@@ -1480,6 +1485,8 @@ class PDFConversionRecord(models.Model):
         blank=True, null=True, choices=[(i, i) for i in range(1, 6)], verbose_name="满意度评分(1-5)"
     )
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="创建时间")
+    started_at = models.DateTimeField(blank=True, null=True, verbose_name="开始转换时间")
+    completed_at = models.DateTimeField(blank=True, null=True, verbose_name="完成时间")
 
     class Meta:
         ordering = ["-created_at"]
@@ -1508,6 +1515,179 @@ class PDFConversionRecord(models.Model):
             return f"{self.conversion_time:.1f}s"
 
 
+class PDFConversionCacheEntry(models.Model):
+    """PDF转换结果缓存条目（按输入内容哈希索引，按最近访问时间淘汰）"""
+
+    cache_key = models.CharField(max_length=64, unique=True, verbose_name="输入内容哈希")
+    conversion_type = models.CharField(max_length=20, verbose_name="转换类型")
+    output_filename = models.CharField(max_length=255, verbose_name="输出文件名")
+    file_size = models.BigIntegerField(default=0, verbose_name="文件大小(字节)")
+    page_count = models.IntegerField(default=0, verbose_name="页数")
+    hit_count = models.IntegerField(default=0, verbose_name="命中次数")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="创建时间")
+    last_accessed_at = models.DateTimeField(default=timezone.now, db_index=True, verbose_name="最近访问时间")
+
+    class Meta:
+        verbose_name = "PDF转换结果缓存"
+        verbose_name_plural = "PDF转换结果缓存"
+
+    def __str__(self):
+        return f"{self.conversion_type} - {self.output_filename}"
+
+
+class BackgroundTask(models.Model):
+    """后台任务（如异步生成测试用例），状态按任务逐行原子更新，所有Web进程共享"""
+
+    STATUS_CHOICES = [
+        ("pending", "等待处理"),
+        ("running", "运行中"),
+        ("completed", "已完成"),
+        ("failed", "失败"),
+        ("cancelled", "已取消"),
+    ]
+
+    id = models.CharField(max_length=36, primary_key=True, verbose_name="任务ID")
+    task_type = models.CharField(max_length=50, default="generate_test_cases", verbose_name="任务类型")
+    payload = models.JSONField(default=dict, verbose_name="任务参数")
+    owner = models.CharField(max_length=150, blank=True, default="", verbose_name="创建者")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="pending", verbose_name="状态")
+    progress = models.IntegerField(default=0, verbose_name="进度")
+    current_step = models.CharField(max_length=100, default="等待处理", verbose_name="当前步骤")
+    result = models.JSONField(null=True, blank=True, verbose_name="结果")
+    error = models.TextField(null=True, blank=True, verbose_name="错误信息")
+    worker_id = models.CharField(max_length=100, blank=True, default="", verbose_name="执行进程")
+    attempts = models.IntegerField(default=0, verbose_name="执行次数")
+    heartbeat_at = models.DateTimeField(null=True, blank=True, verbose_name="最近心跳")
+    created_at = models.DateTimeField(default=timezone.now, db_index=True, verbose_name="创建时间")
+    started_at = models.DateTimeField(null=True, blank=True, verbose_name="开始时间")
+    completed_at = models.DateTimeField(null=True, blank=True, verbose_name="完成时间")
+
+    class Meta:
+        verbose_name = "后台任务"
+        verbose_name_plural = "后台任务"
+        indexes = [models.Index(fields=["status", "heartbeat_at"], name="tools_bgtask_status_hb_idx")]
+
+    def __str__(self):
+        return f"{self.task_type} - {self.id} ({self.status})"
+
+
+class BackgroundTaskEvent(models.Model):
+    """后台任务进度事件（只追加，用于进度回放）"""
+
+    task = models.ForeignKey(BackgroundTask, on_delete=models.CASCADE, related_name="events", verbose_name="任务")
+    status = models.CharField(max_length=20, verbose_name="状态")
+    progress = models.IntegerField(default=0, verbose_name="进度")
+    step = models.CharField(max_length=100, verbose_name="步骤")
+    created_at = models.DateTimeField(default=timezone.now, verbose_name="时间")
+
+    class Meta:
+        verbose_name = "后台任务事件"
+        verbose_name_plural = "后台任务事件"
+        ordering = ["id"]
+
+    def __str__(self):
+        return f"{self.task_id} {self.progress}% {self.step}"
+
+
+class RowCounter(models.Model):
+    """表的精确行数，由信号增量维护（见 services.stats_counters）"""
+
+    key = models.CharField(max_length=100, primary_key=True, verbose_name="计数项")
+    value = models.BigIntegerField(default=0, verbose_name="计数")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="更新时间")
+
+    class Meta:
+        verbose_name = "行数计数器"
+        verbose_name_plural = "行数计数器"
+
+    def __str__(self):
+        return f"{self.key}: {self.value}"
+
+
+class DailyStat(models.Model):
+    """按天聚合的统计值，is_final 表示该日已结束、数值不再变化"""
+
+    date = models.DateField(verbose_name="日期")
+    metric = models.CharField(max_length=64, verbose_name="统计项")
+    value = models.BigIntegerField(default=0, verbose_name="数值")
+    is_final = models.BooleanField(default=False, verbose_name="已固定")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="更新时间")
+
+    class Meta:
+        verbose_name = "每日统计"
+        verbose_name_plural = "每日统计"
+        unique_together = ["date", "metric"]
+        ordering = ["-date", "metric"]
+
+    def __str__(self):
+        return f"{self.date} {self.metric}: {self.value}"
+
+
+class ShardMigration(models.Model):
+    """分片扩缩容的数据迁移进度，按源分片记录已扫描到的主键，中断后可从断点继续（见 services.shard_rebalancer）"""
+
+    STATUS_CHOICES = [
+        ("copying", "复制中"),
+        ("cleaning", "清理源分片"),
+        ("completed", "已完成"),
+    ]
+
+    table_name = models.CharField(max_length=100, verbose_name="分片表")
+    source_shards = models.JSONField(default=list, verbose_name="原分片")
+    target_shards = models.JSONField(default=list, verbose_name="目标分片")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="copying", verbose_name="状态")
+    checkpoints = models.JSONField(default=dict, verbose_name="扫描断点")
+    copied_rows = models.BigIntegerField(default=0, verbose_name="已复制行数")
+    deleted_rows = models.BigIntegerField(default=0, verbose_name="已清理行数")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="创建时间")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="更新时间")
+
+    class Meta:
+        verbose_name = "分片迁移"
+        verbose_name_plural = "分片迁移"
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"{self.table_name}: {len(self.source_shards)} -> {len(self.target_shards)} ({self.status})"
+
+
+class ShardTombstone(models.Model):
+    """分片迁移期间被删除的行，迁移复制时跳过，避免已删除的行被带回新分片（见 services.shard_rebalancer）"""
+
+    table_name = models.CharField(max_length=100, verbose_name="分片表")
+    object_pk = models.CharField(max_length=64, verbose_name="主键")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="删除时间")
+
+    class Meta:
+        verbose_name = "分片删除记录"
+        verbose_name_plural = "分片删除记录"
+        unique_together = ["table_name", "object_pk"]
+
+    def __str__(self):
+        return f"{self.table_name}: {self.object_pk}"
+
+
+class DiaryMoodDay(models.Model):
+    """日记心情按天汇总，随日记保存增量更新，心情分析只读取这张窄表（见 services.mood_analysis）"""
+
+    entry = models.OneToOneField(
+        "tools.LifeDiaryEntry", on_delete=models.CASCADE, related_name="mood_day", verbose_name="日记"
+    )
+    user = models.ForeignKey(User, on_delete=models.CASCADE, verbose_name="用户")
+    date = models.DateField(verbose_name="日期")
+    mood = models.CharField(max_length=10, verbose_name="心情")
+    score = models.SmallIntegerField(null=True, blank=True, verbose_name="心情分值")
+    title = models.CharField(max_length=200, blank=True, verbose_name="标题")
+
+    class Meta:
+        verbose_name = "日记心情汇总"
+        verbose_name_plural = "日记心情汇总"
+        unique_together = ["user", "date"]
+
+    def __str__(self):
+        return f"{self.user_id} {self.date} {self.mood}"
+
+
 # 塔罗牌相关模型已移动到 tarot_models.py
 
 
@@ -2635,6 +2815,10 @@ class FitnessCommunityPost(models.Model):
         ordering = ["-created_at"]
         verbose_name = "健身社区帖子"
         verbose_name_plural = "健身社区帖子"
+        indexes = [
+            # 帖子流按 (created_at, id) 游标翻页
+            models.Index(fields=["created_at", "id"], name="fitness_post_feed_idx"),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.title}"
@@ -3152,6 +3336,7 @@ class ShipBaoItem(models.Model):
     location_address = models.CharField(max_length=500, blank=True, null=True, verbose_name="详细地址")
     latitude = models.FloatField(blank=True, null=True, verbose_name="纬度")
     longitude = models.FloatField(blank=True, null=True, verbose_name="经度")
+    geohash = models.CharField(max_length=12, blank=True, default="", verbose_name="地理哈希")
 
     # 状态
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="pending", verbose_name="交易状态")
@@ -3176,11 +3361,22 @@ class ShipBaoItem(models.Model):
             models.Index(fields=["created_at"]),
             models.Index(fields=["location_city"]),
             models.Index(fields=["latitude", "longitude"]),
+            # 按距离检索时在发布中的物品上做 geohash 前缀区间扫描
+            models.Index(fields=["status", "geohash"], name="shipbao_item_geo_idx"),
         ]
 
     def __str__(self):
         return f"{self.seller.username} - {self.title} - ¥{self.price}"
 
+    def save(self, *args, **kwargs):
+        from ..services.geo_search import geohash_for
+
+        self.geohash = geohash_for(self.latitude, self.longitude)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"latitude", "longitude"} & set(update_fields):
+            kwargs["update_fields"] = {*update_fields, "geohash"}
+        super().save(*args, **kwargs)
+
     def get_condition_stars(self):
         """获取新旧程度星级显示"""
         return "★" * self.condition + "☆" * (5 - self.condition)
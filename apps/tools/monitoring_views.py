@@ -50,6 +50,32 @@ def get_system_metrics(request):
         return JsonResponse({"success": False, "error": str(e)}, status=500)
 
 
+@login_required
+@user_passes_test(is_admin)
+def get_metric_series(request):
+    """获取指标趋势: ?metric=system.cpu_percent&metric=...&window=24h[&tier=1h]"""
+    from apps.tools.services.metrics_timeseries import TIERS, get_metrics_store, is_valid_metric_name, parse_window
+
+    try:
+        window = parse_window(request.GET.get("window"))
+        tier = request.GET.get("tier") or None
+        if tier and tier not in TIERS:
+            return JsonResponse({"success": False, "error": f"tier 只能是 {', '.join(TIERS)}"}, status=400)
+        store = get_metrics_store()
+        metrics = request.GET.getlist("metric") or store.metrics()
+        invalid = [metric for metric in metrics if not is_valid_metric_name(metric)]
+        if invalid:
+            return JsonResponse({"success": False, "error": f"非法指标名: {', '.join(invalid)}"}, status=400)
+        data = {
+            metric: {**store.series(metric, window, tier), "rollup": store.rollup(metric, window, tier)} for metric in metrics
+        }
+        return JsonResponse({"success": True, "window": window, "data": data})
+    except ValueError as e:
+        return JsonResponse({"success": False, "error": str(e)}, status=400)
+    except Exception as e:
+        return JsonResponse({"success": False, "error": str(e)}, status=500)
+
+
 @login_required
 @user_passes_test(is_admin)
 def get_alerts(request):
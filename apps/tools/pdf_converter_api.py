@@ -9,12 +9,12 @@ import json
 import logging
 import os
 
-from django.core.files.base import ContentFile
-from django.core.files.storage import default_storage
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 
+from .services.pdf_conversion_cache import OUTPUT_SUFFIXES, compute_input_hash, result_cache
+
 try:
     import fitz  # PyMuPDF
 
@@ -33,13 +33,17 @@ except ImportError:
     print("警告: pypdf/pdfplumber 未安装，PDF转换功能将受限")
 import base64
 import io
-import uuid
 
 from PIL import Image
 
 # 配置日志
 logger = logging.getLogger(__name__)
 
+# pdf2docx转换参数：逐页汇报进度的路径和直接 convert 的路径使用同一组参数
+PDF2DOCX_CONVERT_KWARGS = {"zoom_x": 1.0, "zoom_y": 1.0, "crop": (0, 0, 0, 0)}
+# 逐页转换依赖的 pdf2docx Converter 内部接口（0.5.x），缺少任一个时退回到 convert
+PDF2DOCX_STAGED_API = ("default_settings", "load_pages", "parse_document", "pages", "make_docx")
+
 
 class PDFConverter:
     """PDF转换引擎核心类"""
@@ -130,8 +134,11 @@ class PDFConverter:
 
         return suggestion
 
-    def pdf_to_word(self, pdf_file):
-        """PDF转Word - 真实实现"""
+    def pdf_to_word(self, pdf_file, progress_callback=None):
+        """PDF转Word - 真实实现
+
+        progress_callback(done, total) 在每页解析完成后调用
+        """
         try:
             # 检查pdf2docx库是否可用
             try:
@@ -164,18 +171,10 @@ class PDFConverter:
 
                 try:
                     # 改进转换参数，优化页面布局，并添加错误处理
-                    import logging
-
-                    # 临时抑制pdf2docx的WARNING和ERROR日志，只保留CRITICAL
-                    pdf2docx_logger = logging.getLogger("pdf2docx")
-                    original_level = pdf2docx_logger.getEffectiveLevel()
-                    pdf2docx_logger.setLevel(logging.CRITICAL)
-
-                    try:
-                        cv.convert(temp_docx_path, start=0, end=None, pages=None, zoom_x=1.0, zoom_y=1.0, crop=(0, 0, 0, 0))
-                    finally:
-                        # 恢复原始日志级别
-                        pdf2docx_logger.setLevel(original_level)
+                    if progress_callback is None:
+                        cv.convert(temp_docx_path, start=0, end=None, pages=None, **PDF2DOCX_CONVERT_KWARGS)
+                    else:
+                        self._pdf2docx_convert_with_progress(cv, temp_docx_path, progress_callback)
 
                 except Exception as conv_error:
                     cv.close()
@@ -326,6 +325,33 @@ class PDFConverter:
             logger.error(f"PDF转Word失败: {str(e)}")
             return False, f"转换失败: {str(e)}", None
 
+    def _pdf2docx_convert_with_progress(self, cv, docx_path, progress_callback):
+        """按pdf2docx的 打开 -> 分析 -> 逐页解析 -> 生成 流程转换，逐页汇报进度
+
+        这几步是 pdf2docx 0.5.x 的内部接口；版本不兼容时整体 convert，只在结束时汇报一次进度
+        """
+        if not all(hasattr(cv, name) for name in PDF2DOCX_STAGED_API):
+            logger.warning("pdf2docx版本不支持逐页转换，无法汇报页面进度")
+            cv.convert(docx_path, start=0, end=None, pages=None, **PDF2DOCX_CONVERT_KWARGS)
+            progress_callback(1, 1)
+            return
+
+        convert_settings = cv.default_settings
+        convert_settings.update(PDF2DOCX_CONVERT_KWARGS)
+        cv.load_pages().parse_document(**convert_settings)
+
+        pages = [page for page in cv.pages if not page.skip_parsing]
+        total = len(pages)
+        for done, page in enumerate(pages, start=1):
+            try:
+                page.parse(**convert_settings)
+            except Exception as page_error:
+                # 与pdf2docx默认的ignore_page_error行为一致：跳过解析失败的页面
+                logger.warning(f"pdf2docx解析第{page.id + 1}页失败，已跳过: {page_error}")
+            progress_callback(done, total)
+
+        cv.make_docx(docx_path, **convert_settings)
+
     def _ocr_pdf_to_word_from_path(self, pdf_path: str):
         """对扫描版PDF执行OCR识别并输出Word（docx字节）
         依赖: pytesseract + 系统 tesseract 二进制
@@ -995,7 +1021,7 @@ class PDFConverter:
             logger.error(f"Word转PDF失败: {str(e)}")
             return False, f"转换失败: {str(e)}", None
 
-    def pdf_to_images(self, pdf_file, dpi=150):
+    def pdf_to_images(self, pdf_file, dpi=150, progress_callback=None):
         """PDF转图片"""
         try:
             if not FITZ_AVAILABLE:
@@ -1003,22 +1029,19 @@ class PDFConverter:
 
             doc = fitz.open(stream=pdf_file.read(), filetype="pdf")
             images = []
+            total_pages = len(doc)
 
-            for page_num in range(len(doc)):
+            mat = fitz.Matrix(dpi / 72, dpi / 72)  # 设置DPI
+            for page_num in range(total_pages):
                 page = doc.load_page(page_num)
-                mat = fitz.Matrix(dpi / 72, dpi / 72)  # 设置DPI
                 pix = page.get_pixmap(matrix=mat)
 
-                # 转换为PIL Image
-                img_data = pix.tobytes("png")
-                img = Image.open(io.BytesIO(img_data))
-
-                # 转换为base64
-                img_buffer = io.BytesIO()
-                img.save(img_buffer, format="PNG")
-                img_base64 = base64.b64encode(img_buffer.getvalue()).decode()
+                # Pixmap直接编码为PNG，无需再经过PIL二次编码
+                img_base64 = base64.b64encode(pix.tobytes("png")).decode()
 
-                images.append({"page": page_num + 1, "data": img_base64, "width": img.width, "height": img.height})
+                images.append({"page": page_num + 1, "data": img_base64, "width": pix.width, "height": pix.height})
+                if progress_callback:
+                    progress_callback(page_num + 1, total_pages)
 
             doc.close()
             return True, images, "pdf_to_images"
@@ -1027,6 +1050,51 @@ class PDFConverter:
             logger.error(f"PDF转图片失败: {str(e)}")
             return False, f"转换失败: {str(e)}", None
 
+    def pdf_to_images_zip(
+        self, pdf_file, zip_path, dpi=150, image_format="png", quality=85, progress_callback=None, workers=None
+    ):
+        """PDF转图片并打包为ZIP文件
+
+        页面按区间在多个进程中并行渲染，每页由Pixmap直接写入磁盘后再打包，
+        内存占用与页数无关。返回的页面信息不包含图片数据
+        """
+        try:
+            if not FITZ_AVAILABLE:
+                return False, "PyMuPDF未安装，无法进行PDF转换", None
+
+            import tempfile
+            import zipfile
+
+            from .services.pdf_page_renderer import render_pdf_pages
+
+            with tempfile.TemporaryDirectory() as work_dir:
+                pdf_path = os.path.join(work_dir, "source.pdf")
+                with open(pdf_path, "wb") as temp_pdf:
+                    for chunk in pdf_file.chunks():
+                        temp_pdf.write(chunk)
+
+                pages_dir = os.path.join(work_dir, "pages")
+                pages = render_pdf_pages(
+                    pdf_path,
+                    pages_dir,
+                    dpi=dpi,
+                    image_format=image_format,
+                    quality=quality,
+                    workers=workers,
+                    progress_callback=progress_callback,
+                )
+
+                # 图片本身已经压缩，ZIP只做存储
+                with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_STORED) as zip_file:
+                    for page in pages:
+                        zip_file.write(os.path.join(pages_dir, page["filename"]), page["filename"])
+
+            return True, pages, "pdf_to_images"
+
+        except Exception as e:
+            logger.error(f"PDF转图片失败: {str(e)}")
+            return False, f"转换失败: {str(e)}", None
+
     def images_to_pdf(self, image_files):
         """图片转PDF"""
         try:
@@ -1467,7 +1535,23 @@ def pdf_converter_api(request):
             else:
                 return JsonResponse({"success": False, "error": message}, status=400)
 
+        # 相同内容、类型和参数的转换直接复用已有结果
+        if conversion_type == "text-to-pdf":
+            cache_key = compute_input_hash(text_content.encode("utf-8"), conversion_type)
+        else:
+            cache_params = {"dpi": 150, "format": "png", "quality": 85} if conversion_type == "pdf-to-image" else {}
+            cache_key = compute_input_hash(file, conversion_type, cache_params)
+            file.seek(0)
+
+        cached_result = result_cache.get(cache_key)
+        if cached_result:
+            if conversion_record:
+                _mark_record_success(conversion_record, cached_result, cache_key, time.time() - start_time)
+            logger.info(f"PDF转换命中缓存: {conversion_type}, {cached_result['filename']}")
+            return _conversion_response(conversion_type, file, cached_result, cached=True)
+
         # 执行转换
+        zip_path = None
         if conversion_type == "text-to-pdf":
             # text_content已经在上面从JSON或表单数据中获取
             success, result, file_type = converter.text_to_pdf(text_content)
@@ -1476,7 +1560,14 @@ def pdf_converter_api(request):
         elif conversion_type == "word-to-pdf":
             success, result, file_type = converter.word_to_pdf(file)
         elif conversion_type == "pdf-to-image":
-            success, result, file_type = converter.pdf_to_images(file)
+            import tempfile
+
+            with tempfile.NamedTemporaryFile(suffix=".zip", delete=False) as zip_temp:
+                zip_path = zip_temp.name
+            # 同步接口在Web进程内执行，不再启动渲染进程池；需要并行渲染时走异步任务接口
+            success, result, file_type = converter.pdf_to_images_zip(file, zip_path, workers=1)
+            if not success and os.path.exists(zip_path):
+                os.unlink(zip_path)
         elif conversion_type == "image-to-pdf":
             success, result, file_type = converter.images_to_pdf([file])
         elif conversion_type == "pdf-to-text":
@@ -1499,140 +1590,66 @@ def pdf_converter_api(request):
 
             return JsonResponse({"success": False, "error": result}, status=500)
 
-        # 保存转换结果
-        output_filename = f"{uuid.uuid4()}_{conversion_type.replace('-', '_')}"
-
-        if file_type == "pdf_to_word":
-            output_filename += ".docx"
-            default_storage.save(f"converted/{output_filename}", ContentFile(result))
-            # 设置下载链接
-            download_url = f"/tools/api/pdf-converter/download/{output_filename}/"
-
-            # 更新转换记录为成功状态（如果存在）
-            if conversion_record:
-                conversion_record.status = "success"
-                conversion_record.output_filename = output_filename
-                conversion_record.conversion_time = conversion_time
-                conversion_record.download_url = download_url
-                conversion_record.save()
-        elif file_type == "word_to_pdf":
-            output_filename += ".pdf"
-            default_storage.save(f"converted/{output_filename}", ContentFile(result))
-            # 设置下载链接
-            download_url = f"/tools/api/pdf-converter/download/{output_filename}/"
-
-            # 更新转换记录为成功状态（如果存在）
-            if conversion_record:
-                conversion_record.status = "success"
-                conversion_record.output_filename = output_filename
-                conversion_record.conversion_time = conversion_time
-                conversion_record.download_url = download_url
-                conversion_record.save()
-        elif file_type == "pdf_to_images":
-            # 创建ZIP文件包含所有图片
-            import base64
-            import zipfile
-            from io import BytesIO
-
-            zip_buffer = BytesIO()
-            with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zip_file:
-                for i, img_data in enumerate(result):
-                    # 解码base64图片数据
-                    img_bytes = base64.b64decode(img_data["data"])
-                    # 添加到ZIP文件
-                    zip_file.writestr(f"page_{i+1}.png", img_bytes)
-
-            zip_content = zip_buffer.getvalue()
-            zip_buffer.close()
-
-            # 保存ZIP文件
-            output_filename += "_images.zip"
-            default_storage.save(f"converted/{output_filename}", ContentFile(zip_content))
-            download_url = f"/tools/api/pdf-converter/download/{output_filename}/"
-
-            # 更新转换记录为成功状态（如果存在）
-            if conversion_record:
-                conversion_record.status = "success"
-                conversion_record.output_filename = output_filename
-                conversion_record.conversion_time = conversion_time
-                conversion_record.download_url = download_url
-                conversion_record.save()
-
-            # 返回下载链接
-            return JsonResponse(
-                {
-                    "success": True,
-                    "type": "file",
-                    "download_url": download_url,
-                    "filename": output_filename,
-                    "original_filename": file.name,
-                    "file_size": len(zip_content),
-                    "total_pages": len(result),
-                    "message": f"已转换{len(result)}页，打包为ZIP文件供下载",
-                    "conversion_type": conversion_type,
-                }
-            )
-        elif file_type == "images_to_pdf":
-            output_filename += ".pdf"
-            default_storage.save(f"converted/{output_filename}", ContentFile(result))
-            # 设置下载链接
-            download_url = f"/tools/api/pdf-converter/download/{output_filename}/"
-
-            # 更新转换记录为成功状态（如果存在）
-            if conversion_record:
-                conversion_record.status = "success"
-                conversion_record.output_filename = output_filename
-                conversion_record.conversion_time = conversion_time
-                conversion_record.download_url = download_url
-                conversion_record.save()
-        elif file_type == "text_to_pdf":
-            output_filename += ".pdf"
-            default_storage.save(f"converted/{output_filename}", ContentFile(result))
-            # 设置下载链接
-            download_url = f"/tools/api/pdf-converter/download/{output_filename}/"
-
-            # 更新转换记录为成功状态（如果存在）
-            if conversion_record:
-                conversion_record.status = "success"
-                conversion_record.output_filename = output_filename
-                conversion_record.conversion_time = conversion_time
-                conversion_record.download_url = download_url
-                conversion_record.save()
-        elif file_type == "pdf_to_text":
-            output_filename += ".txt"
-            default_storage.save(f"converted/{output_filename}", ContentFile(result.encode("utf-8")))
-            # 设置下载链接
-            download_url = f"/tools/api/pdf-converter/download/{output_filename}/"
-
-            # 更新转换记录为成功状态（如果存在）
-            if conversion_record:
-                conversion_record.status = "success"
-                conversion_record.output_filename = output_filename
-                conversion_record.conversion_time = conversion_time
-                conversion_record.download_url = download_url
-                conversion_record.save()
-        else:
+        if file_type not in OUTPUT_SUFFIXES:
             return JsonResponse({"success": False, "error": "未知的文件类型"}, status=500)
 
-        # 确定原始文件名
-        if conversion_type == "text-to-pdf":
-            original_filename = "文本内容"
-        elif conversion_type == "pdf-to-text":
-            original_filename = file.name if file else "PDF文件"
+        # 保存转换结果（按内容哈希命名，登记到结果缓存）
+        if file_type == "pdf_to_images":
+            # 保存渲染时已写好的ZIP文件
+            try:
+                result_fields = result_cache.put_file(cache_key, conversion_type, file_type, zip_path, page_count=len(result))
+            finally:
+                os.unlink(zip_path)
         else:
-            original_filename = file.name if file else "文件"
-
-        return JsonResponse(
-            {
-                "success": True,
-                "type": "file",
-                "download_url": download_url,
-                "filename": output_filename,
-                "original_filename": original_filename,
-                "conversion_type": conversion_type,
-            }
-        )
+            content = result.encode("utf-8") if file_type == "pdf_to_text" else result
+            result_fields = result_cache.put_content(cache_key, conversion_type, file_type, content)
+
+        # 更新转换记录为成功状态（如果存在）
+        if conversion_record:
+            _mark_record_success(conversion_record, result_fields, cache_key, conversion_time)
+
+        return _conversion_response(conversion_type, file, result_fields)
 
     except Exception as e:
         logger.error(f"PDF转换测试API错误: {str(e)}")
         return JsonResponse({"success": False, "error": f"服务器错误: {str(e)}"}, status=500)
+
+
+def _mark_record_success(conversion_record, result_fields, cache_key, conversion_time):
+    """更新转换记录为成功状态"""
+    conversion_record.status = "success"
+    conversion_record.input_hash = cache_key
+    conversion_record.output_filename = result_fields["filename"]
+    conversion_record.download_url = result_fields["download_url"]
+    conversion_record.page_count = result_fields.get("page_count", 0)
+    conversion_record.conversion_time = conversion_time
+    conversion_record.save()
+
+
+def _conversion_response(conversion_type, file, result_fields, cached=False):
+    """构造转换成功的响应"""
+    if conversion_type == "text-to-pdf":
+        original_filename = "文本内容"
+    elif conversion_type == "pdf-to-text":
+        original_filename = file.name if file else "PDF文件"
+    else:
+        original_filename = file.name if file else "文件"
+
+    data = {
+        "success": True,
+        "type": "file",
+        "download_url": result_fields["download_url"],
+        "filename": result_fields["filename"],
+        "original_filename": original_filename,
+        "conversion_type": conversion_type,
+        "cached": cached,
+    }
+    if conversion_type == "pdf-to-image":
+        # 返回下载链接与页数
+        total_pages = result_fields.get("page_count", 0)
+        data.update(
+            file_size=result_fields["file_size"],
+            total_pages=total_pages,
+            message=f"已转换{total_pages}页，打包为ZIP文件供下载",
+        )
+    return JsonResponse(data)
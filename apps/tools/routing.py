@@ -4,4 +4,5 @@ from . import consumers
 
 websocket_urlpatterns = [
     re_path(r"ws/chat/(?P<room_id>[^/]+)/$", consumers.ChatConsumer.as_asgi()),
+    re_path(r"ws/tasks/(?P<task_id>[0-9a-f-]+)/$", consumers.TaskProgressConsumer.as_asgi()),
 ]
@@ -8,8 +8,6 @@ from typing import Dict, List
 import qrcode
 import requests
 
-from .boss_zhipin_selenium import BossZhipinSeleniumService
-
 
 class BossZhipinAPI:
     """Boss直聘API服务类 - 支持扫码登录和发送联系请求"""
@@ -25,6 +23,9 @@ class BossZhipinAPI:
 
         # 初始化Selenium服务
         if self.use_selenium:
+            # selenium/webdriver_manager体积较大，只在启用时导入
+            from .boss_zhipin_selenium import BossZhipinSeleniumService
+
             self.selenium_service = BossZhipinSeleniumService(headless=True)
 
         # 设置默认请求头
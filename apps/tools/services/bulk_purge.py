@@ -0,0 +1,179 @@
+"""
+批量清理引擎
+按主键顺序（keyset）分批删除满足条件的行，每批从上一批的最大主键继续，不会每轮从表头重新扫描；
+没有级联和删除信号的模型直接执行 DELETE ... WHERE id BETWEEN lo AND hi AND <条件>，
+否则退回 Django 的级联删除。每批单独提交以缩短持锁时间，批次之间按耗时和从库复制延迟限流。
+
+PostgreSQL 按时间分区的日志表先整块卸载并删除完全过期的分区，剩余部分再逐批删除
+"""
+
+import logging
+import re
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.db import connections, router, transaction
+from django.db.models import Q
+from django.db.models.deletion import Collector
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+logger = logging.getLogger(__name__)
+
+_PARTITION_UPPER_BOUND = re.compile(r"TO \('([^']+)'\)")
+
+
+def replication_lag_seconds(using: str = "default") -> float:
+    """主库上各从库的最大回放延迟（秒），非 PostgreSQL 或查询失败时返回0"""
+    connection = connections[using]
+    if connection.vendor != "postgresql":
+        return 0.0
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT COALESCE(MAX(EXTRACT(EPOCH FROM replay_lag)), 0) FROM pg_stat_replication")
+            return float(cursor.fetchone()[0] or 0)
+    except Exception as e:
+        logger.warning(f"查询复制延迟失败: {e}")
+        return 0.0
+
+
+def drop_expired_partitions(model, cutoff: datetime, using: Optional[str] = None) -> List[str]:
+    """卸载并删除上界不晚于 cutoff 的分区，返回被删除的分区名；表未分区时不做任何事"""
+    using = using or router.db_for_write(model)
+    connection = connections[using]
+    if connection.vendor != "postgresql":
+        return []
+
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT child.relname, pg_get_expr(child.relpartbound, child.oid)
+            FROM pg_inherits
+            JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE parent.oid = to_regclass(%s) AND parent.relkind = 'p'
+            """,
+            [connection.ops.quote_name(table)],
+        )
+        partitions = cursor.fetchall()
+
+    dropped = []
+    for name, bound in partitions:
+        match = _PARTITION_UPPER_BOUND.search(bound or "")
+        upper = parse_datetime(match.group(1)) if match else None
+        if upper is None:
+            continue
+        if timezone.is_naive(upper) and timezone.is_aware(cutoff):
+            upper = timezone.make_aware(upper, timezone.get_default_timezone())
+        if upper > cutoff:
+            continue
+        with transaction.atomic(using=using), connection.cursor() as cursor:
+            cursor.execute(
+                f"ALTER TABLE {connection.ops.quote_name(table)} DETACH PARTITION {connection.ops.quote_name(name)}"
+            )
+            cursor.execute(f"DROP TABLE {connection.ops.quote_name(name)}")
+        dropped.append(name)
+        logger.info(f"已删除过期分区 {name}（上界 {upper}）")
+    return dropped
+
+
+class BulkPurger:
+    """按主键分批删除满足条件的行
+
+    batch_size: 每批行数
+    pause: 批次之间的最短间隔（秒）
+    throttle_ratio: 额外休眠该批耗时的倍数，数据库越忙批次越慢、让出的时间也越多
+    max_replication_lag: 从库延迟超过该值时暂停删除，等待追上
+    max_seconds: 本次运行的时间上限，超出后停止并在结果中标记 finished=False
+    """
+
+    def __init__(
+        self,
+        model,
+        batch_size: int = 1000,
+        pause: Optional[float] = None,
+        throttle_ratio: float = 0.5,
+        max_replication_lag: Optional[float] = None,
+        max_seconds: Optional[float] = None,
+        using: Optional[str] = None,
+    ):
+        self.model = model
+        self.batch_size = batch_size
+        self.pause = pause if pause is not None else getattr(settings, "PURGE_BATCH_PAUSE_SECONDS", 0.05)
+        self.throttle_ratio = throttle_ratio
+        self.max_replication_lag = (
+            max_replication_lag if max_replication_lag is not None else getattr(settings, "PURGE_MAX_REPLICATION_LAG", 5.0)
+        )
+        self.max_seconds = max_seconds
+        self.using = using or router.db_for_write(model)
+
+    def can_fast_delete(self) -> bool:
+        """没有级联关系、删除信号的模型可以直接执行 DELETE，跳过逐行收集"""
+        return Collector(using=self.using, origin=None).can_fast_delete(self.model._base_manager.using(self.using).none())
+
+    def _wait_for_replicas(self, deadline: Optional[float]):
+        lag = replication_lag_seconds(self.using)
+        while lag > self.max_replication_lag and (deadline is None or time.monotonic() < deadline):
+            logger.info(f"从库延迟 {lag:.1f}s，暂停清理")
+            time.sleep(min(lag, 5.0))
+            lag = replication_lag_seconds(self.using)
+
+    def purge(self, condition: Q, time_field: Optional[str] = None, cutoff: Optional[datetime] = None) -> Dict:
+        """删除满足 condition 的全部行
+
+        同时给出 time_field 和 cutoff 时，先尝试删除整块过期的分区
+        """
+        started = time.monotonic()
+        deadline = started + self.max_seconds if self.max_seconds else None
+        partitions = drop_expired_partitions(self.model, cutoff, self.using) if time_field and cutoff else []
+
+        manager = self.model._base_manager.using(self.using)
+        fast = self.can_fast_delete()
+        pk_name = self.model._meta.pk.name
+        last_pk = None
+        deleted = batches = 0
+        finished = True
+
+        while True:
+            if deadline is not None and time.monotonic() >= deadline:
+                finished = False
+                break
+
+            keys = manager.filter(condition)
+            if last_pk is not None:
+                keys = keys.filter(pk__gt=last_pk)
+            ids = list(keys.order_by(pk_name).values_list(pk_name, flat=True)[: self.batch_size])
+            if not ids:
+                break
+
+            batch_started = time.monotonic()
+            batch = manager.filter(condition, pk__gte=ids[0], pk__lte=ids[-1])
+            with transaction.atomic(using=self.using):
+                if fast:
+                    count = batch._raw_delete(self.using)
+                else:
+                    count = batch.delete()[1].get(self.model._meta.label, 0)
+            deleted += count
+            batches += 1
+            last_pk = ids[-1]
+
+            if len(ids) < self.batch_size:
+                break
+            time.sleep(max(self.pause, (time.monotonic() - batch_started) * self.throttle_ratio))
+            self._wait_for_replicas(deadline)
+
+        elapsed = time.monotonic() - started
+        result = {
+            "deleted_count": deleted,
+            "batches": batches,
+            "partitions_dropped": partitions,
+            "fast_delete": fast,
+            "finished": finished,
+            "elapsed": round(elapsed, 3),
+            "rows_per_second": round(deleted / elapsed, 1) if elapsed > 0 else 0.0,
+        }
+        logger.info(f"{self.model._meta.label} 清理完成: {result}")
+        return result
@@ -5,13 +5,17 @@
 
 import logging
 from datetime import datetime, timedelta
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 from django.core.cache import cache
 from django.db import connection
+from django.db.models import Q
+from django.utils import timezone
 
 from apps.tools.models import SocialMediaSubscription, ToolUsageLog
 
+from .bulk_purge import BulkPurger
+
 logger = logging.getLogger(__name__)
 
 
@@ -20,9 +24,10 @@ class DatabaseCleanupService:
 
     def __init__(self):
         self.cleanup_config = {
-            "tool_usage_logs": {"retention_days": 90, "batch_size": 1000, "enabled": True},  # 保留90天
+            # 保留90天，单次最多运行30分钟，未删完的部分下次继续
+            "tool_usage_logs": {"retention_days": 90, "batch_size": 5000, "max_seconds": 1800, "enabled": True},
             "social_media_subscriptions": {"retention_days": 180, "batch_size": 500, "enabled": True},  # 保留180天
-            "user_sessions": {"retention_days": 30, "batch_size": 1000, "enabled": True},  # 保留30天
+            "user_sessions": {"batch_size": 5000, "enabled": True},  # 删除已过期的会话
             "cache_cleanup": {"enabled": True},
             "orphaned_files": {"enabled": True},
         }
@@ -62,31 +67,21 @@ class DatabaseCleanupService:
             logger.error(f"数据库清理失败: {e}")
             return {"status": "error", "message": str(e), "timestamp": datetime.now()}
 
+    def _purge(self, config_key: str, model, condition: Q, time_field: Optional[str] = None, cutoff=None) -> Dict[str, Any]:
+        config = self.cleanup_config[config_key]
+        purger = BulkPurger(model, batch_size=config["batch_size"], max_seconds=config.get("max_seconds"))
+        result = purger.purge(condition, time_field=time_field, cutoff=cutoff)
+        if "retention_days" in config:
+            result["retention_days"] = config["retention_days"]
+        return result
+
     def _cleanup_tool_usage_logs(self) -> Dict[str, Any]:
         """清理工具使用日志"""
         try:
-            retention_days = self.cleanup_config["tool_usage_logs"]["retention_days"]
-            batch_size = self.cleanup_config["tool_usage_logs"]["batch_size"]
-            cutoff_date = datetime.now() - timedelta(days=retention_days)
-
-            # 获取要删除的记录数量
-            total_count = ToolUsageLog.objects.filter(created_at__lt=cutoff_date).count()
-
-            # 分批删除
-            deleted_count = 0
-            while True:
-                batch = ToolUsageLog.objects.filter(created_at__lt=cutoff_date)[:batch_size]
-
-                if not batch.exists():
-                    break
-
-                batch_ids = list(batch.values_list("id", flat=True))
-                ToolUsageLog.objects.filter(id__in=batch_ids).delete()
-                deleted_count += len(batch_ids)
-
-                logger.info(f"已删除 {deleted_count}/{total_count} 条工具使用日志")
-
-            return {"deleted_count": deleted_count, "total_count": total_count, "retention_days": retention_days}
+            cutoff_date = timezone.now() - timedelta(days=self.cleanup_config["tool_usage_logs"]["retention_days"])
+            return self._purge(
+                "tool_usage_logs", ToolUsageLog, Q(created_at__lt=cutoff_date), time_field="created_at", cutoff=cutoff_date
+            )
 
         except Exception as e:
             logger.error(f"清理工具使用日志失败: {e}")
@@ -95,28 +90,11 @@ class DatabaseCleanupService:
     def _cleanup_social_media_subscriptions(self) -> Dict[str, Any]:
         """清理社交媒体订阅"""
         try:
-            retention_days = self.cleanup_config["social_media_subscriptions"]["retention_days"]
-            batch_size = self.cleanup_config["social_media_subscriptions"]["batch_size"]
-            cutoff_date = datetime.now() - timedelta(days=retention_days)
-
-            # 获取要删除的记录数量
-            total_count = SocialMediaSubscription.objects.filter(created_at__lt=cutoff_date, status="inactive").count()
-
-            # 分批删除
-            deleted_count = 0
-            while True:
-                batch = SocialMediaSubscription.objects.filter(created_at__lt=cutoff_date, status="inactive")[:batch_size]
-
-                if not batch.exists():
-                    break
-
-                batch_ids = list(batch.values_list("id", flat=True))
-                SocialMediaSubscription.objects.filter(id__in=batch_ids).delete()
-                deleted_count += len(batch_ids)
-
-                logger.info(f"已删除 {deleted_count}/{total_count} 条社交媒体订阅")
-
-            return {"deleted_count": deleted_count, "total_count": total_count, "retention_days": retention_days}
+            cutoff_date = timezone.now() - timedelta(days=self.cleanup_config["social_media_subscriptions"]["retention_days"])
+            # 订阅有级联的通知记录，清理引擎会退回逐批级联删除
+            return self._purge(
+                "social_media_subscriptions", SocialMediaSubscription, Q(created_at__lt=cutoff_date, status="inactive")
+            )
 
         except Exception as e:
             logger.error(f"清理社交媒体订阅失败: {e}")
@@ -125,18 +103,9 @@ class DatabaseCleanupService:
     def _cleanup_user_sessions(self) -> Dict[str, Any]:
         """清理用户会话"""
         try:
-            retention_days = self.cleanup_config["user_sessions"]["retention_days"]
-            cutoff_date = datetime.now() - timedelta(days=retention_days)
-
-            # 清理Django会话
             from django.contrib.sessions.models import Session
-            from django.utils import timezone
-
-            expired_sessions = Session.objects.filter(expire_date__lt=timezone.now())
-            deleted_count = expired_sessions.count()
-            expired_sessions.delete()
 
-            return {"deleted_count": deleted_count, "retention_days": retention_days}
+            return self._purge("user_sessions", Session, Q(expire_date__lt=timezone.now()))
 
         except Exception as e:
             logger.error(f"清理用户会话失败: {e}")
@@ -202,34 +171,38 @@ class DatabaseCleanupService:
             logger.error(f"清理数据库连接失败: {e}")
 
     def get_cleanup_stats(self) -> Dict[str, Any]:
-        """获取清理统计信息"""
+        """获取清理统计信息
+
+        每分钟由监控任务调用：总数使用估算行数，待清理数量只在索引上扫描过期的一段
+        """
+        from django.contrib.sessions.models import Session
+
+        from .stats_counters import estimated_count
+
         try:
             stats = {}
 
             # 工具使用日志统计
             retention_days = self.cleanup_config["tool_usage_logs"]["retention_days"]
-            cutoff_date = datetime.now() - timedelta(days=retention_days)
+            cutoff_date = timezone.now() - timedelta(days=retention_days)
             stats["tool_usage_logs"] = {
-                "total_count": ToolUsageLog.objects.count(),
+                "total_count": estimated_count(ToolUsageLog),
                 "old_count": ToolUsageLog.objects.filter(created_at__lt=cutoff_date).count(),
                 "retention_days": retention_days,
             }
 
             # 社交媒体订阅统计
             retention_days = self.cleanup_config["social_media_subscriptions"]["retention_days"]
-            cutoff_date = datetime.now() - timedelta(days=retention_days)
+            cutoff_date = timezone.now() - timedelta(days=retention_days)
             stats["social_media_subscriptions"] = {
-                "total_count": SocialMediaSubscription.objects.count(),
+                "total_count": estimated_count(SocialMediaSubscription),
                 "old_count": SocialMediaSubscription.objects.filter(created_at__lt=cutoff_date, status="inactive").count(),
                 "retention_days": retention_days,
             }
 
             # 用户会话统计
-            from django.contrib.sessions.models import Session
-            from django.utils import timezone
-
             stats["user_sessions"] = {
-                "total_count": Session.objects.count(),
+                "total_count": estimated_count(Session),
                 "expired_count": Session.objects.filter(expire_date__lt=timezone.now()).count(),
             }
 
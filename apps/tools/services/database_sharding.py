@@ -3,24 +3,126 @@
 支持水平分片和垂直分片，为大规模数据做准备
 """
 
+import bisect
 import hashlib
+import heapq
 import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Any, Dict, List
+from itertools import chain, islice
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
+from django.conf import settings
 from django.core.cache import cache
-from django.db import connections
+from django.db import DatabaseError, connections, models
 from django.utils import timezone
 
 logger = logging.getLogger(__name__)
 
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_shard_executor() -> ThreadPoolExecutor:
+    """分片查询共用的线程池"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, "SHARD_QUERY_MAX_WORKERS", 8), thread_name_prefix="shard-query"
+                )
+    return _executor
+
+
+def hash_key(value: Any) -> int:
+    """键在哈希环上的位置（md5 前 64 位）"""
+    data = value.encode() if isinstance(value, str) else str(value).encode()
+    return int.from_bytes(hashlib.md5(data, usedforsecurity=False).digest()[:8], "big")
+
+
+class ConsistentHashRing:
+    """带虚拟节点的一致性哈希环
+
+    每个分片在环上放置 vnodes 个点，键归属顺时针方向的第一个点所在的分片；
+    增加第 N 个分片时只有约 1/N 的键改变归属，且只从各原分片各迁走一小段
+    """
+
+    RING_SIZE = 1 << 64
+
+    def __init__(self, nodes: Iterable[str] = (), vnodes: int = 160):
+        self.vnodes = vnodes
+        self._points: List[int] = []
+        self._owners: List[str] = []
+        self.nodes: List[str] = []
+        for node in nodes:
+            self.add_node(node)
+
+    def add_node(self, node: str):
+        if node in self.nodes:
+            return
+        self.nodes.append(node)
+        for i in range(self.vnodes):
+            point = hash_key(f"{node}#{i}")
+            index = bisect.bisect_left(self._points, point)
+            self._points.insert(index, point)
+            self._owners.insert(index, node)
+
+    def remove_node(self, node: str):
+        if node not in self.nodes:
+            return
+        self.nodes.remove(node)
+        keep = [(p, o) for p, o in zip(self._points, self._owners) if o != node]
+        self._points = [p for p, _ in keep]
+        self._owners = [o for _, o in keep]
+
+    def node_for_hash(self, point: int) -> str:
+        if not self._points:
+            raise ValueError("哈希环上没有分片")
+        index = bisect.bisect_left(self._points, point)
+        return self._owners[index % len(self._points)]
+
+    def get_node(self, key: Any) -> str:
+        return self.node_for_hash(hash_key(key))
+
+    def moved_ranges(self, other: "ConsistentHashRing") -> List[Tuple[int, int, str, str]]:
+        """与另一个环相比改变归属的区间 (起点(不含), 终点(含), 原分片, 新分片)"""
+        points = sorted(set(self._points) | set(other._points))
+        ranges = []
+        for i, end in enumerate(points):
+            start = points[i - 1] if i else points[-1] - self.RING_SIZE
+            old, new = self.node_for_hash(end), other.node_for_hash(end)
+            if old != new:
+                ranges.append((start, end, old, new))
+        return ranges
+
+    def moved_fraction(self, other: "ConsistentHashRing") -> float:
+        """改变归属的键空间比例"""
+        return sum(end - start for start, end, _, _ in self.moved_ranges(other)) / self.RING_SIZE
+
 
 class ShardManager:
-    """分片管理器"""
+    """分片管理器
+
+    hash 策略使用一致性哈希环；扩缩容迁移期间（见 services.shard_rebalancer）写入按新拓扑路由，
+    读取先查新归属分片、未命中再查原分片。迁移完成后的拓扑保存在 state_db 的 ShardMigration 中，
+    各进程定期读取并覆盖 load_shard_configs 中的默认分片列表
+    """
+
+    MIGRATIONS_CACHE_KEY = "shard_migrations"
+    MIGRATIONS_REFRESH_SECONDS = 5
+    PUBLISHED_STATUSES = ("cleaning", "completed")
 
     def __init__(self):
         self.shards = {}
         self.shard_configs = {}
+        self.state_db = getattr(settings, "SHARD_MIGRATION_STATE_DB", "default")
+        self._rings = {}
+        self._migrations = {}
+        self._migrations_loaded_at = 0.0
         self.load_shard_configs()
 
     def load_shard_configs(self):
@@ -84,14 +186,124 @@ class ShardManager:
         # 这样可以避免分片健康检查的错误
         return False
 
+    def get_ring(self, shards: List[str], vnodes: int = 160) -> ConsistentHashRing:
+        """按分片列表缓存的哈希环"""
+        key = (tuple(shards), vnodes)
+        ring = self._rings.get(key)
+        if ring is None:
+            ring = self._rings[key] = ConsistentHashRing(shards, vnodes)
+        return ring
+
+    def _refresh(self):
+        """定期重新读取进行中的迁移（缓存）和已发布的拓扑（数据库）"""
+        now = time.monotonic()
+        if now - self._migrations_loaded_at > self.MIGRATIONS_REFRESH_SECONDS:
+            self._migrations = cache.get(self.MIGRATIONS_CACHE_KEY) or {}
+            self._load_topology()
+            self._migrations_loaded_at = now
+
+    def _hash_tables(self) -> List[str]:
+        return [
+            table
+            for table, config in self.shard_configs.items()
+            if config["type"] == "horizontal" and config.get("strategy", "hash") == "hash"
+        ]
+
+    def _load_topology(self):
+        """用最近一次已发布迁移的目标分片覆盖配置中的分片列表"""
+        tables = self._hash_tables()
+        if not tables:
+            return
+        from ..models import ShardMigration
+
+        try:
+            published = (
+                ShardMigration.objects.using(self.state_db)
+                .filter(table_name__in=tables, status__in=self.PUBLISHED_STATUSES)
+                .order_by("id")
+                .values_list("table_name", "target_shards")
+            )
+            for table_name, shards in published:
+                self.shard_configs[table_name]["shards"] = list(shards)
+        except DatabaseError as e:
+            logger.warning(f"读取分片拓扑失败，沿用当前配置: {e}")
+
+    def get_config(self, table_name: str) -> Optional[Dict]:
+        """表的分片配置，分片列表为当前生效的拓扑"""
+        self._refresh()
+        return self.shard_configs.get(table_name)
+
+    def _active_migrations(self) -> Dict[str, List[str]]:
+        """进行中的迁移 {表: 目标分片列表}，经缓存在各进程间共享"""
+        self._refresh()
+        return self._migrations
+
+    def begin_migration(self, table_name: str, target_shards: List[str]):
+        """登记迁移：之后的写入按目标拓扑路由"""
+        migrations = dict(cache.get(self.MIGRATIONS_CACHE_KEY) or {})
+        migrations[table_name] = list(target_shards)
+        cache.set(self.MIGRATIONS_CACHE_KEY, migrations, timeout=None)
+        self._migrations = migrations
+        self._migrations_loaded_at = time.monotonic()
+
+    def finish_migration(self, table_name: str):
+        """目标拓扑成为正式配置
+
+        调用前目标拓扑须已作为 ShardMigration（status=cleaning）写入 state_db。其它进程在
+        MIGRATIONS_REFRESH_SECONDS 内读到新拓扑，此前仍按迁移中的规则写新分片、先读新分片，清理源分片不影响它们
+        """
+        migrations = dict(cache.get(self.MIGRATIONS_CACHE_KEY) or {})
+        target = migrations.pop(table_name, None) or self._migrations.get(table_name)
+        cache.set(self.MIGRATIONS_CACHE_KEY, migrations, timeout=None)
+        self._migrations = migrations
+        self._migrations_loaded_at = time.monotonic()
+        if target and table_name in self.shard_configs:
+            self.shard_configs[table_name]["shards"] = list(target)
+        else:
+            self._load_topology()
+
+    def is_migrating(self, table_name: str) -> bool:
+        return self._migration_config(table_name) is not None
+
+    def record_deletion(self, table_name: str, pk: Any):
+        """迁移期间删除行时记录墓碑，迁移复制据此跳过该行"""
+        if not self.is_migrating(table_name):
+            return
+        from ..models import ShardTombstone
+
+        ShardTombstone.objects.using(self.state_db).bulk_create(
+            [ShardTombstone(table_name=table_name, object_pk=str(pk))], ignore_conflicts=True
+        )
+
+    def tombstoned(self, table_name: str, pks: Optional[Iterable[Any]] = None) -> set:
+        """迁移期间被删除的主键（字符串形式）；pks 为 None 时返回该表全部墓碑"""
+        from ..models import ShardTombstone
+
+        tombstones = ShardTombstone.objects.using(self.state_db).filter(table_name=table_name)
+        if pks is not None:
+            tombstones = tombstones.filter(object_pk__in=[str(pk) for pk in pks])
+        return set(tombstones.values_list("object_pk", flat=True))
+
+    def clear_tombstones(self, table_name: str):
+        from ..models import ShardTombstone
+
+        ShardTombstone.objects.using(self.state_db).filter(table_name=table_name).delete()
+
+    def _migration_config(self, table_name: str) -> Optional[Dict]:
+        target = self._active_migrations().get(table_name)
+        config = self.shard_configs.get(table_name)
+        if not target or not config:
+            return None
+        return {**config, "shards": target}
+
     def get_shard_for_key(self, table_name: str, key_value: Any) -> str:
         """根据键值获取分片"""
-        config = self.shard_configs.get(table_name)
+        config = self.get_config(table_name)
         if not config:
             return "default"
 
         if config["type"] == "horizontal":
-            return self._get_horizontal_shard(config, key_value)
+            return self._get_horizontal_shard(self._migration_config(table_name) or config, key_value)
         elif config["type"] == "vertical":
             return self._get_vertical_shard(config, table_name)
 
@@ -103,14 +315,8 @@ class ShardManager:
         shards = config["shards"]
 
         if strategy == "hash":
-            # 基于哈希的分片
-            if isinstance(key_value, str):
-                hash_value = hashlib.md5(key_value.encode(), usedforsecurity=False).hexdigest()
-            else:
-                hash_value = hashlib.md5(str(key_value).encode(), usedforsecurity=False).hexdigest()
-
-            shard_index = int(hash_value, 16) % len(shards)
-            return shards[shard_index]
+            # 一致性哈希：增减分片时只有少量键改变归属
+            return self.get_ring(shards, config.get("virtual_nodes", 160)).get_node(key_value)
 
         elif strategy == "time_based":
             # 基于时间的分片
@@ -144,13 +350,29 @@ class ShardManager:
 
         return "default"
 
+    def get_read_shards_for_key(self, table_name: str, key_value: Any) -> List[str]:
+        """读取某个键时依次尝试的分片：迁移期间先查新归属分片，数据可能尚未复制过去，再查原分片"""
+        config = self.get_config(table_name)
+        if not config or config["type"] != "horizontal":
+            return [self.get_shard_for_key(table_name, key_value)]
+
+        current = self._get_horizontal_shard(config, key_value)
+        migration = self._migration_config(table_name)
+        if migration is None:
+            return [current]
+        target = self._get_horizontal_shard(migration, key_value)
+        return [target] if target == current else [target, current]
+
     def get_all_shards(self, table_name: str) -> List[str]:
         """获取表的所有分片"""
-        config = self.shard_configs.get(table_name)
+        config = self.get_config(table_name)
         if not config:
             return ["default"]
 
         if config["type"] == "horizontal":
+            migration = self._migration_config(table_name)
+            if migration:
+                return list(dict.fromkeys(config["shards"] + migration["shards"]))
             return config["shards"]
         elif config["type"] == "vertical":
             all_shards = []
@@ -161,8 +383,34 @@ class ShardManager:
         return ["default"]
 
 
+class _MergeKey:
+    """多字段排序键，支持每个字段单独升序/降序以及 NULL 的位置"""
+
+    __slots__ = ("values", "descending", "nulls_last")
+
+    def __init__(self, values: tuple, descending: tuple, nulls_last: bool):
+        self.values = values
+        self.descending = descending
+        self.nulls_last = nulls_last
+
+    def __lt__(self, other: "_MergeKey") -> bool:
+        for a, b, desc in zip(self.values, other.values, self.descending):
+            if a == b:
+                continue
+            if a is None or b is None:
+                # 与数据库一致：PostgreSQL 升序时 NULL 在最后，SQLite/MySQL 在最前，降序时相反
+                a_first = (b is None) == (self.nulls_last != desc)
+                return a_first
+            return a > b if desc else a < b
+        return False
+
+
 class ShardedQuerySet:
-    """分片查询集"""
+    """分片查询集
+
+    水平分片的查询并发下发到各分片，每个分片只取 ORDER BY ... LIMIT offset+limit 行，
+    再按排序字段对各分片的有序结果做 k 路归并，最后应用 offset/limit
+    """
 
     def __init__(self, model_class, shard_manager: ShardManager):
         self.model_class = model_class
@@ -170,8 +418,9 @@ class ShardedQuerySet:
         self.table_name = model_class._meta.db_table
         self.filters = {}
         self.ordering = []
-        self.limit = None
-        self.offset = None
+        self._limit = None
+        self._offset = None
+        self._migrating = False
 
     def filter(self, **kwargs):
         """添加过滤条件"""
@@ -180,17 +429,20 @@ class ShardedQuerySet:
 
     def order_by(self, *fields):
         """添加排序"""
+        for field in fields:
+            if field == "?" or not field.lstrip("-"):
+                raise ValueError(f"分片查询不支持的排序字段: {field!r}")
         self.ordering.extend(fields)
         return self
 
     def limit(self, limit):
         """限制结果数量"""
-        self.limit = limit
+        self._limit = limit
         return self
 
     def offset(self, offset):
         """设置偏移量"""
-        self.offset = offset
+        self._offset = offset
         return self
 
     def execute(self) -> List[Any]:
@@ -198,73 +450,218 @@ class ShardedQuerySet:
         config = self.shard_manager.shard_configs.get(self.table_name)
         if not config:
             # 使用默认数据库
-            return self._execute_on_shard("default")
+            return self._execute_single("default")
 
         if config["type"] == "horizontal":
             return self._execute_horizontal_query()
         elif config["type"] == "vertical":
             return self._execute_vertical_query()
 
-        return self._execute_on_shard("default")
+        return self._execute_single("default")
 
     def _execute_horizontal_query(self) -> List[Any]:
         """执行水平分片查询"""
-        results = []
         shards = self.shard_manager.get_all_shards(self.table_name)
+        # 迁移期间同一行可能同时存在于新旧分片，去重后各分片的前 offset+limit 行不再足够，不下推 LIMIT
+        self._migrating = self.shard_manager.is_migrating(self.table_name)
+        results = self._scatter(shards)
+        if self._migrating:
+            results = self._drop_migrated_copies(results)
+        streams = list(results.values())
 
-        for shard in shards:
-            try:
-                shard_results = self._execute_on_shard(shard)
-                results.extend(shard_results)
-            except Exception as e:
-                logger.error(f"分片查询失败 {shard}: {e}")
-                continue
-
-        # 合并和排序结果
         if self.ordering:
-            results = self._sort_results(results)
+            nulls_last = any(connections[shard].vendor == "postgresql" for shard in shards)
+            merged = heapq.merge(*streams, key=lambda obj: self._merge_key(obj, nulls_last))
+        else:
+            merged = chain.from_iterable(streams)
 
-        # 应用分页
-        if self.offset is not None:
-            results = results[self.offset :]
-        if self.limit is not None:
-            results = results[: self.limit]
-
-        return results
+        offset = self._offset or 0
+        stop = offset + self._limit if self._limit is not None else None
+        return list(islice(merged, offset, stop))
 
     def _execute_vertical_query(self) -> List[Any]:
         """执行垂直分片查询"""
         # 垂直分片通常需要跨分片JOIN，这里简化处理
         primary_shard = self.shard_manager.get_all_shards(self.table_name)[0]
-        return self._execute_on_shard(primary_shard)
+        return self._execute_single(primary_shard)
+
+    def _execute_single(self, shard: str) -> List[Any]:
+        """单库查询，offset/limit 直接交给数据库"""
+        queryset = self._base_queryset(shard)
+        offset = self._offset or 0
+        if self._limit is not None:
+            return list(queryset[offset : offset + self._limit])
+        return list(queryset[offset:] if offset else queryset)
+
+    def _base_queryset(self, shard: str):
+        queryset = self.model_class._default_manager.using(shard).filter(**self.filters)
+        if self.ordering:
+            queryset = queryset.order_by(*self.ordering)
+        return queryset
+
+    def _shard_queryset(self, shard: str):
+        """下发到单个分片的查询：最终结果最多来自某一个分片的前 offset+limit 行"""
+        queryset = self._base_queryset(shard)
+        if self._limit is not None and not self._migrating:
+            queryset = queryset[: (self._offset or 0) + self._limit]
+        return queryset
 
     def _execute_on_shard(self, shard: str) -> List[Any]:
-        """在指定分片上执行查询"""
-        # 这里应该根据实际的分片实现来执行查询
-        # 目前返回空列表作为占位符
-        return []
+        """在指定分片上执行查询，返回按 ordering 排好序的结果"""
+        return list(self._shard_queryset(shard))
+
+    def _run_in_worker(self, shard: str) -> List[Any]:
+        try:
+            return self._execute_on_shard(shard)
+        finally:
+            # 工作线程各自持有连接，按 CONN_MAX_AGE 及时关闭
+            connections[shard].close_if_unusable_or_obsolete()
+
+    def _scatter(self, shards: List[str]) -> Dict[str, List[Any]]:
+        """并发查询各分片；当前线程在事务中的分片留在本线程执行，以便读到未提交的写入"""
+        local = [shard for shard in shards if len(shards) == 1 or connections[shard].in_atomic_block]
+        futures = {shard: get_shard_executor().submit(self._run_in_worker, shard) for shard in shards if shard not in local}
+
+        results = {}
+        for shard in shards:
+            try:
+                if shard in futures:
+                    results[shard] = futures[shard].result()
+                else:
+                    results[shard] = self._execute_on_shard(shard)
+            except Exception as e:
+                logger.error(f"分片查询失败 {shard}: {e}")
+        return results
+
+    def _drop_migrated_copies(self, results: Dict[str, List[Any]]) -> Dict[str, List[Any]]:
+        """已复制到新归属分片的行，丢弃原分片上尚未清理的旧副本；迁移期间已删除的行也一并丢弃"""
+        key_field = self.shard_manager.shard_configs[self.table_name]["key_field"]
+        present = {shard: {obj.pk for obj in rows} for shard, rows in results.items()}
+        deleted = self.shard_manager.tombstoned(self.table_name)
+        deduped = {}
+        for shard, rows in results.items():
+            kept = []
+            for obj in rows:
+                if str(obj.pk) in deleted:
+                    continue
+                target = self.shard_manager.get_read_shards_for_key(self.table_name, getattr(obj, key_field))[0]
+                if target == shard or obj.pk not in present.get(target, ()):
+                    kept.append(obj)
+            deduped[shard] = kept
+        return deduped
+
+    def _field_value(self, obj: Any, field: str) -> Any:
+        value = obj
+        for part in field.split("__"):
+            if value is None:
+                return None
+            value = getattr(value, part)
+        # 按外键排序时数据库比较的是主键
+        return value.pk if isinstance(value, models.Model) else value
+
+    def _merge_key(self, obj: Any, nulls_last: bool) -> _MergeKey:
+        values = tuple(self._field_value(obj, field.lstrip("-")) for field in self.ordering)
+        descending = tuple(field.startswith("-") for field in self.ordering)
+        return _MergeKey(values, descending, nulls_last)
 
     def _sort_results(self, results: List[Any]) -> List[Any]:
         """排序结果"""
-        # 实现排序逻辑
-        return sorted(results, key=lambda x: getattr(x, self.ordering[0]))
+        nulls_last = any(
+            connections[shard].vendor == "postgresql" for shard in self.shard_manager.get_all_shards(self.table_name)
+        )
+        return sorted(results, key=lambda obj: self._merge_key(obj, nulls_last))
+
+
+_routing_state = threading.local()
+
+
+def pin_primary(seconds: Optional[float] = None):
+    """当前线程在接下来 seconds 秒内的读取都走主库（默认 PRIMARY_STICKY_SECONDS）"""
+    if seconds is None:
+        seconds = getattr(settings, "PRIMARY_STICKY_SECONDS", 10)
+    until = time.time() + seconds
+    _routing_state.pinned_until = max(until, getattr(_routing_state, "pinned_until", 0.0))
+
+
+def primary_pinned() -> bool:
+    return getattr(_routing_state, "pinned_until", 0.0) > time.time()
+
+
+def reset_routing_state(pinned_until: float = 0.0):
+    """请求开始时重置线程状态；pinned_until 为客户端 Cookie 中带来的粘滞截止时间"""
+    _routing_state.pinned_until = pinned_until
+    _routing_state.wrote = False
+
+
+def wrote_in_request() -> bool:
+    return getattr(_routing_state, "wrote", False)
+
+
+class ReplicaLagMonitor:
+    """副本复制延迟检查，结果按别名缓存 check_interval 秒，查询失败视为不可用"""
+
+    def __init__(self, check_interval: Optional[float] = None):
+        self.check_interval = check_interval
+        self._lags: Dict[str, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def measure(self, alias: str) -> float:
+        connection = connections[alias]
+        if connection.vendor != "postgresql":
+            return 0.0
+        with connection.cursor() as cursor:
+            # 已回放到接收位置说明没有待回放的 WAL，此时主库空闲造成的回放时间差不算延迟
+            cursor.execute(
+                "SELECT CASE WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+                "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+            )
+            return float(cursor.fetchone()[0] or 0)
+
+    def lag(self, alias: str) -> float:
+        interval = (
+            self.check_interval if self.check_interval is not None else getattr(settings, "REPLICA_LAG_CHECK_INTERVAL", 5)
+        )
+        now = time.monotonic()
+        cached = self._lags.get(alias)
+        if cached and now - cached[0] < interval:
+            return cached[1]
+        try:
+            lag = self.measure(alias)
+        except Exception as e:
+            logger.warning(f"副本 {alias} 延迟检查失败: {e}")
+            lag = float("inf")
+        with self._lock:
+            self._lags[alias] = (now, lag)
+        return lag
+
+    def healthy_replicas(self, replicas: List[str]) -> List[str]:
+        max_lag = getattr(settings, "REPLICA_MAX_LAG_SECONDS", 5.0)
+        return [alias for alias in replicas if self.lag(alias) <= max_lag]
 
 
 class ShardRouter:
-    """分片路由器"""
+    """分片路由器
 
-    def __init__(self, shard_manager: ShardManager):
-        self.shard_manager = shard_manager
+    写入路由到表所在的主库（分片）；读取在 DATABASE_REPLICAS 配置了副本时分散到延迟不超过
+    REPLICA_MAX_LAG_SECONDS 的副本上，没有可用副本、处于主库事务中或刚写入过（粘滞窗口内）时读主库
+    """
 
-    def db_for_read(self, model, **hints):
-        """为读操作选择数据库"""
+    def __init__(self, shard_manager: Optional[ShardManager] = None, lag_monitor: Optional[ReplicaLagMonitor] = None):
+        # 通过 DATABASE_ROUTERS 字符串加载时不带参数，使用模块底部的全局实例
+        self._shard_manager = shard_manager
+        self.lag_monitor = lag_monitor or ReplicaLagMonitor()
+
+    @property
+    def shard_manager(self) -> ShardManager:
+        return self._shard_manager if self._shard_manager is not None else shard_manager
+
+    def _primary_for(self, model) -> str:
         table_name = model._meta.db_table
         config = self.shard_manager.shard_configs.get(table_name)
 
         if not config:
             return "default"
 
-        # 根据配置选择读数据库
         if config["type"] == "horizontal":
             # 水平分片：选择主分片
             return config["shards"][0]
@@ -276,23 +673,30 @@ class ShardRouter:
 
         return "default"
 
-    def db_for_write(self, model, **hints):
-        """为写操作选择数据库"""
-        table_name = model._meta.db_table
-        config = self.shard_manager.shard_configs.get(table_name)
+    def replicas_for(self, primary: str) -> List[str]:
+        return list(getattr(settings, "DATABASE_REPLICAS", {}).get(primary, []))
 
-        if not config:
-            return "default"
+    def db_for_read(self, model, **hints):
+        """为读操作选择数据库"""
+        primary = self._primary_for(model)
+        replicas = self.replicas_for(primary)
+        if not replicas or primary_pinned() or connections[primary].in_atomic_block:
+            return primary
 
-        # 写操作通常路由到主分片
-        if config["type"] == "horizontal":
-            return config["shards"][0]
-        elif config["type"] == "vertical":
-            for table_pattern, shards in config["shards"].items():
-                if table_name.startswith(table_pattern):
-                    return shards[0]
+        healthy = self.lag_monitor.healthy_replicas(replicas)
+        if not healthy:
+            logger.debug(f"{primary} 的副本均不可用或延迟过高，读取主库")
+            return primary
+        return random.choice(healthy)
 
-        return "default"
+    def db_for_write(self, model, **hints):
+        """为写操作选择数据库"""
+        primary = self._primary_for(model)
+        if self.replicas_for(primary):
+            # 写入后的一段时间内读主库，避免读不到自己刚写入的数据
+            _routing_state.wrote = True
+            pin_primary()
+        return primary
 
     def allow_relation(self, obj1, obj2, **hints):
         """允许关系查询"""
@@ -301,7 +705,35 @@ class ShardRouter:
 
     def allow_migrate(self, db, app_label, model_name=None, **hints):
         """允许迁移"""
-        return True
+        # 副本由主库复制而来，不单独迁移
+        return not any(db in replicas for replicas in getattr(settings, "DATABASE_REPLICAS", {}).values())
+
+
+class PrimaryPinningMiddleware:
+    """读写分离的跨请求粘滞：请求中发生写入时下发 Cookie，粘滞窗口内同一客户端的后续请求读主库"""
+
+    COOKIE_NAME = "db_primary_until"
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        try:
+            pinned_until = float(request.COOKIES.get(self.COOKIE_NAME, 0))
+        except ValueError:
+            pinned_until = 0.0
+        reset_routing_state(pinned_until)
+
+        try:
+            response = self.get_response(request)
+            if wrote_in_request():
+                seconds = getattr(settings, "PRIMARY_STICKY_SECONDS", 10)
+                response.set_cookie(
+                    self.COOKIE_NAME, f"{time.time() + seconds:.3f}", max_age=seconds, httponly=True, samesite="Lax"
+                )
+            return response
+        finally:
+            reset_routing_state()
 
 
 class ShardReplication:
@@ -354,6 +786,19 @@ class ShardReplication:
             except Exception as e:
                 logger.error(f"分片同步失败: {primary_shard} -> {shard}: {e}")
 
+    def _sync_shard_data(self, table_name: str, source_shard: str, target_shard: str):
+        """把源分片上目标分片缺少的行按主键分批补齐"""
+        from django.apps import apps
+
+        from .shard_rebalancer import copy_rows
+
+        model = next((m for m in apps.get_models() if m._meta.db_table == table_name), None)
+        if model is None:
+            logger.warning(f"分片表 {table_name} 没有对应的模型，跳过同步")
+            return
+        copied = copy_rows(model, source_shard, target_shard)
+        logger.info(f"分片同步 {table_name}: {source_shard} -> {target_shard} 复制 {copied} 行")
+
 
 class ShardMonitoring:
     """分片监控"""
@@ -462,6 +907,31 @@ shard_monitoring = ShardMonitoring(shard_manager)
 
 
 # 工具函数
+def track_shard_deletions(manager: Optional[ShardManager] = None, model_list: Optional[Iterable] = None):
+    """删除按哈希分片的行之前记录墓碑（只在迁移期间写入），返回取消注册的函数
+
+    在删除之前记录：迁移复制插入后再查一次墓碑，与并发删除交错时也不会留下已删除的行
+    """
+    from django.apps import apps
+    from django.db.models.signals import pre_delete
+
+    manager = manager or shard_manager
+    tables = set(manager._hash_tables())
+    tracked = [model for model in (model_list or apps.get_models()) if model._meta.db_table in tables]
+
+    def record(sender, instance, **kwargs):
+        manager.record_deletion(sender._meta.db_table, instance.pk)
+
+    for model in tracked:
+        pre_delete.connect(record, sender=model, weak=False, dispatch_uid=f"shard_tombstone:{id(manager)}:{model._meta.label}")
+
+    def untrack():
+        for model in tracked:
+            pre_delete.disconnect(sender=model, dispatch_uid=f"shard_tombstone:{id(manager)}:{model._meta.label}")
+
+    return untrack
+
+
 def get_shard_for_user(user_id: int) -> str:
     """获取用户数据的分片"""
     return shard_manager.get_shard_for_key("user_data", user_id)
@@ -0,0 +1,126 @@
+"""
+日记流式导出
+用 queryset.iterator(chunk_size=...) 分批读取（PostgreSQL 上是服务端游标，SQLite 上是 fetchmany），
+逐行编码成 JSON Lines / CSV / JSON 数组，攒够 BUFFER_SIZE 字节交给 StreamingHttpResponse；
+需要压缩时用 zlib 流式写出 gzip。任何时刻内存中只有一批数据库行和一个输出缓冲，与导出总量无关
+"""
+
+import csv
+import json
+import zlib
+from itertools import chain
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+
+FORMATS = {
+    "jsonl": ("application/x-ndjson", "jsonl"),
+    "csv": ("text/csv; charset=utf-8", "csv"),
+    "json": ("application/json", "json"),
+}
+CHUNK_SIZE = 2000
+BUFFER_SIZE = 64 * 1024
+
+# 导出的日记字段（mood_note 字段已删除）
+DIARY_FIELDS = ("date", "title", "content", "mood", "tags")
+
+
+class _Echo:
+    """csv.writer 的伪文件对象，writerow 直接返回编码后的一行"""
+
+    def write(self, value):
+        return value
+
+
+def _dumps(value) -> str:
+    return json.dumps(value, ensure_ascii=False, cls=DjangoJSONEncoder)
+
+
+def diary_rows(queryset, fields: Sequence[str] = DIARY_FIELDS, chunk_size: int = CHUNK_SIZE) -> Iterator[dict]:
+    for row in queryset.values_list(*fields).iterator(chunk_size=chunk_size):
+        yield dict(zip(fields, row))
+
+
+def jsonl_lines(rows: Iterable[dict]) -> Iterator[str]:
+    for row in rows:
+        yield _dumps(row) + "\n"
+
+
+def csv_lines(rows: Iterable[Sequence]) -> Iterator[str]:
+    """逐行编码 CSV，表头作为第一行传入"""
+    writer = csv.writer(_Echo())
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def json_array_lines(
+    rows: Iterable[dict], key: str = "entries", info: Optional[Callable[[int], dict]] = None
+) -> Iterator[str]:
+    """{"entries": [...], "export_info": {...}}，export_info 在最后写出，可以带上实际导出的条数"""
+    count = 0
+    yield "{" + _dumps(key) + ": ["
+    for row in rows:
+        yield ("," if count else "") + "\n" + _dumps(row)
+        count += 1
+    yield "\n]"
+    if info is not None:
+        yield ', "export_info": ' + _dumps(info(count))
+    yield "}\n"
+
+
+def encode(lines: Iterable[str], buffer_size: int = BUFFER_SIZE) -> Iterator[bytes]:
+    """把逐行输出合并成约 buffer_size 字节的块，避免每行一次写 socket"""
+    buffer: List[str] = []
+    size = 0
+    for line in lines:
+        buffer.append(line)
+        size += len(line)
+        if size >= buffer_size:
+            yield "".join(buffer).encode("utf-8")
+            buffer = []
+            size = 0
+    if buffer:
+        yield "".join(buffer).encode("utf-8")
+
+
+def gzip_chunks(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def streaming_export(lines: Iterable[str], fmt: str, filename: str, compress: bool = False) -> StreamingHttpResponse:
+    """把逐行输出包装成下载响应，filename 不带扩展名"""
+    content_type, extension = FORMATS[fmt]
+    chunks = encode(lines)
+    filename = f"{filename}.{extension}"
+    if compress:
+        chunks = gzip_chunks(chunks)
+        content_type = "application/gzip"
+        filename += ".gz"
+    response = StreamingHttpResponse(chunks, content_type=content_type)
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
+def export_diary(queryset, fmt: str, filename: str, compress: bool = False, info: Optional[Callable[[int], dict]] = None):
+    """按 fmt 导出日记，字段为 DIARY_FIELDS"""
+    if fmt not in FORMATS:
+        raise ValueError(f"不支持的导出格式: {fmt}")
+    rows = diary_rows(queryset.order_by("-date", "-id"))
+    if fmt == "jsonl":
+        lines = jsonl_lines(rows)
+    elif fmt == "csv":
+        lines = csv_lines(
+            chain(
+                [DIARY_FIELDS],
+                ([", ".join(map(str, value)) if isinstance(value, list) else value for value in row.values()] for row in rows),
+            )
+        )
+    else:
+        lines = json_array_lines(rows, info=info)
+    return streaming_export(lines, fmt, filename, compress)
@@ -0,0 +1,277 @@
+"""
+日记全文检索
+PostgreSQL：search_vector 生成列（标题/正文/语音文字分权重）上的 GIN 索引，以及同样文本上的 pg_trgm GIN 索引，
+    分词检索和子串检索（中文没有空格分词，ILIKE 走三元组索引）都不再全表扫描
+SQLite：FTS5 外部内容表（trigram 分词），由触发器随日记增删改同步，测试环境首次检索时自动创建
+
+结果按相关度排序（没有检索词时按日期），带高亮摘要，使用 (分数/日期, id) 游标做 keyset 分页
+"""
+
+import base64
+import html
+import json
+import re
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.db import connections, models
+from django.db.models.expressions import RawSQL
+
+from ..models import LifeDiaryEntry
+
+TABLE = LifeDiaryEntry._meta.db_table
+FTS_TABLE = f"{TABLE}_fts"
+SEARCH_FIELDS = ("title", "content", "voice_text")
+# trigram 分词最短可检索长度，更短的词在当前用户的日记中按子串过滤
+MIN_INDEXED_TERM = 3
+MAX_TERMS = 8
+SNIPPET_CHARS = 80
+
+# PostgreSQL 全文检索与三元组索引使用同一个文档表达式
+PG_DOCUMENT = "(coalesce(title, '') || ' ' || coalesce(content, '') || ' ' || coalesce(voice_text, ''))"
+PG_INSTALL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    f"""ALTER TABLE {TABLE} ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(title, '')), 'A')
+        || setweight(to_tsvector('simple', coalesce(content, '')), 'B')
+        || setweight(to_tsvector('simple', coalesce(voice_text, '')), 'C')
+    ) STORED""",
+    f"CREATE INDEX IF NOT EXISTS {TABLE}_search_gin ON {TABLE} USING gin (search_vector)",
+    f"CREATE INDEX IF NOT EXISTS {TABLE}_search_trgm ON {TABLE} USING gin ({PG_DOCUMENT} gin_trgm_ops)",
+]
+PG_UNINSTALL = [
+    f"DROP INDEX IF EXISTS {TABLE}_search_trgm",
+    f"DROP INDEX IF EXISTS {TABLE}_search_gin",
+    f"ALTER TABLE {TABLE} DROP COLUMN IF EXISTS search_vector",
+]
+
+_COLUMNS = ", ".join(SEARCH_FIELDS)
+_NEW = ", ".join(f"new.{f}" for f in SEARCH_FIELDS)
+_OLD = ", ".join(f"old.{f}" for f in SEARCH_FIELDS)
+SQLITE_INSTALL = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5({_COLUMNS}, content='{TABLE}', content_rowid='id', "
+    "tokenize='trigram')",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON {TABLE} BEGIN "
+    f"INSERT INTO {FTS_TABLE}(rowid, {_COLUMNS}) VALUES (new.id, {_NEW}); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON {TABLE} BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_COLUMNS}) VALUES ('delete', old.id, {_OLD}); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE ON {TABLE} BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_COLUMNS}) VALUES ('delete', old.id, {_OLD}); "
+    f"INSERT INTO {FTS_TABLE}(rowid, {_COLUMNS}) VALUES (new.id, {_NEW}); END",
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+]
+SQLITE_UNINSTALL = [f"DROP TRIGGER IF EXISTS {FTS_TABLE}_{suffix}" for suffix in ("ai", "ad", "au")] + [
+    f"DROP TABLE IF EXISTS {FTS_TABLE}"
+]
+
+
+def install_search_index(connection):
+    """创建检索列/索引（PostgreSQL）或 FTS5 表及同步触发器（SQLite），可重复执行"""
+    statements = {"postgresql": PG_INSTALL, "sqlite": SQLITE_INSTALL}.get(connection.vendor, [])
+    with connection.cursor() as cursor:
+        for sql in statements:
+            cursor.execute(sql)
+
+
+def uninstall_search_index(connection):
+    statements = {"postgresql": PG_UNINSTALL, "sqlite": SQLITE_UNINSTALL}.get(connection.vendor, [])
+    with connection.cursor() as cursor:
+        for sql in statements:
+            cursor.execute(sql)
+
+
+def split_terms(query: str) -> List[str]:
+    """按空白拆分检索词，去重并限制数量"""
+    return list(dict.fromkeys(term for term in query.split() if term))[:MAX_TERMS]
+
+
+def highlight(text: str, terms: List[str], width: int = SNIPPET_CHARS) -> str:
+    """截取第一个命中词附近的文本，转义后用 <mark> 标出所有命中词"""
+    text = text or ""
+    if not terms:
+        return html.escape(text[:width] + ("..." if len(text) > width else ""))
+    pattern = re.compile("|".join(re.escape(term) for term in sorted(terms, key=len, reverse=True)), re.IGNORECASE)
+    match = pattern.search(text)
+    start = max(0, match.start() - width // 4) if match else 0
+    end = min(len(text), start + width)
+    fragment = text[start:end]
+
+    parts = []
+    position = 0
+    for hit in pattern.finditer(fragment):
+        parts.append(html.escape(fragment[position : hit.start()]))
+        parts.append(f"<mark>{html.escape(hit.group())}</mark>")
+        position = hit.end()
+    parts.append(html.escape(fragment[position:]))
+    return ("..." if start else "") + "".join(parts) + ("..." if end < len(text) else "")
+
+
+def encode_cursor(kind: str, value: Any, pk: int) -> str:
+    payload = json.dumps([kind, value.isoformat() if isinstance(value, date) else value, pk])
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[str, Any, int]:
+    try:
+        kind, value, pk = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if kind == "date":
+            value = date.fromisoformat(value)
+        return kind, value, int(pk)
+    except (ValueError, TypeError) as e:
+        raise ValueError("无效的分页游标") from e
+
+
+class DiarySearch:
+    """用户日记检索"""
+
+    def __init__(self, using: str = "default"):
+        self.using = using
+        self.connection = connections[using]
+
+    def _ensure_index(self) -> bool:
+        """SQLite 上 FTS 表不存在时创建；事务中不建表（回滚虚拟表的创建会使连接无法再建立保存点），返回索引是否可用"""
+        if self.connection.vendor != "sqlite":
+            return True
+        with self.connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE])
+            if cursor.fetchone():
+                return True
+        if self.connection.in_atomic_block:
+            return False
+        install_search_index(self.connection)
+        return True
+
+    def _filtered(self, user, mood: str, date_from: Optional[date], date_to: Optional[date], tags: List[str]):
+        queryset = LifeDiaryEntry.objects.using(self.using).filter(user=user)
+        if mood:
+            queryset = queryset.filter(mood=mood)
+        if date_from:
+            queryset = queryset.filter(date__gte=date_from)
+        if date_to:
+            queryset = queryset.filter(date__lte=date_to)
+        for tag in tags:
+            if self.connection.vendor == "sqlite":
+                queryset = queryset.filter(
+                    RawSQL(
+                        f"EXISTS (SELECT 1 FROM json_each({TABLE}.tags) WHERE json_each.value = %s)",
+                        [tag],
+                        output_field=models.BooleanField(),
+                    )
+                )
+            else:
+                queryset = queryset.filter(tags__contains=[tag])
+        return queryset
+
+    def _ranked_ids(self, queryset, terms: List[str], after: Optional[Tuple[float, int]], limit: int):
+        """按相关度取一页 (id, 分数)；没有可用索引的检索词时返回 None"""
+        vendor = self.connection.vendor
+        if vendor == "sqlite":
+            indexed = [term for term in terms if len(term) >= MIN_INDEXED_TERM] if self._ensure_index() else []
+            for term in terms:
+                if term not in indexed:
+                    condition = models.Q()
+                    for field in SEARCH_FIELDS:
+                        condition |= models.Q(**{f"{field}__icontains": term})
+                    queryset = queryset.filter(condition)
+            if not indexed:
+                return None, queryset
+            ids_sql, ids_params = queryset.values("id").query.sql_with_params()
+            match = " AND ".join('"' + term.replace('"', '""') + '"' for term in indexed)
+            inner = (
+                f"SELECT rowid AS id, -bm25({FTS_TABLE}, 10.0, 1.0, 2.0) AS score FROM {FTS_TABLE} "
+                f"WHERE {FTS_TABLE} MATCH %s AND +rowid IN ({ids_sql})"
+            )
+            params = [match, *ids_params]
+        elif vendor == "postgresql":
+            ids_sql, ids_params = queryset.values("id").query.sql_with_params()
+            conditions = " AND ".join(
+                f"(e.search_vector @@ plainto_tsquery('simple', %s) OR {PG_DOCUMENT} ILIKE %s)" for _ in terms
+            )
+            inner = (
+                f"SELECT e.id, ts_rank_cd(e.search_vector, plainto_tsquery('simple', %s)) "
+                f"+ word_similarity(%s, {PG_DOCUMENT}) AS score FROM {TABLE} e "
+                f"WHERE e.id IN ({ids_sql}) AND {conditions}"
+            )
+            phrase = " ".join(terms)
+            params = [phrase, phrase, *ids_params]
+            for term in terms:
+                escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+                params += [term, f"%{escaped}%"]
+        else:
+            for term in terms:
+                condition = models.Q()
+                for field in SEARCH_FIELDS:
+                    condition |= models.Q(**{f"{field}__icontains": term})
+                queryset = queryset.filter(condition)
+            return None, queryset
+
+        sql = f"SELECT id, score FROM ({inner}) ranked"
+        if after is not None:
+            sql += " WHERE score < %s OR (score = %s AND id < %s)"
+            params += [after[0], after[0], after[1]]
+        sql += " ORDER BY score DESC, id DESC LIMIT %s"
+        params.append(limit)
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.fetchall(), queryset
+
+    @staticmethod
+    def _snippet_source(entry, terms: List[str]) -> str:
+        """摘要取自第一个命中检索词的字段"""
+        texts = [entry.content, entry.voice_text, entry.title]
+        lowered = [term.lower() for term in terms]
+        for text in texts:
+            if text and any(term in text.lower() for term in lowered):
+                return text
+        return next((text for text in texts if text), "")
+
+    def search(
+        self,
+        user,
+        query: str = "",
+        mood: str = "",
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        tags: Optional[List[str]] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """检索日记，返回 {"results": [...], "next_cursor": str | None}"""
+        terms = split_terms(query)
+        after = decode_cursor(cursor) if cursor else None
+        queryset = self._filtered(user, mood, date_from, date_to, tags or [])
+
+        ranked = None
+        if terms:
+            score_after = (after[1], after[2]) if after and after[0] == "score" else None
+            ranked, queryset = self._ranked_ids(queryset, terms, score_after, limit + 1)
+
+        if ranked is not None:
+            entries = queryset.model.objects.using(self.using).in_bulk([pk for pk, _ in ranked[:limit]])
+            page = [(entries[pk], score) for pk, score in ranked[:limit] if pk in entries]
+            has_more = len(ranked) > limit
+            next_cursor = encode_cursor("score", page[-1][1], page[-1][0].pk) if has_more and page else None
+        else:
+            if after and after[0] == "date":
+                queryset = queryset.filter(models.Q(date__lt=after[1]) | models.Q(date=after[1], id__lt=after[2]))
+            rows = list(queryset.order_by("-date", "-id")[: limit + 1])
+            page = [(entry, None) for entry in rows[:limit]]
+            has_more = len(rows) > limit
+            next_cursor = encode_cursor("date", page[-1][0].date, page[-1][0].pk) if has_more and page else None
+
+        results = []
+        for entry, score in page:
+            results.append(
+                {
+                    "id": entry.id,
+                    "date": entry.date.strftime("%Y-%m-%d"),
+                    "title": entry.title,
+                    "content": entry.content[:200] + "..." if len(entry.content) > 200 else entry.content,
+                    "snippet": highlight(self._snippet_source(entry, terms), terms),
+                    "mood": entry.mood,
+                    "tags": entry.tags,
+                    "score": round(score, 6) if score is not None else None,
+                    "created_at": entry.created_at.strftime("%Y-%m-%d %H:%M"),
+                }
+            )
+        return {"results": results, "next_cursor": next_cursor}
@@ -0,0 +1,113 @@
+"""
+健身社区帖子流
+一页帖子只用一条查询：发帖用户和关联打卡用 select_related 连表取出，点赞数、评论数用关联子查询计数，
+当前用户是否点赞用 Exists 子查询；按 (created_at, id) 倒序做 keyset 分页，翻页代价与页码无关
+"""
+
+import base64
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from django.db.models import Count, Exists, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from ..models import FitnessCommunityComment, FitnessCommunityLike, FitnessCommunityPost
+
+MAX_PAGE_SIZE = 50
+
+
+def encode_cursor(created_at: datetime, pk: int) -> str:
+    return base64.urlsafe_b64encode(f"{created_at.isoformat()}|{pk}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        created_at, pk = base64.urlsafe_b64decode(cursor.encode()).decode().rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(pk)
+    except (ValueError, TypeError) as e:
+        raise ValueError("无效的分页游标") from e
+
+
+def _count_subquery(queryset) -> Coalesce:
+    """按帖子计数的关联子查询，避免多个 COUNT 连表相乘"""
+    counts = queryset.filter(post=OuterRef("pk")).order_by().values("post").annotate(count=Count("pk")).values("count")
+    return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+
+def feed_queryset(viewer, post_type: str = "", user_id: Optional[str] = None):
+    posts = FitnessCommunityPost.objects.filter(is_deleted=False, is_public=True)
+    if post_type:
+        posts = posts.filter(post_type=post_type)
+    if user_id:
+        posts = posts.filter(user_id=user_id)
+    return posts.select_related("user", "related_checkin").annotate(
+        like_total=_count_subquery(FitnessCommunityLike.objects.filter(comment__isnull=True)),
+        comment_total=_count_subquery(FitnessCommunityComment.objects.filter(is_deleted=False)),
+        is_liked=Exists(FitnessCommunityLike.objects.filter(post=OuterRef("pk"), user=viewer, comment__isnull=True)),
+    )
+
+
+def serialize_post(post) -> Dict[str, Any]:
+    checkin = post.related_checkin
+    return {
+        "id": post.id,
+        "post_type": post.post_type,
+        "title": post.title,
+        "content": post.content,
+        "tags": post.tags,
+        "training_parts": post.training_parts,
+        "difficulty_level": post.difficulty_level,
+        "likes_count": post.like_total,
+        "comments_count": post.comment_total,
+        "shares_count": post.shares_count,
+        "views_count": post.views_count,
+        "is_liked": post.is_liked,
+        "is_featured": post.is_featured,
+        "created_at": post.created_at.isoformat(),
+        "user": {
+            "id": post.user.id,
+            "username": post.user.username,
+            # FitnessUserProfile 没有昵称和头像字段
+            "display_name": post.user.username,
+            "avatar": None,
+        },
+        "related_checkin": (
+            {
+                "id": checkin.id,
+                "date": checkin.date.isoformat(),
+                # 打卡详情表已在 0072 中删除
+                "workout_type": None,
+                "duration": None,
+                "training_parts": [],
+                "feeling_rating": None,
+            }
+            if checkin
+            else None
+        ),
+    }
+
+
+def community_feed(
+    viewer, post_type: str = "", user_id: Optional[str] = None, page_size: int = 10, cursor: Optional[str] = None
+) -> Dict[str, Any]:
+    """一页帖子，返回 {"posts", "page_size", "next_cursor", "has_next"}，首页（没有游标）额外返回 total_count"""
+    page_size = min(max(page_size, 1), MAX_PAGE_SIZE)
+    posts = feed_queryset(viewer, post_type, user_id)
+    result = {"page_size": page_size}
+    if cursor:
+        created_at, pk = decode_cursor(cursor)
+        posts = posts.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk))
+    else:
+        result["total_count"] = posts.count()
+
+    rows = list(posts.order_by("-created_at", "-id")[: page_size + 1])
+    page = rows[:page_size]
+    has_next = len(rows) > page_size
+    result.update(
+        {
+            "posts": [serialize_post(post) for post in page],
+            "has_next": has_next,
+            "next_cursor": encode_cursor(page[-1].created_at, page[-1].id) if has_next else None,
+        }
+    )
+    return result
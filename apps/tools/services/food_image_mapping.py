@@ -3,6 +3,8 @@
 提供准确的食品名称到图片路径的映射，支持图像识别功能
 """
 
+from .food_image_resolver import FoodImageResolver
+
 # 基础图片路径
 LOCAL_FOOD_IMAGE_BASE = "/static/img/food/"
 
@@ -130,6 +132,9 @@ FALLBACK_IMAGES = {
     "default": f"{LOCAL_FOOD_IMAGE_BASE}default-food.svg",
 }
 
+# 导入时对映射表建立一次索引；映射表在运行时不会修改
+food_image_resolver = FoodImageResolver(ACCURATE_FOOD_IMAGES, FALLBACK_IMAGES)
+
 # 图像识别关键词映射
 IMAGE_RECOGNITION_KEYWORDS = {
     # 早餐关键词
@@ -185,25 +190,14 @@ def get_food_image(food_name, cuisine=None, meal_type=None):
     Returns:
         str: 图片路径
     """
-    # 精确匹配
-    if food_name in ACCURATE_FOOD_IMAGES:
-        return ACCURATE_FOOD_IMAGES[food_name]
-
-    # 模糊匹配
-    for key, value in ACCURATE_FOOD_IMAGES.items():
-        if food_name in key or key in food_name:
-            return value
+    return food_image_resolver.resolve(food_name, cuisine, meal_type)
 
-    # 按菜系匹配
-    if cuisine and cuisine in FALLBACK_IMAGES:
-        return FALLBACK_IMAGES[cuisine]
 
-    # 按餐点类型匹配
-    if meal_type and meal_type in FALLBACK_IMAGES:
-        return FALLBACK_IMAGES[meal_type]
-
-    # 默认图片
-    return FALLBACK_IMAGES["default"]
+def resolve_food_images(food_names, cuisine=None, meal_type=None):
+    """
+    批量获取食品图片路径，结果与 food_names 一一对应
+    """
+    return food_image_resolver.resolve_many(food_names, cuisine, meal_type)
 
 
 def recognize_food_from_image(image_path, confidence_threshold=0.7):
@@ -0,0 +1,214 @@
+"""
+食品名称到图片的索引化解析
+映射表在构建时一次性建立索引，单次解析的开销只与食品名称长度有关，与映射表大小无关：
+
+1. 原始名称：精确匹配；否则取"映射键是名称的子串"或"名称是映射键的子串"中在映射表里最靠前的键，
+   与原来逐个键扫描的结果一致。前者用 Aho–Corasick 自动机扫描一遍名称，后者查映射键全部子串的哈希索引
+2. 规范化名称（NFKC、小写、去掉空白/标点和括号里的备注；装有 pypinyin 时加入映射键的拼音）：
+   精确匹配；名称中包含的最长映射键；包含名称的最靠前映射键
+3. 字符二元组倒排索引：Dice 相似度不低于 NGRAM_MIN_SIMILARITY 的最相似键（容忍错别字）
+
+解析结果按名称做 LRU 缓存
+"""
+
+import re
+import unicodedata
+from collections import defaultdict
+from functools import lru_cache
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+try:
+    from pypinyin import lazy_pinyin
+
+    PYPINYIN_AVAILABLE = True
+except ImportError:
+    PYPINYIN_AVAILABLE = False
+
+NGRAM_MIN_SIMILARITY = 0.5
+# 出现在过多映射键里的二元组区分度低，跳过，使单次查询的开销有上限
+NGRAM_MAX_POSTINGS = 64
+LRU_SIZE = 4096
+
+_BRACKETED = re.compile(r"[（(【\[].*?[）)】\]]")
+
+
+def normalize(name: str) -> str:
+    """NFKC 全角转半角、小写，去掉括号内的备注、空白和标点符号"""
+    name = _BRACKETED.sub("", unicodedata.normalize("NFKC", name).casefold())
+    return "".join(ch for ch in name if unicodedata.category(ch)[0] not in "PSZC")
+
+
+def _bigrams(text: str) -> List[str]:
+    return [text[i : i + 2] for i in range(len(text) - 1)]
+
+
+class _Automaton:
+    """Aho–Corasick 自动机：一次扫描找出文本中出现的映射键
+
+    每个状态记录经过失败链可达的所有输出中，映射表里最靠前的键和最长的键
+    """
+
+    def __init__(self, words: Iterable[Tuple[str, int]]):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail = [0]
+        self.first: List[Optional[int]] = [None]
+        self.longest: List[Optional[Tuple[int, int]]] = [None]
+        for word, order in words:
+            if not word:
+                continue
+            state = 0
+            for ch in word:
+                nxt = self.goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[state][ch] = nxt
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.first.append(None)
+                    self.longest.append(None)
+                state = nxt
+            self.first[state] = _min(self.first[state], order)
+            self.longest[state] = _max(self.longest[state], (len(word), -order))
+
+        queue = list(self.goto[0].values())
+        for state in queue:
+            for ch, nxt in self.goto[state].items():
+                fallback = self.fail[state]
+                while fallback and ch not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[nxt] = self.goto[fallback].get(ch, 0)
+                self.first[nxt] = _min(self.first[nxt], self.first[self.fail[nxt]])
+                self.longest[nxt] = _max(self.longest[nxt], self.longest[self.fail[nxt]])
+                queue.append(nxt)
+
+    def scan(self, text: str) -> Tuple[Optional[int], Optional[int]]:
+        """返回 (文本中出现的最靠前的键, 文本中出现的最长的键)，都是映射表中的序号"""
+        state = 0
+        first, longest = None, None
+        for ch in text:
+            while state and ch not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(ch, 0)
+            first = _min(first, self.first[state])
+            longest = _max(longest, self.longest[state])
+        return first, (-longest[1] if longest else None)
+
+
+def _min(a: Optional[int], b: Optional[int]) -> Optional[int]:
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return min(a, b)
+
+
+def _max(a, b):
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return max(a, b)
+
+
+def _substring_index(words: Iterable[Tuple[str, int]]) -> Dict[str, int]:
+    """映射键的每个子串 -> 包含它的最靠前的键"""
+    index: Dict[str, int] = {}
+    for word, order in words:
+        for start in range(len(word) + 1):
+            for end in range(start, len(word) + 1):
+                sub = word[start:end]
+                if index.get(sub, order) >= order:
+                    index[sub] = order
+    return index
+
+
+class FoodImageResolver:
+    def __init__(self, images: Mapping[str, str], fallbacks: Mapping[str, str], lru_size: int = LRU_SIZE):
+        self.keys = list(images)
+        self.images = dict(images)
+        self.fallbacks = dict(fallbacks)
+
+        raw = [(key, order) for order, key in enumerate(self.keys)]
+        self._raw_automaton = _Automaton(raw)
+        self._raw_substrings = _substring_index(raw)
+
+        # 规范化后的别名（含拼音）指向同一个键
+        aliases = []
+        for order, key in enumerate(self.keys):
+            aliases.append((normalize(key), order))
+            if PYPINYIN_AVAILABLE:
+                aliases.append((normalize("".join(lazy_pinyin(key))), order))
+        aliases = [(alias, order) for alias, order in aliases if alias]
+        self._normalized: Dict[str, int] = {}
+        for alias, order in aliases:
+            self._normalized.setdefault(alias, order)
+        self._normalized_automaton = _Automaton(aliases)
+        self._normalized_substrings = _substring_index(aliases)
+
+        postings = defaultdict(set)
+        self._gram_counts: Dict[int, int] = defaultdict(int)
+        for alias, order in aliases:
+            grams = set(_bigrams(alias))
+            self._gram_counts[order] = max(self._gram_counts[order], len(grams))
+            for gram in grams:
+                postings[gram].add(order)
+        self._postings = {gram: sorted(orders) for gram, orders in postings.items() if len(orders) <= NGRAM_MAX_POSTINGS}
+
+        self.match = lru_cache(maxsize=lru_size)(self._match)
+
+    def _match(self, name: str) -> Optional[str]:
+        """返回匹配到的映射键，没有匹配时为 None"""
+        if name in self.images:
+            return name
+        first, _ = self._raw_automaton.scan(name)
+        order = _min(first, self._raw_substrings.get(name))
+        if order is not None:
+            return self.keys[order]
+
+        normalized = normalize(name)
+        if not normalized:
+            return None
+        if normalized in self._normalized:
+            return self.keys[self._normalized[normalized]]
+        _, longest = self._normalized_automaton.scan(normalized)
+        if longest is not None:
+            return self.keys[longest]
+        containing = self._normalized_substrings.get(normalized)
+        if containing is not None:
+            return self.keys[containing]
+        return self._ngram_match(normalized)
+
+    def _ngram_match(self, normalized: str) -> Optional[str]:
+        grams = set(_bigrams(normalized))
+        hits: Dict[int, int] = defaultdict(int)
+        for gram in grams:
+            for order in self._postings.get(gram, ()):
+                hits[order] += 1
+        best, best_score = None, NGRAM_MIN_SIMILARITY
+        for order, common in sorted(hits.items()):
+            score = 2 * common / (len(grams) + self._gram_counts[order])
+            if score > best_score or (score == best_score and best is None):
+                best, best_score = order, score
+        return self.keys[best] if best is not None else None
+
+    def resolve(self, food_name: str, cuisine: Optional[str] = None, meal_type: Optional[str] = None) -> str:
+        key = self.match(food_name)
+        if key is not None:
+            return self.images[key]
+        if cuisine and cuisine in self.fallbacks:
+            return self.fallbacks[cuisine]
+        if meal_type and meal_type in self.fallbacks:
+            return self.fallbacks[meal_type]
+        return self.fallbacks["default"]
+
+    def resolve_many(
+        self, food_names: Iterable[str], cuisine: Optional[str] = None, meal_type: Optional[str] = None
+    ) -> List[str]:
+        """批量解析，结果与 food_names 一一对应；重复的名称只解析一次"""
+        resolved: Dict[str, str] = {}
+        results = []
+        for name in food_names:
+            if name not in resolved:
+                resolved[name] = self.resolve(name, cuisine, meal_type)
+            results.append(resolved[name])
+        return results
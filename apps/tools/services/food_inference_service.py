@@ -0,0 +1,337 @@
+"""
+食品图像推理服务
+进程内只加载一次模型；并发请求在短时间窗口内合并为一个批次做一次前向计算；
+按图片内容哈希缓存特征向量；与预先计算好的食品库特征矩阵做一次向量化余弦相似度top-k匹配
+"""
+
+import hashlib
+import io
+import logging
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from django.conf import settings
+
+import numpy as np
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+INPUT_SIZE = 224
+RESIZE_SIZE = 256
+IMAGENET_MEAN = np.array([0.485, 0.456, 0.406], dtype=np.float32).reshape(3, 1, 1)
+IMAGENET_STD = np.array([0.229, 0.224, 0.225], dtype=np.float32).reshape(3, 1, 1)
+
+# 编码器：输入 (N, 3, 224, 224) float32，输出 (N, D) 特征
+Encoder = Callable[[np.ndarray], np.ndarray]
+
+
+def preprocess_image(image: Image.Image) -> np.ndarray:
+    """与 torchvision Resize(256) + CenterCrop(224) + Normalize 等价的预处理，返回 (3, 224, 224)"""
+    image = image.convert("RGB")
+    width, height = image.size
+    scale = RESIZE_SIZE / min(width, height)
+    image = image.resize((max(RESIZE_SIZE, round(width * scale)), max(RESIZE_SIZE, round(height * scale))), Image.BILINEAR)
+    width, height = image.size
+    left, top = (width - INPUT_SIZE) // 2, (height - INPUT_SIZE) // 2
+    image = image.crop((left, top, left + INPUT_SIZE, top + INPUT_SIZE))
+    array = np.asarray(image, dtype=np.float32).transpose(2, 0, 1) / 255.0
+    return (array - IMAGENET_MEAN) / IMAGENET_STD
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-12)
+
+
+# ---------------------------------------------------------------------------
+# 模型后端
+# ---------------------------------------------------------------------------
+
+
+def build_torch_encoder(backend: str = "torchscript", num_threads: Optional[int] = None) -> Encoder:
+    """ResNet50去掉分类层，输出全局平均池化后的2048维特征
+
+    backend=torchscript 时对模型做trace + freeze，CPU上可融合Conv/BN
+    """
+    import torch
+    from torchvision.models import ResNet50_Weights, resnet50
+
+    if num_threads:
+        torch.set_num_threads(num_threads)
+
+    model = resnet50(weights=ResNet50_Weights.IMAGENET1K_V2)
+    model.fc = torch.nn.Identity()
+    model.eval()
+
+    if backend == "torchscript":
+        with torch.inference_mode():
+            example = torch.zeros(1, 3, INPUT_SIZE, INPUT_SIZE)
+            model = torch.jit.optimize_for_inference(torch.jit.freeze(torch.jit.trace(model, example)))
+
+    def encode(batch: np.ndarray) -> np.ndarray:
+        with torch.inference_mode():
+            return model(torch.from_numpy(np.ascontiguousarray(batch))).numpy()
+
+    return encode
+
+
+def build_onnx_encoder(model_path: str, num_threads: Optional[int] = None) -> Encoder:
+    """加载导出（可量化）的ONNX特征模型，输入名取模型第一个输入"""
+    import onnxruntime
+
+    options = onnxruntime.SessionOptions()
+    if num_threads:
+        options.intra_op_num_threads = num_threads
+    session = onnxruntime.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+    input_name = session.get_inputs()[0].name
+
+    def encode(batch: np.ndarray) -> np.ndarray:
+        output = session.run(None, {input_name: batch.astype(np.float32)})[0]
+        return output.reshape(output.shape[0], -1)
+
+    return encode
+
+
+def build_default_encoder() -> Encoder:
+    backend = getattr(settings, "FOOD_RECOGNITION_BACKEND", "torchscript")
+    num_threads = getattr(settings, "FOOD_RECOGNITION_THREADS", None)
+    onnx_path = getattr(settings, "FOOD_RECOGNITION_ONNX_PATH", "")
+    if backend == "onnx" and onnx_path and os.path.exists(onnx_path):
+        logger.info(f"食品识别使用ONNX模型: {onnx_path}")
+        return build_onnx_encoder(onnx_path, num_threads)
+    logger.info(f"食品识别使用PyTorch模型, 后端: {backend}")
+    return build_torch_encoder("eager" if backend == "onnx" else backend, num_threads)
+
+
+# ---------------------------------------------------------------------------
+# 食品库特征索引
+# ---------------------------------------------------------------------------
+
+
+class FoodEmbeddingIndex:
+    """食品库特征矩阵：每张参考图片一行
+
+    多个食品共用同一张参考图片时特征完全相同，无法区分，合并为一个标签（映射表中最靠前的食品），
+    其余食品记在 aliases 中
+    """
+
+    def __init__(self, names: Sequence[str], matrix: np.ndarray, aliases: Optional[Dict[str, List[str]]] = None):
+        self.names = list(names)
+        self.matrix = _normalize_rows(np.asarray(matrix, dtype=np.float32))
+        self.aliases = aliases or {}
+
+    def __len__(self):
+        return len(self.names)
+
+    def top_k(self, embeddings: np.ndarray, k: int = 5) -> List[List[Tuple[str, float]]]:
+        """对一批查询特征做余弦相似度top-k，返回每个查询的 [(食品名, 相似度)]"""
+        queries = _normalize_rows(np.atleast_2d(np.asarray(embeddings, dtype=np.float32)))
+        scores = queries @ self.matrix.T
+        k = min(k, scores.shape[1])
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        results = []
+        for row, candidates in zip(scores, top):
+            # 相似度相同时按行号排序，结果稳定
+            ordered = candidates[np.lexsort((candidates, -row[candidates]))]
+            results.append([(self.names[i], float(row[i])) for i in ordered])
+        return results
+
+
+def group_by_image(names: Sequence[str], paths: Sequence[str]) -> Tuple[List[str], List[str], Dict[str, List[str]]]:
+    """按参考图片合并食品：返回 (标签, 图片路径, 标签 -> 共用图片的其他食品)"""
+    groups: Dict[str, List[str]] = {}
+    for name, path in zip(names, paths):
+        groups.setdefault(path, []).append(name)
+    labels = [group[0] for group in groups.values()]
+    aliases = {group[0]: group[1:] for group in groups.values() if len(group) > 1}
+    return labels, list(groups), aliases
+
+
+def load_food_library() -> Tuple[List[str], List[str]]:
+    """食品库：食品名称与参考图片的静态文件路径（多个食品可能共用一张图片）"""
+    from django.contrib.staticfiles import finders
+
+    from .food_image_mapping import ACCURATE_FOOD_IMAGES, LOCAL_FOOD_IMAGE_BASE
+
+    names, paths = [], []
+    for name, url in ACCURATE_FOOD_IMAGES.items():
+        path = finders.find("img/food/" + url[len(LOCAL_FOOD_IMAGE_BASE) :])
+        if path:
+            names.append(name)
+            paths.append(path)
+    return names, paths
+
+
+# ---------------------------------------------------------------------------
+# 推理服务
+# ---------------------------------------------------------------------------
+
+
+class FoodInferenceService:
+    """进程级食品图像推理服务
+
+    - encode/recognize 可被多个请求线程并发调用，后台线程把等待中的请求合并成批次
+    - 特征按图片内容哈希做LRU缓存
+    """
+
+    def __init__(
+        self,
+        encoder: Optional[Encoder] = None,
+        max_batch_size: Optional[int] = None,
+        max_wait_ms: Optional[float] = None,
+        cache_size: int = 1024,
+        library: Optional[Tuple[Sequence[str], Sequence[str]]] = None,
+    ):
+        self._encoder = encoder
+        self.max_batch_size = max_batch_size or getattr(settings, "FOOD_RECOGNITION_MAX_BATCH", 16)
+        self.max_wait = (
+            max_wait_ms if max_wait_ms is not None else getattr(settings, "FOOD_RECOGNITION_BATCH_WAIT_MS", 10)
+        ) / 1000
+        self._library = library
+        self._index = None
+        # 生成索引时要提交推理请求（会用到 _lock），单独加锁
+        self._index_lock = threading.Lock()
+        self._requests = queue.Queue()
+        self._worker = None
+        self._lock = threading.Lock()
+        self._cache = OrderedDict()
+        self._cache_size = cache_size
+        self._cache_lock = threading.Lock()
+        self.stats = {"requests": 0, "cache_hits": 0, "batches": 0, "batched_images": 0}
+
+    # ---- 模型与索引 ----
+
+    @property
+    def encoder(self) -> Encoder:
+        if self._encoder is None:
+            with self._lock:
+                if self._encoder is None:
+                    started = time.perf_counter()
+                    self._encoder = build_default_encoder()
+                    logger.info(f"食品识别模型加载完成, 耗时 {time.perf_counter() - started:.1f}s")
+        return self._encoder
+
+    @property
+    def index(self) -> FoodEmbeddingIndex:
+        if self._index is None:
+            with self._index_lock:
+                if self._index is None:
+                    labels, paths, aliases = group_by_image(*(self._library or load_food_library()))
+                    matrix = self.encode_many([self._read(path) for path in paths], timeout=300)
+                    self._index = FoodEmbeddingIndex(labels, matrix, aliases)
+                    logger.info(
+                        f"食品库特征矩阵已生成: {len(labels)} 张参考图片, {sum(map(len, aliases.values()))} 个共用图片的食品"
+                    )
+        return self._index
+
+    @staticmethod
+    def _read(path: str) -> bytes:
+        with open(path, "rb") as fp:
+            return fp.read()
+
+    # ---- 批处理 ----
+
+    def _ensure_worker(self):
+        if self._worker is None or not self._worker.is_alive():
+            with self._lock:
+                if self._worker is None or not self._worker.is_alive():
+                    self._worker = threading.Thread(target=self._batch_loop, name="food-inference", daemon=True)
+                    self._worker.start()
+
+    def _batch_loop(self):
+        while True:
+            batch = [self._requests.get()]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._requests.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._run_batch(batch)
+
+    def _run_batch(self, batch: List[Tuple[np.ndarray, Future]]):
+        try:
+            embeddings = self.encoder(np.stack([array for array, _ in batch]))
+        except Exception as e:
+            logger.error(f"食品识别批量推理失败: {e}")
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        self.stats["batches"] += 1
+        self.stats["batched_images"] += len(batch)
+        for (_, future), embedding in zip(batch, embeddings):
+            future.set_result(embedding)
+
+    # ---- 对外接口 ----
+
+    def encode_many(self, images: Sequence[bytes], timeout: float = 30.0) -> np.ndarray:
+        """多张图片字节 -> 特征矩阵；未命中缓存的图片一起提交，由后台线程合并成批次"""
+        keys = [hashlib.sha256(data).hexdigest() for data in images]
+        embeddings, pending = [None] * len(images), []
+        with self._cache_lock:
+            self.stats["requests"] += len(images)
+            for i, key in enumerate(keys):
+                cached = self._cache.get(key)
+                if cached is not None:
+                    self._cache.move_to_end(key)
+                    self.stats["cache_hits"] += 1
+                    embeddings[i] = cached
+
+        if any(embedding is None for embedding in embeddings):
+            self._ensure_worker()
+            for i, data in enumerate(images):
+                if embeddings[i] is None:
+                    future = Future()
+                    self._requests.put((preprocess_image(Image.open(io.BytesIO(data))), future))
+                    pending.append((i, future))
+
+        for i, future in pending:
+            embeddings[i] = future.result(timeout=timeout)
+            with self._cache_lock:
+                self._cache[keys[i]] = embeddings[i]
+                self._cache.move_to_end(keys[i])
+                while len(self._cache) > self._cache_size:
+                    self._cache.popitem(last=False)
+        return np.vstack(embeddings)
+
+    def encode_bytes(self, data: bytes, timeout: float = 30.0) -> np.ndarray:
+        """图片字节 -> 特征向量，相同内容直接命中缓存"""
+        return self.encode_many([data], timeout)[0]
+
+    def recognize_bytes(self, data: bytes, top_k: int = 5) -> List[Tuple[str, float]]:
+        """识别图片，返回按相似度排序的 [(食品名, 相似度)]"""
+        index = self.index
+        return index.top_k(self.encode_bytes(data), top_k)[0]
+
+    def recognize_path(self, image_path: str, top_k: int = 5) -> List[Tuple[str, float]]:
+        return self.recognize_bytes(self._read(image_path), top_k)
+
+    def get_stats(self) -> Dict:
+        stats = dict(self.stats)
+        stats["avg_batch_size"] = round(stats["batched_images"] / stats["batches"], 2) if stats["batches"] else 0.0
+        stats["cached_embeddings"] = len(self._cache)
+        stats["model_loaded"] = self._encoder is not None
+        return stats
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_inference_service() -> FoodInferenceService:
+    """进程内唯一的推理服务实例（模型在首次识别时加载）"""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = FoodInferenceService()
+    return _service
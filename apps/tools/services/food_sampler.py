@@ -0,0 +1,218 @@
+"""
+食物随机抽样
+每种筛选组合（菜系, 餐种）的食物 id 数组在进程内缓存，首次使用时从数据库构建，菜系和餐种须是 FoodItem 的选项之一；
+共享缓存里存两个版本号：新增、删除食物或菜系/餐种改变时更新筛选版本，各进程发现变化后立即重建数组；
+只有受欢迎度改变（如用户评分）时更新权重版本，同一组合最多每 WEIGHTS_REFRESH_SECONDS 秒重建一次。
+其它字段的修改不触发重建；bulk_create / queryset.update 不发信号，批量导入后需要调用 invalidate
+
+抽样时只取数组下标：均匀抽样为 randrange，按受欢迎度加权时用 Vose 别名法（构建 O(n)，每次抽样 O(1)）；
+最近吃过的食物用拒绝采样跳过，抽中的几条食物连同绑定照片用一条查询取出
+"""
+
+import random
+import time
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.core.cache import cache
+from django.db.models import OuterRef, Subquery
+from django.db.models.signals import post_delete, post_init, post_save
+
+VERSION_KEY = "food_sampler:version"
+WEIGHTS_VERSION_KEY = "food_sampler:weights_version"
+# 只有受欢迎度变化时，同一组合的数组最多每隔这么多秒重建一次
+WEIGHTS_REFRESH_SECONDS = 60
+# 拒绝采样的尝试次数（相对于要抽取的条数），用尽后退回到在数组上过滤
+MAX_ATTEMPTS_FACTOR = 8
+# 决定食物属于哪些组合的字段；受欢迎度只影响权重
+FILTER_FIELDS = ("cuisine", "meal_types")
+WEIGHT_FIELDS = ("popularity_score",)
+
+_DEFERRED = object()
+
+# (菜系, 餐种) -> (筛选版本, 权重版本, 构建时间, 数组)
+_pools: Dict[Tuple[Optional[str], Optional[str]], Tuple[int, int, float, "FoodPool"]] = {}
+
+
+class AliasTable:
+    """Vose 别名法：按权重抽取下标"""
+
+    def __init__(self, weights: Iterable[float]):
+        weights = list(weights)
+        n = len(weights)
+        total = sum(weights)
+        self.prob = array("d", [0.0]) * n
+        self.alias = array("l", [0]) * n
+        scaled = [w * n / total for w in weights] if total > 0 else [1.0] * n
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.prob[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] -= 1.0 - scaled[less]
+            (small if scaled[more] < 1.0 else large).append(more)
+        # 浮点误差剩下的下标概率都按 1 处理
+        for i in small + large:
+            self.prob[i] = 1.0
+
+    def __len__(self):
+        return len(self.prob)
+
+    def sample(self, rng=random) -> int:
+        i = rng.randrange(len(self.prob))
+        return i if rng.random() < self.prob[i] else self.alias[i]
+
+
+class FoodPool:
+    """一种筛选组合下的食物 id 和受欢迎度权重"""
+
+    def __init__(self, ids: Iterable[int], weights: Iterable[float]):
+        self.ids = array("l", ids)
+        self._weights = array("d", weights)
+        self._alias: Optional[AliasTable] = None
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def alias(self) -> AliasTable:
+        if self._alias is None:
+            self._alias = AliasTable(self._weights)
+        return self._alias
+
+    def draw(self, weighted: bool, rng=random) -> int:
+        index = self.alias.sample(rng) if weighted else rng.randrange(len(self.ids))
+        return self.ids[index]
+
+
+def _versions() -> Tuple[int, int]:
+    found = cache.get_many([VERSION_KEY, WEIGHTS_VERSION_KEY])
+    version = found.get(VERSION_KEY)
+    if version is None:
+        version = cache.get_or_set(VERSION_KEY, time.time_ns, None)
+    return version, found.get(WEIGHTS_VERSION_KEY, 0)
+
+
+def invalidate():
+    """食物库变化后调用，所有进程下次抽样时重建"""
+    cache.set(VERSION_KEY, time.time_ns(), None)
+
+
+def invalidate_weights():
+    """只有受欢迎度变化时调用，各进程按 WEIGHTS_REFRESH_SECONDS 限频重建"""
+    cache.set(WEIGHTS_VERSION_KEY, time.time_ns(), None)
+
+
+def _is_known(cuisine: Optional[str], meal_type: Optional[str]) -> bool:
+    """只缓存已知的菜系和餐种，请求参数不能让 _pools 无限增长"""
+    from ..models import FoodItem
+
+    return (not cuisine or cuisine in dict(FoodItem.CUISINE_CHOICES)) and (
+        not meal_type or meal_type in dict(FoodItem.MEAL_TYPE_CHOICES)
+    )
+
+
+def _build(cuisine: Optional[str], meal_type: Optional[str]) -> FoodPool:
+    from ..models import FoodItem
+
+    rows = FoodItem.objects.order_by("id")
+    if cuisine:
+        rows = rows.filter(cuisine=cuisine)
+    ids, weights = [], []
+    # 餐种存在 JSON 列表里，在 Python 中判断，不依赖数据库的 JSON contains
+    for pk, meal_types, popularity in rows.values_list("id", "meal_types", "popularity_score").iterator(chunk_size=5000):
+        if meal_type and meal_type not in (meal_types or []):
+            continue
+        ids.append(pk)
+        # 受欢迎度为 0 的食物也要能被抽到
+        weights.append(max(popularity or 0.0, 0.0) + 1.0)
+    return FoodPool(ids, weights)
+
+
+def get_pool(cuisine: Optional[str] = None, meal_type: Optional[str] = None) -> FoodPool:
+    key = (cuisine or None, meal_type or None)
+    if not _is_known(*key):
+        return FoodPool((), ())
+    version, weights_version = _versions()
+    cached = _pools.get(key)
+    if (
+        cached is None
+        or cached[0] != version
+        or (cached[1] != weights_version and time.monotonic() - cached[2] >= WEIGHTS_REFRESH_SECONDS)
+    ):
+        cached = (version, weights_version, time.monotonic(), _build(*key))
+        _pools[key] = cached
+    return cached[3]
+
+
+def sample_ids(
+    cuisine: Optional[str] = None,
+    meal_type: Optional[str] = None,
+    count: int = 1,
+    exclude: Iterable[int] = (),
+    weighted: bool = False,
+    rng=random,
+) -> List[int]:
+    """抽取最多 count 个不重复的食物 id，跳过 exclude；耗时与食物库大小无关"""
+    pool = get_pool(cuisine, meal_type)
+    skip = set(exclude)
+    chosen: List[int] = []
+    attempts = count * MAX_ATTEMPTS_FACTOR if len(pool) else 0
+    while len(chosen) < count and attempts:
+        attempts -= 1
+        pk = pool.draw(weighted, rng)
+        if pk not in skip:
+            chosen.append(pk)
+            skip.add(pk)
+    if len(chosen) < count and len(pool):
+        # 可选的食物很少（大部分被排除）时，直接在剩下的 id 中抽
+        rest = [pk for pk in pool.ids if pk not in skip]
+        chosen += rng.sample(rest, min(count - len(chosen), len(rest)))
+    return chosen
+
+
+def fetch_foods(ids: List[int]) -> list:
+    """按 ids 的顺序取出食物，photo_name 注解为最近绑定的照片文件名（没有绑定时为 None）"""
+    from ..models import FoodItem, FoodPhotoBinding
+
+    photos = FoodPhotoBinding.objects.filter(food_item=OuterRef("pk")).order_by("-created_at", "-id").values("photo_name")
+    foods = FoodItem.objects.annotate(photo_name=Subquery(photos[:1])).order_by().in_bulk(ids)
+    return [foods[pk] for pk in ids if pk in foods]
+
+
+def _snapshot(instance) -> Dict:
+    # 只读 __dict__：延迟加载的字段不会因此多一次查询，保存时视为已改变
+    return {field: instance.__dict__.get(field, _DEFERRED) for field in FILTER_FIELDS + WEIGHT_FIELDS}
+
+
+def _on_food_loaded(sender, instance, **kwargs):
+    instance._sampler_snapshot = _snapshot(instance)
+
+
+def _on_food_saved(sender, instance, created=False, raw=False, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, "_sampler_snapshot", None)
+    current = instance._sampler_snapshot = _snapshot(instance)
+    if created or previous is None:
+        invalidate()
+        return
+    changed = {field for field in current if current[field] != previous[field]}
+    if changed.intersection(FILTER_FIELDS):
+        invalidate()
+    elif changed:
+        invalidate_weights()
+
+
+def _on_food_deleted(sender, **kwargs):
+    invalidate()
+
+
+def track_food_sampler():
+    from ..models import FoodItem
+
+    uid = "food_sampler"
+    post_init.connect(_on_food_loaded, sender=FoodItem, dispatch_uid=uid, weak=False)
+    post_save.connect(_on_food_saved, sender=FoodItem, dispatch_uid=uid, weak=False)
+    post_delete.connect(_on_food_deleted, sender=FoodItem, dispatch_uid=uid, weak=False)
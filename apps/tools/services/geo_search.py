@@ -0,0 +1,195 @@
+"""
+附近物品检索（不依赖 PostGIS）
+物品保存时按经纬度计算 geohash 存入带索引的列。按距离检索时：
+
+1. 选择能用不超过 MAX_CELLS 个格子覆盖检索半径包围盒的最高 geohash 精度
+2. 每个格子对应 geohash 列上的一个前缀区间（>= 前缀 AND < 前缀的后继），每个区间在 (status, geohash) 索引上做一次范围扫描，
+   只取 id 和经纬度
+3. 只对候选行计算精确的 haversine 距离，按 (距离, id) 排序并按游标取一页
+
+半径从 RADII_KM 逐级扩大，直到半径内游标之后的物品足够一页；半径内的物品一定比半径外的近，所以每一页都是精确排序。
+没有坐标的物品排在所有有坐标的物品之后，按 id 排序
+"""
+
+import base64
+import json
+from math import asin, ceil, cos, degrees, floor, radians, sin, sqrt
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.db.models import Q
+
+EARTH_RADIUS_KM = 6371.0
+GEOHASH_PRECISION = 12
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+# 逐级扩大的检索半径（公里），最后一级不限距离
+RADII_KM = (1, 2, 5, 10, 20, 40, 80, 160, 320, 640, 1280, 2560, None)
+# 覆盖包围盒时最多使用的 geohash 格子数
+MAX_CELLS = 16
+
+
+def encode_geohash(latitude: float, longitude: float, precision: int = GEOHASH_PRECISION) -> str:
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    value = 0
+    even = True
+    while len(chars) < precision:
+        interval, coordinate = (lon_range, longitude) if even else (lat_range, latitude)
+        middle = (interval[0] + interval[1]) / 2
+        value <<= 1
+        if coordinate >= middle:
+            value |= 1
+            interval[0] = middle
+        else:
+            interval[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(BASE32[value])
+            bits = 0
+            value = 0
+    return "".join(chars)
+
+
+def geohash_for(latitude, longitude) -> str:
+    """物品的 geohash，坐标缺失或无效时为空字符串"""
+    try:
+        latitude, longitude = float(latitude), float(longitude)
+    except (TypeError, ValueError):
+        return ""
+    if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+        return ""
+    return encode_geohash(latitude, longitude)
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    lat1, lon1, lat2, lon2 = map(radians, (lat1, lon1, lat2, lon2))
+    a = sin((lat2 - lat1) / 2) ** 2 + cos(lat1) * cos(lat2) * sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * asin(min(1.0, sqrt(a)))
+
+
+def cell_size(precision: int) -> Tuple[float, float]:
+    """geohash 格子的 (纬度跨度, 经度跨度)，单位为度"""
+    lon_bits = ceil(precision * 5 / 2)
+    lat_bits = precision * 5 - lon_bits
+    return 180.0 / 2**lat_bits, 360.0 / 2**lon_bits
+
+
+def covering_prefixes(latitude: float, longitude: float, radius_km: float) -> List[str]:
+    """覆盖以 (latitude, longitude) 为圆心、radius_km 为半径的包围盒的 geohash 前缀，格子数不超过 MAX_CELLS；
+    返回空列表表示需要全表
+
+    与 haversine_km 使用同一个球面：纬度跨度为圆心角 r/R；经度跨度 asin(sin(r/R) / cos(纬度)) 取包围盒
+    靠近极点一侧边缘的纬度计算，不小于圆上任一点的经度差。包围盒含极点时经度不受限，返回全表
+    """
+    angle = radius_km / EARTH_RADIUS_KM
+    d_lat = degrees(angle)
+    south, north = latitude - d_lat, latitude + d_lat
+    if south <= -90 or north >= 90:
+        return []
+    ratio = sin(angle) / cos(radians(max(abs(south), abs(north))))
+    if ratio >= 1:
+        return []
+    d_lon = degrees(asin(ratio))
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        lat_span, lon_span = cell_size(precision)
+        rows = floor((north + 90) / lat_span) - floor((south + 90) / lat_span) + 1
+        columns = floor((longitude + d_lon + 180) / lon_span) - floor((longitude - d_lon + 180) / lon_span) + 1
+        if rows * columns <= MAX_CELLS:
+            break
+    else:
+        return []
+    prefixes = set()
+    for row in range(rows):
+        lat = min(south + row * lat_span, north)
+        for column in range(columns):
+            lon = (min(longitude - d_lon + column * lon_span, longitude + d_lon) + 180.0) % 360.0 - 180.0
+            prefixes.add(encode_geohash(lat, lon, precision))
+    return sorted(prefixes)
+
+
+def _successor(prefix: str) -> Optional[str]:
+    """所有以 prefix 开头的 geohash 之后的第一个前缀；只用 geohash 字符，非 C 排序规则下比较结果也一致"""
+    while prefix:
+        position = BASE32.index(prefix[-1])
+        if position + 1 < len(BASE32):
+            return prefix[:-1] + BASE32[position + 1]
+        prefix = prefix[:-1]
+    return None
+
+
+def prefix_filters(prefixes: List[str]) -> List[Q]:
+    """每个前缀区间一个条件；排序后首尾相接的格子合并为一个区间"""
+    ranges: List[List[Optional[str]]] = []
+    for prefix in sorted(prefixes):
+        if ranges and ranges[-1][1] == prefix:
+            ranges[-1][1] = _successor(prefix)
+        else:
+            ranges.append([prefix, _successor(prefix)])
+    filters = []
+    for low, high in ranges:
+        cell = Q(geohash__gte=low)
+        if high is not None:
+            cell &= Q(geohash__lt=high)
+        filters.append(cell)
+    return filters
+
+
+def encode_cursor(distance: Optional[float], pk: int) -> str:
+    return base64.urlsafe_b64encode(json.dumps([distance, pk]).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[float], int]:
+    try:
+        distance, pk = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return (float(distance) if distance is not None else None), int(pk)
+    except (ValueError, TypeError) as e:
+        raise ValueError("无效的分页游标") from e
+
+
+def nearest(queryset, latitude: float, longitude: float, limit: int = 20, cursor: Optional[str] = None) -> Dict[str, Any]:
+    """queryset 中离 (latitude, longitude) 最近的一页物品
+
+    返回 {"items": [(物品, 距离公里数或 None), ...], "next_cursor": str | None}
+    """
+    after = decode_cursor(cursor) if cursor else None
+    page: List[Tuple[int, Optional[float]]] = []
+
+    if after is None or after[0] is not None:
+        after_distance, after_pk = after if after else (-1.0, 0)
+        located = queryset.exclude(geohash="")
+        for radius in RADII_KM:
+            if radius is not None and radius < after_distance:
+                continue
+            # 多个区间用 OR 连接时 SQLite 只按 status 走索引，所以逐个区间查询再 UNION ALL（区间互不相交）；
+            # 不再加经纬度范围条件，否则有统计信息时 SQLite 会改用 (latitude, longitude) 索引扫描整条纬度带
+            parts = [
+                located.filter(cell).values_list("id", "latitude", "longitude").order_by()
+                for cell in (prefix_filters(covering_prefixes(latitude, longitude, radius)) if radius is not None else [])
+            ] or [located.values_list("id", "latitude", "longitude").order_by()]
+            rows = parts[0].union(*parts[1:], all=True) if len(parts) > 1 else parts[0]
+            ranked = []
+            for pk, lat, lon in rows:
+                distance = haversine_km(latitude, longitude, lat, lon)
+                if (radius is None or distance <= radius) and (distance, pk) > (after_distance, after_pk):
+                    ranked.append((distance, pk))
+            if len(ranked) > limit or radius is None:
+                ranked.sort()
+                page = [(pk, distance) for distance, pk in ranked[: limit + 1]]
+                break
+
+    if len(page) <= limit:
+        # 有坐标的物品已经取完，接着按 id 返回没有坐标的物品
+        unknown = queryset.filter(geohash="")
+        if after is not None and after[0] is None:
+            unknown = unknown.filter(id__gt=after[1])
+        page += [(pk, None) for pk in unknown.order_by("id").values_list("id", flat=True)[: limit + 1 - len(page)]]
+
+    has_next = len(page) > limit
+    page = page[:limit]
+    items = queryset.in_bulk([pk for pk, _ in page])
+    return {
+        "items": [(items[pk], distance) for pk, distance in page if pk in items],
+        "next_cursor": encode_cursor(page[-1][1], page[-1][0]) if has_next else None,
+    }
@@ -0,0 +1,342 @@
+"""
+进程内指标注册表与 OpenMetrics 导出
+请求路径上只做计数器/直方图的内存累加；系统、数据库、缓存等需要调用 psutil 或查询的指标
+由后台线程按固定间隔采样写入仪表盘（Gauge），/metrics 只负责把当前值格式化为文本
+
+指标按进程独立统计，多 worker 部署时由 Prometheus 分别抓取各实例后聚合
+"""
+
+import bisect
+import logging
+import math
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+
+class _CounterChild:
+    def __init__(self):
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self._value += amount
+
+    def set_total(self, value: float):
+        """同步外部维护的累计值（如进程CPU时间），只增不减"""
+        with self._lock:
+            self._value = max(self._value, float(value))
+
+    def samples(self, name: str) -> List[Tuple[str, Tuple, float]]:
+        return [(f"{name}_total", (), self._value)]
+
+
+class _GaugeChild:
+    def __init__(self):
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def set(self, value: float):
+        self._value = float(value)
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1.0):
+        self.inc(-amount)
+
+    def samples(self, name: str) -> List[Tuple[str, Tuple, float]]:
+        return [(name, (), self._value)]
+
+
+class _HistogramChild:
+    def __init__(self, buckets: Tuple[float, ...]):
+        self._buckets = buckets
+        self._counts = [0] * (len(buckets) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self._buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    def samples(self, name: str) -> List[Tuple[str, Tuple, float]]:
+        with self._lock:
+            counts, total = list(self._counts), self._sum
+        samples, cumulative = [], 0
+        for bound, count in zip(self._buckets + (math.inf,), counts):
+            cumulative += count
+            samples.append((f"{name}_bucket", (("le", _format_value(float(bound))),), cumulative))
+        samples.append((f"{name}_count", (), cumulative))
+        samples.append((f"{name}_sum", (), total))
+        return samples
+
+
+class _Metric:
+    """带标签的指标族，labels() 返回的子指标会被缓存，热路径上只有一次字典查找"""
+
+    metric_type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (), registry=None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        (registry or REGISTRY).register(self)
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values):
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} 需要标签 {self.labelnames}")
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def render(self) -> List[str]:
+        lines = [f"# TYPE {self.name} {self.metric_type}", f"# HELP {self.name} {_escape(self.documentation)}"]
+        for key, child in sorted(list(self._children.items()), key=lambda item: item[0]):
+            for sample_name, extra, value in child.samples(self.name):
+                names = self.labelnames + tuple(label for label, _ in extra)
+                values = key + tuple(label_value for _, label_value in extra)
+                lines.append(f"{sample_name}{_format_labels(names, values)} {_format_value(value)}")
+        return lines
+
+
+class Counter(_Metric):
+    metric_type = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0):
+        self.labels().inc(amount)
+
+    def set_total(self, value: float):
+        self.labels().set_total(value)
+
+
+class Gauge(_Metric):
+    metric_type = "gauge"
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def set(self, value: float):
+        self.labels().set(value)
+
+
+class Histogram(_Metric):
+    metric_type = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets: Sequence[float] = DEFAULT_BUCKETS, registry=None):
+        self.buckets = tuple(sorted(float(bound) for bound in buckets if bound != math.inf))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float):
+        self.labels().observe(value)
+
+
+class MetricsRegistry:
+    """指标注册表，采样器（collector）由后台线程按间隔调用"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self.last_collect_at: Optional[float] = None
+
+    def register(self, metric: _Metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"指标重复注册: {metric.name}")
+            self._metrics[metric.name] = metric
+
+    def add_collector(self, collector: Callable[[], None]):
+        self._collectors.append(collector)
+        return collector
+
+    def run_collectors(self):
+        for collector in self._collectors:
+            try:
+                collector()
+            except Exception as e:
+                logger.warning(f"指标采样失败 {collector.__name__}: {e}")
+        self.last_collect_at = time.time()
+
+    def start_background_collection(self, interval: Optional[float] = None):
+        """启动后台采样线程（每个进程一个），重复调用无副作用"""
+        if not getattr(settings, "METRICS_BACKGROUND_COLLECTION", True):
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            interval = interval or getattr(settings, "METRICS_COLLECT_INTERVAL", 15)
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._collect_loop, args=(interval,), name="metrics-collector", daemon=True)
+            self._thread.start()
+
+    def _collect_loop(self, interval: float):
+        from django.db import connections
+
+        while True:
+            self.run_collectors()
+            # 采样线程持有的数据库连接不跨周期复用
+            connections.close_all()
+            time.sleep(interval)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+# 请求指标（由 PerformanceMonitoringMiddleware 通过 observe_request 更新）
+HTTP_REQUESTS = Counter("http_requests", "HTTP请求数", ["method", "status"])
+HTTP_REQUEST_DURATION = Histogram("http_request_duration_seconds", "HTTP请求耗时", ["method", "view"])
+HTTP_EXCEPTIONS = Counter("http_exceptions", "视图抛出的未处理异常数", ["view"])
+
+# 后台采样指标
+PROCESS_RESIDENT_MEMORY = Gauge("process_resident_memory_bytes", "进程常驻内存")
+# 计数器导出时加 _total 后缀: process_cpu_seconds_total
+PROCESS_CPU_SECONDS = Counter("process_cpu_seconds", "进程累计CPU时间")
+PROCESS_THREADS = Gauge("process_threads", "进程线程数")
+PROCESS_OPEN_FDS = Gauge("process_open_fds", "进程打开的文件描述符数")
+SYSTEM_CPU_PERCENT = Gauge("system_cpu_percent", "系统CPU使用率（两次采样之间）")
+SYSTEM_MEMORY_PERCENT = Gauge("system_memory_percent", "系统内存使用率")
+SYSTEM_DISK_PERCENT = Gauge("system_disk_percent", "根分区磁盘使用率")
+SYSTEM_LOAD1 = Gauge("system_load1", "1分钟平均负载")
+DB_CONNECTIONS = Gauge("db_connections", "数据库连接数")
+DB_SLOW_QUERIES = Gauge("db_slow_queries", "执行超过5秒的活动查询数")
+DB_LOCK_WAITS = Gauge("db_lock_waits", "等待锁的会话数")
+CACHE_UP = Gauge("cache_up", "缓存读写是否正常")
+CACHE_LATENCY = Gauge("cache_roundtrip_seconds", "缓存一次写入+读取的耗时")
+COLLECTOR_LAST_RUN = Gauge("metrics_collector_last_run_timestamp_seconds", "最近一次后台采样时间")
+
+_system_snapshot: Dict = {}
+
+
+@REGISTRY.add_collector
+def collect_process_metrics():
+    import psutil
+
+    process = psutil.Process()
+    with process.oneshot():
+        PROCESS_RESIDENT_MEMORY.set(process.memory_info().rss)
+        cpu = process.cpu_times()
+        PROCESS_CPU_SECONDS.set_total(cpu.user + cpu.system)
+        PROCESS_THREADS.set(process.num_threads())
+        if hasattr(process, "num_fds"):
+            PROCESS_OPEN_FDS.set(process.num_fds())
+
+
+@REGISTRY.add_collector
+def collect_system_metrics():
+    import psutil
+
+    # interval=None 返回与上次调用之间的CPU使用率，不阻塞
+    snapshot = {
+        "cpu_percent": psutil.cpu_percent(interval=None),
+        "memory_percent": psutil.virtual_memory().percent,
+        "disk_percent": psutil.disk_usage("/").percent,
+        "load_average": os.getloadavg() if hasattr(os, "getloadavg") else None,
+    }
+    SYSTEM_CPU_PERCENT.set(snapshot["cpu_percent"])
+    SYSTEM_MEMORY_PERCENT.set(snapshot["memory_percent"])
+    SYSTEM_DISK_PERCENT.set(snapshot["disk_percent"])
+    if snapshot["load_average"]:
+        SYSTEM_LOAD1.set(snapshot["load_average"][0])
+    _system_snapshot.update(snapshot, sampled_at=time.time())
+
+
+@REGISTRY.add_collector
+def collect_database_metrics():
+    from .monitoring_service import DatabaseMonitor
+
+    metrics = DatabaseMonitor.get_database_metrics()
+    DB_CONNECTIONS.set(metrics["connections"])
+    DB_SLOW_QUERIES.set(metrics["slow_queries"])
+    DB_LOCK_WAITS.set(metrics["lock_waits"])
+
+
+@REGISTRY.add_collector
+def collect_cache_metrics():
+    from django.core.cache import cache
+
+    started = time.perf_counter()
+    try:
+        cache.set("metrics_cache_probe", started, 60)
+        ok = cache.get("metrics_cache_probe") == started
+    except Exception:
+        ok = False
+    CACHE_LATENCY.set(time.perf_counter() - started)
+    CACHE_UP.set(1 if ok else 0)
+    COLLECTOR_LAST_RUN.set(time.time())
+
+
+def system_snapshot(max_age: Optional[float] = None) -> Dict:
+    """最近一次后台采样的系统指标；尚未采样或已过期时立即（非阻塞地）采样一次"""
+    max_age = max_age if max_age is not None else getattr(settings, "METRICS_COLLECT_INTERVAL", 15) * 2
+    if not _system_snapshot or time.time() - _system_snapshot["sampled_at"] > max_age:
+        collect_system_metrics()
+    return dict(_system_snapshot)
+
+
+def view_name(request) -> str:
+    """用路由名作为指标标签，避免按原始路径产生无限多的标签值"""
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "unmatched"
+    return match.view_name or match._func_path
+
+
+def observe_request(method: str, view: str, status: int, duration: float):
+    HTTP_REQUESTS.labels(method, status).inc()
+    HTTP_REQUEST_DURATION.labels(method, view).observe(duration)
@@ -0,0 +1,221 @@
+"""
+监控指标时序存储
+每个指标按 1m / 1h / 1d 三个精度各保存一个固定大小的环形缓冲区（numpy 内存映射文件），
+写入时同时累加到三个精度的当前桶，槽位按 桶起始时间 // 步长 % 槽位数 循环复用，
+文件大小固定，不需要单独清理过期数据
+
+每个槽位: [桶起始时间, 样本数, 总和, 最小值, 最大值, 最后一个值]
+"""
+
+import fcntl
+import logging
+import os
+import re
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional
+
+from django.conf import settings
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# 精度 -> (桶步长秒数, 槽位数)
+TIERS = {
+    "1m": (60, 24 * 60),  # 保留1天
+    "1h": (3600, 30 * 24),  # 保留30天
+    "1d": (86400, 400),  # 保留400天
+}
+
+FIELDS = ("start", "count", "sum", "min", "max", "last")
+_START, _COUNT, _SUM, _MIN, _MAX, _LAST = range(len(FIELDS))
+
+_METRIC_NAME = re.compile(r"^[A-Za-z0-9_.\-]{1,128}$")
+
+
+def is_valid_metric_name(name: str) -> bool:
+    """指标名会拼进文件路径，只允许字母、数字和 _ . -"""
+    return bool(_METRIC_NAME.match(name)) and ".." not in name
+
+
+def parse_window(value, default: int = 3600) -> int:
+    """把 "90"、"15m"、"24h"、"7d" 形式的时间窗口转换为秒数"""
+    if value in (None, ""):
+        return default
+    value = str(value).strip().lower()
+    units = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+    if value[-1] in units:
+        return int(float(value[:-1]) * units[value[-1]])
+    return int(float(value))
+
+
+def pick_tier(window: int) -> str:
+    """选择保留时长能覆盖时间窗口的最细精度"""
+    for tier, (step, slots) in TIERS.items():
+        if window <= step * slots:
+            return tier
+    return "1d"
+
+
+def flatten_metrics(data: Dict, prefix: str = "", depth: int = 2) -> Dict[str, float]:
+    """把嵌套的监控快照展开为 {"system.cpu_percent": 12.5, ...}，只保留数值字段"""
+    result = {}
+    for key, value in data.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, bool):
+            continue
+        if isinstance(value, (int, float)):
+            result[name] = float(value)
+        elif isinstance(value, dict) and depth > 1:
+            result.update(flatten_metrics(value, f"{name}.", depth - 1))
+        elif isinstance(value, (list, tuple)) and value and key == "load_average":
+            # 只取1分钟负载
+            result[f"{name}_1m"] = float(value[0])
+    return {name: value for name, value in result.items() if is_valid_metric_name(name)}
+
+
+def unflatten_metrics(values: Dict[str, float]) -> Dict:
+    """flatten_metrics 的逆过程：{"system.cpu_percent": 12.5} -> {"system": {"cpu_percent": 12.5}}"""
+    result: Dict = {}
+    for name, value in values.items():
+        *parents, leaf = name.split(".")
+        node = result
+        for part in parents:
+            node = node.setdefault(part, {})
+        node[leaf] = value
+    return result
+
+
+class MetricsTimeSeriesStore:
+    """基于环形缓冲区的指标时序存储，多进程通过文件锁串行写入"""
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = str(
+            directory or getattr(settings, "METRICS_TIMESERIES_DIR", os.path.join(settings.BASE_DIR, "data", "metrics"))
+        )
+
+    def _path(self, metric: str, tier: str) -> str:
+        if not is_valid_metric_name(metric):
+            raise ValueError(f"非法指标名: {metric}")
+        return os.path.join(self.directory, f"{metric}.{tier}.npy")
+
+    @contextmanager
+    def _locked(self):
+        os.makedirs(self.directory, exist_ok=True)
+        with open(os.path.join(self.directory, ".lock"), "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _open(self, metric: str, tier: str, create: bool = False) -> Optional[np.ndarray]:
+        path = self._path(metric, tier)
+        if not os.path.exists(path):
+            if not create:
+                return None
+            buffer = np.lib.format.open_memmap(path, mode="w+", dtype=np.float64, shape=(TIERS[tier][1], len(FIELDS)))
+            buffer[:, _START] = -1
+            return buffer
+        return np.load(path, mmap_mode="r+" if create else "r")
+
+    def append(self, metric: str, value: float, timestamp: Optional[float] = None):
+        self.append_many({metric: value}, timestamp)
+
+    def append_many(self, values: Dict[str, float], timestamp: Optional[float] = None):
+        """写入一批同一时刻的指标值"""
+        timestamp = time.time() if timestamp is None else timestamp
+        with self._locked():
+            for metric, value in values.items():
+                if not is_valid_metric_name(metric):
+                    logger.warning(f"忽略非法指标名: {metric}")
+                    continue
+                for tier, (step, slots) in TIERS.items():
+                    buffer = self._open(metric, tier, create=True)
+                    start = timestamp // step * step
+                    row = buffer[int(start // step) % slots]
+                    if row[_START] != start:
+                        # 槽位属于上一轮的旧桶，重置
+                        row[:] = (start, 0, 0.0, value, value, value)
+                    row[_COUNT] += 1
+                    row[_SUM] += value
+                    row[_MIN] = min(row[_MIN], value)
+                    row[_MAX] = max(row[_MAX], value)
+                    row[_LAST] = value
+                    buffer.flush()
+
+    def _rows(self, metric: str, tier: str, window: int, end: Optional[float]) -> np.ndarray:
+        if tier not in TIERS:
+            raise ValueError(f"未知的精度: {tier}")
+        buffer = self._open(metric, tier)
+        if buffer is None:
+            return np.empty((0, len(FIELDS)))
+        end = time.time() if end is None else end
+        # 取与 (end - window, end] 有重叠的桶
+        starts = buffer[:, _START]
+        rows = buffer[(starts > end - window - TIERS[tier][0]) & (starts <= end) & (buffer[:, _COUNT] > 0)]
+        return rows[np.argsort(rows[:, _START])]
+
+    def series(self, metric: str, window: int = 3600, tier: Optional[str] = None, end: Optional[float] = None) -> Dict:
+        """返回时间窗口内的序列，每个点为一个桶的聚合值"""
+        tier = tier or pick_tier(window)
+        rows = self._rows(metric, tier, window, end)
+        return {
+            "metric": metric,
+            "tier": tier,
+            "step": TIERS[tier][0],
+            "points": [
+                {
+                    "timestamp": int(row[_START]),
+                    "avg": row[_SUM] / row[_COUNT],
+                    "min": row[_MIN],
+                    "max": row[_MAX],
+                    "count": int(row[_COUNT]),
+                }
+                for row in rows.tolist()
+            ],
+        }
+
+    def rollup(self, metric: str, window: int = 3600, tier: Optional[str] = None, end: Optional[float] = None) -> Dict:
+        """时间窗口内的汇总: 样本数、平均值、最小值、最大值、最新值"""
+        rows = self._rows(metric, tier or pick_tier(window), window, end)
+        if not len(rows):
+            return {"metric": metric, "count": 0, "avg": None, "min": None, "max": None, "last": None}
+        count = rows[:, _COUNT].sum()
+        return {
+            "metric": metric,
+            "count": int(count),
+            "avg": float(rows[:, _SUM].sum() / count),
+            "min": float(rows[:, _MIN].min()),
+            "max": float(rows[:, _MAX].max()),
+            "last": float(rows[-1, _LAST]),
+        }
+
+    def latest(self, metrics: Optional[Iterable[str]] = None) -> Dict[str, Dict]:
+        """各指标最近一次写入的值和时间（取自1m精度）"""
+        result = {}
+        for metric in metrics or self.metrics():
+            buffer = self._open(metric, "1m")
+            if buffer is None:
+                continue
+            row = buffer[int(np.argmax(buffer[:, _START]))]
+            if row[_COUNT] > 0:
+                result[metric] = {"value": float(row[_LAST]), "timestamp": int(row[_START])}
+        return result
+
+    def metrics(self) -> List[str]:
+        if not os.path.isdir(self.directory):
+            return []
+        suffix = ".1m.npy"
+        return sorted(name[: -len(suffix)] for name in os.listdir(self.directory) if name.endswith(suffix))
+
+
+_store = None
+
+
+def get_metrics_store() -> MetricsTimeSeriesStore:
+    global _store
+    if _store is None:
+        _store = MetricsTimeSeriesStore()
+    return _store
@@ -7,7 +7,6 @@
 
 import json
 import logging
-import os
 import time
 from datetime import datetime, timedelta
 from typing import Any, Dict
@@ -20,10 +19,11 @@ from django.http import HttpRequest
 from django.template.loader import render_to_string
 from django.utils import timezone
 
-import psutil
-
 logger = logging.getLogger(__name__)
 
+# 最近一次监控快照，不过期
+LAST_SNAPSHOT_KEY = "monitoring_data:last"
+
 
 class PerformanceMonitor:
     """性能监控器"""
@@ -129,11 +129,15 @@ class SystemMonitor:
     @staticmethod
     def get_system_metrics():
         """获取系统指标"""
+        from .metrics_registry import system_snapshot
+
+        # 使用后台采样的值，避免在请求中阻塞1秒测量CPU
+        snapshot = system_snapshot()
         return {
-            "cpu_percent": psutil.cpu_percent(interval=1),
-            "memory_percent": psutil.virtual_memory().percent,
-            "disk_percent": psutil.disk_usage("/").percent,
-            "load_average": os.getloadavg() if hasattr(os, "getloadavg") else None,
+            "cpu_percent": snapshot["cpu_percent"],
+            "memory_percent": snapshot["memory_percent"],
+            "disk_percent": snapshot["disk_percent"],
+            "load_average": snapshot["load_average"],
             "timestamp": timezone.now(),
         }
 
@@ -307,23 +311,33 @@ class PerformanceMonitoringMiddleware:
     """性能监控中间件"""
 
     def __init__(self, get_response):
+        from .metrics_registry import REGISTRY
+
         self.get_response = get_response
         self.monitor = PerformanceMonitor()
+        REGISTRY.start_background_collection()
 
     def __call__(self, request):
+        from .metrics_registry import HTTP_EXCEPTIONS, observe_request, view_name
+
         # 开始监控
+        started = time.perf_counter()
         self.monitor.start_monitoring(request)
 
         try:
             response = self.get_response(request)
-            # 结束监控
-            self.monitor.end_monitoring(response)
-            return response
         except Exception as e:
             # 记录异常
+            HTTP_EXCEPTIONS.labels(view_name(request)).inc()
+            observe_request(request.method, view_name(request), 500, time.perf_counter() - started)
             self.monitor.end_monitoring(exception=e)
             raise
 
+        # 结束监控
+        observe_request(request.method, view_name(request), response.status_code, time.perf_counter() - started)
+        self.monitor.end_monitoring(response)
+        return response
+
 
 class HealthCheckService:
     """健康检查服务"""
@@ -413,10 +427,16 @@ def collect_monitoring_data() -> Dict[str, Any]:
 
         data["cleanup"] = get_cleanup_stats()
 
-        # 存储到缓存中
+        # 最新快照存到缓存中（另存一份不过期的副本，快照过期时返回），数值指标追加到时序存储供趋势图使用
         cache.set("monitoring_data", data, timeout=3600)
+        cache.set(LAST_SNAPSHOT_KEY, data, timeout=None)
 
-        return {"status": "success", "data_points": len(data), "timestamp": datetime.now()}
+        from .metrics_timeseries import flatten_metrics, get_metrics_store
+
+        metrics = flatten_metrics(data)
+        get_metrics_store().append_many(metrics)
+
+        return {"status": "success", "data_points": len(data), "metrics": len(metrics), "timestamp": datetime.now()}
 
     except Exception as e:
         logger.error(f"收集监控数据失败: {e}")
@@ -424,15 +444,22 @@ def collect_monitoring_data() -> Dict[str, Any]:
 
 
 def get_monitoring_data() -> Dict[str, Any]:
-    """获取监控数据"""
+    """获取监控数据
+
+    快照过期时不在请求中重新收集（耗时秒级，由定时任务刷新）：返回最近一次的快照，
+    没有时用时序存储中各指标的最新值还原为相同结构，两种情况都带 stale=True
+    """
     try:
         data = cache.get("monitoring_data")
         if data:
             return data
-        else:
-            # 如果没有缓存数据，重新收集
-            collect_monitoring_data()
-            return cache.get("monitoring_data", {})
+        data = cache.get(LAST_SNAPSHOT_KEY)
+        if not data:
+            from .metrics_timeseries import get_metrics_store, unflatten_metrics
+
+            latest = get_metrics_store().latest()
+            data = unflatten_metrics({name: point["value"] for name, point in latest.items()})
+        return {**data, "stale": True}
     except Exception as e:
         logger.error(f"获取监控数据失败: {e}")
         return {"error": str(e)}
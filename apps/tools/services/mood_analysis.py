@@ -0,0 +1,192 @@
+"""
+日记心情分析
+每篇日记的心情、分值和标题同步到按 (用户, 日期) 唯一的 DiaryMoodDay 窄表，由 post_save 信号增量维护
+（删除随外键级联）；bulk_create / queryset.update 不发信号，需要调用 rebuild_mood_days 重建
+
+分析只读取时间范围内的汇总行：心情分布和积极/消极天数用分组聚合，按周统计用 TruncWeek，
+相邻两天心情是否变化用窗口函数；时间线、趋势和按日历日计算的 7 天滚动平均取自同一次按日期排序的查询
+"""
+
+from collections import deque
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+
+from django.db.models import Avg, Count, F, Min, Q, Window
+from django.db.models.functions import Lag, TruncWeek
+from django.db.models.signals import post_save
+from django.utils import timezone
+
+# 心情权重（正数表示积极，负数表示消极）
+MOOD_WEIGHTS = {
+    "happy": 3,
+    "excited": 2,
+    "content": 1,
+    "neutral": 0,
+    "worried": -1,
+    "sad": -2,
+    "angry": -3,
+    "anxious": -2,
+    "stressed": -2,
+    "calm": 1,
+    "grateful": 2,
+    "inspired": 2,
+    "confident": 2,
+    "tired": -1,
+    "frustrated": -2,
+}
+POSITIVE_MOODS = ["happy", "excited", "content", "calm", "grateful", "inspired", "confident"]
+NEGATIVE_MOODS = ["sad", "angry", "anxious", "stressed", "frustrated"]
+NEUTRAL_MOODS = ["neutral", "worried", "tired"]
+
+MAX_DAYS = 365
+TREND_WINDOW = 14
+ROLLING_DAYS = 7
+
+
+def mood_day_values(entry) -> Dict:
+    return {
+        "user_id": entry.user_id,
+        "date": entry.date,
+        "mood": entry.mood,
+        "score": MOOD_WEIGHTS.get(entry.mood),
+        "title": entry.title,
+    }
+
+
+def _on_entry_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    from apps.tools.models import DiaryMoodDay
+
+    DiaryMoodDay.objects.update_or_create(entry_id=instance.pk, defaults=mood_day_values(instance))
+
+
+def track_mood_days():
+    from apps.tools.models import LifeDiaryEntry
+
+    post_save.connect(_on_entry_saved, sender=LifeDiaryEntry, dispatch_uid="mood_analysis:mood_day", weak=False)
+
+
+def rebuild_mood_days(user=None, batch_size: int = 1000) -> int:
+    """按日记重建汇总行，返回行数"""
+    from apps.tools.models import DiaryMoodDay, LifeDiaryEntry
+
+    entries = LifeDiaryEntry.objects.only("id", "user_id", "date", "mood", "title").order_by("id")
+    days = DiaryMoodDay.objects.all()
+    if user is not None:
+        entries = entries.filter(user=user)
+        days = days.filter(user=user)
+    days.delete()
+
+    total = 0
+    batch = []
+    for entry in entries.iterator(chunk_size=batch_size):
+        batch.append(DiaryMoodDay(entry_id=entry.pk, **mood_day_values(entry)))
+        if len(batch) >= batch_size:
+            DiaryMoodDay.objects.bulk_create(batch)
+            total += len(batch)
+            batch = []
+    DiaryMoodDay.objects.bulk_create(batch)
+    return total + len(batch)
+
+
+def _trend(scores) -> str:
+    """最近 14 天的加权平均与前后两半的变化判断趋势；scores 中 None 表示心情没有权重"""
+    if len(scores) < 5:
+        return "stable"
+    recent = scores[-TREND_WINDOW:]
+    weighted = [score for score in recent if score is not None]
+    if not weighted:
+        return "stable"
+    average = sum(weighted) / len(weighted)
+
+    if len(recent) >= 8:
+        first_half = recent[: len(recent) // 2]
+        second_half = recent[len(recent) // 2 :]
+        first_avg = sum(score or 0 for score in first_half) / len(first_half)
+        second_avg = sum(score or 0 for score in second_half) / len(second_half)
+        if second_avg > first_avg + 0.5:
+            return "improving"
+        if second_avg < first_avg - 0.5:
+            return "declining"
+
+    if average > 0.5:
+        return "improving"
+    if average < -0.5:
+        return "declining"
+    return "stable"
+
+
+def _rolling_average(rows) -> List[Dict]:
+    """每条记录当天及之前 6 个日历日内（缺记的日子不计入）有权重的分值的平均；rows 为按日期排序的 (日期, 分值)"""
+    window = deque()
+    total = 0
+    averages = []
+    for day, score in rows:
+        if score is not None:
+            window.append((day, score))
+            total += score
+        while window and window[0][0] <= day - timedelta(days=ROLLING_DAYS):
+            total -= window.popleft()[1]
+        averages.append({"date": day.strftime("%Y-%m-%d"), "score": round(total / len(window), 2) if window else None})
+    return averages
+
+
+def mood_analysis(user, days: int = 30, today: Optional[date] = None) -> Dict:
+    """最近 days 天的心情分析"""
+    from apps.tools.models import DiaryMoodDay
+
+    days = min(days, MAX_DAYS)
+    today = today or timezone.now().date()
+    rows = DiaryMoodDay.objects.filter(user=user, date__gte=today - timedelta(days=days))
+
+    timeline_rows = list(
+        rows.annotate(
+            previous_mood=Window(Lag("mood"), order_by=F("date").asc()),
+        )
+        .order_by("date")
+        .values_list("date", "mood", "title", "score", "previous_mood")
+    )
+    # 按首次出现的日期排序，与逐行累加的结果顺序一致（最常见心情并列时取先出现的）
+    distribution = {
+        row["mood"]: row["count"]
+        for row in rows.values("mood").annotate(count=Count("id"), first_date=Min("date")).order_by("first_date")
+    }
+    totals = rows.aggregate(
+        positive_days=Count("id", filter=Q(mood__in=POSITIVE_MOODS)),
+        negative_days=Count("id", filter=Q(mood__in=NEGATIVE_MOODS)),
+        neutral_days=Count("id", filter=Q(mood__in=NEUTRAL_MOODS)),
+    )
+    weekly = [
+        {
+            "week": row["week"].strftime("%Y-%m-%d"),
+            "entries": row["entries"],
+            "average_score": round(row["average_score"], 2) if row["average_score"] is not None else None,
+        }
+        for row in rows.annotate(week=TruncWeek("date"))
+        .values("week")
+        .annotate(entries=Count("id"), average_score=Avg("score"))
+        .order_by("week")
+    ]
+
+    timeline = [{"date": day.strftime("%Y-%m-%d"), "mood": mood, "title": title} for day, mood, title, *_ in timeline_rows]
+    count = len(timeline)
+    stats = {
+        "total_entries": count,
+        "analysis_period": f"最近{days}天",
+        "mood_distribution": distribution,
+        "mood_timeline": timeline,
+        "mood_trend": _trend([row[3] for row in timeline_rows]),
+        "most_common_mood": max(distribution.items(), key=lambda x: x[1])[0] if distribution else "neutral",
+        "trend_confidence": "high" if count >= 10 else "medium" if count >= 5 else "low",
+        **totals,
+        "weekly": weekly,
+        "rolling_average": _rolling_average((row[0], row[3]) for row in timeline_rows),
+    }
+
+    if count >= 7:
+        changes = sum(1 for row in timeline_rows if row[4] is not None and row[4] != row[1])
+        stats["stability"] = "stable" if changes <= count * 0.3 else "volatile" if changes >= count * 0.7 else "moderate"
+    else:
+        stats["stability"] = "insufficient_data"
+    return stats
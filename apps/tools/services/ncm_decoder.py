@@ -0,0 +1,195 @@
+"""
+网易云音乐NCM文件解码
+文件结构: 魔数 | 密钥块 | 元数据块 | CRC与封面 | RC4加密的音频数据
+
+音频部分的RC4密钥流每256字节循环一次，因此按固定大小分块读取，
+用numpy对整块做一次异或后直接写入输出文件，不在内存中保留整首歌曲
+"""
+
+import base64
+import json
+import logging
+import struct
+from typing import BinaryIO, Dict, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+NCM_MAGIC = b"CTENFDAM"
+CORE_KEY = b"hzHRAmso5kInbaxW"
+META_KEY = b"#14ljk_!\\]&0U<'("
+KEY_PREFIX = b"neteasecloudmusic"
+META_PREFIX = b"163 key(Don't modify):"
+
+# 每次读取的字节数；decrypt_stream 按已解密的总字节数偏移密钥流，分块大小不需要是256的整数倍
+CHUNK_SIZE = 1024 * 1024
+
+
+class NCMFormatError(ValueError):
+    """文件不是有效的NCM格式"""
+
+
+def _aes_ecb_decrypt(key: bytes, data: bytes) -> bytes:
+    from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+
+    if len(data) % 16:
+        raise NCMFormatError("加密数据长度不是16的倍数")
+    decryptor = Cipher(algorithms.AES(key), modes.ECB()).decryptor()
+    data = decryptor.update(data) + decryptor.finalize()
+    # 移除PKCS7填充
+    padding = data[-1] if data else 0
+    return data[:-padding] if 0 < padding <= 16 else data
+
+
+def _xor_bytes(data: bytes, value: int) -> bytes:
+    return np.bitwise_xor(np.frombuffer(data, dtype=np.uint8), value).tobytes()
+
+
+def build_key_stream(rc4_key: bytes) -> np.ndarray:
+    """RC4密钥调度后生成256字节的循环密钥流，第n个音频字节使用 stream[n % 256]"""
+    if not rc4_key:
+        raise NCMFormatError("密钥数据为空，无法进行解密")
+    box = list(range(256))
+    j = 0
+    for i in range(256):
+        j = (j + box[i] + rc4_key[i % len(rc4_key)]) & 0xFF
+        box[i], box[j] = box[j], box[i]
+    # NCM变种的PRGA不交换S盒，且从下标1开始
+    stream = [box[(box[i] + box[(i + box[i]) & 0xFF]) & 0xFF] for i in range(256)]
+    return np.roll(np.array(stream, dtype=np.uint8), -1)
+
+
+def detect_audio_format(head: bytes) -> Optional[str]:
+    """根据解密后音频的文件头判断格式"""
+    if head.startswith(b"ID3") or head[:2] in (b"\xff\xfb", b"\xff\xfa", b"\xff\xf3", b"\xff\xf2"):
+        return "mp3"
+    if head.startswith(b"fLaC"):
+        return "flac"
+    if head.startswith(b"RIFF") and head[8:12] == b"WAVE":
+        return "wav"
+    if head[4:8] == b"ftyp":
+        return "m4a"
+    return None
+
+
+def _detect_image_format(data: bytes) -> str:
+    return "png" if data.startswith(b"\x89PNG") else "jpeg"
+
+
+class NCMHeader:
+    """NCM文件头解析结果，audio_offset 为加密音频数据的起始位置"""
+
+    def __init__(self, key_stream: np.ndarray, metadata: Dict, album_cover: Optional[Dict], audio_offset: int):
+        self.key_stream = key_stream
+        self.metadata = metadata
+        self.album_cover = album_cover
+        self.audio_offset = audio_offset
+
+
+def _read_exact(fp: BinaryIO, size: int) -> bytes:
+    data = fp.read(size)
+    if len(data) != size:
+        raise NCMFormatError("NCM文件不完整")
+    return data
+
+
+def _read_uint32(fp: BinaryIO) -> int:
+    return struct.unpack("<I", _read_exact(fp, 4))[0]
+
+
+def _parse_metadata(data: bytes) -> Dict:
+    """元数据: 异或0x63 -> 去掉前缀 -> base64 -> AES解密 -> 去掉 "music:" -> JSON"""
+    try:
+        data = _xor_bytes(data, 0x63)
+        if data.startswith(META_PREFIX):
+            data = data[len(META_PREFIX) :]
+        data = _aes_ecb_decrypt(META_KEY, base64.b64decode(data))
+        meta = json.loads(data[data.index(b":") + 1 :].decode("utf-8"))
+    except Exception as e:
+        logger.warning(f"NCM元数据解密失败: {e}")
+        return {}
+
+    artists = meta.get("artist") or []
+    return {
+        "title": meta.get("musicName", ""),
+        "artist": artists[0][0] if artists and isinstance(artists[0], list) else (artists[0] if artists else ""),
+        "album": meta.get("album", ""),
+        "duration": meta.get("duration", 0) / 1000,  # 转换为秒
+        "format": meta.get("format", ""),
+    }
+
+
+def read_header(fp: BinaryIO) -> NCMHeader:
+    """解析NCM文件头，返回后 fp 位于加密音频数据的起始位置"""
+    if fp.read(8) != NCM_MAGIC:
+        raise NCMFormatError("不是有效的NCM文件")
+    fp.seek(2, 1)
+
+    key_data = _xor_bytes(_read_exact(fp, _read_uint32(fp)), 0x64)
+    key_data = _aes_ecb_decrypt(CORE_KEY, key_data)
+    key_stream = build_key_stream(key_data[len(KEY_PREFIX) :])
+
+    meta_length = _read_uint32(fp)
+    metadata = _parse_metadata(_read_exact(fp, meta_length)) if meta_length else {}
+
+    # CRC32(4字节) + 保留(1字节)
+    fp.seek(5, 1)
+    cover_space = _read_uint32(fp)
+    cover_size = _read_uint32(fp)
+    album_cover = None
+    if cover_size:
+        cover = _read_exact(fp, cover_size)
+        album_cover = {"data": cover, "format": _detect_image_format(cover), "size": cover_size}
+    fp.seek(max(cover_space - cover_size, 0), 1)
+
+    return NCMHeader(key_stream, metadata, album_cover, fp.tell())
+
+
+def decrypt_stream(src: BinaryIO, dst: BinaryIO, key_stream: np.ndarray, chunk_size: int = CHUNK_SIZE) -> int:
+    """从 src 当前位置起分块解密音频并写入 dst，返回写入的字节数"""
+    # 起始偏移最大255，铺到至少 chunk_size + 256 字节，任意偏移、任意分块大小都能取出连续的密钥
+    keys = np.tile(key_stream, -(-(chunk_size + 256) // 256))
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    array = np.frombuffer(buffer, dtype=np.uint8)
+    total = 0
+    while True:
+        size = src.readinto(buffer)
+        if not size:
+            break
+        offset = total & 0xFF
+        np.bitwise_xor(array[:size], keys[offset : offset + size], out=array[:size])
+        dst.write(view[:size])
+        total += size
+    return total
+
+
+def read_ncm_info(ncm_path: str) -> Dict:
+    """只解析文件头，返回元数据和专辑封面（不解密音频）"""
+    with open(ncm_path, "rb") as fp:
+        header = read_header(fp)
+    return {"metadata": header.metadata, "album_cover": header.album_cover}
+
+
+def decrypt_ncm(ncm_path: str, output_path: str, chunk_size: int = CHUNK_SIZE) -> Dict:
+    """把NCM文件中的音频流式解密到 output_path
+
+    返回 {"output_path", "size", "format", "metadata", "album_cover"}，
+    format 根据解密后的文件头识别，无法识别时取元数据中的格式
+    """
+    with open(ncm_path, "rb") as src, open(output_path, "wb") as dst:
+        header = read_header(src)
+        size = decrypt_stream(src, dst, header.key_stream, chunk_size)
+
+    with open(output_path, "rb") as fp:
+        audio_format = detect_audio_format(fp.read(16)) or header.metadata.get("format") or "mp3"
+
+    logger.info(f"NCM解密完成: {ncm_path} -> {output_path} ({size} bytes, {audio_format})")
+    return {
+        "output_path": output_path,
+        "size": size,
+        "format": audio_format,
+        "metadata": header.metadata,
+        "album_cover": header.album_cover,
+    }
@@ -0,0 +1,221 @@
+"""
+PDF转换结果缓存
+以（输入内容sha256 + 转换类型 + 参数）为键，将转换结果保存在媒体存储中，
+重复转换直接返回已有文件；按最近访问时间（LRU）和总大小淘汰旧结果
+"""
+
+import hashlib
+import json
+import logging
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files import File
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db.models import Count, F, Sum
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+STORAGE_DIR = "converted"
+STATS_CACHE_PREFIX = "pdf_conversion_cache_stats"
+
+# 转换结果类型 -> 输出文件后缀
+OUTPUT_SUFFIXES = {
+    "pdf_to_word": ".docx",
+    "word_to_pdf": ".pdf",
+    "pdf_to_images": "_images.zip",
+    "images_to_pdf": ".pdf",
+    "text_to_pdf": ".pdf",
+    "pdf_to_text": ".txt",
+}
+
+
+def compute_input_hash(file_obj, conversion_type: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """计算输入内容哈希（内容 + 转换类型 + 参数），作为转换结果的缓存键"""
+    digest = hashlib.sha256()
+    if hasattr(file_obj, "chunks"):
+        for chunk in file_obj.chunks():
+            digest.update(chunk)
+    else:
+        digest.update(file_obj)
+    digest.update(conversion_type.encode("utf-8"))
+    digest.update(json.dumps(params or {}, sort_keys=True).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class ConversionResultCache:
+    """转换结果缓存，索引存数据库（多进程共享），文件存媒体存储"""
+
+    def __init__(self, max_bytes: Optional[int] = None, max_entries: Optional[int] = None):
+        self._max_bytes = max_bytes
+        self._max_entries = max_entries
+
+    @property
+    def max_bytes(self) -> int:
+        if self._max_bytes is not None:
+            return self._max_bytes
+        return getattr(settings, "PDF_CONVERSION_CACHE_MAX_BYTES", 2 * 1024 * 1024 * 1024)
+
+    @property
+    def max_entries(self) -> int:
+        if self._max_entries is not None:
+            return self._max_entries
+        return getattr(settings, "PDF_CONVERSION_CACHE_MAX_ENTRIES", 5000)
+
+    @staticmethod
+    def output_filename(cache_key: str, file_type: str) -> str:
+        return f"{cache_key[:32]}_{file_type}{OUTPUT_SUFFIXES.get(file_type, '')}"
+
+    @staticmethod
+    def _as_result(entry) -> Dict[str, Any]:
+        return {
+            "filename": entry.output_filename,
+            "download_url": f"/tools/api/pdf-converter/download/{entry.output_filename}/",
+            "page_count": entry.page_count,
+            "file_size": entry.file_size,
+        }
+
+    # ---- 查询 ----
+
+    def get(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """查找已有转换结果，命中时刷新最近访问时间；结果文件丢失的条目视为未命中"""
+        from apps.tools.models.legacy_models import PDFConversionCacheEntry
+
+        try:
+            entry = PDFConversionCacheEntry.objects.filter(cache_key=cache_key).first()
+            if entry is not None and not default_storage.exists(f"{STORAGE_DIR}/{entry.output_filename}"):
+                logger.warning(f"转换缓存文件已丢失，移除条目: {entry.output_filename}")
+                entry.delete()
+                entry = None
+
+            if entry is None:
+                self._incr("misses")
+                return None
+
+            PDFConversionCacheEntry.objects.filter(pk=entry.pk).update(
+                hit_count=F("hit_count") + 1, last_accessed_at=timezone.now()
+            )
+        except Exception as e:
+            # 缓存不可用时退化为正常转换
+            logger.error(f"查询转换缓存失败: {cache_key[:16]}, 错误: {e}")
+            return None
+
+        self._incr("hits")
+        return self._as_result(entry)
+
+    # ---- 写入 ----
+
+    def put_file(self, cache_key: str, conversion_type: str, file_type: str, source_path: str, page_count: int = 0):
+        """将转换输出文件保存到存储并登记缓存条目，返回与get相同格式的结果"""
+        filename = self.output_filename(cache_key, file_type)
+        storage_path = f"{STORAGE_DIR}/{filename}"
+        if not default_storage.exists(storage_path):
+            with open(source_path, "rb") as fp:
+                default_storage.save(storage_path, File(fp))
+        return self._register(cache_key, conversion_type, filename, page_count)
+
+    def put_content(self, cache_key: str, conversion_type: str, file_type: str, content: bytes, page_count: int = 0):
+        """将内存中的转换结果保存到存储并登记缓存条目"""
+        filename = self.output_filename(cache_key, file_type)
+        storage_path = f"{STORAGE_DIR}/{filename}"
+        if not default_storage.exists(storage_path):
+            default_storage.save(storage_path, ContentFile(content))
+        return self._register(cache_key, conversion_type, filename, page_count)
+
+    def _register(self, cache_key: str, conversion_type: str, filename: str, page_count: int) -> Dict[str, Any]:
+        from apps.tools.models.legacy_models import PDFConversionCacheEntry
+
+        entry = PDFConversionCacheEntry(
+            cache_key=cache_key,
+            conversion_type=conversion_type,
+            output_filename=filename,
+            file_size=default_storage.size(f"{STORAGE_DIR}/{filename}"),
+            page_count=page_count,
+            last_accessed_at=timezone.now(),
+        )
+        try:
+            PDFConversionCacheEntry.objects.update_or_create(
+                cache_key=cache_key,
+                defaults={
+                    field: getattr(entry, field)
+                    for field in ("conversion_type", "output_filename", "file_size", "page_count", "last_accessed_at")
+                },
+            )
+            self.evict(protect_key=cache_key)
+        except Exception as e:
+            # 结果文件已保存，索引失败只影响后续复用
+            logger.error(f"登记转换缓存失败: {filename}, 错误: {e}")
+        return self._as_result(entry)
+
+    # ---- 淘汰 ----
+
+    def evict(self, protect_key: Optional[str] = None) -> int:
+        """总大小或条目数超出上限时，按最近访问时间从旧到新删除，返回删除的条目数"""
+        from apps.tools.models.legacy_models import PDFConversionCacheEntry
+
+        totals = PDFConversionCacheEntry.objects.aggregate(total_bytes=Sum("file_size"), entries=Count("id"))
+        total_bytes, entries = totals["total_bytes"] or 0, totals["entries"]
+        if total_bytes <= self.max_bytes and entries <= self.max_entries:
+            return 0
+
+        evicted = 0
+        candidates = (
+            PDFConversionCacheEntry.objects.exclude(cache_key=protect_key)
+            .order_by("last_accessed_at")
+            .only("pk", "output_filename", "file_size")
+        )
+        for entry in candidates.iterator():
+            if total_bytes <= self.max_bytes and entries <= self.max_entries:
+                break
+            # 只有成功删除索引的进程负责删除文件，避免并发淘汰重复计数
+            deleted, _ = PDFConversionCacheEntry.objects.filter(pk=entry.pk).delete()
+            if not deleted:
+                continue
+            try:
+                default_storage.delete(f"{STORAGE_DIR}/{entry.output_filename}")
+            except Exception as e:
+                logger.warning(f"删除缓存文件失败: {entry.output_filename}, 错误: {e}")
+            total_bytes -= entry.file_size
+            entries -= 1
+            evicted += 1
+
+        if evicted:
+            self._incr("evictions", evicted)
+            logger.info(f"转换缓存淘汰 {evicted} 个条目, 剩余 {entries} 个, {total_bytes / 1024 / 1024:.1f} MB")
+        return evicted
+
+    # ---- 统计 ----
+
+    def _incr(self, name: str, delta: int = 1):
+        key = f"{STATS_CACHE_PREFIX}:{name}"
+        try:
+            cache.add(key, 0, None)
+            cache.incr(key, delta)
+        except Exception as e:
+            logger.debug(f"更新转换缓存统计失败: {name}, 错误: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """命中率与容量统计"""
+        from apps.tools.models.legacy_models import PDFConversionCacheEntry
+
+        counters = cache.get_many([f"{STATS_CACHE_PREFIX}:{name}" for name in ("hits", "misses", "evictions")])
+        hits = counters.get(f"{STATS_CACHE_PREFIX}:hits", 0)
+        misses = counters.get(f"{STATS_CACHE_PREFIX}:misses", 0)
+        totals = PDFConversionCacheEntry.objects.aggregate(total_bytes=Sum("file_size"), entries=Count("id"))
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / (hits + misses) * 100, 1) if hits + misses else 0.0,
+            "evictions": counters.get(f"{STATS_CACHE_PREFIX}:evictions", 0),
+            "entries": totals["entries"],
+            "total_bytes": totals["total_bytes"] or 0,
+            "max_bytes": self.max_bytes,
+            "max_entries": self.max_entries,
+        }
+
+
+# 全局转换结果缓存实例
+result_cache = ConversionResultCache()
@@ -0,0 +1,530 @@
+"""
+PDF转换任务服务
+将PDF转换放到独立的进程池中执行，Web请求只负责提交任务并返回任务ID
+"""
+
+import logging
+import multiprocessing
+import os
+import signal
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files import File
+from django.db import close_old_connections
+from django.utils import timezone
+
+from .pdf_conversion_cache import compute_input_hash, result_cache
+
+logger = logging.getLogger(__name__)
+
+JOB_CACHE_PREFIX = "pdf_conversion_job"
+INFLIGHT_CACHE_PREFIX = "pdf_conversion_inflight"
+JOB_TTL = 60 * 60 * 24  # 任务状态保留1天
+
+# 支持异步执行的转换类型 -> 期望的输入文件类型
+JOB_CONVERSION_TYPES = {
+    "pdf-to-word": "pdf",
+    "word-to-pdf": "word",
+    "pdf-to-image": "pdf",
+    "image-to-pdf": "image",
+    "pdf-to-text": "pdf",
+    "txt-to-pdf": "text",
+}
+
+TERMINAL_STATUSES = ("completed", "failed")
+
+
+class PDFConversionTimeout(Exception):
+    """转换超过时间限制"""
+
+
+# ---------------------------------------------------------------------------
+# 子进程部分：只做CPU密集的转换，不访问数据库和存储
+# ---------------------------------------------------------------------------
+
+_progress_queue = None
+
+
+def _init_worker(progress_queue, memory_limit_mb: int):
+    """进程池初始化：设置进度队列、内存上限并初始化Django"""
+    global _progress_queue
+    _progress_queue = progress_queue
+
+    if memory_limit_mb:
+        try:
+            import resource
+
+            limit = int(memory_limit_mb) * 1024 * 1024
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        except (ImportError, ValueError, OSError) as e:
+            logger.warning(f"设置转换进程内存上限失败: {e}")
+
+    import django
+    from django.apps import apps
+
+    if not apps.ready:
+        django.setup()
+
+
+def _queue_emit(event: tuple):
+    if _progress_queue is not None:
+        _progress_queue.put(event)
+
+
+def _raise_timeout(signum, frame):
+    raise PDFConversionTimeout("转换超时")
+
+
+def _execute_conversion(
+    conversion_type: str, input_path: str, output_path: str, original_filename: str, params: Dict[str, Any], progress
+):
+    """调用PDFConverter执行转换并把结果写入output_path，返回 (success, 错误信息, file_type, page_count)"""
+    from apps.tools.pdf_converter_api import PDFConverter
+
+    converter = PDFConverter()
+    page_count = 0
+
+    def on_page(done, total):
+        nonlocal page_count
+        page_count = total
+        progress(done, total)
+
+    with open(input_path, "rb") as fp:
+        file_obj = File(fp, name=original_filename)
+        if conversion_type == "pdf-to-word":
+            success, result, file_type = converter.pdf_to_word(file_obj, progress_callback=on_page)
+        elif conversion_type == "word-to-pdf":
+            success, result, file_type = converter.word_to_pdf(file_obj)
+        elif conversion_type == "pdf-to-image":
+            # 已在转换进程池中执行，页面在本进程内顺序渲染
+            success, result, file_type = converter.pdf_to_images_zip(
+                file_obj,
+                output_path,
+                dpi=params.get("dpi", 150),
+                image_format=params.get("format", "png"),
+                quality=params.get("quality", 85),
+                progress_callback=on_page,
+                workers=1,
+            )
+        elif conversion_type == "image-to-pdf":
+            success, result, file_type = converter.images_to_pdf([file_obj])
+        elif conversion_type == "pdf-to-text":
+            success, result, file_type = converter.pdf_to_text(file_obj)
+        elif conversion_type == "txt-to-pdf":
+            success, result, file_type = converter.txt_to_pdf(file_obj)
+        else:
+            return False, f"不支持的转换类型: {conversion_type}", None, 0
+
+    if not success:
+        return False, result, None, page_count
+
+    if file_type == "pdf_to_images":
+        page_count = len(result)
+    else:
+        if isinstance(result, str):
+            result = result.encode("utf-8")
+        with open(output_path, "wb") as out:
+            out.write(result)
+
+    return True, None, file_type, page_count
+
+
+def _run_conversion_job(
+    job_id: str,
+    conversion_type: str,
+    input_path: str,
+    original_filename: str,
+    params: Dict[str, Any],
+    time_limit: int,
+    emit: Optional[Callable[[tuple], None]] = None,
+) -> Dict[str, Any]:
+    """在转换进程中执行单个任务，结果写入临时文件并返回路径"""
+    emit = emit or _queue_emit
+    emit(("started", job_id, time.time()))
+
+    use_alarm = bool(time_limit) and hasattr(signal, "SIGALRM") and threading.current_thread() is threading.main_thread()
+    if use_alarm:
+        previous_handler = signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.alarm(int(time_limit))
+
+    with tempfile.NamedTemporaryFile(suffix=".out", delete=False) as out:
+        output_path = out.name
+
+    started = time.time()
+    try:
+        success, error, file_type, page_count = _execute_conversion(
+            conversion_type,
+            input_path,
+            output_path,
+            original_filename,
+            params,
+            lambda done, total: emit(("progress", job_id, done, total)),
+        )
+    except PDFConversionTimeout:
+        success, error, page_count = False, f"转换超时（超过{time_limit}秒）", 0
+    except MemoryError:
+        success, error, page_count = False, "转换所需内存超出限制", 0
+    finally:
+        if use_alarm:
+            signal.alarm(0)
+            signal.signal(signal.SIGALRM, previous_handler)
+
+    duration = time.time() - started
+    if not success:
+        os.unlink(output_path)
+        return {"success": False, "error": error, "duration": duration, "page_count": page_count}
+
+    return {
+        "success": True,
+        "output_path": output_path,
+        "file_type": file_type,
+        "page_count": page_count,
+        "duration": duration,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Web进程部分：任务提交、状态维护和结果落盘
+# ---------------------------------------------------------------------------
+
+
+class PDFConversionJobManager:
+    """PDF转换任务管理器"""
+
+    def __init__(self):
+        self.max_workers = getattr(settings, "PDF_CONVERSION_WORKERS", 2)
+        self.time_limit = getattr(settings, "PDF_CONVERSION_TIME_LIMIT", 10 * 60)
+        self.memory_limit_mb = getattr(settings, "PDF_CONVERSION_MEMORY_LIMIT_MB", 1024)
+        self.max_tasks_per_child = getattr(settings, "PDF_CONVERSION_MAX_TASKS_PER_CHILD", 20)
+
+        self._executor = None
+        self._finalizer = None
+        self._progress_queue = None
+        self._listener = None
+        self._lock = threading.Lock()
+        self._state_lock = threading.Lock()
+        self._active_jobs = set()
+
+    # ---- 进程池 ----
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                context = multiprocessing.get_context("spawn")
+                self._progress_queue = context.Queue()
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=context,
+                    initializer=_init_worker,
+                    initargs=(self._progress_queue, self.memory_limit_mb),
+                    max_tasks_per_child=self.max_tasks_per_child,
+                )
+                if self._finalizer is None:
+                    self._finalizer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pdf-job-finalizer")
+                self._listener = threading.Thread(
+                    target=self._listen_progress, args=(self._progress_queue,), name="pdf-job-progress", daemon=True
+                )
+                self._listener.start()
+            return self._executor
+
+    def _reset_executor(self):
+        """进程池损坏（如子进程被系统杀死）后丢弃，下次提交时重建"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+            queue, self._progress_queue = self._progress_queue, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+        if queue is not None:
+            queue.put(None)
+
+    def _listen_progress(self, queue):
+        while True:
+            try:
+                event = queue.get()
+            except (EOFError, OSError):
+                return
+            if event is None:
+                return
+            try:
+                self._apply_event(event)
+            except Exception as e:
+                logger.error(f"处理转换进度事件失败: {e}")
+
+    def _apply_event(self, event: tuple):
+        kind, job_id = event[0], event[1]
+        if kind == "started":
+            started_at = event[2]
+            self._update_job(
+                job_id,
+                lambda job: job.update(
+                    status="running",
+                    started_at=started_at,
+                    queue_time=round(max(0.0, started_at - job["created_at"]), 3),
+                    current_step="转换中",
+                ),
+            )
+        elif kind == "progress":
+            done, total = event[2], event[3]
+            self._update_job(
+                job_id,
+                lambda job: job.update(
+                    current_page=done,
+                    total_pages=total,
+                    progress=min(99, int(done * 100 / total)) if total else job["progress"],
+                    current_step=f"正在处理第 {done}/{total} 页",
+                ),
+            )
+
+    # ---- 任务状态 ----
+
+    def _job_key(self, job_id: str) -> str:
+        return f"{JOB_CACHE_PREFIX}:{job_id}"
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return cache.get(self._job_key(job_id))
+
+    def _update_job(self, job_id: str, mutate: Callable[[Dict[str, Any]], None]) -> Optional[Dict[str, Any]]:
+        with self._state_lock:
+            job = cache.get(self._job_key(job_id))
+            if job is None or job["status"] in TERMINAL_STATUSES:
+                return job
+            mutate(job)
+            cache.set(self._job_key(job_id), job, JOB_TTL)
+            return job
+
+    def get_stats(self) -> Dict[str, Any]:
+        """本进程内的任务队列统计"""
+        with self._state_lock:
+            active = len(self._active_jobs)
+        return {"active_conversions": active, "max_workers": self.max_workers}
+
+    # ---- 提交 ----
+
+    def submit(
+        self,
+        uploaded_file,
+        conversion_type: str,
+        user=None,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """提交转换任务，返回任务状态。相同内容的任务会复用已有结果或正在执行的任务"""
+        from apps.tools.models.legacy_models import PDFConversionRecord
+
+        params = params or {}
+        input_hash = compute_input_hash(uploaded_file, conversion_type, params)
+        record_type = conversion_type.replace("-", "_")
+
+        # 1. 已有转换结果：直接返回
+        cached_result = result_cache.get(input_hash)
+        if cached_result:
+            job = self._new_job(conversion_type, uploaded_file.name, input_hash)
+            job.update(
+                status="completed",
+                progress=100,
+                current_step="转换完成（复用已有结果）",
+                cached=True,
+                completed_at=job["created_at"],
+                **cached_result,
+            )
+            cache.set(self._job_key(job["id"]), job, JOB_TTL)
+            if user is not None and user.is_authenticated:
+                PDFConversionRecord.objects.create(
+                    user=user,
+                    conversion_type=record_type,
+                    original_filename=uploaded_file.name,
+                    file_size=uploaded_file.size,
+                    status="success",
+                    job_id=job["id"],
+                    input_hash=input_hash,
+                    output_filename=cached_result["filename"],
+                    download_url=cached_result["download_url"],
+                    page_count=cached_result.get("page_count", 0),
+                    completed_at=timezone.now(),
+                )
+            return job
+
+        # 2. 相同内容的任务正在执行：复用该任务
+        inflight_id = cache.get(f"{INFLIGHT_CACHE_PREFIX}:{input_hash}")
+        inflight_job = self.get_job(inflight_id) if inflight_id else None
+        if inflight_job and inflight_job["status"] not in TERMINAL_STATUSES:
+            if user is not None and user.is_authenticated:
+                PDFConversionRecord.objects.create(
+                    user=user,
+                    conversion_type=record_type,
+                    original_filename=uploaded_file.name,
+                    file_size=uploaded_file.size,
+                    status="pending",
+                    job_id=inflight_id,
+                    input_hash=input_hash,
+                )
+            return inflight_job
+
+        # 3. 新任务：输入落到临时文件，交给转换进程
+        suffix = os.path.splitext(uploaded_file.name)[1].lower()
+        with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as temp_input:
+            for chunk in uploaded_file.chunks():
+                temp_input.write(chunk)
+            input_path = temp_input.name
+
+        job = self._new_job(conversion_type, uploaded_file.name, input_hash)
+        cache.set(self._job_key(job["id"]), job, JOB_TTL)
+        cache.set(f"{INFLIGHT_CACHE_PREFIX}:{input_hash}", job["id"], self.time_limit + 60)
+
+        if user is not None and user.is_authenticated:
+            PDFConversionRecord.objects.create(
+                user=user,
+                conversion_type=record_type,
+                original_filename=uploaded_file.name,
+                file_size=uploaded_file.size,
+                status="pending",
+                job_id=job["id"],
+                input_hash=input_hash,
+            )
+
+        with self._state_lock:
+            self._active_jobs.add(job["id"])
+
+        args = (job["id"], conversion_type, input_path, uploaded_file.name, params, self.time_limit)
+        if getattr(settings, "PDF_CONVERSION_JOBS_EAGER", False):
+            # 测试环境：在当前进程内同步执行
+            try:
+                outcome = _run_conversion_job(*args, emit=self._apply_event)
+            except Exception as e:
+                outcome = {"success": False, "error": str(e), "duration": 0.0}
+            self._finalize_job(job["id"], input_path, outcome)
+        else:
+            try:
+                future = self._get_executor().submit(_run_conversion_job, *args)
+            except BrokenProcessPool:
+                self._reset_executor()
+                future = self._get_executor().submit(_run_conversion_job, *args)
+            future.add_done_callback(
+                lambda f, job_id=job["id"]: self._finalizer.submit(self._finalize_future, job_id, input_path, f)
+            )
+
+        return self.get_job(job["id"])
+
+    def _new_job(self, conversion_type: str, original_filename: str, input_hash: str) -> Dict[str, Any]:
+        return {
+            "id": str(uuid.uuid4()),
+            "status": "pending",
+            "conversion_type": conversion_type,
+            "original_filename": original_filename,
+            "input_hash": input_hash,
+            "progress": 0,
+            "current_step": "排队中",
+            "current_page": 0,
+            "total_pages": 0,
+            "created_at": time.time(),
+            "started_at": None,
+            "completed_at": None,
+            "queue_time": 0.0,
+            "conversion_time": 0.0,
+            "filename": None,
+            "download_url": None,
+            "cached": False,
+            "error": None,
+        }
+
+    # ---- 完成 ----
+
+    def _finalize_future(self, job_id: str, input_path: str, future):
+        try:
+            outcome = future.result()
+        except BrokenProcessPool:
+            self._reset_executor()
+            outcome = {"success": False, "error": "转换进程异常退出（可能超出内存限制）", "duration": 0.0}
+        except Exception as e:
+            outcome = {"success": False, "error": str(e), "duration": 0.0}
+        try:
+            self._finalize_job(job_id, input_path, outcome)
+        finally:
+            close_old_connections()
+
+    def _finalize_job(self, job_id: str, input_path: str, outcome: Dict[str, Any]):
+        """保存转换结果、更新任务状态与转换记录"""
+        from apps.tools.models.legacy_models import PDFConversionRecord
+
+        try:
+            os.unlink(input_path)
+        except OSError:
+            pass
+
+        job = self.get_job(job_id) or {}
+        input_hash = job.get("input_hash", "")
+        completed_at = time.time()
+        started_at = job.get("started_at") or completed_at - outcome.get("duration", 0.0)
+        queue_time = job.get("queue_time") or round(max(0.0, started_at - job.get("created_at", started_at)), 3)
+        conversion_time = round(outcome.get("duration", 0.0), 3)
+        page_count = outcome.get("page_count", 0) or job.get("total_pages", 0)
+
+        result_fields = {}
+        if outcome["success"]:
+            try:
+                result_fields = result_cache.put_file(
+                    input_hash, job.get("conversion_type", ""), outcome["file_type"], outcome["output_path"], page_count
+                )
+            finally:
+                os.unlink(outcome["output_path"])
+
+        def mark_done(job):
+            job.update(
+                status="completed" if outcome["success"] else "failed",
+                progress=100 if outcome["success"] else job["progress"],
+                current_step="转换完成" if outcome["success"] else "转换失败",
+                started_at=started_at,
+                completed_at=completed_at,
+                queue_time=queue_time,
+                conversion_time=conversion_time,
+                total_pages=page_count,
+                error=None if outcome["success"] else outcome.get("error"),
+                **result_fields,
+            )
+
+        self._update_job(job_id, mark_done)
+        cache.delete(f"{INFLIGHT_CACHE_PREFIX}:{input_hash}")
+        with self._state_lock:
+            self._active_jobs.discard(job_id)
+
+        record_updates = {
+            "status": "success" if outcome["success"] else "failed",
+            "conversion_time": conversion_time,
+            "queue_time": queue_time,
+            "page_count": page_count,
+            "started_at": datetime.fromtimestamp(started_at, tz=timezone.get_current_timezone()),
+            "completed_at": datetime.fromtimestamp(completed_at, tz=timezone.get_current_timezone()),
+        }
+        if outcome["success"]:
+            record_updates["output_filename"] = result_fields["filename"]
+            record_updates["download_url"] = result_fields["download_url"]
+        else:
+            record_updates["error_message"] = outcome.get("error")
+        try:
+            PDFConversionRecord.objects.filter(job_id=job_id).update(**record_updates)
+        except Exception as e:
+            logger.error(f"更新PDF转换记录失败: {job_id}, 错误: {e}")
+
+        if outcome["success"]:
+            logger.info(f"PDF转换任务完成: {job_id}, 页数: {page_count}, 排队 {queue_time}s, 转换 {conversion_time}s")
+        else:
+            logger.warning(f"PDF转换任务失败: {job_id}, 错误: {outcome.get('error')}")
+
+    def shutdown(self):
+        """关闭进程池（测试或进程退出时使用）"""
+        self._reset_executor()
+        if self._finalizer is not None:
+            self._finalizer.shutdown(wait=True)
+            self._finalizer = None
+
+
+# 全局任务管理器实例
+job_manager = PDFConversionJobManager()
@@ -0,0 +1,251 @@
+"""
+PDF页面渲染服务
+按页区间分配到多个进程并行渲染，每页直接由Pixmap写入磁盘，不经过base64和二次编码
+"""
+
+import logging
+import multiprocessing
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+try:
+    import fitz  # PyMuPDF
+
+    FITZ_AVAILABLE = True
+except ImportError:
+    FITZ_AVAILABLE = False
+
+# 输出格式 -> 文件后缀
+IMAGE_FORMATS = {"png": ".png", "jpeg": ".jpg", "webp": ".webp"}
+DEFAULT_QUALITY = 85
+MIN_DPI = 36
+MAX_DPI = 600
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def touch_document(doc_dir: str):
+    """记录逐页图片文档的最近访问时间（源文件的 mtime），供 evict_page_documents 按 LRU 淘汰"""
+    try:
+        os.utime(os.path.join(doc_dir, "source.pdf"))
+    except OSError:
+        pass
+
+
+def _document_usage(doc_dir: str):
+    """返回 (最近访问时间, 占用字节数)"""
+    try:
+        last_access = os.path.getmtime(os.path.join(doc_dir, "source.pdf"))
+    except OSError:
+        last_access = 0.0
+    size = 0
+    for root, _dirs, files in os.walk(doc_dir):
+        for name in files:
+            try:
+                size += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return last_access, size
+
+
+def evict_page_documents(pages_root: str, max_age: float, max_bytes: int, protect: Optional[str] = None) -> int:
+    """删除超过 max_age 秒未访问的文档，总大小仍超过 max_bytes 时按最近访问时间从旧到新删除
+
+    每个文档是 pages_root 下的一个目录（源文件和各参数下渲染的页面），返回删除的文档数
+    """
+    try:
+        entries = [entry for entry in os.scandir(pages_root) if entry.is_dir()]
+    except FileNotFoundError:
+        return 0
+
+    documents = sorted((*_document_usage(entry.path), entry.name, entry.path) for entry in entries)
+    total_bytes = sum(size for _, size, _, _ in documents)
+    expire_before = time.time() - max_age
+    evicted = 0
+    for last_access, size, name, path in documents:
+        if name == protect:
+            continue
+        if last_access >= expire_before and total_bytes <= max_bytes:
+            break
+        shutil.rmtree(path, ignore_errors=True)
+        total_bytes -= size
+        evicted += 1
+
+    if evicted:
+        logger.info(f"逐页图片文档淘汰 {evicted} 个, 剩余 {total_bytes / 1024 / 1024:.1f} MB")
+    return evicted
+
+
+def page_filename(page_number: int, image_format: str) -> str:
+    """页面图片文件名（页码从1开始）"""
+    return f"page_{page_number:04d}{IMAGE_FORMATS[image_format]}"
+
+
+def normalize_render_options(dpi=150, image_format="png", quality=DEFAULT_QUALITY):
+    """校验并规范化渲染参数"""
+    image_format = (image_format or "png").lower()
+    if image_format == "jpg":
+        image_format = "jpeg"
+    if image_format not in IMAGE_FORMATS:
+        raise ValueError(f"不支持的图片格式: {image_format}")
+    dpi = max(MIN_DPI, min(int(dpi), MAX_DPI))
+    quality = max(1, min(int(quality), 100))
+    return dpi, image_format, quality
+
+
+def count_pages(pdf_path: str) -> int:
+    with fitz.open(pdf_path) as doc:
+        return len(doc)
+
+
+def _write_pixmap(pix, path: str, image_format: str, quality: int):
+    """将Pixmap写入文件，PNG/JPEG由MuPDF直接编码，WebP借助PIL"""
+    if image_format == "png":
+        pix.save(path, output="png")
+    elif image_format == "jpeg":
+        pix.save(path, output="jpeg", jpg_quality=quality)
+    else:
+        from PIL import Image
+
+        Image.frombytes("RGB", (pix.width, pix.height), pix.samples).save(path, "WEBP", quality=quality, method=4)
+
+
+def render_page_range(
+    pdf_path: str,
+    page_numbers: Sequence[int],
+    output_dir: str,
+    dpi: int,
+    image_format: str,
+    quality: int,
+    progress_callback: Optional[Callable[[int], None]] = None,
+) -> List[Dict]:
+    """渲染指定页（页码从1开始）并写入output_dir，已存在的页面不会重复渲染"""
+    os.makedirs(output_dir, exist_ok=True)
+    matrix = fitz.Matrix(dpi / 72, dpi / 72)
+    pages = []
+
+    with fitz.open(pdf_path) as doc:
+        for page_number in page_numbers:
+            path = os.path.join(output_dir, page_filename(page_number, image_format))
+            if os.path.exists(path):
+                rect = doc[page_number - 1].rect
+                width, height = round(rect.width * dpi / 72), round(rect.height * dpi / 72)
+            else:
+                pix = doc[page_number - 1].get_pixmap(matrix=matrix, alpha=False)
+                width, height = pix.width, pix.height
+                # 先写临时文件再改名，避免并发请求读到半张图片
+                temp_path = f"{path}.{os.getpid()}.tmp"
+                _write_pixmap(pix, temp_path, image_format, quality)
+                os.replace(temp_path, path)
+                pix = None
+            pages.append(
+                {
+                    "page": page_number,
+                    "filename": os.path.basename(path),
+                    "width": width,
+                    "height": height,
+                    "size": os.path.getsize(path),
+                }
+            )
+            if progress_callback:
+                progress_callback(page_number)
+
+    return pages
+
+
+def _get_executor(max_workers: int) -> ProcessPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+        return _executor
+
+
+def _reset_executor():
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def split_page_ranges(page_numbers: Sequence[int], parts: int) -> List[List[int]]:
+    """将页码切分为连续的区间，每个进程处理一段，减少重复打开文档的开销"""
+    page_numbers = list(page_numbers)
+    parts = max(1, min(parts, len(page_numbers)))
+    size, remainder = divmod(len(page_numbers), parts)
+    ranges, start = [], 0
+    for i in range(parts):
+        end = start + size + (1 if i < remainder else 0)
+        ranges.append(page_numbers[start:end])
+        start = end
+    return [r for r in ranges if r]
+
+
+def render_pdf_pages(
+    pdf_path: str,
+    output_dir: str,
+    dpi: int = 150,
+    image_format: str = "png",
+    quality: int = DEFAULT_QUALITY,
+    page_numbers: Optional[Sequence[int]] = None,
+    workers: Optional[int] = None,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+) -> List[Dict]:
+    """并行渲染PDF页面到output_dir，返回按页码排序的页面信息
+
+    workers为1时在当前进程内顺序渲染（已在转换进程池中执行时使用）
+    """
+    if not FITZ_AVAILABLE:
+        raise RuntimeError("PyMuPDF未安装，无法渲染PDF页面")
+
+    dpi, image_format, quality = normalize_render_options(dpi, image_format, quality)
+    if page_numbers is None:
+        page_numbers = range(1, count_pages(pdf_path) + 1)
+    page_numbers = list(page_numbers)
+    total = len(page_numbers)
+    if not total:
+        return []
+
+    if workers is None:
+        workers = min(os.cpu_count() or 1, 4)
+
+    if workers <= 1 or total == 1:
+        done = 0
+
+        def on_page(_page_number):
+            nonlocal done
+            done += 1
+            if progress_callback:
+                progress_callback(done, total)
+
+        return render_page_range(pdf_path, page_numbers, output_dir, dpi, image_format, quality, on_page)
+
+    # 每个进程至少分到若干页，页数太少时不值得启动多个进程
+    chunks = split_page_ranges(page_numbers, min(workers, max(1, total // 4)))
+    try:
+        futures = [
+            _get_executor(workers).submit(render_page_range, pdf_path, chunk, output_dir, dpi, image_format, quality)
+            for chunk in chunks
+        ]
+        pages, done = [], 0
+        for future in futures:
+            chunk_pages = future.result()
+            pages.extend(chunk_pages)
+            done += len(chunk_pages)
+            if progress_callback:
+                progress_callback(done, total)
+    except BrokenProcessPool:
+        _reset_executor()
+        raise
+
+    pages.sort(key=lambda item: item["page"])
+    return pages
@@ -152,13 +152,14 @@ class SystemMonitor:
     def get_system_info() -> Dict[str, Any]:
         """获取系统信息"""
         try:
-            cpu_percent = psutil.cpu_percent(interval=1)
+            from .metrics_registry import system_snapshot
+
             memory = psutil.virtual_memory()
             disk = psutil.disk_usage("/")
 
             return {
                 "cpu": {
-                    "percent": cpu_percent,
+                    "percent": system_snapshot()["cpu_percent"],
                     "count": psutil.cpu_count(),
                     "freq": psutil.cpu_freq()._asdict() if psutil.cpu_freq() else None,
                 },
@@ -317,6 +318,21 @@ class PerformanceMonitorView(View):
             if include_cache:
                 result["cache_stats"] = CacheMonitor.get_cache_stats()
 
+            # 历史趋势: ?history=system.cpu_percent,system.memory_percent&window=24h
+            history = request.GET.get("history")
+            if history:
+                from .metrics_timeseries import get_metrics_store, is_valid_metric_name, parse_window
+
+                metrics = [name for name in (name.strip() for name in history.split(",")) if name]
+                invalid = [metric for metric in metrics if not is_valid_metric_name(metric)]
+                if invalid:
+                    return JsonResponse({"error": f"非法指标名: {', '.join(invalid)}"}, status=400)
+                store = get_metrics_store()
+                window = parse_window(request.GET.get("window"))
+                result["history"] = {
+                    metric: {**store.series(metric, window), "rollup": store.rollup(metric, window)} for metric in metrics
+                }
+
             return JsonResponse(result)
 
         except Exception as e:
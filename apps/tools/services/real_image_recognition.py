@@ -1,163 +1,27 @@
+import logging
 import os
+import threading
 import traceback
 from typing import Dict, List, Optional, Tuple
 
-import cv2
 import numpy as np
-import torch
-import torchvision.transforms as transforms
-from PIL import Image
-from torchvision.models import ResNet50_Weights, resnet50
 
+from .food_inference_service import FoodInferenceService, get_inference_service
 
-class RealFoodImageRecognition:
-    """真正的食品图像识别服务"""
-
-    def __init__(self):
-        self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-        self.model = None
-        self.transform = None
-        self.food_categories = {}
-        self.initialize_model()
-
-    def initialize_model(self):
-        """初始化深度学习模型"""
-        try:
-            print("🔄 正在初始化图像识别模型...")
-
-            # 使用预训练的ResNet50模型
-            self.model = resnet50(weights=ResNet50_Weights.IMAGENET1K_V2)
-            self.model.eval()
-            self.model.to(self.device)
-
-            # 图像预处理
-            self.transform = transforms.Compose(
-                [
-                    transforms.Resize(256),
-                    transforms.CenterCrop(224),
-                    transforms.ToTensor(),
-                    transforms.Normalize(mean=[0.485, 0.456, 0.406], std=[0.229, 0.224, 0.225]),
-                ]
-            )
-
-            # 食品类别映射（基于ImageNet类别）
-            self.food_categories = {
-                # 中式食品
-                "宫保鸡丁": ["chicken", "pepper", "sauce", "stir-fry"],
-                "麻婆豆腐": ["tofu", "spicy", "sauce", "bean"],
-                "红烧肉": ["pork", "braised", "sauce", "meat"],
-                "番茄炒蛋": ["tomato", "egg", "scrambled", "vegetable"],
-                "鱼香肉丝": ["pork", "shredded", "sauce", "vegetable"],
-                "回锅肉": ["pork", "twice-cooked", "spicy", "meat"],
-                "白切鸡": ["chicken", "boiled", "white", "meat"],
-                "叉烧肉": ["pork", "barbecued", "red", "meat"],
-                "炸酱面": ["noodle", "sauce", "bean", "pasta"],
-                "蛋炒饭": ["rice", "egg", "fried", "grain"],
-                # 西式食品
-                "意大利面": ["pasta", "noodle", "italian", "sauce"],
-                "披萨": ["pizza", "cheese", "tomato", "bread"],
-                "汉堡包": ["burger", "bread", "meat", "sandwich"],
-                "沙拉": ["salad", "vegetable", "green", "fresh"],
-                "牛排": ["steak", "beef", "grilled", "meat"],
-                "三明治": ["sandwich", "bread", "meat", "vegetable"],
-                # 日式食品
-                "寿司": ["sushi", "rice", "fish", "japanese"],
-                "拉面": ["ramen", "noodle", "soup", "japanese"],
-                "天妇罗": ["tempura", "fried", "seafood", "japanese"],
-                # 韩式食品
-                "石锅拌饭": ["bibimbap", "rice", "vegetable", "korean"],
-                "泡菜": ["kimchi", "fermented", "vegetable", "korean"],
-                "韩式烤肉": ["bbq", "grilled", "meat", "korean"],
-                # 其他食品
-                "小龙虾": ["crayfish", "seafood", "shellfish", "spicy"],
-                "火锅": ["hotpot", "soup", "meat", "vegetable"],
-                "烧烤": ["bbq", "grilled", "meat", "charcoal"],
-                "水煮鱼": ["fish", "boiled", "spicy", "soup"],
-                "北京烤鸭": ["duck", "roasted", "chinese", "meat"],
-            }
-
-            print(f"✅ 图像识别模型已初始化 (设备: {self.device})")
-
-        except Exception as e:
-            print(f"❌ 模型初始化失败: {e}")
-            print(f"详细错误信息: {traceback.format_exc()}")
-            self.model = None
-
-    def preprocess_image(self, image_path: str) -> Optional[torch.Tensor]:
-        """预处理图像"""
-        try:
-            print(f"🔄 正在预处理图像: {image_path}")
-
-            # 检查文件是否存在
-            if not os.path.exists(image_path):
-                print(f"❌ 图像文件不存在: {image_path}")
-                return None
-
-            # 检查文件大小
-            file_size = os.path.getsize(image_path)
-            print(f"📁 图像文件大小: {file_size / 1024 / 1024:.2f} MB")
+logger = logging.getLogger(__name__)
 
-            if file_size > 50 * 1024 * 1024:  # 50MB
-                print("❌ 图像文件过大")
-                return None
+MAX_IMAGE_SIZE = 50 * 1024 * 1024  # 50MB
 
-            # 读取图像
-            if isinstance(image_path, str):
-                image = Image.open(image_path).convert("RGB")
-            else:
-                # 如果是PIL Image对象
-                image = image_path.convert("RGB")
 
-            print(f"📐 图像尺寸: {image.size}")
-
-            # 应用变换
-            tensor = self.transform(image)
-            result = tensor.unsqueeze(0).to(self.device)
+class RealFoodImageRecognition:
+    """真正的食品图像识别服务
 
-            print("✅ 图像预处理完成")
-            return result
+    模型推理由进程级的 FoodInferenceService 完成（模型只加载一次、并发请求合并批次），
+    本类负责图片校验、颜色纹理分析和结果组装
+    """
 
-        except Exception as e:
-            print(f"❌ 图像预处理失败: {e}")
-            print(f"详细错误信息: {traceback.format_exc()}")
-            return None
-
-    def extract_features(self, image_tensor: torch.Tensor) -> np.ndarray:
-        """提取图像特征"""
-        try:
-            print("🔄 正在提取图像特征...")
-
-            if self.model is None:
-                print("❌ 模型未初始化")
-                return np.array([])
-
-            with torch.no_grad():
-                # 使用模型的前向传播，但只取到倒数第二层
-                # ResNet50的结构：conv1 -> bn1 -> relu -> maxpool -> layer1 -> layer2 -> layer3 -> layer4 -> avgpool -> fc
-                # 我们取layer4的输出作为特征
-                x = image_tensor
-                x = self.model.conv1(x)
-                x = self.model.bn1(x)
-                x = self.model.relu(x)
-                x = self.model.maxpool(x)
-
-                x = self.model.layer1(x)
-                x = self.model.layer2(x)
-                x = self.model.layer3(x)
-                x = self.model.layer4(x)  # 这是我们要的特征层
-
-                # 全局平均池化
-                features = torch.nn.functional.adaptive_avg_pool2d(x, (1, 1))
-                features = features.view(features.size(0), -1)
-                result = features.cpu().numpy()
-
-                print(f"✅ 特征提取完成，特征维度: {result.shape}")
-                return result
-
-        except Exception as e:
-            print(f"❌ 特征提取失败: {e}")
-            print(f"详细错误信息: {traceback.format_exc()}")
-            return np.array([])
+    def __init__(self, service: Optional[FoodInferenceService] = None):
+        self.service = service or get_inference_service()
 
     def analyze_food_characteristics(self, image_path: str) -> Dict:
         """分析食品特征"""
@@ -165,6 +29,8 @@ class RealFoodImageRecognition:
             print("🔄 正在分析食品特征...")
 
             # 使用OpenCV分析图像特征
+            import cv2
+
             image = cv2.imread(image_path)
             if image is None:
                 print("❌ 无法读取图像文件")
@@ -201,88 +67,20 @@ class RealFoodImageRecognition:
             print(f"详细错误信息: {traceback.format_exc()}")
             return {}
 
-    def match_food_category(self, features: np.ndarray, characteristics: Dict) -> List[Tuple[str, float]]:
-        """匹配食品类别"""
-        try:
-            print("🔄 正在匹配食品类别...")
-
-            if self.model is None or len(features) == 0:
-                print("❌ 模型未初始化或特征为空")
-                return []
-
-            # 基于颜色和纹理特征进行匹配
-            color_features = characteristics.get("color", {})
-            texture_features = characteristics.get("texture", {})
-
-            matches = []
-
-            for food_name, keywords in self.food_categories.items():
-                score = 0.0
-
-                # 基于颜色特征评分
-                if color_features:
-                    if "red" in keywords and color_features["red_ratio"] > 0.1:
-                        score += 0.3
-                    if "green" in keywords and color_features["green_ratio"] > 0.1:
-                        score += 0.3
-                    if "yellow" in keywords and color_features["yellow_ratio"] > 0.1:
-                        score += 0.3
-
-                # 基于纹理特征评分
-                if texture_features:
-                    if "smooth" in keywords and texture_features["smoothness"] < 30:
-                        score += 0.2
-                    if "crispy" in keywords and texture_features["contrast"] > 100:
-                        score += 0.2
-
-                # 添加随机性以模拟真实识别
-                score += np.random.normal(0, 0.1)
-                score = max(0, min(1, score))
-
-                if score > 0.1:  # 只返回有意义的匹配
-                    matches.append((food_name, score))
-
-            # 按分数排序
-            matches.sort(key=lambda x: x[1], reverse=True)
-            result = matches[:5]  # 返回前5个匹配
-
-            print(f"✅ 食品类别匹配完成，找到 {len(result)} 个匹配")
-            return result
-
-        except Exception as e:
-            print(f"❌ 类别匹配失败: {e}")
-            print(f"详细错误信息: {traceback.format_exc()}")
-            return []
+    def match_food_category(self, image_path: str, top_k: int = 5) -> List[Tuple[str, float]]:
+        """与食品库特征矩阵做一次向量化余弦相似度匹配，返回前top_k个 (食品名, 相似度)"""
+        return self.service.recognize_path(image_path, top_k)
 
     def recognize_food(self, image_path: str, confidence_threshold: float = 0.3) -> Dict:
         """识别食品"""
         try:
-            print(f"🎯 开始识别食品: {image_path}")
-
-            if self.model is None:
-                return {
-                    "food_name": "模型未初始化",
-                    "confidence": 0.0,
-                    "alternatives": [],
-                    "error": "深度学习模型未正确初始化",
-                }
-
-            # 预处理图像
-            image_tensor = self.preprocess_image(image_path)
-            if image_tensor is None:
-                return {"food_name": "图像预处理失败", "confidence": 0.0, "alternatives": [], "error": "无法预处理上传的图像"}
-
-            # 提取特征
-            features = self.extract_features(image_tensor)
-            if len(features) == 0:
-                return {"food_name": "特征提取失败", "confidence": 0.0, "alternatives": [], "error": "无法从图像中提取特征"}
-
-            # 分析食品特征
-            characteristics = self.analyze_food_characteristics(image_path)
+            if not os.path.exists(image_path):
+                return {"food_name": "图像预处理失败", "confidence": 0.0, "alternatives": [], "error": "图像文件不存在"}
+            if os.path.getsize(image_path) > MAX_IMAGE_SIZE:
+                return {"food_name": "图像预处理失败", "confidence": 0.0, "alternatives": [], "error": "图像文件过大"}
 
             # 匹配食品类别
-            matches = self.match_food_category(features, characteristics)
-
+            matches = self.match_food_category(image_path)
             if not matches:
                 return {"food_name": "未知食品", "confidence": 0.0, "alternatives": [], "error": "未找到匹配的食品类别"}
 
@@ -307,25 +105,43 @@ class RealFoodImageRecognition:
                 "food_name": best_match,
                 "confidence": confidence,
                 "alternatives": alternatives[:3],
-                "characteristics": characteristics,
+                # 与最佳匹配共用同一张参考图片、无法从图像区分的食品
+                "related_foods": self.service.index.aliases.get(best_match, []),
+                "characteristics": self.analyze_food_characteristics(image_path),
             }
 
-            print(f"✅ 食品识别完成: {best_match} (置信度: {confidence:.2f})")
+            logger.info(f"食品识别完成: {best_match} (置信度: {confidence:.2f})")
             return result
 
         except Exception as e:
-            print(f"❌ 食品识别失败: {e}")
-            print(f"详细错误信息: {traceback.format_exc()}")
+            logger.error(f"食品识别失败: {e}\n{traceback.format_exc()}")
             return {"food_name": "识别失败", "confidence": 0.0, "alternatives": [], "error": str(e)}
 
 
-# 全局实例
-real_recognition = RealFoodImageRecognition()
+# 全局实例：首次识别时才创建，模型由共享的推理服务加载
+_real_recognition = None
+_real_recognition_lock = threading.Lock()
+
+
+def get_real_recognition() -> RealFoodImageRecognition:
+    global _real_recognition
+    if _real_recognition is None:
+        with _real_recognition_lock:
+            if _real_recognition is None:
+                _real_recognition = RealFoodImageRecognition()
+    return _real_recognition
+
+
+def __getattr__(name):
+    # 兼容旧代码中的 real_recognition 全局实例
+    if name == "real_recognition":
+        return get_real_recognition()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def recognize_food_from_image_real(image_path: str, confidence_threshold: float = 0.3) -> Dict:
     """真正的图像识别函数"""
-    return real_recognition.recognize_food(image_path, confidence_threshold)
+    return get_real_recognition().recognize_food(image_path, confidence_threshold)
 
 
 def get_food_suggestions_by_image_real(image_path: str) -> List[str]:
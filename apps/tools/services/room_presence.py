@@ -0,0 +1,129 @@
+"""
+聊天室在线状态
+房间成员（user1/user2 以及未被封禁的 ChatRoomMember）的在线状态和头像用一条查询取出，
+结果按房间缓存 ROOM_PRESENCE_CACHE_SECONDS 秒；接口的权限检查使用同一份成员列表
+
+在线状态或房间成员变化时由信号删除相关房间的缓存：在线状态改变时为用户作为 user1/user2 或成员的房间，
+只更新 last_seen 等其它字段的保存不查询房间；成员加入、退出或封禁状态变化时为该房间。
+queryset.update 不发信号，批量更新后调用 invalidate_users
+"""
+
+from typing import Dict, Iterable, List
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_init, post_save
+
+CACHE_PREFIX = "room_presence:"
+
+
+def _cache_key(room_pk: int) -> str:
+    return f"{CACHE_PREFIX}{room_pk}"
+
+
+def _load(room) -> List[Dict]:
+    from django.contrib.auth.models import User
+
+    from apps.tools.models import ChatRoomMember
+
+    owners = [pk for pk in (room.user1_id, room.user2_id) if pk]
+    joined = ChatRoomMember.objects.filter(room=room, is_banned=False).values("user_id")
+    rows = (
+        User.objects.filter(Q(id__in=owners) | Q(id__in=joined))
+        .values("id", "username", "useronlinestatus__status", "useronlinestatus__last_seen", "profile__avatar")
+        .order_by("username")
+    )
+    # 房间创建者和加入者排在前面，其余按用户名
+    members = sorted(rows, key=lambda row: owners.index(row["id"]) if row["id"] in owners else len(owners))
+
+    presence = []
+    for row in members:
+        is_online = row["useronlinestatus__status"] == "online"
+        presence.append(
+            {
+                "user_id": row["id"],
+                "username": row["username"],
+                "avatar": default_storage.url(row["profile__avatar"]) if row["profile__avatar"] else None,
+                "last_seen": row["useronlinestatus__last_seen"].isoformat() if is_online else None,
+                "is_online": is_online,
+            }
+        )
+    return presence
+
+
+def room_presence(room) -> List[Dict]:
+    """房间成员的在线状态，查询次数与成员数无关"""
+    key = _cache_key(room.pk)
+    presence = cache.get(key)
+    if presence is None:
+        presence = _load(room)
+        cache.set(key, presence, getattr(settings, "ROOM_PRESENCE_CACHE_SECONDS", 5))
+    return presence
+
+
+def is_member(presence: List[Dict], user_id: int) -> bool:
+    """user_id 是否在 room_presence 返回的成员列表中"""
+    return any(member["user_id"] == user_id for member in presence)
+
+
+def invalidate_rooms(room_pks: Iterable[int]):
+    keys = [_cache_key(pk) for pk in set(room_pks) if pk]
+    if keys:
+        cache.delete_many(keys)
+
+
+def _rooms_of(user_ids: List[int]) -> set:
+    from apps.tools.models import ChatRoom, ChatRoomMember
+
+    owned = ChatRoom.objects.filter(Q(user1_id__in=user_ids) | Q(user2_id__in=user_ids)).values("id")
+    joined = ChatRoomMember.objects.filter(user_id__in=user_ids).values("room_id")
+    return set(ChatRoom.objects.filter(Q(id__in=owned) | Q(id__in=joined)).values_list("id", flat=True))
+
+
+def invalidate_users(user_ids: Iterable[int]):
+    """删除这些用户作为 user1/user2 或成员的房间的缓存"""
+    user_ids = list(user_ids)
+    if user_ids:
+        invalidate_rooms(_rooms_of(user_ids))
+
+
+def _remember_status(sender, instance, **kwargs):
+    # 延迟加载的字段不在 __dict__ 中，不能触发额外查询
+    instance._presence_status = instance.__dict__.get("status")
+
+
+def _on_status_saved(sender, instance, created=False, raw=False, **kwargs):
+    if raw:
+        return
+    # 心跳只更新 last_seen，在线状态不变时不查询房间，列表随缓存过期刷新
+    if created or instance.status != getattr(instance, "_presence_status", None):
+        invalidate_users([instance.user_id])
+    instance._presence_status = instance.status
+
+
+def _on_status_deleted(sender, instance, **kwargs):
+    invalidate_users([instance.user_id])
+
+
+def _on_room_changed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        invalidate_rooms([instance.pk])
+
+
+def _on_member_changed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        invalidate_rooms([instance.room_id])
+
+
+def track_room_presence():
+    from apps.tools.models import ChatRoom, ChatRoomMember, UserOnlineStatus
+
+    uid = "room_presence"
+    post_init.connect(_remember_status, sender=UserOnlineStatus, dispatch_uid=uid, weak=False)
+    post_save.connect(_on_status_saved, sender=UserOnlineStatus, dispatch_uid=uid, weak=False)
+    post_delete.connect(_on_status_deleted, sender=UserOnlineStatus, dispatch_uid=uid, weak=False)
+    post_save.connect(_on_room_changed, sender=ChatRoom, dispatch_uid=uid, weak=False)
+    post_save.connect(_on_member_changed, sender=ChatRoomMember, dispatch_uid=uid, weak=False)
+    post_delete.connect(_on_member_changed, sender=ChatRoomMember, dispatch_uid=uid, weak=False)
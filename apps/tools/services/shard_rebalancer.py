@@ -0,0 +1,190 @@
+"""
+分片扩缩容迁移
+按一致性哈希比较新旧拓扑，只复制归属发生变化的键对应的行：
+1. 登记迁移，之后的写入按新拓扑路由，按键读取先查新分片再查原分片（双读）；
+   迁移期间删除的行记录墓碑（见 database_sharding.track_shard_deletions）
+2. 逐个扫描会失去键区间的源分片，按主键分批把归属改变的行复制到新分片，跳过有墓碑的行，每批记录断点
+3. 新拓扑写入 ShardMigration（status=cleaning）成为正式配置，各进程从数据库读取
+4. 再次分批扫描，删除源分片上已迁走的行
+
+断点保存在 ShardMigration 中，任务中断后用相同参数再次运行会从断点继续
+"""
+
+import logging
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.db import transaction
+
+from ..models import ShardMigration
+from .database_sharding import ShardManager, shard_manager
+
+logger = logging.getLogger(__name__)
+
+
+def copy_rows(model, source: str, target: str, batch_size: int = 1000) -> int:
+    """按主键分批把 source 上的行复制到 target，target 上已存在的主键保持不变，返回扫描的行数"""
+    manager = model._base_manager.using(source)
+    pk_name = model._meta.pk.name
+    last_pk = None
+    copied = 0
+    while True:
+        batch = manager.all()
+        if last_pk is not None:
+            batch = batch.filter(pk__gt=last_pk)
+        rows = list(batch.order_by(pk_name)[:batch_size])
+        if not rows:
+            return copied
+        last_pk = rows[-1].pk
+        with transaction.atomic(using=target):
+            model._base_manager.using(target).bulk_create(rows, ignore_conflicts=True)
+        copied += len(rows)
+
+
+class ShardRebalancer:
+    """把 table_name 的水平分片（hash 策略）从当前分片列表迁移到 target_shards
+
+    model: 存放在各分片中的模型，分片键取配置中的 key_field；主键需全局唯一（如 UUID），复制时按主键去重
+    state_db: 保存迁移进度的数据库别名
+    """
+
+    def __init__(
+        self,
+        model,
+        table_name: str,
+        target_shards: List[str],
+        manager: ShardManager = shard_manager,
+        batch_size: int = 1000,
+        state_db: Optional[str] = None,
+    ):
+        config = manager.get_config(table_name)
+        if not config or config["type"] != "horizontal" or config.get("strategy", "hash") != "hash":
+            raise ValueError(f"{table_name} 不是按哈希水平分片的表")
+
+        self.model = model
+        self.table_name = table_name
+        self.manager = manager
+        self.key_field = config["key_field"]
+        self.vnodes = config.get("virtual_nodes", 160)
+        self.target_shards = list(target_shards)
+        self.batch_size = batch_size
+        self.state_db = state_db or manager.state_db
+        # 清理阶段中断后重跑时配置已是新拓扑，原分片以迁移记录为准
+        pending = self._pending()
+        self.source_shards = list(pending.source_shards if pending is not None else config["shards"])
+        self.old_ring = manager.get_ring(self.source_shards, self.vnodes)
+        self.new_ring = manager.get_ring(self.target_shards, self.vnodes)
+
+    def plan(self) -> Dict[str, Any]:
+        """迁移计划：改变归属的键空间比例以及需要扫描的源分片"""
+        ranges = self.old_ring.moved_ranges(self.new_ring)
+        flows = defaultdict(int)
+        for start, end, old, new in ranges:
+            flows[(old, new)] += end - start
+        return {
+            "moved_fraction": self.old_ring.moved_fraction(self.new_ring),
+            "moved_ranges": len(ranges),
+            "sources": sorted({old for _, _, old, _ in ranges}),
+            "flows": {f"{old}->{new}": share / self.old_ring.RING_SIZE for (old, new), share in sorted(flows.items())},
+        }
+
+    def _pending(self) -> Optional[ShardMigration]:
+        return (
+            ShardMigration.objects.using(self.state_db).filter(table_name=self.table_name).exclude(status="completed").first()
+        )
+
+    def _state(self) -> ShardMigration:
+        state = self._pending()
+        if state is None:
+            # 上一次迁移的墓碑已无用
+            self.manager.clear_tombstones(self.table_name)
+            return ShardMigration.objects.using(self.state_db).create(
+                table_name=self.table_name, source_shards=self.source_shards, target_shards=self.target_shards
+            )
+        if state.source_shards != self.source_shards or state.target_shards != self.target_shards:
+            raise ValueError(f"{self.table_name} 已有未完成的迁移: {state.source_shards} -> {state.target_shards}")
+        return state
+
+    def _moved(self, row, shard: str) -> bool:
+        return self.new_ring.get_node(getattr(row, self.key_field)) != shard
+
+    def _scan(self, state: ShardMigration, shard: str, handle, budget: Optional[int]) -> Tuple[bool, Optional[int]]:
+        """从断点继续分批扫描源分片，返回 (是否扫描完, 剩余批次预算)"""
+        manager = self.model._base_manager.using(shard)
+        pk_name = self.model._meta.pk.name
+        while budget is None or budget > 0:
+            last_pk = state.checkpoints.get(shard)
+            batch = manager.all()
+            if last_pk is not None:
+                batch = batch.filter(pk__gt=last_pk)
+            rows = list(batch.order_by(pk_name)[: self.batch_size])
+            if not rows:
+                return True, budget
+            handle(state, shard, [row for row in rows if self._moved(row, shard)])
+            state.checkpoints[shard] = rows[-1].pk
+            state.save(using=self.state_db, update_fields=["checkpoints", "copied_rows", "deleted_rows", "updated_at"])
+            if budget is not None:
+                budget -= 1
+        return False, budget
+
+    def _copy(self, state: ShardMigration, shard: str, rows: List[Any]):
+        deleted = self.manager.tombstoned(self.table_name, [row.pk for row in rows])
+        by_target = defaultdict(list)
+        for row in rows:
+            if str(row.pk) not in deleted:
+                by_target[self.new_ring.get_node(getattr(row, self.key_field))].append(row)
+        for target, target_rows in by_target.items():
+            with transaction.atomic(using=target):
+                # 迁移期间的写入已按新拓扑落在目标分片，已存在的行以目标分片为准
+                self.model._base_manager.using(target).bulk_create(target_rows, ignore_conflicts=True)
+            # 墓碑在删除之前写入：插入后再查一次，清掉与插入并发删除的行
+            deleted = self.manager.tombstoned(self.table_name, [row.pk for row in target_rows])
+            if deleted:
+                self.model._base_manager.using(target).filter(
+                    pk__in=[row.pk for row in target_rows if str(row.pk) in deleted]
+                ).delete()
+            state.copied_rows += len(target_rows) - len(deleted)
+
+    def _delete(self, state: ShardMigration, shard: str, rows: List[Any]):
+        if rows:
+            with transaction.atomic(using=shard):
+                deleted, _ = self.model._base_manager.using(shard).filter(pk__in=[row.pk for row in rows]).delete()
+            state.deleted_rows += deleted
+
+    def run(self, max_batches: Optional[int] = None) -> Dict[str, Any]:
+        """执行迁移；max_batches 限制本次运行处理的批次数，未完成时再次调用从断点继续"""
+        state = self._state()
+        sources = self.plan()["sources"]
+        budget = max_batches
+
+        if state.status == "copying":
+            self.manager.begin_migration(self.table_name, self.target_shards)
+            for shard in sources:
+                done, budget = self._scan(state, shard, self._copy, budget)
+                if not done:
+                    return self._progress(state, finished=False)
+            # 先把新拓扑持久化，之后任何进程（包括重启后）都按新拓扑读写，再删除源分片上的行
+            state.status = "cleaning"
+            state.checkpoints = {}
+            state.save(using=self.state_db, update_fields=["status", "checkpoints", "updated_at"])
+        self.manager.finish_migration(self.table_name)
+
+        for shard in sources:
+            done, budget = self._scan(state, shard, self._delete, budget)
+            if not done:
+                return self._progress(state, finished=False)
+
+        state.status = "completed"
+        state.save(using=self.state_db, update_fields=["status", "updated_at"])
+        self.manager.clear_tombstones(self.table_name)
+        logger.info(f"分片迁移完成 {self.table_name}: 复制 {state.copied_rows} 行，清理 {state.deleted_rows} 行")
+        return self._progress(state, finished=True)
+
+    def _progress(self, state: ShardMigration, finished: bool) -> Dict[str, Any]:
+        return {
+            "status": state.status,
+            "finished": finished,
+            "copied_rows": state.copied_rows,
+            "deleted_rows": state.deleted_rows,
+            "checkpoints": dict(state.checkpoints),
+        }
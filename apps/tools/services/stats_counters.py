@@ -0,0 +1,182 @@
+"""
+计数统计服务
+监控和管理后台只需要近似总数和按天的统计，不应对日志表做全表 COUNT(*)：
+
+- estimated_count: 大表在 PostgreSQL 上读取 pg_class.reltuples（ANALYZE/autovacuum 维护的估算行数）
+- exact_count: 小表的精确总数保存在 RowCounter 中，由 post_save/post_delete 信号增量维护，
+  bulk_create / queryset.update 等不发信号的批量操作调用 adjust_count，定时任务 recount 纠偏
+- daily_stat: 按天聚合的统计保存在 DailyStat 中，已结束的日期只计算一次，当天的值短时间缓存，
+  统计查询都使用时间范围条件以便走 created_at 索引
+"""
+
+import logging
+from datetime import date, datetime, time, timedelta
+from typing import Callable, Dict, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections, router, transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+def estimated_count(model, threshold: Optional[int] = None) -> int:
+    """估算表的行数；估算值低于阈值（或不是 PostgreSQL）时返回精确计数"""
+    threshold = threshold if threshold is not None else getattr(settings, "ESTIMATED_COUNT_THRESHOLD", 100000)
+    connection = connections[router.db_for_read(model)]
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(%s)",
+                [connection.ops.quote_name(model._meta.db_table)],
+            )
+            row = cursor.fetchone()
+        # 从未 ANALYZE 的表 reltuples 为 -1
+        if row and row[0] >= threshold:
+            return int(row[0])
+    return model._default_manager.count()
+
+
+# ---------------------------------------------------------------- 精确计数器
+
+_tracked_models = {}
+
+
+def counter_key(model) -> str:
+    return model._meta.label_lower
+
+
+def _on_created(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        adjust_count(sender, 1)
+
+
+def _on_deleted(sender, instance, **kwargs):
+    adjust_count(sender, -1)
+
+
+def track_count(model):
+    """为模型维护精确行数（适用于写入不频繁的小表）"""
+    uid = f"stats_counters:{counter_key(model)}"
+    _tracked_models[counter_key(model)] = model
+    post_save.connect(_on_created, sender=model, dispatch_uid=uid, weak=False)
+    post_delete.connect(_on_deleted, sender=model, dispatch_uid=uid, weak=False)
+
+
+def adjust_count(model, delta: int):
+    """事务提交后增减计数；计数行尚不存在时忽略，首次读取时会用精确计数初始化"""
+    from apps.tools.models import RowCounter
+
+    key = counter_key(model)
+    using = router.db_for_write(RowCounter)
+    transaction.on_commit(
+        lambda: RowCounter.objects.using(using).filter(key=key).update(value=F("value") + delta, updated_at=timezone.now()),
+        using=router.db_for_write(model),
+    )
+
+
+def recount(model) -> int:
+    """重新精确计数并写回"""
+    from apps.tools.models import RowCounter
+
+    value = model._default_manager.count()
+    RowCounter.objects.update_or_create(key=counter_key(model), defaults={"value": value})
+    return value
+
+
+def exact_count(model) -> int:
+    from apps.tools.models import RowCounter
+
+    value = RowCounter.objects.filter(key=counter_key(model)).values_list("value", flat=True).first()
+    return recount(model) if value is None else value
+
+
+# ---------------------------------------------------------------- 按天统计
+
+
+def _day_range(day: date):
+    start = timezone.make_aware(datetime.combine(day, time.min)) if settings.USE_TZ else datetime.combine(day, time.min)
+    return start, start + timedelta(days=1)
+
+
+def _admin_active_users(start, end) -> int:
+    from apps.users.models import UserActionLog
+
+    return UserActionLog.objects.filter(created_at__gte=start, created_at__lt=end).values("admin_user").distinct().count()
+
+
+def _active_users(start, end) -> int:
+    from apps.users.models import UserActivityLog
+
+    return UserActivityLog.objects.filter(created_at__gte=start, created_at__lt=end).values("user").distinct().count()
+
+
+def _logins(start, end) -> int:
+    from apps.users.models import UserActivityLog
+
+    return UserActivityLog.objects.filter(activity_type="login", created_at__gte=start, created_at__lt=end).count()
+
+
+def _api_calls(start, end) -> int:
+    from apps.users.models import APIUsageStats
+
+    return APIUsageStats.objects.filter(created_at__gte=start, created_at__lt=end).count()
+
+
+def _tool_usage(start, end) -> int:
+    from apps.tools.models import ToolUsageLog
+
+    return ToolUsageLog.objects.filter(created_at__gte=start, created_at__lt=end).count()
+
+
+# 统计名 -> 计算函数(当天开始时间, 次日开始时间)
+DAILY_METRICS: Dict[str, Callable] = {
+    "admin_active_users": _admin_active_users,
+    "active_users": _active_users,
+    "logins": _logins,
+    "api_calls": _api_calls,
+    "tool_usage": _tool_usage,
+}
+
+
+def daily_stat(metric: str, day: Optional[date] = None) -> int:
+    """某天的统计值；已结束的日期读取 DailyStat，当天的值缓存 DAILY_STAT_TODAY_TTL 秒"""
+    from apps.tools.models import DailyStat
+
+    if metric not in DAILY_METRICS:
+        raise ValueError(f"未知的统计项: {metric}")
+    today = timezone.localdate()
+    day = day or today
+    if day > today:
+        return 0
+
+    cache_key = f"daily_stat:{metric}:{day.isoformat()}"
+    if day == today:
+        value = cache.get(cache_key)
+        if value is not None:
+            return value
+    else:
+        row = DailyStat.objects.filter(date=day, metric=metric, is_final=True).values_list("value", flat=True).first()
+        if row is not None:
+            return row
+
+    value = DAILY_METRICS[metric](*_day_range(day))
+    DailyStat.objects.update_or_create(date=day, metric=metric, defaults={"value": value, "is_final": day < today})
+    if day == today:
+        cache.set(cache_key, value, getattr(settings, "DAILY_STAT_TODAY_TTL", 60))
+    return value
+
+
+def finalize_daily_stats(day: Optional[date] = None) -> Dict[str, int]:
+    """计算并固定某天（默认昨天）的全部统计"""
+    day = day or timezone.localdate() - timedelta(days=1)
+    return {metric: daily_stat(metric, day) for metric in DAILY_METRICS}
+
+
+def refresh_counters() -> Dict:
+    """定时任务: 纠正精确计数器的漂移，并固定昨天的按天统计"""
+    counters = {key: recount(model) for key, model in _tracked_models.items()}
+    return {"counters": counters, "daily_stats": finalize_daily_stats()}
@@ -47,14 +47,18 @@ def update_user_online_status():
         now = timezone.now()
         cutoff_time = now - timedelta(minutes=5)  # 5分钟无活动认为离线
 
+        from .services.room_presence import invalidate_users
+
         # 查找超过5分钟没有活动的在线用户
         inactive_users = UserOnlineStatus.objects.filter(is_online=True, last_seen__lt=cutoff_time)
+        user_ids = list(inactive_users.values_list("user_id", flat=True))
 
-        # 更新为离线状态
-        inactive_users.update(status="offline", is_online=False)
+        # 更新为离线状态；批量更新不发信号，手动清除相关聊天室的在线用户缓存
+        UserOnlineStatus.objects.filter(user_id__in=user_ids).update(status="offline", is_online=False)
+        invalidate_users(user_ids)
 
-        if inactive_users.exists():
-            logger.info(f"更新了 {inactive_users.count()} 个用户的在线状态为离线")
+        if user_ids:
+            logger.info(f"更新了 {len(user_ids)} 个用户的在线状态为离线")
 
         return True
     except Exception as e:
@@ -139,3 +143,13 @@ def update_plan_progress():
     """更新计划进度"""
     # 这里可以添加计划进度更新的逻辑
     # 比如根据用户的实际完成情况调整计划
+
+
+@shared_task
+def refresh_stats_counters():
+    """纠正行数计数器漂移并固定昨天的按天统计"""
+    from .services.stats_counters import refresh_counters
+
+    result = refresh_counters()
+    logger.info(f"统计计数已刷新: {result}")
+    return result
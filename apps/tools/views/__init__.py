@@ -1,73 +1,84 @@
 # views package
 
-# 从分模块的视图文件导入
-# 从legacy_views导入核心函数（避免循环导入）
-from ..legacy_views import (  # 音频转换相关; 旅行指南相关; 心链相关; 聊天相关API; 生活日记相关API; 社交订阅相关API; 抖音分析相关API; 模式相关API; 三重觉醒相关API; 食物随机选择器相关API; 页面视图; 其他常用函数
-    add_social_subscription_api,
-    admin_required,
-    audio_converter_api,
-    audio_converter_view,
-    chat_debug_view,
-    chat_enhanced,
-    check_heart_link_status_api,
-    cleanup_expired_heart_link_requests,
-    complete_daily_task_api,
-    convert_audio_file,
-    copilot_page,
-    create_code_workout_api,
-    create_copilot_collaboration_api,
-    create_exhaustion_proof_api,
-    create_fitness_workout_api,
-    create_heart_link_request_api,
-    creative_writer,
-    creative_writer_api,
-    decrypt_ncm_file,
-    disconnect_inactive_users,
-    douyin_analysis_api,
-    douyin_analyzer,
-    emo_diary,
-    emo_diary_api,
-    export_travel_guide_api,
-    fitness_api,
-    fitness_community,
-    fitness_profile,
-    fitness_tools,
-    food_randomizer,
-    format_travel_guide_for_export,
-    generate_product_preview_api,
-    generate_travel_guide,
-    generate_travel_guide_with_deepseek,
-    get_active_chat_rooms_api,
-    get_ai_dependency_api,
-    get_chat_messages_api,
-    get_douyin_analysis_api,
-    get_douyin_analysis_list_api,
-    get_notifications_api,
-    get_online_users_api,
-    get_pain_currency_api,
-    get_subscription_stats_api,
-    get_subscriptions_api,
-    get_user_preferred_mode_api,
-    get_workout_dashboard_api,
-    heart_link,
-    heart_link_chat,
-    is_admin,
-    life_diary_api,
-    mark_notification_read_api,
-    meditation_guide,
-    pause_food_randomization_api,
-    peace_meditation_view,
-    rate_food_api,
-    record_exhaustion_audio_api,
-    record_mode_click_api,
-    send_message_api,
-    start_food_randomization_api,
-    triple_awakening_dashboard,
-    update_online_status_api,
-    update_subscription_api,
-    validate_budget_range,
+# legacy_views 体积很大且依赖较多，这里不再在包导入时整体加载；
+# 通过模块级 __getattr__ 在首次访问这些名称时再从 legacy_views 导入
+_LEGACY_EXPORTS = frozenset(
+    {
+        "add_social_subscription_api",
+        "admin_required",
+        "audio_converter_api",
+        "audio_converter_view",
+        "chat_debug_view",
+        "chat_enhanced",
+        "check_heart_link_status_api",
+        "cleanup_expired_heart_link_requests",
+        "complete_daily_task_api",
+        "convert_audio_file",
+        "copilot_page",
+        "create_code_workout_api",
+        "create_copilot_collaboration_api",
+        "create_exhaustion_proof_api",
+        "create_fitness_workout_api",
+        "create_heart_link_request_api",
+        "creative_writer",
+        "creative_writer_api",
+        "decrypt_ncm_file",
+        "disconnect_inactive_users",
+        "douyin_analysis_api",
+        "douyin_analyzer",
+        "emo_diary",
+        "emo_diary_api",
+        "export_travel_guide_api",
+        "fitness_api",
+        "fitness_community",
+        "fitness_profile",
+        "fitness_tools",
+        "food_randomizer",
+        "format_travel_guide_for_export",
+        "generate_product_preview_api",
+        "generate_travel_guide",
+        "generate_travel_guide_with_deepseek",
+        "get_active_chat_rooms_api",
+        "get_ai_dependency_api",
+        "get_chat_messages_api",
+        "get_douyin_analysis_api",
+        "get_douyin_analysis_list_api",
+        "get_notifications_api",
+        "get_online_users_api",
+        "get_pain_currency_api",
+        "get_subscription_stats_api",
+        "get_subscriptions_api",
+        "get_user_preferred_mode_api",
+        "get_workout_dashboard_api",
+        "heart_link",
+        "heart_link_chat",
+        "is_admin",
+        "life_diary_api",
+        "mark_notification_read_api",
+        "meditation_guide",
+        "pause_food_randomization_api",
+        "peace_meditation_view",
+        "rate_food_api",
+        "record_exhaustion_audio_api",
+        "record_mode_click_api",
+        "send_message_api",
+        "start_food_randomization_api",
+        "triple_awakening_dashboard",
+        "update_online_status_api",
+        "update_subscription_api",
+        "validate_budget_range",
+    }
 )
 
+
+def __getattr__(name):
+    if name in _LEGACY_EXPORTS:
+        from .. import legacy_views
+
+        return getattr(legacy_views, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 # 通用文件下载视图
 
 # from .chat_views import *  # 暂时注释掉，直到修复导入问题
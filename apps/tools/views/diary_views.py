@@ -12,6 +12,7 @@ from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 
 from ..models import LifeDiaryEntry
+from ..services.diary_export import FORMATS, export_diary
 from .base import (
     BaseView,
     CachedViewMixin,
@@ -477,22 +478,21 @@ def export_diary_entries(request):
         if date_to:
             queryset = queryset.filter(date__lte=date_to)
 
-        entries = list(queryset.order_by("-date").values("title", "content", "mood", "date", "tags", "mood_note"))
-
-        if format_type == "json":
-            return JsonResponse(
-                {
-                    "entries": entries,
-                    "export_info": {
-                        "user": user.username,
-                        "export_date": timezone.now().isoformat(),
-                        "total_entries": len(entries),
-                    },
-                }
-            )
-        else:
+        if format_type not in FORMATS:
             return error_response("不支持的导出格式")
 
+        def export_info(total_entries):
+            return {"user": user.username, "export_date": timezone.now().isoformat(), "total_entries": total_entries}
+
+        # 流式输出，内存占用与日记总数无关
+        return export_diary(
+            queryset,
+            format_type,
+            f"diary_export_{timezone.now():%Y%m%d_%H%M%S}",
+            compress=bool(data.get("gzip")),
+            info=export_info,
+        )
+
     except json.JSONDecodeError:
         return error_response("无效的JSON数据")
     except Exception as e:
@@ -485,42 +485,6 @@ def add_weight_record_api(request):
         return JsonResponse({"success": False, "error": str(e)}, status=500)
 
 
-@csrf_exempt
-@require_http_methods(["GET"])
-@login_required
-def get_fitness_community_posts_api(request):
-    """获取健身社区帖子API"""
-    try:
-        # 这里应该从数据库获取健身社区帖子
-        posts_data = [
-            {
-                "id": 1,
-                "user": {"id": 1, "username": "健身达人", "avatar": "/static/img/default-avatar.svg"},
-                "content": "今天完成了深蹲训练，感觉很有成就感！",
-                "image": None,
-                "likes_count": 15,
-                "comments_count": 3,
-                "created_at": "2024-01-15 14:30",
-                "is_liked": False,
-            },
-            {
-                "id": 2,
-                "user": {"id": 2, "username": "力量训练者", "avatar": "/static/img/default-avatar.svg"},
-                "content": "卧推突破个人记录，100kg！",
-                "image": "/static/img/fitness/workout.jpg",
-                "likes_count": 28,
-                "comments_count": 8,
-                "created_at": "2024-01-15 12:15",
-                "is_liked": True,
-            },
-        ]
-
-        return JsonResponse({"success": True, "posts": posts_data})
-
-    except Exception as e:
-        return JsonResponse({"success": False, "error": str(e)}, status=500)
-
-
 @csrf_exempt
 @require_http_methods(["POST"])
 @login_required
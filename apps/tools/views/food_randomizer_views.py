@@ -16,6 +16,7 @@ from django.views.decorators.http import require_http_methods
 
 from apps.tools.models import FoodRandomizationLog
 from apps.tools.models.legacy_models import FoodHistory, FoodItem, FoodPhotoBinding, FoodRandomizationSession
+from apps.tools.services.food_sampler import fetch_foods, sample_ids
 
 logger = logging.getLogger(__name__)
 
@@ -30,41 +31,38 @@ def food_randomizer_pure_random_api(request):
         cuisine_type = data.get("cuisine_type", "all")
         meal_type = data.get("meal_type", "all")
         exclude_recent = data.get("exclude_recent", True)
+        weighted = data.get("weighted", False)  # 按受欢迎度加权抽取
 
-        # 从数据库获取活跃的食物数据 - 使用FoodItem模型
-        queryset = FoodItem.objects.all()
-
-        # 处理cuisine_type过滤
-        if cuisine_type != "all" and cuisine_type != "mixed":
-            queryset = queryset.filter(cuisine=cuisine_type)
-        # 如果是'mixed'，则不过滤cuisine类型，显示所有菜系
+        # 处理cuisine_type过滤，'mixed'不过滤cuisine类型，显示所有菜系
+        cuisine_filter = cuisine_type if cuisine_type not in ("all", "mixed") else None
 
         # 处理meal_type过滤
+        meal_filter = None
         if meal_type != "all":
             # 将'lunch'映射到'main'，因为午餐通常是主食
             if meal_type == "lunch":
                 meal_type = "main"
             # FoodItem模型使用meal_types JSON字段，需要特殊处理
             if meal_type in ["breakfast", "lunch", "dinner", "snack"]:
-                queryset = queryset.filter(meal_types__contains=[meal_type])
+                meal_filter = meal_type
 
         # 排除最近食用的食物（如果需要的话）
+        recent_food_ids = []
         if exclude_recent and request.user.is_authenticated:
             # 获取用户最近3天内食用过的食物
             recent_cutoff = datetime.now() - timedelta(days=3)
             recent_food_ids = FoodRandomizationLog.objects.filter(
                 user=request.user, created_at__gte=recent_cutoff, selected=True
             ).values_list("food_id", flat=True)
-            queryset = queryset.exclude(id__in=recent_food_ids)
 
-        # 转换为列表
-        available_foods = list(queryset)
+        # 在缓存的 id 数组上抽取选中的食物和 3 个备选，只查询抽中的几条
+        food_ids = sample_ids(cuisine_filter, meal_filter, count=4, exclude=recent_food_ids, weighted=bool(weighted))
+        foods = fetch_foods(food_ids)
 
-        if not available_foods:
+        if not foods:
             return JsonResponse({"success": False, "error": "没有找到符合条件的食物"}, status=404)
 
-        # 随机选择食物
-        selected_food = random.choice(available_foods)
+        selected_food, alternatives = foods[0], foods[1:]
 
         # 生成推荐理由
         reasons = [
@@ -79,15 +77,10 @@ def food_randomizer_pure_random_api(request):
             "维生素丰富，增强免疫力",
         ]
 
-        # 获取备选食物（除了选中的食物）
-        alternative_foods = [f for f in available_foods if f.id != selected_food.id]
-        alternatives = random.sample(alternative_foods, min(3, len(alternative_foods)))
-
         # 将选中的食物转换为字典格式 - 适配FoodItem模型
         def food_to_dict(food):
-            # 获取绑定的图片
-            binding = FoodPhotoBinding.objects.filter(food_item=food).first()
-            image_url = f"/static/img/food/{binding.photo_name}" if binding else "/static/img/food/default-food.svg"
+            # 绑定的图片已在取食物时一并查出
+            image_url = f"/static/img/food/{food.photo_name}" if food.photo_name else "/static/img/food/default-food.svg"
 
             return {
                 "id": food.id,
@@ -3,14 +3,16 @@
 用于监控应用状态
 """
 
+import hmac
 import logging
 import os
 import time
 
+from django.conf import settings
 from django.contrib.auth.decorators import login_required
 from django.core.cache import cache
 from django.db import connection
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse
 from django.shortcuts import render
 from django.utils.decorators import method_decorator
 from django.views import View
@@ -68,7 +70,9 @@ class DetailedHealthCheckView(View):
 
         # 检查系统资源
         try:
-            cpu_percent = psutil.cpu_percent(interval=1)
+            from apps.tools.services.metrics_registry import system_snapshot
+
+            cpu_percent = system_snapshot()["cpu_percent"]
             memory = psutil.virtual_memory()
             disk = psutil.disk_usage("/")
 
@@ -96,6 +100,36 @@ def detailed_health_check(request):
     return view.get(request)
 
 
+class MetricsView(View):
+    """OpenMetrics 格式的指标导出，供 Prometheus 抓取
+
+    只格式化内存中的当前值，系统/数据库/缓存指标由后台线程采样。
+    允许携带 Authorization: Bearer <METRICS_AUTH_TOKEN>、已登录的管理员，
+    或来源地址在 METRICS_ALLOWED_IPS 中的请求；其余一律拒绝
+    """
+
+    def get(self, request):
+        from apps.tools.services.metrics_registry import CONTENT_TYPE, REGISTRY
+
+        token = getattr(settings, "METRICS_AUTH_TOKEN", "")
+        if not self._allowed(request, token):
+            if token:
+                return HttpResponse("unauthorized\n", status=401, content_type="text/plain")
+            return HttpResponse("forbidden\n", status=403, content_type="text/plain")
+
+        REGISTRY.start_background_collection()
+        return HttpResponse(REGISTRY.render(), content_type=CONTENT_TYPE)
+
+    @staticmethod
+    def _allowed(request, token):
+        if token and hmac.compare_digest(request.META.get("HTTP_AUTHORIZATION", ""), f"Bearer {token}"):
+            return True
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated and user.is_staff:
+            return True
+        return request.META.get("REMOTE_ADDR") in getattr(settings, "METRICS_ALLOWED_IPS", ())
+
+
 def auto_test_status(request):
     """自动化测试状态"""
     return JsonResponse(
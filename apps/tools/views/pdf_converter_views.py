@@ -25,14 +25,19 @@ logger = logging.getLogger(__name__)
 def pdf_converter_status_api(request):
     """PDF转换器状态API - 真实实现"""
     try:
+        from ..services.pdf_conversion_jobs import job_manager
+
+        job_stats = job_manager.get_stats()
+
         # 检查转换器状态
         status_info = {
             "status": "running",
             "version": "1.0.0",
             "last_check": datetime.now().isoformat(),
             "uptime": "24小时",
-            "queue_size": 0,
-            "active_conversions": 0,
+            "queue_size": job_stats["active_conversions"],
+            "active_conversions": job_stats["active_conversions"],
+            "max_workers": job_stats["max_workers"],
         }
 
         # 检查各个功能模块的可用性
@@ -67,6 +72,7 @@ def pdf_converter_stats_api(request):
         from django.db.models import Avg
 
         from ..models.legacy_models import PDFConversionRecord
+        from ..services.pdf_conversion_cache import result_cache
 
         # 获取所有转换记录（全站统计）
         if request.user.is_authenticated:
@@ -156,6 +162,7 @@ def pdf_converter_stats_api(request):
             "total_files": total_conversions,  # 添加总文件数
             "avg_speed": avg_speed,  # 保持兼容性
             "avg_conversion_time": avg_speed,  # 添加兼容性字段
+            "conversion_cache": result_cache.get_stats(),  # 转换结果缓存命中率
         }
 
         return JsonResponse({"success": True, "stats": stats_data})
@@ -254,6 +261,222 @@ def pdf_converter_batch(request):
         return JsonResponse({"success": False, "error": f"批量转换失败: {str(e)}"}, status=500)
 
 
+@csrf_exempt
+@require_http_methods(["POST"])
+def pdf_conversion_job_submit_api(request):
+    """提交PDF转换任务 - 转换在独立进程池中执行，立即返回任务ID"""
+    try:
+        from ..pdf_converter_api import PDFConverter
+        from ..services.pdf_conversion_jobs import JOB_CONVERSION_TYPES, job_manager
+        from ..services.pdf_page_renderer import normalize_render_options
+
+        conversion_type = request.POST.get("type", "")
+        if conversion_type not in JOB_CONVERSION_TYPES:
+            return JsonResponse({"success": False, "error": f"不支持的转换类型: {conversion_type}"}, status=400)
+
+        if "file" not in request.FILES:
+            return JsonResponse({"success": False, "error": "没有上传文件"}, status=400)
+        file = request.FILES["file"]
+
+        is_valid, message = PDFConverter().validate_file(file, JOB_CONVERSION_TYPES[conversion_type])
+        if not is_valid:
+            return JsonResponse({"success": False, "error": message}, status=400)
+
+        params = {}
+        if conversion_type == "pdf-to-image":
+            try:
+                dpi, image_format, quality = normalize_render_options(
+                    request.POST.get("dpi", 150), request.POST.get("format", "png"), request.POST.get("quality", 85)
+                )
+            except ValueError as e:
+                return JsonResponse({"success": False, "error": f"无效的渲染参数: {e}"}, status=400)
+            params = {"dpi": dpi, "format": image_format, "quality": quality}
+
+        job = job_manager.submit(file, conversion_type, user=request.user, params=params)
+
+        return JsonResponse(
+            {
+                "success": True,
+                "job_id": job["id"],
+                "status": job["status"],
+                "cached": job["cached"],
+                "status_url": f"/tools/api/pdf-converter/jobs/{job['id']}/",
+            },
+            status=202 if job["status"] != "completed" else 200,
+        )
+
+    except Exception as e:
+        logger.error(f"提交PDF转换任务失败: {str(e)}")
+        return JsonResponse({"success": False, "error": f"提交任务失败: {str(e)}"}, status=500)
+
+
+@require_http_methods(["GET"])
+def pdf_conversion_job_status_api(request, job_id):
+    """查询PDF转换任务状态和逐页进度"""
+    from ..services.pdf_conversion_jobs import job_manager
+
+    job = job_manager.get_job(job_id)
+    if not job:
+        return JsonResponse({"success": False, "error": "任务不存在或已过期"}, status=404)
+
+    response_data = {
+        "success": True,
+        "job_id": job["id"],
+        "status": job["status"],
+        "progress": job["progress"],
+        "current_step": job["current_step"],
+        "current_page": job["current_page"],
+        "total_pages": job["total_pages"],
+        "conversion_type": job["conversion_type"],
+        "original_filename": job["original_filename"],
+        "queue_time": job["queue_time"],
+        "conversion_time": job["conversion_time"],
+        "cached": job["cached"],
+    }
+    if job["status"] == "completed":
+        response_data["download_url"] = job["download_url"]
+        response_data["filename"] = job["filename"]
+    elif job["status"] == "failed":
+        response_data["error"] = job["error"]
+
+    return JsonResponse(response_data)
+
+
+PAGE_IMAGE_CONTENT_TYPES = {"png": "image/png", "jpeg": "image/jpeg", "webp": "image/webp"}
+
+
+def _page_render_options(params):
+    from ..services.pdf_page_renderer import normalize_render_options
+
+    return normalize_render_options(params.get("dpi", 150), params.get("format", "png"), params.get("quality", 85))
+
+
+def _page_image_url(doc_id, page_number, dpi, image_format, quality):
+    return f"/tools/api/pdf-converter/pages/{doc_id}/{page_number}/?dpi={dpi}&format={image_format}&quality={quality}"
+
+
+@csrf_exempt
+@login_required
+@require_http_methods(["POST"])
+def pdf_pages_upload_api(request):
+    """上传PDF并返回逐页图片URL
+
+    lazy=1（默认）时只保存原文件，页面在首次访问时渲染；lazy=0时并行渲染全部页面。
+    上传的文档超过 PDF_PAGES_MAX_AGE 未访问或总大小超过 PDF_PAGES_MAX_BYTES 时被淘汰
+    """
+    try:
+        import hashlib
+
+        from django.core.files.storage import default_storage
+
+        from ..services.pdf_page_renderer import count_pages, evict_page_documents, render_pdf_pages, touch_document
+
+        if "file" not in request.FILES:
+            return JsonResponse({"success": False, "error": "没有上传文件"}, status=400)
+        file = request.FILES["file"]
+        if not file.name.lower().endswith(".pdf"):
+            return JsonResponse({"success": False, "error": "请上传PDF文件"}, status=400)
+        max_upload_bytes = getattr(settings, "PDF_PAGES_MAX_UPLOAD_BYTES", 50 * 1024 * 1024)
+        if file.size > max_upload_bytes:
+            return JsonResponse(
+                {"success": False, "error": f"文件大小不能超过{max_upload_bytes // 1024 // 1024}MB"}, status=413
+            )
+
+        try:
+            dpi, image_format, quality = _page_render_options(request.POST)
+        except ValueError as e:
+            return JsonResponse({"success": False, "error": f"无效的渲染参数: {e}"}, status=400)
+
+        digest = hashlib.sha256()
+        for chunk in file.chunks():
+            digest.update(chunk)
+        doc_id = digest.hexdigest()[:32]
+
+        # 相同内容的PDF只保存一份
+        source_name = f"converted/pages/{doc_id}/source.pdf"
+        if not default_storage.exists(source_name):
+            default_storage.save(source_name, file)
+        source_path = default_storage.path(source_name)
+        touch_document(os.path.dirname(source_path))
+        evict_page_documents(
+            default_storage.path("converted/pages"),
+            getattr(settings, "PDF_PAGES_MAX_AGE", 24 * 60 * 60),
+            getattr(settings, "PDF_PAGES_MAX_BYTES", 1024 * 1024 * 1024),
+            protect=doc_id,
+        )
+        total_pages = count_pages(source_path)
+
+        lazy = request.POST.get("lazy", "1") != "0"
+        rendered = {}
+        if not lazy:
+            output_dir = default_storage.path(f"converted/pages/{doc_id}/{dpi}_{quality}")
+            for page in render_pdf_pages(source_path, output_dir, dpi, image_format, quality):
+                rendered[page["page"]] = page
+
+        pages = []
+        for page_number in range(1, total_pages + 1):
+            item = {"page": page_number, "url": _page_image_url(doc_id, page_number, dpi, image_format, quality)}
+            if page_number in rendered:
+                item.update(
+                    width=rendered[page_number]["width"],
+                    height=rendered[page_number]["height"],
+                    size=rendered[page_number]["size"],
+                )
+            pages.append(item)
+
+        return JsonResponse(
+            {
+                "success": True,
+                "doc_id": doc_id,
+                "total_pages": total_pages,
+                "dpi": dpi,
+                "format": image_format,
+                "lazy": lazy,
+                "pages": pages,
+            }
+        )
+
+    except Exception as e:
+        logger.error(f"PDF逐页渲染失败: {str(e)}")
+        return JsonResponse({"success": False, "error": f"渲染失败: {str(e)}"}, status=500)
+
+
+@require_http_methods(["GET"])
+def pdf_page_image_view(request, doc_id, page_number):
+    """返回单页图片，未渲染过的页面在此时按需渲染"""
+    from django.core.files.storage import default_storage
+
+    from ..services.pdf_page_renderer import page_filename, render_page_range, touch_document
+
+    if len(doc_id) != 32 or any(c not in "0123456789abcdef" for c in doc_id):
+        raise Http404("文件不存在")
+
+    source_name = f"converted/pages/{doc_id}/source.pdf"
+    if not default_storage.exists(source_name):
+        raise Http404("文件不存在")
+
+    try:
+        dpi, image_format, quality = _page_render_options(request.GET)
+    except ValueError as e:
+        return JsonResponse({"success": False, "error": f"无效的渲染参数: {e}"}, status=400)
+
+    output_dir = default_storage.path(f"converted/pages/{doc_id}/{dpi}_{quality}")
+    image_path = os.path.join(output_dir, page_filename(page_number, image_format))
+    touch_document(os.path.dirname(output_dir))
+    if not os.path.exists(image_path):
+        from ..services.pdf_page_renderer import count_pages
+
+        source_path = default_storage.path(source_name)
+        if not 1 <= page_number <= count_pages(source_path):
+            raise Http404("页码超出范围")
+        render_page_range(source_path, [page_number], output_dir, dpi, image_format, quality)
+
+    response = FileResponse(open(image_path, "rb"), content_type=PAGE_IMAGE_CONTENT_TYPES[image_format])
+    # 同一文档、同一参数的页面内容不会变化
+    response["Cache-Control"] = "public, max-age=86400"
+    return response
+
+
 def pdf_download_view(request, filename):
     """PDF文件下载视图 - 真实实现"""
     try:
@@ -15,6 +15,7 @@ from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 
 from apps.content.views import admin_required
+from apps.tools.services.stats_counters import daily_stat, exact_count
 
 from .forms import ProfileEditForm, UserRegistrationForm
 from .models import Profile, UserActionLog, UserActivityLog, UserMembership, UserRole, UserSessionStats, UserStatus, UserTheme
@@ -303,7 +304,7 @@ def admin_user_management(request):
 
     from django.utils import timezone
 
-    total_users = User.objects.count()
+    total_users = exact_count(User)
     active_users = User.objects.filter(is_active=True).count()
 
     # VIP用户统计
@@ -584,17 +585,13 @@ def admin_user_monitoring(request):
 
     from .models import APIUsageStats, UserActivityLog, UserSessionStats
 
-    # 获取今日数据
-    today = timezone.now().date()
-
-    # 今日活跃用户
-    today_active_users = UserActivityLog.objects.filter(created_at__date=today).values("user").distinct().count()
-
-    # 今日登录次数
-    today_logins = UserActivityLog.objects.filter(activity_type="login", created_at__date=today).count()
+    # 获取今日数据（按时间范围过滤以使用 created_at 索引）
+    today_start = timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0)
 
-    # 今日API调用次数
-    today_api_calls = APIUsageStats.objects.filter(created_at__date=today).count()
+    # 今日活跃用户、登录次数、API调用次数（按天统计，短时间缓存）
+    today_active_users = daily_stat("active_users")
+    today_logins = daily_stat("logins")
+    today_api_calls = daily_stat("api_calls")
 
     # 当前在线用户
     online_users = UserSessionStats.objects.filter(
@@ -606,7 +603,7 @@ def admin_user_monitoring(request):
 
     # API使用统计
     api_stats = (
-        APIUsageStats.objects.filter(created_at__date=today)
+        APIUsageStats.objects.filter(created_at__gte=today_start)
         .values("endpoint", "method")
         .annotate(count=Count("id"), avg_response_time=Avg("response_time"))
         .order_by("-count")[:10]
@@ -644,17 +641,13 @@ def admin_monitoring_stats_api(request):
     from .models import APIUsageStats, UserActivityLog, UserSessionStats
 
     try:
-        # 获取今日数据
-        today = timezone.now().date()
-
-        # 今日活跃用户
-        today_active_users = UserActivityLog.objects.filter(created_at__date=today).values("user").distinct().count()
-
-        # 今日登录次数
-        today_logins = UserActivityLog.objects.filter(activity_type="login", created_at__date=today).count()
+        # 获取今日数据（按时间范围过滤以使用 created_at 索引）
+        today_start = timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0)
 
-        # 今日API调用次数
-        today_api_calls = APIUsageStats.objects.filter(created_at__date=today).count()
+        # 今日活跃用户、登录次数、API调用次数（按天统计，短时间缓存）
+        today_active_users = daily_stat("active_users")
+        today_logins = daily_stat("logins")
+        today_api_calls = daily_stat("api_calls")
 
         # 当前在线用户
         online_users = UserSessionStats.objects.filter(
@@ -679,7 +672,7 @@ def admin_monitoring_stats_api(request):
 
         # API使用统计
         api_stats = (
-            APIUsageStats.objects.filter(created_at__date=today)
+            APIUsageStats.objects.filter(created_at__gte=today_start)
             .values("endpoint", "method")
             .annotate(count=Count("id"), avg_response_time=Avg("response_time"))
             .order_by("-count")[:10]
@@ -88,6 +88,8 @@ MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
+    # 读写分离：写入后的粘滞窗口内读主库
+    "apps.tools.services.database_sharding.PrimaryPinningMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
@@ -145,6 +147,18 @@ DATABASES = {
     }
 }
 
+# 只读副本：DB_REPLICA_HOSTS 为逗号分隔的副本主机，依次注册为 replica_1、replica_2 ... 别名，
+# 读取按复制延迟分散到副本，写入及写入后 PRIMARY_STICKY_SECONDS 秒内的读取走主库
+DATABASE_REPLICAS = {}
+_replica_hosts = [host.strip() for host in os.environ.get("DB_REPLICA_HOSTS", "").split(",") if host.strip()]
+for _index, _host in enumerate(_replica_hosts, 1):
+    DATABASES[f"replica_{_index}"] = {**DATABASES["default"], "HOST": _host, "TEST": {"MIRROR": "default"}}
+    DATABASE_REPLICAS.setdefault("default", []).append(f"replica_{_index}")
+DATABASE_ROUTERS = ["apps.tools.services.database_sharding.ShardRouter"] if DATABASE_REPLICAS else []
+REPLICA_MAX_LAG_SECONDS = 5.0
+REPLICA_LAG_CHECK_INTERVAL = 5
+PRIMARY_STICKY_SECONDS = 10
+
 # Redis缓存配置
 CACHES = {
     "default": {
@@ -279,6 +293,62 @@ CELERY_TIMEZONE = "Asia/Shanghai"
 CELERY_TASK_TRACK_STARTED = True
 CELERY_TASK_TIME_LIMIT = 30 * 60
 
+# PDF转换进程池配置
+PDF_CONVERSION_WORKERS = int(os.environ.get("PDF_CONVERSION_WORKERS", 2))
+PDF_CONVERSION_TIME_LIMIT = 10 * 60  # 单个转换任务最长10分钟
+PDF_CONVERSION_MEMORY_LIMIT_MB = 1024  # 单个转换进程内存上限
+PDF_CONVERSION_MAX_TASKS_PER_CHILD = 20  # 转换进程处理20个任务后重建，避免内存泄漏
+# PDF转换结果缓存（按内容哈希复用，超出上限时按最近访问时间淘汰）
+PDF_CONVERSION_CACHE_MAX_BYTES = int(os.environ.get("PDF_CONVERSION_CACHE_MAX_BYTES", 2 * 1024 * 1024 * 1024))
+PDF_CONVERSION_CACHE_MAX_ENTRIES = 5000
+# 逐页图片接口上传的文档：单个文件大小上限，超过保留时间未访问或总大小超限时淘汰
+PDF_PAGES_MAX_UPLOAD_BYTES = 50 * 1024 * 1024
+PDF_PAGES_MAX_AGE = 24 * 60 * 60
+PDF_PAGES_MAX_BYTES = int(os.environ.get("PDF_PAGES_MAX_BYTES", 1024 * 1024 * 1024))
+
+# 后台任务（异步生成测试用例等）配置
+ASYNC_TASK_WORKERS = int(os.environ.get("ASYNC_TASK_WORKERS", 4))  # 每个进程的任务线程数
+ASYNC_TASK_HEARTBEAT_SECONDS = 30
+ASYNC_TASK_LEASE_SECONDS = 120  # 心跳超过该时间的任务视为执行进程已退出，重新排队
+ASYNC_TASK_MAX_ATTEMPTS = 2
+ASYNC_TASK_TIMEOUT_HOURS = 1
+
+# 食品图像识别推理配置（后端: torchscript / eager / onnx）
+FOOD_RECOGNITION_BACKEND = os.environ.get("FOOD_RECOGNITION_BACKEND", "torchscript")
+FOOD_RECOGNITION_ONNX_PATH = os.environ.get("FOOD_RECOGNITION_ONNX_PATH", "")
+FOOD_RECOGNITION_THREADS = int(os.environ.get("FOOD_RECOGNITION_THREADS", 0)) or None
+FOOD_RECOGNITION_MAX_BATCH = 16
+FOOD_RECOGNITION_BATCH_WAIT_MS = 10
+
+# 监控指标时序存储目录（每个指标按 1m/1h/1d 精度各一个固定大小的环形缓冲文件）
+METRICS_TIMESERIES_DIR = os.environ.get("METRICS_TIMESERIES_DIR", str(BASE_DIR / "data" / "metrics"))
+
+# /metrics 指标导出（后台采样间隔秒数）；抓取需携带 Authorization: Bearer <token>，
+# 或以管理员登录，或来源地址在 METRICS_ALLOWED_IPS（逗号分隔）中，否则拒绝
+METRICS_COLLECT_INTERVAL = 15
+METRICS_AUTH_TOKEN = os.environ.get("METRICS_AUTH_TOKEN", "")
+METRICS_ALLOWED_IPS = [ip.strip() for ip in os.environ.get("METRICS_ALLOWED_IPS", "").split(",") if ip.strip()]
+
+# 计数统计：估算行数超过该值的表直接使用 PostgreSQL 估算值；当天的按天统计缓存秒数
+ESTIMATED_COUNT_THRESHOLD = 100000
+DAILY_STAT_TODAY_TTL = 60
+
+# 批量清理：批次间最短间隔秒数；从库复制延迟超过该秒数时暂停删除
+PURGE_BATCH_PAUSE_SECONDS = 0.05
+PURGE_MAX_REPLICATION_LAG = 5.0
+
+# 分享链接点击计数写回数据库的间隔秒数（<=0 时不启动后台线程）；EAGER 时每次点击立即写回
+SHARE_CLICK_FLUSH_INTERVAL = 5
+SHARE_CLICKS_EAGER = False
+
+# 分片查询：并发查询各分片的最大线程数
+SHARD_QUERY_MAX_WORKERS = 8
+# 分片扩缩容迁移进度保存的数据库
+SHARD_MIGRATION_STATE_DB = "default"
+
+# 聊天室在线用户列表的缓存秒数（在线状态变化时主动失效）
+ROOM_PRESENCE_CACHE_SECONDS = 5
+
 # 缓存配置
 CACHEOPS_REDIS = os.environ.get("REDIS_URL", "redis://127.0.0.1:6379/4")
 CACHEOPS_DEFAULTS = {"timeout": 60 * 15}
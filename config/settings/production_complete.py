@@ -114,7 +114,7 @@ MIDDLEWARE.extend(
 # 添加自定义中间件（如果存在）
 custom_middleware = [
     "apps.users.middleware.UserActivityMiddleware",
-    "middleware.performance.PerformanceMiddleware",
+    "middleware.performance.PerformanceMonitoringMiddleware",
 ]
 
 for middleware in custom_middleware:
@@ -49,11 +49,19 @@ STATICFILES_STORAGE = "django.contrib.staticfiles.storage.StaticFilesStorage"
 
 # 媒体文件配置
 MEDIA_ROOT = "/tmp/qatoolbox_test_media"
+METRICS_TIMESERIES_DIR = "/tmp/qatoolbox_test_metrics"
+METRICS_BACKGROUND_COLLECTION = False
+PURGE_BATCH_PAUSE_SECONDS = 0
 
 # Celery配置
 CELERY_TASK_ALWAYS_EAGER = True
 CELERY_TASK_EAGER_PROPAGATES = True
 
+# PDF转换任务和后台任务在测试中同步执行
+PDF_CONVERSION_JOBS_EAGER = True
+ASYNC_TASKS_EAGER = True
+SHARE_CLICKS_EAGER = True
+
 # 允许的主机
 ALLOWED_HOSTS = ["testserver", "localhost", "127.0.0.1"]
 
@@ -79,6 +79,9 @@ STATICFILES_STORAGE = "django.contrib.staticfiles.storage.StaticFilesStorage"
 
 # 测试环境媒体文件
 MEDIA_ROOT = "/tmp/qatoolbox_test_media"
+METRICS_TIMESERIES_DIR = "/tmp/qatoolbox_test_metrics"
+METRICS_BACKGROUND_COLLECTION = False
+PURGE_BATCH_PAUSE_SECONDS = 0
 
 # 测试环境日志配置
 LOGGING = LOGGING.copy()  # 从base.py继承LOGGING配置
@@ -91,6 +94,11 @@ LOGGING["loggers"]["apps.users"]["level"] = "WARNING"
 CELERY_TASK_ALWAYS_EAGER = True
 CELERY_TASK_EAGER_PROPAGATES = True
 
+# PDF转换任务和后台任务在测试中同步执行
+PDF_CONVERSION_JOBS_EAGER = True
+ASYNC_TASKS_EAGER = True
+SHARE_CLICKS_EAGER = True
+
 # 禁用调试工具栏
 INSTALLED_APPS = [app for app in INSTALLED_APPS if app != "debug_toolbar"]
 MIDDLEWARE = [mw for mw in MIDDLEWARE if "debug_toolbar" not in mw]
@@ -6,6 +6,7 @@ from django.core.cache import cache
 from django.db import connection
 from django.http import JsonResponse
 
+from apps.tools.services.metrics_registry import HTTP_EXCEPTIONS, REGISTRY, observe_request, view_name
 from utils.database_optimizer import db_monitor
 
 logger = logging.getLogger(__name__)
@@ -18,17 +19,20 @@ class PerformanceMonitoringMiddleware:
         self.get_response = get_response
         self.slow_request_threshold = getattr(settings, "SLOW_REQUEST_THRESHOLD", 2.0)
         self.enable_monitoring = getattr(settings, "ENABLE_PERFORMANCE_MONITORING", True)
+        REGISTRY.start_background_collection()
 
     def __call__(self, request):
+        # 请求指标始终写入注册表，供 /metrics 导出
+        started = time.perf_counter()
         if not self.enable_monitoring:
-            return self.get_response(request)
+            return self._observed_response(request, started)
 
         # 记录请求开始
         start_time = time.time()
         start_queries = len(connection.queries)
 
         # 处理请求
-        response = self.get_response(request)
+        response = self._observed_response(request, started)
 
         # 计算性能指标
         execution_time = time.time() - start_time
@@ -44,6 +48,16 @@ class PerformanceMonitoringMiddleware:
 
         return response
 
+    def _observed_response(self, request, started):
+        try:
+            response = self.get_response(request)
+        except Exception:
+            HTTP_EXCEPTIONS.labels(view_name(request)).inc()
+            observe_request(request.method, view_name(request), 500, time.perf_counter() - started)
+            raise
+        observe_request(request.method, view_name(request), response.status_code, time.perf_counter() - started)
+        return response
+
     def _log_performance(self, request, response, execution_time, query_count):
         """记录性能指标"""
         # 基本信息
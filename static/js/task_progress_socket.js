@@ -0,0 +1,76 @@
+/**
+ * 后台任务进度订阅
+ * 通过 /ws/tasks/<任务ID>/ 接收服务端推送的进度事件，断线后带上最后收到的事件ID重连补齐进度；
+ * 浏览器不支持WebSocket或多次连接失败时调用 onFallback，由页面退回轮询
+ *
+ * 用法:
+ *   const watcher = watchTaskProgress(taskId, {
+ *       onProgress: event => {},   // {id, status, progress, step, created_at}
+ *       onFinished: event => {},   // 任务结束（completed / failed / cancelled）
+ *       onFallback: () => {},
+ *   });
+ *   watcher.close();
+ */
+
+function watchTaskProgress(taskId, handlers) {
+    const TERMINAL_STATUSES = ['completed', 'failed', 'cancelled'];
+    const MAX_RETRIES = 5;
+    let lastEventId = 0;
+    let retries = 0;
+    let finished = false;
+    let closed = false;
+    let socket = null;
+
+    function fallback() {
+        if (!closed && handlers.onFallback) {
+            handlers.onFallback();
+        }
+        closed = true;
+    }
+
+    function connect() {
+        const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
+        socket = new WebSocket(`${protocol}//${window.location.host}/ws/tasks/${taskId}/?last_event_id=${lastEventId}`);
+
+        socket.onopen = () => {
+            retries = 0;
+        };
+
+        socket.onmessage = (message) => {
+            const data = JSON.parse(message.data);
+            if (data.type !== 'task_progress') return;
+
+            const event = data.event;
+            lastEventId = Math.max(lastEventId, event.id);
+            if (handlers.onProgress) handlers.onProgress(event);
+            if (TERMINAL_STATUSES.includes(event.status)) {
+                finished = true;
+                if (handlers.onFinished) handlers.onFinished(event);
+            }
+        };
+
+        socket.onclose = (event) => {
+            if (finished || closed) return;
+            // 4404: 任务不存在
+            if (event.code === 4404 || retries >= MAX_RETRIES) {
+                fallback();
+                return;
+            }
+            retries += 1;
+            setTimeout(connect, Math.min(1000 * 2 ** (retries - 1), 10000));
+        };
+    }
+
+    if (!('WebSocket' in window)) {
+        fallback();
+    } else {
+        connect();
+    }
+
+    return {
+        close() {
+            closed = true;
+            if (socket) socket.close();
+        },
+    };
+}
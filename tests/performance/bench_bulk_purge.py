@@ -0,0 +1,91 @@
+"""
+批量清理基准测试
+对比旧的 “filter[:batch] -> exists -> values_list -> delete” 循环与按主键分批的 BulkPurger
+
+SQLite 删除后立即回收索引项，旧循环每轮从头扫描的代价在这里很小；
+PostgreSQL 上已删除的行在 VACUUM 之前仍留在索引中，旧循环每一批都要重新跳过之前所有批次的死元组
+
+用法:
+    DJANGO_SETTINGS_MODULE=config.settings.test_minimal python tests/performance/bench_bulk_purge.py [行数]
+"""
+
+import os
+import sys
+import time
+from datetime import timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.test_minimal")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.contrib.auth.models import User  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.db.models import Q  # noqa: E402
+from django.utils import timezone  # noqa: E402
+
+from apps.tools.models import RowCounter, ToolUsageLog  # noqa: E402
+from apps.tools.services.bulk_purge import BulkPurger  # noqa: E402
+
+BATCH_SIZE = 1000
+
+
+def populate(rows):
+    """每3行中有2行过期"""
+    ToolUsageLog.objects.all().delete()
+    user = User.objects.first()
+    ToolUsageLog.objects.bulk_create(
+        [ToolUsageLog(user=user, tool_type="PDF_CONVERTER", input_data="{}") for _ in range(rows)], batch_size=5000
+    )
+    ids = ToolUsageLog.objects.values_list("id", flat=True)
+    old = [pk for i, pk in enumerate(ids) if i % 3]
+    for start in range(0, len(old), 5000):
+        ToolUsageLog.objects.filter(id__in=old[start : start + 5000]).update(created_at=timezone.now() - timedelta(days=100))
+    return len(old)
+
+
+def legacy_purge(cutoff):
+    """基线实现：与改造前的 _cleanup_tool_usage_logs 一致"""
+    deleted = 0
+    while True:
+        batch = ToolUsageLog.objects.filter(created_at__lt=cutoff)[:BATCH_SIZE]
+        if not batch.exists():
+            break
+        batch_ids = list(batch.values_list("id", flat=True))
+        ToolUsageLog.objects.filter(id__in=batch_ids).delete()
+        deleted += len(batch_ids)
+    return deleted
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    with connection.schema_editor() as editor:
+        for model in (User, RowCounter, ToolUsageLog):
+            editor.create_model(model)
+    User.objects.create_user("bench", password="x")
+    cutoff = timezone.now() - timedelta(days=90)
+
+    results = []
+    expected = populate(rows)
+    started = time.perf_counter()
+    deleted = legacy_purge(cutoff)
+    results.append(("legacy loop", deleted, time.perf_counter() - started))
+
+    assert populate(rows) == expected
+    started = time.perf_counter()
+    deleted = BulkPurger(ToolUsageLog, batch_size=BATCH_SIZE, pause=0, throttle_ratio=0).purge(Q(created_at__lt=cutoff))[
+        "deleted_count"
+    ]
+    results.append(("BulkPurger", deleted, time.perf_counter() - started))
+
+    print(f"{rows} 行，其中 {expected} 行过期，批大小 {BATCH_SIZE}（SQLite 内存库）")
+    print(f"{'实现':<14}{'删除行数':>10}{'耗时(s)':>10}{'行/秒':>12}")
+    for name, deleted, elapsed in results:
+        assert deleted == expected, (name, deleted, expected)
+        print(f"{name:<14}{deleted:>10}{elapsed:>10.2f}{deleted / elapsed:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
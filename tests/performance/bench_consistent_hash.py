@@ -0,0 +1,59 @@
+"""
+分片键迁移比例基准测试
+对比取模分片与一致性哈希环从 4 个分片扩容到 5 个分片时需要迁移的键比例，以及各分片的负载偏差
+
+用法:
+    DJANGO_SETTINGS_MODULE=config.settings.test_minimal python tests/performance/bench_consistent_hash.py [键数量]
+"""
+
+import os
+import statistics
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.test_minimal")
+
+import django  # noqa: E402
+
+django.setup()
+
+from apps.tools.services.database_sharding import ConsistentHashRing, hash_key  # noqa: E402
+
+OLD = [f"user_shard_{i}" for i in range(1, 5)]
+NEW = OLD + ["user_shard_5"]
+
+
+def modulo(shards):
+    return lambda key: shards[hash_key(key) % len(shards)]
+
+
+def imbalance(assign, keys):
+    """各分片键数量相对平均值的最大偏差"""
+    counts = Counter(assign(key) for key in keys)
+    mean = statistics.mean(counts.values())
+    return max(abs(c - mean) for c in counts.values()) / mean
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    keys = list(range(1, total + 1))
+
+    strategies = [("取模", modulo(OLD), modulo(NEW), None)]
+    for vnodes in (1, 40, 160):
+        old_ring, new_ring = ConsistentHashRing(OLD, vnodes), ConsistentHashRing(NEW, vnodes)
+        strategies.append((f"哈希环 vnodes={vnodes}", old_ring.get_node, new_ring.get_node, old_ring.moved_fraction(new_ring)))
+
+    print(f"{total} 个用户ID，{len(OLD)} -> {len(NEW)} 个分片（理想迁移比例 {1 / len(NEW):.1%}）")
+    print(f"{'策略':<20}{'迁移键比例':>12}{'键空间比例':>12}{'负载偏差':>10}{'查找(us)':>10}")
+    for name, old, new, fraction in strategies:
+        started = time.perf_counter()
+        moved = sum(old(key) != new(key) for key in keys)
+        lookup_us = (time.perf_counter() - started) / (2 * total) * 1e6
+        space = f"{fraction:.1%}" if fraction is not None else "-"
+        print(f"{name:<20}{moved / total:>12.1%}{space:>12}{imbalance(new, keys):>10.1%}{lookup_us:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
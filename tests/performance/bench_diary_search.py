@@ -0,0 +1,103 @@
+"""
+日记检索基准测试
+对比旧的 icontains 查询（按用户过滤后逐行做 LIKE 子串匹配）与 FTS5 trigram 索引检索
+
+用法:
+    DJANGO_SETTINGS_MODULE=config.settings.test_minimal python tests/performance/bench_diary_search.py [用户数] [每用户天数]
+"""
+
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.test_minimal")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.contrib.auth.models import User  # noqa: E402
+from django.db import connection, models  # noqa: E402
+
+from apps.tools.models import LifeDiaryEntry  # noqa: E402
+from apps.tools.services.diary_search import DiarySearch, install_search_index  # noqa: E402
+
+WORDS = "今天 早上 工作 开会 朋友 吃饭 跑步 爬山 读书 电影 加班 下雨 晴天 咖啡 地铁 周末 旅行 学习 项目 代码".split()
+QUERIES = ["爬山", "咖啡 地铁", "项目代码", "performance", "没有这个词"]
+ROUNDS = 20
+
+
+def populate(users, days):
+    random.seed(7)
+    start = date(2020, 1, 1)
+    owners = User.objects.bulk_create([User(username=f"bench{i}") for i in range(users)])
+    for user in owners:
+        LifeDiaryEntry.objects.bulk_create(
+            [
+                LifeDiaryEntry(
+                    user=user,
+                    date=start + timedelta(days=day),
+                    title="".join(random.sample(WORDS, 2)),
+                    content="，".join("".join(random.sample(WORDS, 3)) for _ in range(12))
+                    + (" performance" if day % 97 == 0 else ""),
+                    mood="happy",
+                )
+                for day in range(days)
+            ],
+            batch_size=2000,
+        )
+    return owners
+
+
+def legacy_search(user, query):
+    """基线实现：改造前的查询（去掉已删除的 mood_note 字段）"""
+    return list(
+        LifeDiaryEntry.objects.filter(user=user)
+        .filter(models.Q(title__icontains=query) | models.Q(content__icontains=query))
+        .order_by("-date")[:50]
+    )
+
+
+def timed(func):
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        func()
+    return (time.perf_counter() - started) / ROUNDS * 1000
+
+
+def main():
+    users = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    days = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    with connection.schema_editor() as editor:
+        for model in (User, LifeDiaryEntry):
+            editor.create_model(model)
+    install_search_index(connection)
+    owners = populate(users, days)
+    user = owners[len(owners) // 2]
+    search = DiarySearch()
+
+    legacy_sql, legacy_params = (
+        LifeDiaryEntry.objects.filter(user=user)
+        .filter(models.Q(title__icontains="x") | models.Q(content__icontains="x"))
+        .order_by("-date")[:50]
+        .query.sql_with_params()
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {legacy_sql}", legacy_params)
+        print("旧查询计划:", " / ".join(row[-1] for row in cursor.fetchall()))
+
+    print(f"{users * days} 篇日记（{users} 个用户 × {days} 天），每个查询 {ROUNDS} 次取平均（SQLite 内存库）")
+    print(f"{'检索词':<14}{'旧(ms)':>10}{'命中':>6}{'FTS(ms)':>10}{'命中':>6}")
+    for query in QUERIES:
+        legacy_ms = timed(lambda: legacy_search(user, query))
+        legacy_hits = len(legacy_search(user, query)) if " " not in query else "-"
+        fts_ms = timed(lambda: search.search(user, query=query))
+        fts_hits = len(search.search(user, query=query)["results"])
+        print(f"{query:<14}{legacy_ms:>10.2f}{legacy_hits:>6}{fts_ms:>10.2f}{fts_hits:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+食品图片解析基准测试
+对比原来逐个键扫描的 get_food_image 与索引化解析（不经过 LRU），映射表从 100 增长到 100k 个键；
+查询名称一半能匹配（映射键加上前后缀），一半匹配不到
+
+用法:
+    python tests/performance/bench_food_image_resolver.py
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from apps.tools.services.food_image_resolver import FoodImageResolver  # noqa: E402
+
+SIZES = (100, 1_000, 10_000, 100_000)
+FALLBACKS = {"default": "default.jpg", "chinese": "chinese.jpg"}
+# 常用汉字区间，随机组合成菜名
+CHARS = [chr(code) for code in range(0x4E00, 0x4E00 + 3000)]
+
+
+def legacy_resolve(images, name, cuisine=None, meal_type=None):
+    """改造前的 get_food_image"""
+    if name in images:
+        return images[name]
+    for key, value in images.items():
+        if name in key or key in name:
+            return value
+    if cuisine and cuisine in FALLBACKS:
+        return FALLBACKS[cuisine]
+    if meal_type and meal_type in FALLBACKS:
+        return FALLBACKS[meal_type]
+    return FALLBACKS["default"]
+
+
+def make_images(size, rng):
+    images = {}
+    while len(images) < size:
+        images["".join(rng.choices(CHARS, k=rng.randrange(3, 7)))] = f"{len(images)}.jpg"
+    return images
+
+
+def make_queries(images, rng, count=2000):
+    keys = list(images)
+    queries = []
+    for i in range(count):
+        if i % 2:
+            queries.append("香辣" + rng.choice(keys) + "套餐")
+        else:
+            queries.append("".join(rng.choices(CHARS, k=rng.randrange(4, 8))))
+    return queries
+
+
+def per_lookup_us(func, queries, budget=2.0):
+    """在 budget 秒内尽量多跑几遍查询，返回单次查询的微秒数"""
+    done = 0
+    started = time.perf_counter()
+    while time.perf_counter() - started < budget:
+        for name in queries[done % len(queries) : done % len(queries) + 50]:
+            func(name)
+        done += 50
+    return (time.perf_counter() - started) / done * 1_000_000
+
+
+def main():
+    rng = random.Random(50)
+    print("单次解析耗时（微秒），不经过 LRU；一半名称能匹配，一半匹配不到")
+    print(f"{'映射键数':>8}{'构建(ms)':>10}{'旧实现(us)':>12}{'索引(us)':>10}{'批量(us)':>10}")
+    for size in SIZES:
+        images = make_images(size, rng)
+        queries = make_queries(images, rng)
+
+        started = time.perf_counter()
+        resolver = FoodImageResolver(images, FALLBACKS, lru_size=0)
+        build_ms = (time.perf_counter() - started) * 1000
+
+        # 原来能匹配到的名称，结果必须一致
+        for name in queries[:200]:
+            expected = legacy_resolve(images, name)
+            assert expected == FALLBACKS["default"] or resolver.resolve(name) == expected, name
+
+        legacy_us = per_lookup_us(lambda name: legacy_resolve(images, name, "chinese"), queries, budget=1.0)
+        indexed_us = per_lookup_us(lambda name: resolver.resolve(name, "chinese"), queries)
+        started = time.perf_counter()
+        resolver.resolve_many(queries, "chinese")
+        batch_us = (time.perf_counter() - started) / len(queries) * 1_000_000
+        print(f"{size:>8}{build_ms:>10.1f}{legacy_us:>12.1f}{indexed_us:>10.1f}{batch_us:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
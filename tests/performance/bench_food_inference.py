@@ -0,0 +1,102 @@
+"""
+食品图像识别推理基准测试
+对每个可用的模型后端（PyTorch eager、TorchScript，设置了 FOOD_RECOGNITION_ONNX_PATH 时加上 ONNX），
+对比逐个请求单独推理（批大小1）与并发请求经 FoodInferenceService 合并批次后的延迟和吞吐
+
+用法:
+    DJANGO_SETTINGS_MODULE=config.settings.test_minimal python tests/performance/bench_food_inference.py [请求数] [并发数]
+"""
+
+import io
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+
+import numpy as np  # noqa: E402
+from PIL import Image  # noqa: E402
+
+from apps.tools.services.food_inference_service import (  # noqa: E402
+    FoodInferenceService,
+    build_onnx_encoder,
+    build_torch_encoder,
+)
+
+
+def make_images(count):
+    rng = np.random.default_rng(0)
+    images = []
+    for _ in range(count):
+        buffer = io.BytesIO()
+        Image.fromarray(rng.integers(0, 255, size=(480, 640, 3), dtype=np.uint8)).save(buffer, format="JPEG")
+        images.append(buffer.getvalue())
+    return images
+
+
+def report(label, latencies, elapsed):
+    latencies = np.asarray(latencies) * 1000
+    print(
+        f"{label:<22} {np.percentile(latencies, 50):>8.1f} {np.percentile(latencies, 95):>8.1f} "
+        f"{len(latencies) / elapsed:>10.1f}"
+    )
+
+
+def timed(service, data):
+    start = time.perf_counter()
+    service.encode_bytes(data)
+    return time.perf_counter() - start
+
+
+def backends():
+    """(名称, 构建函数)，按 CPU 上从慢到快的预期顺序"""
+    num_threads = settings.FOOD_RECOGNITION_THREADS
+    yield "eager", lambda: build_torch_encoder("eager", num_threads)
+    yield "torchscript", lambda: build_torch_encoder("torchscript", num_threads)
+    onnx_path = settings.FOOD_RECOGNITION_ONNX_PATH
+    if onnx_path and os.path.exists(onnx_path):
+        yield "onnx", lambda: build_onnx_encoder(onnx_path, num_threads)
+
+
+def run_backend(encoder, images, concurrency):
+    encoder(np.zeros((1, 3, 224, 224), dtype=np.float32))  # 预热
+    print(f"{'方式':<20} {'p50(ms)':>8} {'p95(ms)':>8} {'吞吐(张/秒)':>10}")
+
+    # 缓存容量为0，保证每个请求都真正推理
+    sequential = FoodInferenceService(encoder=encoder, max_batch_size=1, max_wait_ms=0, cache_size=0)
+    start = time.perf_counter()
+    latencies = [timed(sequential, data) for data in images]
+    report("逐个推理", latencies, time.perf_counter() - start)
+
+    for max_batch in (8, 16, 32):
+        batched = FoodInferenceService(encoder=encoder, max_batch_size=max_batch, max_wait_ms=10, cache_size=0)
+        start = time.perf_counter()
+        with ThreadPoolExecutor(concurrency) as pool:
+            latencies = list(pool.map(lambda data: timed(batched, data), images))
+        report(f"并发合批 (batch≤{max_batch})", latencies, time.perf_counter() - start)
+        print(f"{'':<22} 平均批大小: {batched.get_stats()['avg_batch_size']}")
+
+
+def run(requests, concurrency):
+    images = make_images(requests)
+    print(f"请求数: {requests}, 并发数: {concurrency}, CPU: {os.cpu_count()}")
+    for name, build in backends():
+        try:
+            started = time.perf_counter()
+            encoder = build()
+        except ImportError as e:
+            print(f"\n[{name}] 未安装推理依赖，跳过: {e}")
+            continue
+        print(f"\n[{name}] 模型加载 {time.perf_counter() - started:.1f}s")
+        run_backend(encoder, images, concurrency)
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 128, int(sys.argv[2]) if len(sys.argv) > 2 else 16)
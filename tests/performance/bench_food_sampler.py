@@ -0,0 +1,105 @@
+"""
+食物随机抽样基准测试
+对比旧实现（取出全部匹配的食物后 random.choice，每个食物再查一次绑定照片）与缓存 id 数组 + 别名法抽样，
+食物库从 200 增长到 200k
+
+用法:
+    DJANGO_SETTINGS_MODULE=config.settings.test_minimal python tests/performance/bench_food_sampler.py
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.test_minimal")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.contrib.auth.models import User  # noqa: E402
+from django.db import connection  # noqa: E402
+
+from apps.tools.models import FoodItem, FoodPhotoBinding, RowCounter  # noqa: E402
+from apps.tools.services.food_sampler import fetch_foods, get_pool, invalidate, sample_ids  # noqa: E402
+
+SIZES = (200, 2_000, 20_000, 200_000)
+CUISINES = ["chinese", "western", "japanese", "korean", "thai"]
+MEALS = [["breakfast"], ["dinner"], ["dinner", "snack"], ["snack"]]
+
+
+def populate(start, stop, owner):
+    rng = random.Random(start)
+    foods = FoodItem.objects.bulk_create(
+        [
+            FoodItem(
+                name=f"菜品{i}",
+                cuisine=CUISINES[i % len(CUISINES)],
+                meal_types=MEALS[i % len(MEALS)],
+                ingredients=["食材"] * 5,
+                tags=["家常"],
+                popularity_score=rng.random() * 10,
+            )
+            for i in range(start, stop)
+        ],
+        batch_size=5000,
+    )
+    FoodPhotoBinding.objects.bulk_create(
+        [
+            FoodPhotoBinding(
+                food_item=food, photo_name=f"{food.id}.jpg", photo_url="http://example.com/x.jpg", created_by=owner
+            )
+            for food in foods[::3]
+        ],
+        batch_size=5000,
+    )
+
+
+def legacy_pick(cuisine):
+    """改造前：list(queryset) + random.choice，选中和备选的食物各查一次绑定照片"""
+    available = list(FoodItem.objects.filter(cuisine=cuisine))
+    selected = random.choice(available)
+    alternatives = random.sample([food for food in available if food.id != selected.id], 3)
+    for food in [selected] + alternatives:
+        FoodPhotoBinding.objects.filter(food_item=food).first()
+
+
+def sampler_pick(cuisine, weighted):
+    fetch_foods(sample_ids(cuisine, count=4, weighted=weighted))
+
+
+def timed(func, rounds):
+    started = time.perf_counter()
+    for _ in range(rounds):
+        func()
+    return (time.perf_counter() - started) / rounds * 1000
+
+
+def main():
+    with connection.schema_editor() as editor:
+        for model in (User, FoodItem, FoodPhotoBinding, RowCounter):
+            editor.create_model(model)
+    owner = User.objects.create(username="bench_owner")
+
+    print("每次随机推荐 1 个选中 + 3 个备选，按菜系筛选（SQLite 内存库）")
+    print(f"{'食物数':>8}{'旧实现(ms)':>12}{'构建(ms)':>10}{'抽样(us)':>10}{'均匀(ms)':>10}{'加权(ms)':>10}")
+    size = 0
+    for target in SIZES:
+        populate(size, target, owner)
+        size = target
+        # bulk_create 不发信号，导入后手动更新版本号
+        invalidate()
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+        legacy_ms = timed(lambda: legacy_pick("chinese"), 3 if size > 20_000 else 10)
+        build_ms = timed(lambda: get_pool("chinese").alias, 1)
+        draw_us = timed(lambda: sample_ids("chinese", count=4, weighted=True), 5000) * 1000
+        uniform_ms = timed(lambda: sampler_pick("chinese", False), 500)
+        weighted_ms = timed(lambda: sampler_pick("chinese", True), 500)
+        print(f"{size:>8}{legacy_ms:>12.2f}{build_ms:>10.1f}{draw_us:>10.1f}{uniform_ms:>10.3f}{weighted_ms:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
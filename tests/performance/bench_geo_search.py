@@ -0,0 +1,106 @@
+"""
+船宝附近物品基准测试
+对比全表取出物品后在 Python 中逐个计算 haversine 距离并排序，与 geohash 前缀预筛选后只对候选行计算距离
+
+用法:
+    DJANGO_SETTINGS_MODULE=config.settings.test_minimal python tests/performance/bench_geo_search.py [物品数]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.test_minimal")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.contrib.auth.models import User  # noqa: E402
+from django.db import connection  # noqa: E402
+
+from apps.tools.models import RowCounter, ShipBaoItem  # noqa: E402
+from apps.tools.services.geo_search import geohash_for, haversine_km, nearest  # noqa: E402
+
+# (城市, 纬度, 经度)，物品集中在几个城市周围，另有少量散落全国
+CITIES = [("北京", 39.9042, 116.4074), ("上海", 31.2304, 121.4737), ("广州", 23.1291, 113.2644), ("成都", 30.5728, 104.0668)]
+ORIGINS = [("北京城区", 39.9042, 116.4074), ("上海郊区", 31.05, 121.2), ("拉萨", 29.65, 91.1)]
+ROUNDS = 5
+
+
+def populate(count):
+    random.seed(47)
+    seller = User.objects.create(username="bench_seller")
+    batch = []
+    for i in range(count):
+        if i % 50 == 0:
+            latitude, longitude = random.uniform(20, 45), random.uniform(90, 125)
+        else:
+            _, lat, lon = CITIES[i % len(CITIES)]
+            latitude, longitude = lat + random.gauss(0, 0.15), lon + random.gauss(0, 0.15)
+        batch.append(
+            ShipBaoItem(
+                seller=seller,
+                title=f"物品{i}",
+                description="",
+                category="books",
+                price=10,
+                condition=4,
+                location="",
+                latitude=latitude,
+                longitude=longitude,
+                geohash=geohash_for(latitude, longitude),
+            )
+        )
+        if len(batch) == 5000:
+            ShipBaoItem.objects.bulk_create(batch)
+            batch = []
+    ShipBaoItem.objects.bulk_create(batch)
+
+
+def scan(latitude, longitude, limit=20):
+    """基线：取出全部物品，逐个计算距离后排序"""
+    items = list(ShipBaoItem.objects.filter(status="pending"))
+    items.sort(key=lambda item: (haversine_km(latitude, longitude, item.latitude, item.longitude), item.id))
+    return items[:limit]
+
+
+def timed(func):
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        func()
+    return (time.perf_counter() - started) / ROUNDS * 1000
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    with connection.schema_editor() as editor:
+        for model in (User, ShipBaoItem, RowCounter):
+            editor.create_model(model)
+    populate(count)
+    # 没有统计信息时 SQLite 会把 "id IN (...) AND status = ?" 规划成按 status 扫描索引
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+    queryset = ShipBaoItem.objects.filter(status="pending")
+
+    def fifth_page(latitude, longitude):
+        cursor = None
+        for _ in range(5):
+            cursor = nearest(queryset, latitude, longitude, cursor=cursor)["next_cursor"]
+
+    print(f"{count} 件物品，每项 {ROUNDS} 次取平均（SQLite 内存库）")
+    print(f"{'位置':<10}{'全表扫描(ms)':>14}{'首页(ms)':>12}{'前5页(ms)':>12}{'一致':>6}")
+    for name, latitude, longitude in ORIGINS:
+        scan_ms = timed(lambda: scan(latitude, longitude))
+        first_ms = timed(lambda: nearest(queryset, latitude, longitude))
+        pages_ms = timed(lambda: fifth_page(latitude, longitude))
+        same = [item.id for item in scan(latitude, longitude)] == [
+            item.id for item, _ in nearest(queryset, latitude, longitude)["items"]
+        ]
+        print(f"{name:<10}{scan_ms:>14.1f}{first_ms:>12.2f}{pages_ms:>12.2f}{str(same):>6}")
+
+
+if __name__ == "__main__":
+    main()
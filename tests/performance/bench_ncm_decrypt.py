@@ -0,0 +1,84 @@
+"""
+NCM解密基准测试
+对比旧实现（整文件读入 + 逐字节生成器异或）与分块numpy异或、直接写盘的 decrypt_ncm
+
+用法:
+    python tests/performance/bench_ncm_decrypt.py [音频MB数]
+"""
+
+import os
+import resource
+import shutil
+import struct
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import numpy as np  # noqa: E402
+from cryptography.hazmat.primitives import padding  # noqa: E402
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes  # noqa: E402
+
+from apps.tools.services.ncm_decoder import CORE_KEY, KEY_PREFIX, build_key_stream, decrypt_ncm, read_header  # noqa: E402
+
+
+def make_ncm(path, audio_size):
+    """生成无元数据、无封面的NCM文件"""
+    rc4_key = os.urandom(96)
+    padder = padding.PKCS7(128).padder()
+    encryptor = Cipher(algorithms.AES(CORE_KEY), modes.ECB()).encryptor()
+    key_block = encryptor.update(padder.update(KEY_PREFIX + rc4_key) + padder.finalize()) + encryptor.finalize()
+    key_block = bytes(b ^ 0x64 for b in key_block)
+
+    audio = np.frombuffer(os.urandom(audio_size), dtype=np.uint8)
+    keys = np.resize(build_key_stream(rc4_key), audio_size)
+    with open(path, "wb") as fp:
+        fp.write(b"CTENFDAM\x00\x00" + struct.pack("<I", len(key_block)) + key_block)
+        fp.write(struct.pack("<I", 0) + b"\x00" * 5 + struct.pack("<II", 0, 0))
+        fp.write((audio ^ keys).tobytes())
+
+
+def legacy_decrypt(ncm_path, output_path):
+    """基线实现：与改造前的 decrypt_ncm_file_correct + 写临时文件一致"""
+    with open(ncm_path, "rb") as f:
+        header = read_header(f)
+        data = f.read()
+    # 旧实现从S盒重新生成的256字节流，下标0对应音频第255字节
+    stream = list(np.roll(header.key_stream, 1))
+    stream = bytes(bytearray(stream * (len(data) // 256 + 1))[1 : 1 + len(data)])
+    decrypted = bytes(a ^ b for a, b in zip(data, stream))
+    with open(output_path, "wb") as f:
+        f.write(decrypted)
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run(size_mb):
+    work_dir = tempfile.mkdtemp()
+    ncm_path = os.path.join(work_dir, "bench.ncm")
+    make_ncm(ncm_path, int(size_mb * 1024 * 1024))
+    print(f"音频大小: {size_mb} MB")
+    print(f"{'方式':<24} {'耗时(s)':>8} {'MB/s':>8} {'峰值RSS(MB)':>12}")
+
+    try:
+        start = time.perf_counter()
+        decrypt_ncm(ncm_path, os.path.join(work_dir, "new.mp3"))
+        elapsed = time.perf_counter() - start
+        print(f"{'新: 分块numpy异或':<20} {elapsed:>8.3f} {size_mb / elapsed:>8.1f} {peak_rss_mb():>12.0f}")
+
+        start = time.perf_counter()
+        legacy_decrypt(ncm_path, os.path.join(work_dir, "old.mp3"))
+        elapsed = time.perf_counter() - start
+        print(f"{'旧: 整文件逐字节异或':<19} {elapsed:>8.3f} {size_mb / elapsed:>8.1f} {peak_rss_mb():>12.0f}")
+
+        with open(os.path.join(work_dir, "new.mp3"), "rb") as new, open(os.path.join(work_dir, "old.mp3"), "rb") as old:
+            assert new.read() == old.read(), "新旧实现解密结果不一致"
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    run(float(sys.argv[1]) if len(sys.argv) > 1 else 10)
@@ -0,0 +1,96 @@
+"""
+PDF逐页渲染基准测试
+对比旧的 pdf_to_images（PNG -> PIL -> PNG -> base64，全部留在内存）
+与按页区间多进程渲染、直接写盘的 render_pdf_pages
+
+用法:
+    DJANGO_SETTINGS_MODULE=config.settings.test_minimal python tests/performance/bench_pdf_page_render.py [页数]
+"""
+
+import base64
+import io
+import os
+import resource
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import fitz  # noqa: E402
+from PIL import Image  # noqa: E402
+
+from apps.tools.services.pdf_page_renderer import render_pdf_pages  # noqa: E402
+
+
+def make_document(path, pages):
+    """生成带文字和矢量图形的测试文档"""
+    doc = fitz.open()
+    for i in range(pages):
+        page = doc.new_page()
+        for line in range(40):
+            page.insert_text((50, 60 + line * 18), f"Page {i + 1} line {line + 1} " + "lorem ipsum dolor sit amet " * 3)
+        page.draw_rect(fitz.Rect(50, 700, 550, 800), color=(0.2, 0.4, 0.8), fill=(0.9, 0.9, 1.0))
+    doc.save(path)
+    doc.close()
+
+
+def legacy_pdf_to_images(pdf_path, dpi):
+    """基线实现：与改造前的 PDFConverter.pdf_to_images 一致"""
+    with open(pdf_path, "rb") as fp:
+        doc = fitz.open(stream=fp.read(), filetype="pdf")
+    images = []
+    for page_num in range(len(doc)):
+        pix = doc.load_page(page_num).get_pixmap(matrix=fitz.Matrix(dpi / 72, dpi / 72))
+        img = Image.open(io.BytesIO(pix.tobytes("png")))
+        buffer = io.BytesIO()
+        img.save(buffer, format="PNG")
+        images.append({"page": page_num + 1, "data": base64.b64encode(buffer.getvalue()).decode()})
+    doc.close()
+    return images
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run(pages):
+    work_dir = tempfile.mkdtemp()
+    pdf_path = os.path.join(work_dir, "bench.pdf")
+    make_document(pdf_path, pages)
+    workers = max(2, min(os.cpu_count() or 1, 4))
+    print(f"文档页数: {pages}, CPU: {os.cpu_count()}, 并行进程数: {workers}")
+    print(f"{'DPI':>5} {'方式':<26} {'耗时(s)':>8} {'页/秒':>8} {'输出(MB)':>9}")
+
+    try:
+        for dpi in (150, 300):
+            start = time.perf_counter()
+            images = legacy_pdf_to_images(pdf_path, dpi)
+            elapsed = time.perf_counter() - start
+            payload_mb = sum(len(image["data"]) for image in images) / 1024 / 1024
+            print(f"{dpi:>5} {'旧: PIL二次编码+base64':<24} {elapsed:>8.2f} {pages / elapsed:>8.1f} {payload_mb:>9.1f}")
+            del images
+
+            for label, worker_count in (("新: 顺序写盘", 1), (f"新: {workers}进程并行写盘", workers)):
+                out_dir = os.path.join(work_dir, f"{dpi}_{worker_count}")
+                start = time.perf_counter()
+                rendered = render_pdf_pages(pdf_path, out_dir, dpi=dpi, workers=worker_count)
+                elapsed = time.perf_counter() - start
+                size_mb = sum(page["size"] for page in rendered) / 1024 / 1024
+                print(f"{dpi:>5} {label:<24} {elapsed:>8.2f} {pages / elapsed:>8.1f} {size_mb:>9.1f}")
+
+            out_dir = os.path.join(work_dir, f"{dpi}_webp")
+            start = time.perf_counter()
+            rendered = render_pdf_pages(pdf_path, out_dir, dpi=dpi, image_format="webp", quality=80, workers=workers)
+            elapsed = time.perf_counter() - start
+            size_mb = sum(page["size"] for page in rendered) / 1024 / 1024
+            print(f"{dpi:>5} {'新: WebP q80 并行写盘':<22} {elapsed:>8.2f} {pages / elapsed:>8.1f} {size_mb:>9.1f}")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    print(f"主进程峰值RSS: {peak_rss_mb():.0f} MB")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100)
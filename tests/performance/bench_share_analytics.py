@@ -0,0 +1,94 @@
+"""
+分享数据汇总基准测试
+按年写入全平台的 ShareAnalytics 行，对比旧的逐行 Python 汇总与数据库聚合 + 已结束日期缓存的耗时
+
+用法:
+    DJANGO_SETTINGS_MODULE=config.settings.test_minimal python tests/performance/bench_share_analytics.py [历史年数]
+"""
+
+import os
+import sys
+import time
+from datetime import timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.test_minimal")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.core.cache import cache  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.utils import timezone  # noqa: E402
+
+from apps.share.models import ShareAnalytics, ShareRecord  # noqa: E402
+from apps.share.summaries import analytics_summary  # noqa: E402
+
+REPEAT = 20
+
+
+def legacy_summary(start_date, end_date):
+    """与改造前的 share_analytics 视图一致"""
+    analytics = ShareAnalytics.objects.filter(date__range=[start_date, end_date]).order_by("date", "platform")
+    platform_summary = {}
+    for record in analytics:
+        platform = record.get_platform_display()
+        if platform not in platform_summary:
+            platform_summary[platform] = {"shares": 0, "clicks": 0}
+        platform_summary[platform]["shares"] += record.share_count
+        platform_summary[platform]["clicks"] += record.click_count
+    daily_summary = {}
+    for record in analytics:
+        date_str = record.date.strftime("%Y-%m-%d")
+        if date_str not in daily_summary:
+            daily_summary[date_str] = {"shares": 0, "clicks": 0}
+        daily_summary[date_str]["shares"] += record.share_count
+        daily_summary[date_str]["clicks"] += record.click_count
+    return {"platform_summary": platform_summary, "daily_summary": daily_summary, "analytics": list(analytics.values())}
+
+
+def timed(func, *args):
+    started = time.perf_counter()
+    for _ in range(REPEAT):
+        func(*args)
+    return (time.perf_counter() - started) / REPEAT * 1000
+
+
+def main():
+    years = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+    with connection.schema_editor() as editor:
+        editor.create_model(ShareAnalytics)
+
+    today = timezone.localdate()
+    platforms = [code for code, _ in ShareRecord.SHARE_PLATFORMS]
+    rows = [
+        ShareAnalytics(
+            date=today - timedelta(days=d), platform=p, share_count=(d * 7 + i) % 50, click_count=(d * 13 + i) % 400
+        )
+        for d in range(365 * years)
+        for i, p in enumerate(platforms)
+    ]
+    ShareAnalytics.objects.bulk_create(rows, batch_size=2000)
+
+    print(f"{len(rows)} 行分享统计（{years} 年 x {len(platforms)} 个平台，SQLite 内存库），每项取 {REPEAT} 次平均")
+    print(f"{'窗口(天)':<10}{'逐行汇总(ms)':>14}{'聚合首次(ms)':>14}{'聚合缓存(ms)':>14}")
+    for days in (7, 30, 90, 365):
+        start = today - timedelta(days=days - 1)
+        legacy = timed(legacy_summary, start, today)
+        new, legacy_result = analytics_summary(start, today), legacy_summary(start, today)
+        assert new["daily_summary"] == legacy_result["daily_summary"]
+        assert new["platform_summary"] == legacy_result["platform_summary"]
+
+        cold = 0.0
+        for _ in range(REPEAT):
+            cache.clear()
+            started = time.perf_counter()
+            analytics_summary(start, today)
+            cold += time.perf_counter() - started
+        warm = timed(analytics_summary, start, today)
+        print(f"{days:<10}{legacy:>14.2f}{cold / REPEAT * 1000:>14.2f}{warm:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+分享链接点击计数压测
+多个线程同时点击同一个链接，对比旧的“读-改-写 save()”路径与内存缓冲 + 批量写回路径：
+最终计数是否丢失、每 1000 次点击产生的写语句数量和吞吐
+
+使用临时文件 SQLite 库，使各线程的连接看到同一份数据
+
+用法:
+    DJANGO_SETTINGS_MODULE=config.settings.test_minimal python tests/performance/bench_share_clicks.py [线程数] [每线程点击数]
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.test_minimal")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.db import connection, connections  # noqa: E402
+from django.utils import timezone  # noqa: E402
+
+from apps.share.counters import ClickBuffer  # noqa: E402
+from apps.share.models import ShareAnalytics, ShareLink  # noqa: E402
+
+SHORT_CODE = "viral"
+
+
+class WriteCounter:
+    """统计所有线程执行的 INSERT/UPDATE 语句数"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.writes = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        if sql.lstrip().split()[0].upper() in ("INSERT", "UPDATE"):
+            with self.lock:
+                self.writes += 1
+        return execute(sql, params, many, context)
+
+
+def legacy_click():
+    """与改造前的 share_page 一致"""
+    share_link = ShareLink.objects.get(short_code=SHORT_CODE, is_active=True)
+    share_link.click_count += 1
+    share_link.save()
+    analytics, _ = ShareAnalytics.objects.get_or_create(
+        date=timezone.now().date(), platform="link", defaults={"share_count": 0, "click_count": 0}
+    )
+    analytics.click_count += 1
+    analytics.save()
+
+
+def run(name, click, threads, clicks, counter, flush=None):
+    ShareLink.objects.update(click_count=0)
+    ShareAnalytics.objects.all().delete()
+    errors = []
+    stop = threading.Event()
+
+    def worker():
+        with connection.execute_wrapper(counter):
+            for _ in range(clicks):
+                try:
+                    click()
+                except Exception as e:
+                    errors.append(e)
+        connection.close()
+
+    def flusher():
+        with connection.execute_wrapper(counter):
+            while not stop.wait(0.05):
+                flush()
+            flush()
+        connection.close()
+
+    counter.writes = 0
+    started = time.perf_counter()
+    background = threading.Thread(target=flusher) if flush else None
+    if background:
+        background.start()
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    stop.set()
+    if background:
+        background.join()
+    elapsed = time.perf_counter() - started
+
+    total = threads * clicks
+    link_count = ShareLink.objects.get(short_code=SHORT_CODE).click_count
+    analytics = ShareAnalytics.objects.filter(platform="link").first()
+    return name, total, link_count, analytics.click_count if analytics else 0, len(errors), counter.writes, elapsed
+
+
+def main():
+    threads = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    clicks = int(sys.argv[2]) if len(sys.argv) > 2 else 250
+    directory = tempfile.mkdtemp(prefix="share-bench-")
+    connections.settings["default"]["NAME"] = os.path.join(directory, "bench.sqlite3")
+    connections.settings["default"]["OPTIONS"] = {"timeout": 30}
+    settings.SHARE_CLICK_FLUSH_INTERVAL = 0
+    settings.SHARE_CLICKS_EAGER = False
+
+    with connection.schema_editor() as editor:
+        editor.create_model(ShareLink)
+        editor.create_model(ShareAnalytics)
+    ShareLink.objects.create(original_url="https://example.com/", short_code=SHORT_CODE, title="bench")
+
+    buffer = ClickBuffer()
+
+    def buffered_click():
+        link_id = ShareLink.objects.filter(short_code=SHORT_CODE, is_active=True).values_list("id", flat=True).first()
+        buffer.record(link_id)
+
+    counter = WriteCounter()
+    results = [
+        run("save() 读-改-写", legacy_click, threads, clicks, counter),
+        run("内存缓冲+批量写回", buffered_click, threads, clicks, counter, flush=buffer.flush),
+    ]
+
+    print(f"{threads} 个线程 x {clicks} 次点击同一链接（SQLite 文件库）")
+    print(f"{'实现':<16}{'点击':>7}{'链接计数':>9}{'统计计数':>9}{'错误':>6}{'写/千次':>9}{'点击/秒':>10}")
+    for name, total, link_count, day_count, errors, writes, elapsed in results:
+        print(
+            f"{name:<16}{total:>7}{link_count:>9}{day_count:>9}{errors:>6}"
+            f"{writes * 1000 / total:>9.1f}{total / elapsed:>10.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+日记流式导出内存测试
+导出 50 万篇日记，用 tracemalloc 记录消费流式响应期间的 Python 内存峰值：
+峰值应受 chunk_size 和输出缓冲限制，与导出总量无关（和只导出 5 万篇时基本相同）
+
+预算可通过环境变量调整: DIARY_EXPORT_PEAK_BUDGET_MB
+"""
+
+import json
+import os
+import tracemalloc
+from datetime import date, timedelta
+
+from django.contrib.auth.models import User
+from django.test import RequestFactory, TestCase
+
+import pytest
+
+from apps.tools.models import LifeDiaryEntry
+from apps.tools.views.diary_views import export_diary_entries
+
+ENTRIES = 500_000
+PEAK_BUDGET_MB = float(os.environ.get("DIARY_EXPORT_PEAK_BUDGET_MB", 16))
+START = date(1000, 1, 1)
+
+
+@pytest.mark.slow
+@pytest.mark.performance
+@pytest.mark.django_db
+class TestDiaryExportMemory(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("export_memory", password="x")
+        batch = []
+        for day in range(ENTRIES):
+            batch.append(
+                LifeDiaryEntry(
+                    user=cls.user,
+                    date=START + timedelta(days=day),
+                    title=f"日记 {day}",
+                    content="今天天气不错，出门散步，晚上读了一会儿书。" * 4,
+                    mood="😊",
+                    tags=["生活", "散步"],
+                )
+            )
+            if len(batch) == 10_000:
+                LifeDiaryEntry.objects.bulk_create(batch)
+                batch = []
+
+    def _profile_export(self, **data):
+        """返回 (导出字节数, 行数, 消费响应期间的内存峰值 MB)"""
+        request = RequestFactory().post("/", json.dumps(data), content_type="application/json")
+        request.user = self.user
+        size = lines = 0
+        tracemalloc.start()
+        try:
+            for chunk in export_diary_entries(request).streaming_content:
+                size += len(chunk)
+                lines += chunk.count(b"\n")
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return size, lines, peak / 1024 / 1024
+
+    def test_peak_memory_is_bounded_by_chunk_size(self):
+        small_size, small_lines, small_peak = self._profile_export(
+            format="jsonl", date_to=(START + timedelta(days=ENTRIES // 10 - 1)).isoformat()
+        )
+        size, lines, peak = self._profile_export(format="jsonl")
+
+        self.assertEqual((small_lines, lines), (ENTRIES // 10, ENTRIES))
+        print(
+            f"\n日记导出: {lines} 行 {size / 1024 / 1024:.0f}MB 峰值 {peak:.1f}MB；"
+            f"{small_lines} 行 {small_size / 1024 / 1024:.0f}MB 峰值 {small_peak:.1f}MB"
+        )
+        # 导出量相差 10 倍，峰值内存不随之增长
+        self.assertLess(peak, PEAK_BUDGET_MB)
+        self.assertLess(peak, small_peak * 1.5 + 1)
+        self.assertLess(peak * 20, size / 1024 / 1024)
@@ -0,0 +1,82 @@
+"""
+Web进程启动预算测试
+在子进程中以 python -X importtime 执行 django.setup() 并加载全部URL路由，
+导入耗时、内存或重量级依赖超出预算时失败
+
+预算可通过环境变量调整: STARTUP_IMPORT_BUDGET_MS, STARTUP_RSS_BUDGET_MB
+"""
+
+import json
+import os
+import re
+import subprocess
+import sys
+
+import pytest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+IMPORT_BUDGET_MS = float(os.environ.get("STARTUP_IMPORT_BUDGET_MS", 1500))
+RSS_BUDGET_MB = float(os.environ.get("STARTUP_RSS_BUDGET_MB", 110))
+
+# 只应在对应路由被请求时才导入的依赖
+DEFERRED_MODULES = ("torch", "torchvision", "cv2", "selenium", "fitz", "pdf2docx", "numpy", "pandas", "requests", "bs4")
+
+STARTUP_SCRIPT = """
+import json, resource, sys
+import django
+django.setup()
+from django.urls import get_resolver, reverse
+get_resolver().url_patterns
+reverse("tools:pdf_converter_api")
+
+def peak_rss_mb():
+    # ru_maxrss 在exec后保留父进程的峰值，优先读取本进程的 VmHWM
+    try:
+        with open("/proc/self/status") as fp:
+            return next(int(line.split()[1]) for line in fp if line.startswith("VmHWM:")) / 1024
+    except (OSError, StopIteration):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+print(json.dumps({
+    "rss_mb": peak_rss_mb(),
+    "loaded": sorted(name for name in %r if name in sys.modules),
+}))
+""" % (
+    DEFERRED_MODULES,
+)
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def run_startup():
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get("DJANGO_SETTINGS_MODULE", "config.settings.test_minimal"))
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [PROJECT_ROOT, env.get("PYTHONPATH")]))
+    # 管理命令参数使 apps.ready 跳过后台定时任务
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", STARTUP_SCRIPT, "test"],
+        cwd=PROJECT_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    assert proc.returncode == 0, proc.stderr[-2000:]
+
+    top_level = {}
+    for line in proc.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match and len(match.group(3)) == 1:
+            top_level[match.group(4)] = int(match.group(2))
+    return json.loads(proc.stdout.strip().splitlines()[-1]), top_level
+
+
+@pytest.mark.performance
+def test_web_worker_startup_budget():
+    result, top_level = run_startup()
+    total_ms = sum(top_level.values()) / 1000
+    slowest = ", ".join(f"{name} {us / 1000:.0f}ms" for name, us in sorted(top_level.items(), key=lambda i: -i[1])[:5])
+
+    assert not result["loaded"], f"启动时导入了应延迟加载的依赖: {result['loaded']}"
+    assert total_ms <= IMPORT_BUDGET_MS, f"启动导入耗时 {total_ms:.0f}ms 超出预算 {IMPORT_BUDGET_MS:.0f}ms（{slowest}）"
+    assert result["rss_mb"] <= RSS_BUDGET_MB, f"启动内存 {result['rss_mb']:.0f}MB 超出预算 {RSS_BUDGET_MB:.0f}MB"
@@ -0,0 +1,36 @@
+"""
+多数据库别名测试工具
+在运行时注册若干基于临时文件的 SQLite 别名并建表，可被多个线程同时访问，用于分片与读写分离测试
+"""
+
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+
+from django.db import connections
+
+
+@contextmanager
+def sqlite_aliases(aliases, models=()):
+    """注册 aliases 中的数据库别名并在每个库中创建 models 的表，退出时移除别名并删除文件"""
+    directory = tempfile.mkdtemp(prefix="shards-")
+    for alias in aliases:
+        configured = connections.configure_settings(
+            {
+                "default": {},
+                alias: {"ENGINE": "django.db.backends.sqlite3", "NAME": os.path.join(directory, f"{alias}.sqlite3")},
+            }
+        )
+        connections.settings[alias] = configured[alias]
+        with connections[alias].schema_editor() as editor:
+            for model in models:
+                editor.create_model(model)
+    try:
+        yield list(aliases)
+    finally:
+        for alias in aliases:
+            connections[alias].close()
+            del connections[alias]
+            del connections.settings[alias]
+        shutil.rmtree(directory, ignore_errors=True)
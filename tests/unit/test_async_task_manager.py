@@ -0,0 +1,94 @@
+"""
+异步任务管理器测试
+测试任务状态接口契约、任务只能被一个进程领取、执行进程退出后的任务恢复以及删除后停止执行
+"""
+
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+import pytest
+
+from apps.tools.async_task_manager import AsyncTaskManager, TaskAborted
+from apps.tools.models.legacy_models import BackgroundTask, BackgroundTaskEvent
+
+
+@pytest.mark.django_db
+@patch("apps.tools.async_task_manager.DeepSeekClient")
+class TestAsyncTaskManager(TestCase):
+    """后台任务测试"""
+
+    def setUp(self):
+        self.manager = AsyncTaskManager()
+
+    def test_api_contract(self, client_class):
+        """测试创建任务与查询状态接口"""
+        client_class.return_value.generate_test_cases.return_value = "## 测试用例"
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse("tools:async_generate_test_cases_api"), {"requirement": "登录", "prompt": "生成"}
+            )
+        task_id = response.json()["task_id"]
+        status = self.client.get(reverse("tools:task_status_api", args=[task_id])).json()
+
+        self.assertEqual(status["status"], "completed")
+        self.assertEqual(status["progress"], 100)
+        self.assertEqual(status["result"], "## 测试用例")
+        self.assertEqual(status["current_step"], "生成完成")
+        self.assertIsNotNone(status["started_at"])
+        self.assertEqual(
+            list(BackgroundTaskEvent.objects.filter(task_id=task_id).values_list("progress", flat=True)), [0, 5, 15, 100]
+        )
+
+    def test_task_is_claimed_once(self, client_class):
+        """测试同一个任务只有一个进程能领取"""
+        with self.captureOnCommitCallbacks():
+            task_id = self.manager.create_task("需求", "提示词")
+        other = AsyncTaskManager()
+
+        self.assertTrue(self.manager._claim(task_id))
+        self.assertFalse(other._claim(task_id))
+        self.assertEqual(BackgroundTask.objects.get(id=task_id).worker_id, self.manager.worker_id)
+
+    def test_stale_task_is_recovered(self, client_class):
+        """测试执行进程退出后任务被其他进程重新执行"""
+        client_class.return_value.generate_test_cases.return_value = "结果"
+        stale = timezone.now() - timedelta(minutes=10)
+        BackgroundTask.objects.create(
+            id="crashed",
+            payload={"requirement": "需求", "user_prompt": "提示词"},
+            status="running",
+            attempts=1,
+            worker_id="dead-worker",
+            heartbeat_at=stale,
+            created_at=stale,
+        )
+        BackgroundTask.objects.create(
+            id="exhausted",
+            payload={"requirement": "需求", "user_prompt": "提示词"},
+            status="running",
+            attempts=2,
+            worker_id="dead-worker",
+            heartbeat_at=stale,
+            created_at=stale,
+        )
+
+        self.assertEqual(self.manager.recover_stale_tasks(), 1)
+
+        crashed = BackgroundTask.objects.get(id="crashed")
+        self.assertEqual((crashed.status, crashed.attempts, crashed.result), ("completed", 2, "结果"))
+        self.assertEqual(BackgroundTask.objects.get(id="exhausted").status, "failed")
+
+    def test_deleted_task_stops(self, client_class):
+        """测试任务被删除后进度更新中止执行"""
+        with self.captureOnCommitCallbacks():
+            task_id = self.manager.create_task("需求", "提示词")
+        self.manager._claim(task_id)
+        self.assertTrue(self.manager.delete_task(task_id))
+
+        with self.assertRaises(TaskAborted):
+            self.manager._update_progress(task_id, 50, "进行中")
@@ -0,0 +1,67 @@
+"""
+批量清理引擎测试
+测试按主键分批删除只删除满足条件的行、无级联模型走单条 DELETE、有级联模型退回级联删除以及运行时间上限
+"""
+
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.db.models import Q
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+import pytest
+
+from apps.tools.models import BackgroundTask, BackgroundTaskEvent, ToolUsageLog
+from apps.tools.services.bulk_purge import BulkPurger
+
+
+@pytest.mark.django_db
+class TestBulkPurger(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("purge_user", password="x")
+        ToolUsageLog.objects.bulk_create(
+            [ToolUsageLog(user=self.user, tool_type="PDF_CONVERTER", input_data=str(i)) for i in range(25)]
+        )
+        self.old_ids = list(ToolUsageLog.objects.order_by("id").values_list("id", flat=True)[::2])
+        ToolUsageLog.objects.filter(id__in=self.old_ids).update(created_at=timezone.now() - timedelta(days=100))
+        self.cutoff = timezone.now() - timedelta(days=90)
+
+    def test_keyset_batches_delete_only_matching_rows(self):
+        purger = BulkPurger(ToolUsageLog, batch_size=5)
+
+        with CaptureQueriesContext(connection) as queries:
+            result = purger.purge(Q(created_at__lt=self.cutoff), time_field="created_at", cutoff=self.cutoff)
+
+        self.assertTrue(result["fast_delete"])
+        self.assertTrue(result["finished"])
+        self.assertEqual(result["deleted_count"], 13)
+        self.assertEqual(result["batches"], 3)
+        self.assertFalse(ToolUsageLog.objects.filter(id__in=self.old_ids).exists())
+        self.assertEqual(ToolUsageLog.objects.count(), 12)
+
+        deletes = [q["sql"] for q in queries.captured_queries if q["sql"].startswith("DELETE")]
+        selects = [q["sql"] for q in queries.captured_queries if q["sql"].startswith("SELECT")]
+        self.assertEqual(len(deletes), 3)
+        # 后续批次从上一批的最大主键继续扫描
+        self.assertTrue(all('"id" > ' in sql for sql in selects[1:]))
+
+    def test_cascading_models_use_collector(self):
+        for i in range(3):
+            task = BackgroundTask.objects.create(id=f"task-{i}", status="completed" if i < 2 else "running")
+            BackgroundTaskEvent.objects.create(task=task, status=task.status, step="done")
+
+        result = BulkPurger(BackgroundTask, batch_size=1).purge(Q(status="completed"))
+
+        self.assertFalse(result["fast_delete"])
+        self.assertEqual(result["deleted_count"], 2)
+        self.assertEqual(list(BackgroundTaskEvent.objects.values_list("task_id", flat=True)), ["task-2"])
+
+    def test_time_budget_stops_early(self):
+        result = BulkPurger(ToolUsageLog, batch_size=5, max_seconds=1e-9).purge(Q(created_at__lt=self.cutoff))
+
+        self.assertFalse(result["finished"])
+        self.assertEqual(result["deleted_count"], 0)
+        self.assertEqual(ToolUsageLog.objects.count(), 25)
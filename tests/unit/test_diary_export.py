@@ -0,0 +1,115 @@
+"""
+日记流式导出测试
+测试 JSON / JSON Lines / CSV 三种格式的内容、gzip 压缩以及旧的 CSV 导出（日记 + 目标）改为流式后的输出
+"""
+
+import csv
+import gzip
+import io
+import json
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.http import StreamingHttpResponse
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+
+import pytest
+
+from apps.tools.models import LifeDiaryEntry, LifeGoal
+from apps.tools.views.diary_views import export_diary_entries
+
+
+@pytest.mark.django_db
+class TestDiaryExport(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("export_user", password="x")
+        other = User.objects.create_user("export_other", password="x")
+        for day in range(1, 6):
+            LifeDiaryEntry.objects.create(
+                user=self.user,
+                date=date(2026, 3, day),
+                title=f"第{day}天",
+                content=f"内容,带逗号\n第二行 {day}",
+                mood="😊",
+                tags=["生活", f"t{day}"],
+            )
+        LifeDiaryEntry.objects.create(user=other, date=date(2026, 3, 1), title="别人的", mood="😢")
+
+    def _export(self, **data):
+        request = RequestFactory().post("/", json.dumps(data), content_type="application/json")
+        request.user = self.user
+        response = export_diary_entries(request)
+        self.assertIsInstance(response, StreamingHttpResponse)
+        return response, b"".join(response.streaming_content)
+
+    def test_json_array_matches_entries(self):
+        response, body = self._export(date_from="2026-03-02")
+        data = json.loads(body)
+        self.assertEqual(
+            [entry["date"] for entry in data["entries"]], ["2026-03-05", "2026-03-04", "2026-03-03", "2026-03-02"]
+        )
+        self.assertEqual(
+            data["entries"][0],
+            {"date": "2026-03-05", "title": "第5天", "content": "内容,带逗号\n第二行 5", "mood": "😊", "tags": ["生活", "t5"]},
+        )
+        self.assertEqual((data["export_info"]["user"], data["export_info"]["total_entries"]), ("export_user", 4))
+        self.assertIn('.json"', response["Content-Disposition"])
+
+        _, empty = self._export(date_from="2030-01-01")
+        self.assertEqual(json.loads(empty)["entries"], [])
+
+    def test_jsonl_csv_and_gzip(self):
+        _, body = self._export(format="jsonl")
+        rows = [json.loads(line) for line in body.decode().splitlines()]
+        self.assertEqual([row["title"] for row in rows], [f"第{day}天" for day in range(5, 0, -1)])
+
+        response, compressed = self._export(format="jsonl", gzip=True)
+        self.assertEqual(response["Content-Type"], "application/gzip")
+        self.assertIn('.jsonl.gz"', response["Content-Disposition"])
+        self.assertEqual(gzip.decompress(compressed), body)
+
+        _, body = self._export(format="csv")
+        rows = list(csv.reader(io.StringIO(body.decode())))
+        self.assertEqual(rows[0], ["date", "title", "content", "mood", "tags"])
+        self.assertEqual(rows[1], ["2026-03-05", "第5天", "内容,带逗号\n第二行 5", "😊", "生活, t5"])
+        self.assertEqual(len(rows), 6)
+
+        request = RequestFactory().post("/", json.dumps({"format": "xml"}), content_type="application/json")
+        request.user = self.user
+        self.assertNotIsInstance(export_diary_entries(request), StreamingHttpResponse)
+
+    def test_rows_are_read_only_while_streaming(self):
+        with CaptureQueriesContext(connection) as queries:
+            response, _ = self._export(format="jsonl")
+        self.assertEqual(len(queries), 1)
+
+        request = RequestFactory().post("/", json.dumps({"format": "jsonl"}), content_type="application/json")
+        request.user = self.user
+        with CaptureQueriesContext(connection) as queries:
+            response = export_diary_entries(request)
+        # 构造响应时还没有查询数据库
+        self.assertEqual(len(queries), 0)
+        self.assertEqual(len(b"".join(response.streaming_content).splitlines()), 5)
+
+    def test_legacy_csv_export_with_goals(self):
+        from apps.tools.legacy_views import export_diary_data
+
+        LifeGoal.objects.create(user=self.user, title="跑完半马", category="health", progress=40, tags=["运动"])
+        request = RequestFactory().post("/")
+        request.user = self.user
+
+        response = export_diary_data(request, {"type": "all", "date_to": "2026-03-02"})
+        rows = list(csv.reader(io.StringIO(b"".join(response.streaming_content).decode())))
+        self.assertEqual(rows[0], ["日期", "标题", "内容", "心情", "标签", "创建时间"])
+        self.assertEqual([row[0] for row in rows[1:3]], ["2026-03-02", "2026-03-01"])
+        self.assertEqual(rows[1][3], "开心")
+        self.assertEqual(rows[3:5], [[], ["=== 生活目标数据 ==="]])
+        self.assertEqual((rows[6][0], rows[6][5]), ("跑完半马", "40%"))
+
+        response = export_diary_data(request, {"type": "diary", "gzip": True})
+        self.assertEqual(len(gzip.decompress(b"".join(response.streaming_content)).decode().splitlines()), 1 + 5 * 2)
+
+        invalid = json.loads(export_diary_data(request, {"date_from": "03/01/2026"}).content)
+        self.assertEqual(invalid["error"], "开始日期格式无效")
@@ -0,0 +1,123 @@
+"""
+日记全文检索测试
+测试按相关度排序并高亮、两个字的中文检索词、触发器同步索引、游标分页、心情/标签过滤以及迁移建立的索引
+"""
+
+import importlib
+from datetime import date, timedelta
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+
+import pytest
+
+from apps.tools.models import LifeDiaryEntry
+from apps.tools.services.diary_search import DiarySearch, highlight, install_search_index, uninstall_search_index
+
+
+@pytest.mark.django_db
+class TestDiarySearch(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # 测试库不执行迁移；在外层事务之外建 FTS 表，SQLite 回滚虚拟表的创建后连接无法再建立保存点
+        install_search_index(connection)
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        uninstall_search_index(connection)
+
+    def setUp(self):
+        self.user = User.objects.create_user("diary_search_user", password="x")
+        other = User.objects.create_user("diary_search_other", password="x")
+        self.start = date(2026, 1, 1)
+        self.entries = [
+            self._entry(0, "周末爬山", "今天和朋友去爬山，山顶的风景很好", "happy", ["户外", "朋友"]),
+            self._entry(1, "工作日", "开会到很晚，想念去爬山的周末", "tired", ["工作"]),
+            self._entry(2, "读书笔记", "读完了一本关于 Python performance 的书", "calm", ["阅读"]),
+            self._entry(3, "爬山计划", "下周再去爬山，这次爬山要早点出发，爬山装备已经准备好", "excited", ["户外"]),
+        ]
+        LifeDiaryEntry.objects.create(user=other, date=self.start, title="别人的爬山", content="爬山爬山爬山", mood="happy")
+
+    def _entry(self, offset, title, content, mood, tags):
+        return LifeDiaryEntry.objects.create(
+            user=self.user, date=self.start + timedelta(days=offset), title=title, content=content, mood=mood, tags=tags
+        )
+
+    def test_ranked_hits_with_highlighted_snippets(self):
+        page = DiarySearch().search(self.user, query="performance")
+        self.assertEqual([r["id"] for r in page["results"]], [self.entries[2].id])
+        self.assertIn("<mark>performance</mark>", page["results"][0]["snippet"])
+
+        page = DiarySearch().search(self.user, query="朋友去爬山")
+        self.assertEqual([r["id"] for r in page["results"]], [self.entries[0].id])
+        self.assertEqual(highlight("a<b>爬山", ["爬山"]), "a&lt;b&gt;<mark>爬山</mark>")
+
+    def test_short_terms_filter_within_user_entries(self):
+        page = DiarySearch().search(self.user, query="爬山 周末")
+        ids = {r["id"] for r in page["results"]}
+        # 只返回当前用户同时包含两个词的日记
+        self.assertEqual(ids, {self.entries[0].id, self.entries[1].id})
+        self.assertIsNone(page["next_cursor"])
+
+    def test_index_follows_updates_and_deletes(self):
+        search = DiarySearch()
+        self.assertEqual(search.search(self.user, query="performance")["results"][0]["id"], self.entries[2].id)
+
+        self.entries[2].content = "读完了一本关于数据库索引的书"
+        self.entries[2].save()
+        self.assertEqual(search.search(self.user, query="performance")["results"], [])
+        self.assertEqual(len(search.search(self.user, query="数据库索引")["results"]), 1)
+
+        self.entries[2].delete()
+        self.assertEqual(search.search(self.user, query="数据库索引")["results"], [])
+
+    def test_cursor_pagination_has_no_duplicates(self):
+        search = DiarySearch()
+        seen = []
+        for query in ("", "去爬山"):
+            cursor = None
+            ids = []
+            while True:
+                page = search.search(self.user, query=query, date_from=self.start, limit=1, cursor=cursor)
+                ids += [r["id"] for r in page["results"]]
+                cursor = page["next_cursor"]
+                if not cursor:
+                    break
+            self.assertEqual(len(ids), len(set(ids)))
+            seen.append(ids)
+        self.assertEqual(seen[0], [entry.id for entry in reversed(self.entries)])
+        self.assertEqual(set(seen[1]), {self.entries[0].id, self.entries[1].id, self.entries[3].id})
+
+    def test_mood_and_tag_filters(self):
+        search = DiarySearch()
+        page = search.search(self.user, tags=["户外"])
+        self.assertEqual([r["id"] for r in page["results"]], [self.entries[3].id, self.entries[0].id])
+
+        page = search.search(self.user, query="爬山", mood="excited", tags=["户外"])
+        self.assertEqual([r["id"] for r in page["results"]], [self.entries[3].id])
+
+
+@pytest.mark.django_db
+class TestSearchIndexMigration(TransactionTestCase):
+    def _index_objects(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT name FROM sqlite_master WHERE name LIKE 'tools_lifediaryentry_fts%' ORDER BY name")
+            return {row[0] for row in cursor.fetchall()}
+
+    def test_migration_installs_and_reverts_without_the_service(self):
+        migration = importlib.import_module("apps.tools.migrations.0078_lifediaryentry_search_index")
+        user = User.objects.create_user("diary_migration_user", password="x")
+        LifeDiaryEntry.objects.create(user=user, date=date(2026, 1, 1), title="迁移前的日记", content="已有的爬山记录")
+
+        with connection.schema_editor(atomic=False) as editor:
+            migration.install(None, editor)
+        self.assertLessEqual({"tools_lifediaryentry_fts", "tools_lifediaryentry_fts_ai"}, self._index_objects())
+        # 已有的日记在建表时重建进索引
+        self.assertEqual(DiarySearch().search(user, query="爬山记录")["results"][0]["title"], "迁移前的日记")
+
+        with connection.schema_editor(atomic=False) as editor:
+            migration.uninstall(None, editor)
+        self.assertEqual(self._index_objects(), set())
@@ -0,0 +1,110 @@
+"""
+健身社区帖子流测试
+测试一页帖子的查询次数与页大小无关、点赞/评论计数和是否点赞的注解以及 (created_at, id) 游标翻页
+"""
+
+import json
+from datetime import date, timedelta
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+import pytest
+
+from apps.tools.models import CheckInCalendar, FitnessCommunityComment, FitnessCommunityLike, FitnessCommunityPost
+from apps.tools.services.fitness_feed import community_feed
+
+
+@pytest.mark.django_db
+class TestFitnessFeed(TestCase):
+    def setUp(self):
+        self.viewer = User.objects.create_user("feed_viewer", password="x")
+        authors = [User.objects.create_user(f"feed_author{i}", password="x") for i in range(5)]
+        checkin = CheckInCalendar.objects.create(user=authors[0], calendar_type="fitness", date=date(2026, 1, 1))
+        now = timezone.now()
+        self.posts = []
+        for i in range(30):
+            post = FitnessCommunityPost.objects.create(
+                user=authors[i % 5],
+                post_type="checkin" if i % 2 else "motivation",
+                title=f"帖子{i}",
+                content="内容",
+                related_checkin=checkin if i % 3 == 0 else None,
+            )
+            self.posts.append(post)
+        # 一半帖子的发布时间相同，翻页必须靠 id 区分
+        FitnessCommunityPost.objects.filter(id__in=[p.id for p in self.posts[:15]]).update(created_at=now)
+        for i, post in enumerate(self.posts[15:]):
+            FitnessCommunityPost.objects.filter(id=post.id).update(created_at=now - timedelta(minutes=i + 1))
+
+        target = self.posts[3]
+        FitnessCommunityLike.objects.create(user=self.viewer, post=target)
+        FitnessCommunityLike.objects.create(user=authors[1], post=target)
+        FitnessCommunityComment.objects.create(post=target, user=authors[2], content="好")
+        FitnessCommunityComment.objects.create(post=target, user=authors[3], content="已删除", is_deleted=True)
+        self.target = target
+
+    def test_query_count_is_independent_of_page_size(self):
+        counts = []
+        for page_size in (5, 20, 50):
+            with CaptureQueriesContext(connection) as queries:
+                feed = community_feed(self.viewer, page_size=page_size)
+            self.assertEqual(len(feed["posts"]), min(page_size, 30))
+            counts.append(len(queries))
+        # 首页：总数 + 帖子各一条
+        self.assertEqual(counts, [2, 2, 2])
+
+        cursor = community_feed(self.viewer, page_size=5)["next_cursor"]
+        with CaptureQueriesContext(connection) as queries:
+            community_feed(self.viewer, page_size=20, cursor=cursor)
+        self.assertEqual(len(queries), 1)
+
+    def test_annotated_counts_and_is_liked(self):
+        posts = {post["id"]: post for post in community_feed(self.viewer, page_size=50)["posts"]}
+        target = posts[self.target.id]
+        self.assertEqual((target["likes_count"], target["comments_count"], target["is_liked"]), (2, 1, True))
+        self.assertEqual(target["related_checkin"]["date"], "2026-01-01")
+        others = [post for pk, post in posts.items() if pk != self.target.id]
+        self.assertFalse(any(post["is_liked"] or post["likes_count"] for post in others))
+
+    def test_cursor_pages_cover_feed_without_duplicates(self):
+        ids = []
+        cursor = None
+        while True:
+            feed = community_feed(self.viewer, post_type="checkin", page_size=4, cursor=cursor)
+            ids += [post["id"] for post in feed["posts"]]
+            cursor = feed["next_cursor"]
+            if not cursor:
+                break
+        expected = list(
+            FitnessCommunityPost.objects.filter(post_type="checkin")
+            .order_by("-created_at", "-id")
+            .values_list("id", flat=True)
+        )
+        self.assertEqual(ids, expected)
+
+    def test_view_rejects_invalid_cursor(self):
+        from apps.tools.legacy_views import get_fitness_community_posts_api
+
+        request = RequestFactory().get("/api/fitness_community/posts/", {"cursor": "not-a-cursor"})
+        request.user = self.viewer
+        response = get_fitness_community_posts_api(request)
+        self.assertEqual(response.status_code, 400)
+
+        request = RequestFactory().get("/api/fitness_community/posts/", {"page_size": "3"})
+        request.user = self.viewer
+        data = json.loads(get_fitness_community_posts_api(request).content)
+        self.assertEqual((len(data["posts"]), data["total_count"], data["has_next"]), (3, 30, True))
+
+    def test_route_serves_the_feed(self):
+        self.client.force_login(self.viewer)
+        response = self.client.get(reverse("tools:get_fitness_community_posts_api"), {"page_size": "3"})
+        data = response.json()
+        self.assertEqual(
+            [post["id"] for post in data["posts"]], [post["id"] for post in community_feed(self.viewer, page_size=3)["posts"]]
+        )
+        self.assertTrue(data["has_next"])
@@ -0,0 +1,102 @@
+"""
+食品图片解析测试
+原始名称的解析结果与原来逐个键扫描的实现完全一致；规范化、二元组匹配只处理原来匹配不到的名称
+"""
+
+import random
+
+from django.test import TestCase
+
+import pytest
+
+from apps.tools.services.food_image_mapping import ACCURATE_FOOD_IMAGES, FALLBACK_IMAGES, get_food_image, resolve_food_images
+from apps.tools.services.food_image_resolver import FoodImageResolver
+
+
+def legacy_get_food_image(food_name, cuisine=None, meal_type=None):
+    """改造前的 get_food_image"""
+    if food_name in ACCURATE_FOOD_IMAGES:
+        return ACCURATE_FOOD_IMAGES[food_name]
+    for key, value in ACCURATE_FOOD_IMAGES.items():
+        if food_name in key or key in food_name:
+            return value
+    if cuisine and cuisine in FALLBACK_IMAGES:
+        return FALLBACK_IMAGES[cuisine]
+    if meal_type and meal_type in FALLBACK_IMAGES:
+        return FALLBACK_IMAGES[meal_type]
+    return FALLBACK_IMAGES["default"]
+
+
+def legacy_match(images, name):
+    if name in images:
+        return name
+    return next((key for key in images if name in key or key in name), None)
+
+
+@pytest.mark.django_db
+class TestFoodImageResolver(TestCase):
+    def test_parity_with_linear_scan(self):
+        rng = random.Random(50)
+        keys = list(ACCURATE_FOOD_IMAGES)
+        names = ["", "未知", "pizza", "炸", "饭"]
+        for key in keys:
+            names.append(key)
+            names.append(key[rng.randrange(len(key)) :])
+            names.append(key[: rng.randrange(1, len(key) + 1)])
+            names.append("香辣" + key + "套餐")
+            names.append(rng.choice(keys)[:2] + key[-1])
+        names += ["".join(rng.choice("".join(keys)) for _ in range(rng.randrange(1, 6))) for _ in range(2000)]
+
+        names += [" " + key + "（大份）" for key in keys]
+
+        matched = 0
+        for name in names:
+            if legacy_match(ACCURATE_FOOD_IMAGES, name) is None:
+                # 原来匹配不到的名称可能由规范化或二元组匹配补上
+                continue
+            matched += 1
+            for cuisine, meal_type in ((None, None), ("western", "snack"), ("thai", "dinner")):
+                self.assertEqual(
+                    get_food_image(name, cuisine, meal_type), legacy_get_food_image(name, cuisine, meal_type), name
+                )
+        self.assertGreater(matched, 900)
+
+        # 规范化后仍匹配不到的名称按菜系、餐点类型回退，与原来一致
+        for name in ("？？", "完全陌生的名字xyz"):
+            self.assertEqual(get_food_image(name, "thai", "dinner"), legacy_get_food_image(name, "thai", "dinner"))
+
+    def test_parity_on_synthetic_overlapping_keys(self):
+        rng = random.Random(7)
+        images = {}
+        while len(images) < 300:
+            images["".join(rng.choice("abcdef") for _ in range(rng.randrange(1, 6)))] = f"{len(images)}.jpg"
+        resolver = FoodImageResolver(images, {"default": "default.jpg"})
+        for _ in range(3000):
+            name = "".join(rng.choice("abcdefg") for _ in range(rng.randrange(0, 8)))
+            expected = legacy_match(images, name)
+            if expected is not None:
+                self.assertEqual(resolver.match(name), expected, name)
+
+    def test_normalized_and_fuzzy_matches(self):
+        resolver = FoodImageResolver(
+            {"宫保鸡丁": "gongbao.jpg", "麻婆豆腐": "mapo.jpg", "Pizza": "pizza.jpg", "意大利面": "pasta.jpg"},
+            {"default": "default.jpg", "western": "western.jpg"},
+        )
+        self.assertEqual(resolver.resolve("宫保 鸡丁（大份）"), "gongbao.jpg")
+        self.assertEqual(resolver.resolve("ＰＩＺＺＡ！"), "pizza.jpg")
+        # 错字：二元组相似度足够高
+        self.assertEqual(resolver.resolve("麻婆豆付"), "mapo.jpg")
+        self.assertEqual(resolver.resolve("意式大利面条"), "pasta.jpg")
+        self.assertEqual(resolver.resolve("烧烤拼盘", cuisine="western"), "western.jpg")
+        self.assertEqual(resolver.resolve("？？"), "default.jpg")
+
+    def test_lru_and_batch_resolution(self):
+        resolver = FoodImageResolver({"红烧肉": "pork.jpg"}, {"default": "default.jpg", "chinese": "chinese.jpg"})
+        names = ["红烧肉盖饭", "清炒时蔬", "红烧肉盖饭", "红烧肉"]
+        self.assertEqual(resolver.resolve_many(names, cuisine="chinese"), ["pork.jpg", "chinese.jpg", "pork.jpg", "pork.jpg"])
+        info = resolver.match.cache_info()
+        self.assertEqual((info.hits, info.misses), (0, 3))
+        resolver.resolve("清炒时蔬")
+        self.assertEqual(resolver.match.cache_info().hits, 1)
+
+        self.assertEqual(resolve_food_images(["宫保鸡丁", "宫保鸡丁"]), [ACCURATE_FOOD_IMAGES["宫保鸡丁"]] * 2)
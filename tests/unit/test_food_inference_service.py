@@ -0,0 +1,117 @@
+"""
+食品图像推理服务测试
+使用numpy假编码器，测试并发请求合并批次、特征缓存、向量化top-k以及识别结果
+"""
+
+import io
+import tempfile
+import threading
+
+from django.test import SimpleTestCase
+
+import numpy as np
+from PIL import Image
+
+from apps.tools.services.food_inference_service import FoodEmbeddingIndex, FoodInferenceService
+from apps.tools.services.real_image_recognition import RealFoodImageRecognition
+
+
+def color_image(color) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (300, 260), color).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+class FakeEncoder:
+    """以各通道均值作为特征，记录每次调用的批次大小"""
+
+    def __init__(self):
+        self.batch_sizes = []
+
+    def __call__(self, batch):
+        self.batch_sizes.append(len(batch))
+        return batch.mean(axis=(2, 3))
+
+
+class TestFoodInferenceService(SimpleTestCase):
+    """推理服务测试"""
+
+    def test_concurrent_requests_are_batched(self):
+        """测试并发请求被合并为一个批次"""
+        encoder = FakeEncoder()
+        service = FoodInferenceService(encoder=encoder, max_batch_size=8, max_wait_ms=200)
+        images = [color_image((i * 30, 100, 200 - i * 20)) for i in range(6)]
+        results = [None] * len(images)
+
+        def worker(i):
+            results[i] = service.encode_bytes(images[i])
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(len(images))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(sum(encoder.batch_sizes), 6)
+        self.assertGreater(max(encoder.batch_sizes), 1)
+        self.assertTrue(all(result is not None and result.shape == (3,) for result in results))
+
+    def test_cached_embedding_skips_encoder(self):
+        """测试相同图片内容命中缓存"""
+        encoder = FakeEncoder()
+        service = FoodInferenceService(encoder=encoder, max_wait_ms=0)
+        data = color_image((10, 20, 30))
+
+        first = service.encode_bytes(data)
+        second = service.encode_bytes(data)
+
+        np.testing.assert_array_equal(first, second)
+        self.assertEqual(encoder.batch_sizes, [1])
+        self.assertEqual(service.get_stats()["cache_hits"], 1)
+
+    def test_top_k_matches_brute_force(self):
+        """测试向量化top-k与逐个计算余弦相似度一致"""
+        rng = np.random.default_rng(0)
+        matrix = rng.normal(size=(50, 16))
+        names = [f"食品{i}" for i in range(50)]
+        index = FoodEmbeddingIndex(names, matrix)
+        query = rng.normal(size=16)
+
+        def cosine(a, b):
+            return float(a @ b / np.linalg.norm(a) / np.linalg.norm(b))
+
+        expected = sorted(((names[i], cosine(query, row)) for i, row in enumerate(matrix)), key=lambda x: -x[1])
+        result = index.top_k(query, 5)[0]
+
+        self.assertEqual([name for name, _ in result], [name for name, _ in expected[:5]])
+        self.assertEqual([round(score, 5) for _, score in result], [round(score, 5) for _, score in expected[:5]])
+
+    def test_recognize_food_uses_library_index(self):
+        """测试识别结果来自食品库最相似的参考图片，共用图片的食品合并为一个标签"""
+        library_dir = self.enterContext(tempfile.TemporaryDirectory())
+        paths = {}
+        for name, color in (("番茄炒蛋", (220, 60, 40)), ("蔬菜沙拉", (60, 200, 60)), ("米饭", (240, 240, 235))):
+            paths[name] = f"{library_dir}/{name}.png"
+            with open(paths[name], "wb") as fp:
+                fp.write(color_image(color))
+        names = list(paths) + ["凉拌菜"]
+        library = (names, list(paths.values()) + [paths["蔬菜沙拉"]])
+        encoder = FakeEncoder()
+        service = FoodInferenceService(encoder=encoder, max_wait_ms=0, library=library)
+
+        # 并发的首次识别只生成一次索引
+        threads = [threading.Thread(target=lambda: service.index) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+        self.assertEqual(sum(encoder.batch_sizes), 3)
+        self.assertEqual(service.index.names, ["番茄炒蛋", "蔬菜沙拉", "米饭"])
+
+        result = RealFoodImageRecognition(service).recognize_food(paths["蔬菜沙拉"], confidence_threshold=0.3)
+
+        self.assertEqual(result["food_name"], "蔬菜沙拉")
+        self.assertEqual(result["related_foods"], ["凉拌菜"])
+        self.assertAlmostEqual(result["confidence"], 1.0, places=4)
+        # 查询图片与参考图片内容相同，特征直接命中缓存
+        self.assertEqual(service.get_stats()["cache_hits"], 1)
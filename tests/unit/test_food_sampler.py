@@ -0,0 +1,129 @@
+"""
+食物随机抽样测试
+测试别名法的抽样分布、id 数组按版本号缓存和失效，以及随机接口只查询抽中的食物和绑定照片
+"""
+
+import json
+import random
+from collections import Counter
+from unittest import mock
+
+from django.contrib.auth.models import AnonymousUser, User
+from django.core.cache import cache
+from django.db import connection
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+
+import pytest
+
+from apps.tools.models import FoodItem, FoodPhotoBinding
+from apps.tools.services import food_sampler
+from apps.tools.services.food_sampler import AliasTable, fetch_foods, get_pool, sample_ids
+from apps.tools.views.food_randomizer_views import food_randomizer_pure_random_api
+
+
+@pytest.mark.django_db
+class TestFoodSampler(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.foods = [
+            FoodItem.objects.create(
+                name=f"菜{i}",
+                cuisine="chinese" if i % 2 else "western",
+                meal_types=["breakfast"] if i % 3 == 0 else ["dinner", "snack"],
+                popularity_score=float(i % 4),
+            )
+            for i in range(24)
+        ]
+        user = User.objects.create_user("sampler_owner", password="x")
+        FoodPhotoBinding.objects.create(
+            food_item=self.foods[1], photo_name="dish.jpg", photo_url="http://x/d.jpg", created_by=user
+        )
+
+    def test_alias_table_follows_weights(self):
+        weights = [1, 2, 3, 4, 0]
+        table = AliasTable(weights)
+        rng = random.Random(49)
+        counts = Counter(table.sample(rng) for _ in range(100_000))
+        for index, weight in enumerate(weights):
+            self.assertAlmostEqual(counts[index] / 100_000, weight / 10, delta=0.01)
+
+        uniform = Counter(AliasTable([0, 0, 0]).sample(rng) for _ in range(3000))
+        self.assertEqual(set(uniform), {0, 1, 2})
+
+    def test_pools_are_filtered_cached_and_versioned(self):
+        pool = get_pool("chinese", "dinner")
+        expected = [food.id for i, food in enumerate(self.foods) if i % 2 and i % 3]
+        self.assertEqual(list(pool.ids), expected)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertIs(get_pool("chinese", "dinner"), pool)
+        self.assertEqual(len(queries), 0)
+
+        added = FoodItem.objects.create(name="新菜", cuisine="chinese", meal_types=["dinner"])
+        self.assertIn(added.id, get_pool("chinese", "dinner").ids)
+        added.delete()
+        self.assertNotIn(added.id, get_pool("chinese", "dinner").ids)
+
+    def test_only_relevant_changes_rebuild_pools(self):
+        pool = get_pool("chinese", "dinner")
+        food = FoodItem.objects.get(pk=self.foods[1].pk)
+        food.name = "改名"
+        food.save()
+        self.assertIs(get_pool("chinese", "dinner"), pool)
+
+        # 评分只改变受欢迎度：限频重建
+        food.popularity_score = 0.8
+        food.save()
+        self.assertIs(get_pool("chinese", "dinner"), pool)
+        with mock.patch.object(food_sampler, "WEIGHTS_REFRESH_SECONDS", 0):
+            rebuilt = get_pool("chinese", "dinner")
+        self.assertIsNot(rebuilt, pool)
+
+        food.cuisine = "western"
+        food.save()
+        self.assertNotIn(food.id, get_pool("chinese", "dinner").ids)
+
+    def test_unknown_filters_are_not_cached(self):
+        self.assertEqual(len(get_pool("no-such-cuisine", "dinner")), 0)
+        self.assertEqual(len(get_pool("chinese", "brunch")), 0)
+        self.assertNotIn(("no-such-cuisine", "dinner"), food_sampler._pools)
+        self.assertNotIn(("chinese", "brunch"), food_sampler._pools)
+
+    def test_sample_ids_are_distinct_and_skip_excluded(self):
+        rng = random.Random(7)
+        pool_ids = set(get_pool("western").ids)
+        for weighted in (False, True):
+            ids = sample_ids("western", count=4, exclude=list(pool_ids)[:8], weighted=weighted, rng=rng)
+            self.assertEqual(len(set(ids)), 4)
+            self.assertTrue(set(ids) <= pool_ids - set(list(pool_ids)[:8]))
+
+        # 大部分被排除时退回到在剩下的 id 中抽
+        keep = list(pool_ids)[:2]
+        self.assertCountEqual(sample_ids("western", count=4, exclude=pool_ids - set(keep), rng=rng), keep)
+        self.assertEqual(sample_ids("thai", count=4), [])
+
+        foods = fetch_foods([self.foods[1].id, self.foods[0].id])
+        self.assertEqual([food.id for food in foods], [self.foods[1].id, self.foods[0].id])
+        self.assertEqual((foods[0].photo_name, foods[1].photo_name), ("dish.jpg", None))
+
+    def test_view_queries_only_the_chosen_foods(self):
+        def pick(**data):
+            request = RequestFactory().post("/", json.dumps(data), content_type="application/json")
+            request.user = AnonymousUser()
+            with CaptureQueriesContext(connection) as queries:
+                response = food_randomizer_pure_random_api(request)
+            return json.loads(response.content), len(queries)
+
+        pick(cuisine_type="chinese", meal_type="dinner")
+        data, queries = pick(cuisine_type="chinese", meal_type="dinner", weighted=True)
+        self.assertEqual(queries, 1)
+        recommendation = data["recommendation"]
+        chosen = [recommendation["food"]] + recommendation["alternatives"]
+        self.assertEqual(len({food["id"] for food in chosen}), 4)
+        self.assertTrue(all(food["cuisine"] == "chinese" for food in chosen))
+
+        data, _ = pick(cuisine_type="chinese", meal_type="breakfast")
+        self.assertEqual(len(data["recommendation"]["alternatives"]), 3)
+        data, _ = pick(cuisine_type="thai")
+        self.assertFalse(data["success"])
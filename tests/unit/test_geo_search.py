@@ -0,0 +1,143 @@
+"""
+船宝物品按距离排序测试
+测试 geohash 前缀预筛选的结果与全表 haversine 排序一致、游标翻页不重复不遗漏以及保存时维护 geohash
+"""
+
+import json
+import random
+from math import asin, atan2, cos, degrees, radians, sin
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase
+
+import pytest
+
+from apps.tools.models import ShipBaoItem
+from apps.tools.services.geo_search import (
+    EARTH_RADIUS_KM,
+    RADII_KM,
+    covering_prefixes,
+    encode_geohash,
+    haversine_km,
+    nearest,
+)
+
+# 北京（本地 IP 的默认定位）
+CENTER = (39.9042, 116.4074)
+
+
+def destination(latitude, longitude, bearing, distance_km):
+    """从 (latitude, longitude) 沿 bearing 方向走 distance_km 到达的点"""
+    lat, lon, angle = radians(latitude), radians(longitude), distance_km / EARTH_RADIUS_KM
+    lat2 = asin(sin(lat) * cos(angle) + cos(lat) * sin(angle) * cos(bearing))
+    lon2 = lon + atan2(sin(bearing) * sin(angle) * cos(lat), cos(angle) - sin(lat) * sin(lat2))
+    return degrees(lat2), (degrees(lon2) + 540.0) % 360.0 - 180.0
+
+
+@pytest.mark.django_db
+class TestGeoSearch(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.seller = User.objects.create_user("geo_seller", password="x")
+        rng = random.Random(47)
+        items = []
+        for i in range(300):
+            # 大部分在城区附近，少量分布在全国，另有几件没有坐标
+            spread = 0.3 if i % 4 else 15.0
+            located = i % 25 != 0
+            items.append(
+                ShipBaoItem(
+                    seller=self.seller,
+                    title=f"物品{i}",
+                    description="描述",
+                    category="books",
+                    price=10,
+                    condition=4,
+                    location="北京",
+                    latitude=CENTER[0] + rng.uniform(-spread, spread) if located else None,
+                    longitude=CENTER[1] + rng.uniform(-spread, spread) if located else None,
+                )
+            )
+        for item in items:
+            item.save()
+
+    def _brute_force(self, queryset):
+        located = sorted(
+            (haversine_km(*CENTER, item.latitude, item.longitude), item.id) for item in queryset if item.latitude is not None
+        )
+        unknown = sorted(item.id for item in queryset if item.latitude is None)
+        return [pk for _, pk in located] + unknown
+
+    def test_first_page_matches_brute_force(self):
+        queryset = ShipBaoItem.objects.filter(status="pending")
+        page = nearest(queryset, *CENTER, limit=20)
+        self.assertEqual([item.id for item, _ in page["items"]], self._brute_force(queryset)[:20])
+        distances = [distance for _, distance in page["items"]]
+        self.assertEqual(distances, sorted(distances))
+        self.assertIsNotNone(page["next_cursor"])
+
+    def test_cursor_pages_cover_all_items_with_unknown_last(self):
+        queryset = ShipBaoItem.objects.filter(status="pending")
+        ids, distances = [], []
+        cursor = None
+        while True:
+            page = nearest(queryset, *CENTER, limit=17, cursor=cursor)
+            ids += [item.id for item, _ in page["items"]]
+            distances += [distance for _, distance in page["items"]]
+            cursor = page["next_cursor"]
+            if not cursor:
+                break
+        self.assertEqual(ids, self._brute_force(queryset))
+        self.assertEqual(distances[-12:], [None] * 12)
+        self.assertNotIn(None, distances[:-12])
+
+        with self.assertRaises(ValueError):
+            nearest(queryset, *CENTER, cursor="not-a-cursor")
+
+    def test_save_maintains_geohash(self):
+        item = ShipBaoItem.objects.filter(latitude__isnull=False).first()
+        self.assertEqual(item.geohash, encode_geohash(item.latitude, item.longitude))
+
+        item.latitude, item.longitude = 31.2304, 121.4737
+        item.save(update_fields=["latitude", "longitude"])
+        item.refresh_from_db()
+        self.assertTrue(item.geohash.startswith("wtw"))
+
+        item.latitude = None
+        item.save()
+        item.refresh_from_db()
+        self.assertEqual(item.geohash, "")
+
+    def test_view_sorts_by_distance_with_cursor(self):
+        from apps.tools.legacy_views import shipbao_items_api
+
+        def get(params):
+            request = RequestFactory().get("/tools/api/shipbao/items/", params, REMOTE_ADDR="127.0.0.1")
+            request.user = self.seller
+            return shipbao_items_api(request)
+
+        data = json.loads(get({"sort_by": "distance"}).content)
+        self.assertTrue(data["success"])
+        self.assertEqual(len(data["data"]), 20)
+        self.assertTrue(data["has_next"])
+        self.assertEqual(data["data"][0]["id"], self._brute_force(ShipBaoItem.objects.all())[0])
+        self.assertTrue(data["data"][0]["distance"].endswith("km"))
+
+        second = json.loads(get({"sort_by": "distance", "cursor": data["next_cursor"]}).content)
+        self.assertFalse({item["id"] for item in data["data"]} & {item["id"] for item in second["data"]})
+        self.assertEqual(get({"sort_by": "distance", "cursor": "bad"}).status_code, 400)
+
+    def test_covering_prefixes_contain_every_point_within_radius(self):
+        rng = random.Random(47)
+        centers = [(40.98, -30.5)] + [(rng.uniform(-80, 80), rng.uniform(-180, 180)) for _ in range(60)]
+        for latitude, longitude in centers:
+            for radius in RADII_KM[:-1]:
+                prefixes = covering_prefixes(latitude, longitude, radius)
+                if not prefixes:
+                    continue
+                for _ in range(40):
+                    point = destination(latitude, longitude, rng.uniform(0, 6.2832), radius * rng.uniform(0.9, 0.9999))
+                    self.assertLessEqual(haversine_km(latitude, longitude, *point), radius)
+                    geohash = encode_geohash(*point)
+                    self.assertTrue(any(geohash.startswith(p) for p in prefixes), (latitude, longitude, radius, point))
@@ -0,0 +1,104 @@
+"""
+URL按需加载测试
+测试反向解析不会导入视图模块、首次请求时才加载，全部路由都能解析到真实视图，
+以及不导入任何视图时所有模型都已注册
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+from django.test import SimpleTestCase
+from django.urls import URLPattern, resolve, reverse
+
+from apps.tools import urls as tool_urls
+from apps.tools.lazy_urls import LazyView, lazy_views
+
+
+class TestLazyView(SimpleTestCase):
+    """LazyView 行为测试"""
+
+    def test_lookup_str_does_not_import(self):
+        view = lazy_views("tests.unit.lazy_urls_target_missing").some_view
+        pattern = URLPattern(pattern=None, callback=view)
+
+        self.assertEqual(pattern.lookup_str, "tests.unit.lazy_urls_target_missing.some_view")
+        self.assertFalse(view.is_loaded)
+        self.assertNotIn("tests.unit.lazy_urls_target_missing", sys.modules)
+
+    def test_attributes_are_forwarded_after_loading(self):
+        view = LazyView("apps.tools.views.pdf_converter_views", "pdf_converter_status_api")
+
+        # CsrfViewMiddleware 在调用视图前读取 csrf_exempt
+        self.assertTrue(view.csrf_exempt)
+        self.assertTrue(view.is_loaded)
+
+    def test_class_based_view(self):
+        view = LazyView("apps.tools.async_test_cases_api", "TaskStatusAPI").as_view()
+
+        self.assertFalse(view.is_loaded)
+        self.assertFalse(hasattr(view, "view_class"))
+        self.assertTrue(view.csrf_exempt)
+        self.assertEqual(view.view_class.__name__, "TaskStatusAPI")
+
+
+class TestToolUrls(SimpleTestCase):
+    """工具路由测试"""
+
+    def test_reverse_and_resolve(self):
+        url = reverse("tools:pdf_converter_status")
+        match = resolve(url)
+
+        self.assertIsInstance(match.func, LazyView)
+        self.assertEqual(match.url_name, "pdf_converter_status")
+
+    def test_every_lazy_view_resolves(self):
+        missing = []
+        for pattern in tool_urls.urlpatterns:
+            if isinstance(pattern.callback, LazyView):
+                try:
+                    pattern.callback._resolve()
+                except (ImportError, AttributeError) as e:
+                    missing.append(f"{pattern.name}: {e}")
+        self.assertEqual(missing, [])
+
+
+MODELS_SCRIPT = """
+import json, sys
+from io import StringIO
+import django
+django.setup()
+from django.apps import apps
+from django.core.management import call_command
+out = StringIO()
+try:
+    call_command("makemigrations", "tools", check=True, dry_run=True, stdout=out)
+except SystemExit:
+    pass
+print(json.dumps({
+    "models": sorted(model.__name__ for model in apps.get_app_config("tools").get_models()),
+    "views": sorted(name for name in sys.modules if name == "apps.tools.views" or name.startswith("apps.tools.views.")),
+    "makemigrations": out.getvalue(),
+}))
+"""
+
+
+class TestModelRegistration(SimpleTestCase):
+    """模型注册不依赖视图模块的导入"""
+
+    def test_models_are_registered_without_views(self):
+        root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get("DJANGO_SETTINGS_MODULE", "config.settings.test_minimal"))
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [root, env.get("PYTHONPATH")]))
+        # 管理命令参数使 apps.ready 跳过后台定时任务
+        proc = subprocess.run(
+            [sys.executable, "-c", MODELS_SCRIPT, "test"], cwd=root, env=env, capture_output=True, text=True, timeout=300
+        )
+        self.assertEqual(proc.returncode, 0, proc.stderr[-2000:])
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+
+        self.assertEqual(result["views"], [])
+        for name in ("Exercise", "BodyPart", "EnhancedTrainingPlan", "UserTrainingPlan", "AchievementUnlockLog"):
+            self.assertIn(name, result["models"])
+        self.assertIn("No changes detected", result["makemigrations"])
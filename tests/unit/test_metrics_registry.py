@@ -0,0 +1,104 @@
+"""
+指标注册表与 /metrics 导出测试
+"""
+
+from django.contrib.auth.models import User
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django.urls import resolve
+
+from apps.tools.services.metrics_registry import (
+    CONTENT_TYPE,
+    HTTP_REQUESTS,
+    REGISTRY,
+    SYSTEM_MEMORY_PERCENT,
+    Counter,
+    Gauge,
+    Histogram,
+    MetricsRegistry,
+)
+from apps.tools.views.health_views import MetricsView
+from middleware.performance import PerformanceMonitoringMiddleware
+
+
+class MetricsRegistryTest(SimpleTestCase):
+    def test_openmetrics_exposition(self):
+        registry = MetricsRegistry()
+        jobs = Counter("jobs", "处理的任务", ["queue"], registry=registry)
+        temperature = Gauge("temperature", "温度", registry=registry)
+        latency = Histogram("latency_seconds", "耗时", buckets=(0.1, 1), registry=registry)
+
+        jobs.labels("pdf").inc()
+        jobs.labels("pdf").inc(2)
+        jobs.labels('a"b').inc()
+        temperature.set(21.5)
+        for value in (0.05, 0.1, 0.5, 3):
+            latency.observe(value)
+
+        lines = registry.render().splitlines()
+        self.assertIn("# TYPE jobs counter", lines)
+        self.assertIn('jobs_total{queue="pdf"} 3', lines)
+        self.assertIn('jobs_total{queue="a\\"b"} 1', lines)
+        self.assertIn("temperature 21.5", lines)
+        self.assertIn('latency_seconds_bucket{le="0.1"} 2', lines)
+        self.assertIn('latency_seconds_bucket{le="1"} 3', lines)
+        self.assertIn('latency_seconds_bucket{le="+Inf"} 4', lines)
+        self.assertIn("latency_seconds_count 4", lines)
+        self.assertIn("latency_seconds_sum 3.65", lines)
+        self.assertEqual(lines[-1], "# EOF")
+
+    def test_label_count_and_duplicate_names_are_rejected(self):
+        registry = MetricsRegistry()
+        jobs = Counter("jobs", "处理的任务", ["queue"], registry=registry)
+        with self.assertRaises(ValueError):
+            jobs.labels("a", "b")
+        with self.assertRaises(ValueError):
+            Gauge("jobs", "重复", registry=registry)
+
+    def test_collectors_fill_gauges(self):
+        REGISTRY.run_collectors()
+        self.assertGreater(SYSTEM_MEMORY_PERCENT.labels()._value, 0)
+        lines = REGISTRY.render().splitlines()
+        self.assertIn("# TYPE process_cpu_seconds counter", lines)
+        self.assertTrue(any(line.startswith("process_cpu_seconds_total ") for line in lines))
+        self.assertTrue(any(line.startswith("process_resident_memory_bytes ") for line in lines))
+
+    def test_counter_total_is_monotonic(self):
+        cpu = Counter("cpu_seconds", "CPU时间", registry=MetricsRegistry())
+        cpu.set_total(2.5)
+        cpu.set_total(1.0)
+        self.assertEqual(cpu.labels()._value, 2.5)
+
+    def test_performance_middleware_observes_requests(self):
+        request = RequestFactory().get("/health/")
+        request.resolver_match = resolve("/health/")
+        before = HTTP_REQUESTS.labels("GET", 201)._value
+        PerformanceMonitoringMiddleware(lambda request: HttpResponse(status=201))(request)
+        self.assertEqual(HTTP_REQUESTS.labels("GET", 201)._value, before + 1)
+
+
+class MetricsViewTest(SimpleTestCase):
+    @override_settings(METRICS_ALLOWED_IPS=["127.0.0.1"])
+    def test_requests_are_counted_and_exported(self):
+        before = HTTP_REQUESTS.labels("GET", 200)._value
+        self.client.get("/health/")
+        self.assertEqual(HTTP_REQUESTS.labels("GET", 200)._value, before + 1)
+
+        response = self.client.get("/metrics")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], CONTENT_TYPE)
+        self.assertIn('http_request_duration_seconds_count{method="GET",view="health_check"}', response.content.decode())
+
+    @override_settings(METRICS_AUTH_TOKEN="secret")
+    def test_token_required_when_configured(self):
+        self.assertEqual(self.client.get("/metrics").status_code, 401)
+        response = self.client.get("/metrics", HTTP_AUTHORIZATION="Bearer secret")
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(METRICS_AUTH_TOKEN="", METRICS_ALLOWED_IPS=[])
+    def test_denied_without_token_staff_or_allowed_ip(self):
+        self.assertEqual(self.client.get("/metrics").status_code, 403)
+
+        request = RequestFactory().get("/metrics")
+        request.user = User(username="ops", is_staff=True)
+        self.assertEqual(MetricsView.as_view()(request).status_code, 200)
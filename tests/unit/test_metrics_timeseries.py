@@ -0,0 +1,138 @@
+"""
+监控指标时序存储测试
+"""
+
+import shutil
+import tempfile
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+
+from apps.tools.services.metrics_timeseries import (
+    TIERS,
+    MetricsTimeSeriesStore,
+    flatten_metrics,
+    is_valid_metric_name,
+    parse_window,
+    pick_tier,
+)
+
+# 对齐到天的起始时间，便于计算桶边界
+T0 = 1_700_000_000 // 86400 * 86400
+
+
+class MetricsTimeSeriesStoreTest(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.store = MetricsTimeSeriesStore(self.directory)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_downsampling_tiers(self):
+        # 两小时内每分钟一个点，值为分钟序号
+        for minute in range(120):
+            self.store.append("system.cpu_percent", float(minute), T0 + minute * 60 + 5)
+        end = T0 + 120 * 60
+
+        minutes = self.store.series("system.cpu_percent", 3600, "1m", end=end)
+        self.assertEqual(len(minutes["points"]), 60)
+        self.assertEqual(minutes["points"][0]["timestamp"], T0 + 60 * 60)
+
+        hours = self.store.series("system.cpu_percent", 2 * 3600, "1h", end=end)["points"]
+        self.assertEqual([p["count"] for p in hours], [60, 60])
+        self.assertEqual([p["avg"] for p in hours], [29.5, 89.5])
+        self.assertEqual((hours[1]["min"], hours[1]["max"]), (60.0, 119.0))
+
+        rollup = self.store.rollup("system.cpu_percent", 86400, "1d", end=end)
+        self.assertEqual(rollup["count"], 120)
+        self.assertEqual(rollup["last"], 119.0)
+
+    def test_ring_buffer_overwrites_expired_slots(self):
+        step, slots = TIERS["1m"]
+        self.store.append("queue", 1.0, T0)
+        # 一整圈之后写入同一槽位，旧桶应被重置而不是累加
+        self.store.append("queue", 5.0, T0 + step * slots)
+
+        points = self.store.series("queue", step * slots, "1m", end=T0 + step * slots)["points"]
+        self.assertEqual(points, [{"timestamp": T0 + step * slots, "avg": 5.0, "min": 5.0, "max": 5.0, "count": 1}])
+
+    def test_latest_and_metrics(self):
+        self.store.append_many({"a": 1.0, "b": 2.0}, T0)
+        self.store.append_many({"a": 3.0}, T0 + 60)
+
+        self.assertEqual(self.store.metrics(), ["a", "b"])
+        self.assertEqual(
+            self.store.latest(), {"a": {"value": 3.0, "timestamp": T0 + 60}, "b": {"value": 2.0, "timestamp": T0}}
+        )
+        self.assertEqual(self.store.rollup("missing")["count"], 0)
+
+    def test_helpers(self):
+        snapshot = {
+            "system": {"cpu_percent": 12.5, "load_average": (0.5, 0.4, 0.3), "timestamp": "x"},
+            "database": {"connections": 3, "healthy": True},
+            "status": "success",
+        }
+        self.assertEqual(
+            flatten_metrics(snapshot),
+            {"system.cpu_percent": 12.5, "system.load_average_1m": 0.5, "database.connections": 3.0},
+        )
+        self.assertEqual([parse_window(v) for v in ("90", "15m", "24h", "7d", None)], [90, 900, 86400, 604800, 3600])
+        self.assertEqual([pick_tier(w) for w in (3600, 7 * 86400, 90 * 86400)], ["1m", "1h", "1d"])
+        self.assertTrue(is_valid_metric_name("system.cpu_percent"))
+        for name in ("../settings", "a/b", "..", ""):
+            self.assertFalse(is_valid_metric_name(name))
+            with self.assertRaises(ValueError):
+                self.store.series(name, 3600)
+
+
+class CollectMonitoringDataTest(SimpleTestCase):
+    def test_collector_appends_to_store(self):
+        from apps.tools.services import monitoring_service
+
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        store = MetricsTimeSeriesStore(directory)
+
+        with (
+            patch.object(
+                monitoring_service.SystemMonitor,
+                "get_system_metrics",
+                return_value={"cpu_percent": 40.0, "memory_percent": 50.0},
+            ),
+            patch.object(monitoring_service.DatabaseMonitor, "get_database_metrics", return_value={"connections": 2}),
+            patch("apps.tools.services.cache_cleanup.get_cache_stats", return_value={}),
+            patch("apps.tools.services.log_rotation.get_log_stats", return_value={}),
+            patch("apps.tools.services.database_cleanup.get_cleanup_stats", return_value={}),
+            patch("apps.tools.services.metrics_timeseries.get_metrics_store", return_value=store),
+        ):
+            result = monitoring_service.collect_monitoring_data()
+            with patch.object(monitoring_service, "collect_monitoring_data") as collect:
+                monitoring_service.cache.delete("monitoring_data")
+                stale = monitoring_service.get_monitoring_data()
+                monitoring_service.cache.delete(monitoring_service.LAST_SNAPSHOT_KEY)
+                rebuilt = monitoring_service.get_monitoring_data()
+
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(store.metrics(), ["database.connections", "system.cpu_percent", "system.memory_percent"])
+        # 缓存过期时不在请求中重新收集：返回上一次的快照，没有时用时序存储的最新值还原出相同结构
+        collect.assert_not_called()
+        self.assertEqual((stale["system"]["cpu_percent"], stale["cache"], stale["stale"]), (40.0, {}, True))
+        self.assertEqual(
+            rebuilt, {"system": {"cpu_percent": 40.0, "memory_percent": 50.0}, "database": {"connections": 2.0}, "stale": True}
+        )
+        self.assertEqual(store.rollup("system.cpu_percent", 3600)["count"], 1)
+
+    def test_series_view_rejects_invalid_metric_names(self):
+        from types import SimpleNamespace
+
+        from django.test import RequestFactory
+
+        from apps.tools.monitoring_views import get_metric_series
+
+        request = RequestFactory().get("/", {"metric": ["system.cpu_percent", "../../settings"]})
+        request.user = SimpleNamespace(is_authenticated=True, is_staff=True)
+        with patch("apps.tools.services.metrics_timeseries.get_metrics_store") as get_store:
+            response = get_metric_series(request)
+        self.assertEqual(response.status_code, 400)
+        get_store.return_value.series.assert_not_called()
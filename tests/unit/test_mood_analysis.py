@@ -0,0 +1,150 @@
+"""
+心情分析测试
+测试基于按天汇总表的分析结果与原来逐行累加的实现一致、汇总随日记增删改同步以及查询次数固定
+"""
+
+import random
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+import pytest
+
+from apps.tools.models import DiaryMoodDay, LifeDiaryEntry
+from apps.tools.services.mood_analysis import MOOD_WEIGHTS, mood_analysis, rebuild_mood_days
+
+MOODS = list(MOOD_WEIGHTS) + ["😊", "😢"]
+
+
+def legacy_mood_analysis(user, days):
+    """改造前 get_mood_analysis 的逐行实现"""
+    from_date = timezone.now().date() - timezone.timedelta(days=days)
+    diaries = LifeDiaryEntry.objects.filter(user=user, date__gte=from_date).order_by("date")
+    mood_counts = {}
+    mood_timeline = []
+    for diary in diaries:
+        mood_counts[diary.mood] = mood_counts.get(diary.mood, 0) + 1
+        mood_timeline.append({"date": diary.date.strftime("%Y-%m-%d"), "mood": diary.mood, "title": diary.title})
+
+    mood_trend = "stable"
+    if len(mood_timeline) >= 5:
+        recent_moods = mood_timeline[-min(14, len(mood_timeline)) :]
+        valid = [MOOD_WEIGHTS[item["mood"]] for item in recent_moods if item["mood"] in MOOD_WEIGHTS]
+        if valid:
+            average_score = sum(valid) / len(valid)
+            by_average = "improving" if average_score > 0.5 else "declining" if average_score < -0.5 else "stable"
+            mood_trend = by_average
+            if len(recent_moods) >= 8:
+                first_half = recent_moods[: len(recent_moods) // 2]
+                second_half = recent_moods[len(recent_moods) // 2 :]
+                first_avg = sum(MOOD_WEIGHTS.get(item["mood"], 0) for item in first_half) / len(first_half)
+                second_avg = sum(MOOD_WEIGHTS.get(item["mood"], 0) for item in second_half) / len(second_half)
+                if second_avg > first_avg + 0.5:
+                    mood_trend = "improving"
+                elif second_avg < first_avg - 0.5:
+                    mood_trend = "declining"
+
+    stats = {
+        "total_entries": len(diaries),
+        "analysis_period": f"最近{days}天",
+        "mood_distribution": mood_counts,
+        "mood_timeline": mood_timeline,
+        "mood_trend": mood_trend,
+        "most_common_mood": max(mood_counts.items(), key=lambda x: x[1])[0] if mood_counts else "neutral",
+        "trend_confidence": "high" if len(mood_timeline) >= 10 else "medium" if len(mood_timeline) >= 5 else "low",
+        "positive_days": sum(
+            1
+            for i in mood_timeline
+            if i["mood"] in ["happy", "excited", "content", "calm", "grateful", "inspired", "confident"]
+        ),
+        "negative_days": sum(1 for i in mood_timeline if i["mood"] in ["sad", "angry", "anxious", "stressed", "frustrated"]),
+        "neutral_days": sum(1 for i in mood_timeline if i["mood"] in ["neutral", "worried", "tired"]),
+    }
+    if len(mood_timeline) >= 7:
+        changes = sum(1 for i in range(1, len(mood_timeline)) if mood_timeline[i]["mood"] != mood_timeline[i - 1]["mood"])
+        stats["stability"] = (
+            "stable"
+            if changes <= len(mood_timeline) * 0.3
+            else "volatile" if changes >= len(mood_timeline) * 0.7 else "moderate"
+        )
+    else:
+        stats["stability"] = "insufficient_data"
+    return stats
+
+
+@pytest.mark.django_db
+class TestMoodAnalysis(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("mood_user", password="x")
+        self.today = timezone.now().date()
+
+    def _write(self, offset, mood, title=""):
+        return LifeDiaryEntry.objects.create(user=self.user, date=self.today - timedelta(days=offset), mood=mood, title=title)
+
+    def test_matches_legacy_output_on_fixture_data(self):
+        rng = random.Random(42)
+        other = User.objects.create_user("mood_other", password="x")
+        LifeDiaryEntry.objects.create(user=other, date=self.today, mood="sad")
+        for offset in rng.sample(range(120), 70):
+            # 偏向积极或消极的连续片段，覆盖 improving/declining/stable 各分支
+            pool = MOODS[:4] if offset < 10 else MOODS
+            self._write(offset, rng.choice(pool), f"第{offset}天")
+
+        for days in (3, 6, 9, 14, 30, 90, 500):
+            expected = legacy_mood_analysis(self.user, min(days, 365))
+            result = mood_analysis(self.user, days)
+            self.assertEqual({key: result[key] for key in expected}, expected, days)
+            self.assertEqual(list(result["mood_distribution"]), list(expected["mood_distribution"]))
+
+    def test_trend_branches_match_legacy(self):
+        for offset, mood in enumerate(["sad"] * 6 + ["happy"] * 6):
+            self._write(offset, mood)
+        # 最近的日期在前：最近 6 天 sad，之前 6 天 happy
+        result = mood_analysis(self.user, 30)
+        self.assertEqual(result["mood_trend"], legacy_mood_analysis(self.user, 30)["mood_trend"])
+        self.assertEqual(result["mood_trend"], "declining")
+        self.assertEqual(result["stability"], "stable")
+        self.assertEqual(sum(week["entries"] for week in result["weekly"]), 12)
+        # 7 天滚动平均：6 天 sad(-2) + 1 天 happy(3)
+        self.assertEqual(result["rolling_average"][-1]["score"], round(-9 / 7, 2))
+        self.assertEqual(result["rolling_average"][0]["score"], 3.0)
+
+    def test_rolling_average_uses_calendar_days(self):
+        for offset, mood in ((20, "happy"), (9, "sad"), (8, "neutral"), (3, "angry"), (1, "😊")):
+            self._write(offset, mood)
+        result = mood_analysis(self.user, 30)
+        # 缺记的日子不计入：相隔超过 6 天的记录不进入同一个窗口，没有权重的心情不参与平均
+        self.assertEqual([point["score"] for point in result["rolling_average"]], [3.0, -2.0, -1.0, -1.67, -3.0])
+
+    def test_summary_follows_entry_writes(self):
+        entry = self._write(1, "happy", "早起")
+        self.assertEqual(DiaryMoodDay.objects.get(entry=entry).score, 3)
+
+        entry.mood = "angry"
+        entry.date = self.today - timedelta(days=2)
+        entry.save()
+        day = DiaryMoodDay.objects.get(entry=entry)
+        self.assertEqual((day.mood, day.score, day.date), ("angry", -3, entry.date))
+        self.assertEqual(DiaryMoodDay.objects.count(), 1)
+
+        LifeDiaryEntry.objects.filter(pk=entry.pk).update(mood="calm")
+        self.assertEqual(rebuild_mood_days(self.user), 1)
+        self.assertEqual(DiaryMoodDay.objects.get(entry=entry).mood, "calm")
+
+        entry.delete()
+        self.assertFalse(DiaryMoodDay.objects.exists())
+
+    def test_query_count_does_not_grow_with_entries(self):
+        counts = []
+        for batch in (range(0, 5), range(5, 60)):
+            for offset in batch:
+                self._write(offset, MOODS[offset % len(MOODS)])
+            with CaptureQueriesContext(connection) as queries:
+                mood_analysis(self.user, 90)
+            counts.append(len(queries))
+        self.assertEqual(counts[0], counts[1])
+        self.assertLessEqual(counts[1], 4)
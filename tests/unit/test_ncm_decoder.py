@@ -0,0 +1,133 @@
+"""
+NCM解码测试
+构造与网易云客户端相同结构的NCM文件，测试分块解密与逐字节参考实现一致、元数据与封面解析
+"""
+
+import base64
+import io
+import json
+import os
+import struct
+import tempfile
+
+from django.test import SimpleTestCase
+
+import numpy as np
+from cryptography.hazmat.primitives import padding
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+
+from apps.tools.services.ncm_decoder import (
+    CORE_KEY,
+    KEY_PREFIX,
+    META_KEY,
+    META_PREFIX,
+    NCMFormatError,
+    decrypt_ncm,
+    decrypt_stream,
+    read_ncm_info,
+)
+
+
+def aes_encrypt(key, data):
+    padder = padding.PKCS7(128).padder()
+    encryptor = Cipher(algorithms.AES(key), modes.ECB()).encryptor()
+    return encryptor.update(padder.update(data) + padder.finalize()) + encryptor.finalize()
+
+
+def reference_key_stream(rc4_key):
+    box = list(range(256))
+    j = 0
+    for i in range(256):
+        j = (j + box[i] + rc4_key[i % len(rc4_key)]) & 0xFF
+        box[i], box[j] = box[j], box[i]
+    return [box[(box[i] + box[(i + box[i]) & 0xFF]) & 0xFF] for i in range(256)]
+
+
+def build_ncm(audio, rc4_key=b"0123456789abcdefghij" * 6, meta=None, cover=b""):
+    """按NCM结构加密音频；音频第n字节与 stream[(n + 1) % 256] 异或"""
+    stream = reference_key_stream(rc4_key)
+    encrypted = bytes(byte ^ stream[(n + 1) & 0xFF] for n, byte in enumerate(audio))
+
+    key_block = bytes(b ^ 0x64 for b in aes_encrypt(CORE_KEY, KEY_PREFIX + rc4_key))
+    meta_block = b""
+    if meta is not None:
+        meta_block = META_PREFIX + base64.b64encode(aes_encrypt(META_KEY, b"music:" + json.dumps(meta).encode()))
+        meta_block = bytes(b ^ 0x63 for b in meta_block)
+
+    return b"".join(
+        [
+            b"CTENFDAM",
+            b"\x00\x00",
+            struct.pack("<I", len(key_block)),
+            key_block,
+            struct.pack("<I", len(meta_block)),
+            meta_block,
+            b"\x00" * 5,
+            struct.pack("<I", len(cover) + 16),
+            struct.pack("<I", len(cover)),
+            cover,
+            b"\x00" * 16,
+            encrypted,
+        ]
+    )
+
+
+class TestNCMDecoder(SimpleTestCase):
+    """NCM解码测试"""
+
+    def setUp(self):
+        self.work_dir = self.enterContext(tempfile.TemporaryDirectory())
+
+    def write_ncm(self, data):
+        path = os.path.join(self.work_dir, "song.ncm")
+        with open(path, "wb") as fp:
+            fp.write(data)
+        return path
+
+    def test_chunked_decryption_matches_reference(self):
+        """测试不同分块大小（含不是256整数倍的分块和非整块结尾）解密结果一致"""
+        audio = b"ID3\x04\x00" + os.urandom(5000)
+        ncm_path = self.write_ncm(build_ncm(audio))
+
+        for chunk_size in (100, 256, 1000, 1024, 1024 * 1024):
+            output_path = os.path.join(self.work_dir, f"out_{chunk_size}.mp3")
+            result = decrypt_ncm(ncm_path, output_path, chunk_size=chunk_size)
+            with open(output_path, "rb") as fp:
+                self.assertEqual(fp.read(), audio)
+            self.assertEqual((result["size"], result["format"]), (len(audio), "mp3"))
+
+    def test_metadata_and_cover(self):
+        """测试元数据与专辑封面解析"""
+        meta = {"musicName": "晴天", "artist": [["周杰伦", 6452]], "album": "叶惠美", "duration": 269000, "format": "flac"}
+        cover = b"\x89PNG\r\n\x1a\n" + b"\x00" * 32
+        ncm_path = self.write_ncm(build_ncm(b"fLaC" + b"\x00" * 2000, meta=meta, cover=cover))
+
+        info = read_ncm_info(ncm_path)
+
+        self.assertEqual(info["metadata"]["title"], "晴天")
+        self.assertEqual(info["metadata"]["artist"], "周杰伦")
+        self.assertEqual(info["metadata"]["duration"], 269)
+        self.assertEqual(info["album_cover"], {"data": cover, "format": "png", "size": len(cover)})
+
+    def test_invalid_file(self):
+        """测试非NCM文件"""
+        with self.assertRaises(NCMFormatError):
+            read_ncm_info(self.write_ncm(b"not an ncm file"))
+
+    def test_stream_is_not_loaded_into_memory(self):
+        """测试 decrypt_stream 使用固定大小缓冲区"""
+
+        class CountingReader(io.BytesIO):
+            max_request = 0
+
+            def readinto(self, buffer):
+                CountingReader.max_request = max(CountingReader.max_request, len(buffer))
+                return super().readinto(buffer)
+
+        src = CountingReader(os.urandom(10000))
+        dst = io.BytesIO()
+        written = decrypt_stream(src, dst, np.zeros(256, dtype="uint8"), chunk_size=512)
+
+        self.assertEqual(written, 10000)
+        self.assertEqual(dst.getvalue(), src.getvalue())
+        self.assertEqual(CountingReader.max_request, 512)
@@ -0,0 +1,94 @@
+"""
+PDF转换结果缓存测试
+测试按内容哈希命中、LRU/容量淘汰以及统计接口中的命中率
+"""
+
+import tempfile
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+import pytest
+
+from apps.tools.models.legacy_models import PDFConversionCacheEntry, PDFConversionRecord
+from apps.tools.services.pdf_conversion_cache import ConversionResultCache
+
+
+@pytest.mark.django_db
+class TestConversionResultCache(TestCase):
+    """转换结果缓存测试"""
+
+    def setUp(self):
+        cache.clear()
+        # 每个测试使用独立的媒体目录，避免上一个测试留下的结果文件
+        media_settings = override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+        media_settings.enable()
+        self.addCleanup(media_settings.disable)
+        self.result_cache = ConversionResultCache(max_bytes=250, max_entries=10)
+
+    def test_get_after_put_is_a_hit(self):
+        """测试写入后命中并统计命中率"""
+        self.assertIsNone(self.result_cache.get("a" * 64))
+        stored = self.result_cache.put_content("a" * 64, "pdf-to-text", "pdf_to_text", b"hello")
+        hit = self.result_cache.get("a" * 64)
+
+        self.assertEqual(hit, stored)
+        self.assertEqual(hit["file_size"], 5)
+        self.assertEqual(PDFConversionCacheEntry.objects.get(cache_key="a" * 64).hit_count, 1)
+        stats = self.result_cache.get_stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["hit_rate"]), (1, 1, 50.0))
+
+    def test_least_recently_used_entry_is_evicted(self):
+        """测试超出容量时淘汰最久未访问的条目"""
+        for key in ("a", "b"):
+            self.result_cache.put_content(key * 64, "pdf-to-text", "pdf_to_text", b"x" * 100)
+        PDFConversionCacheEntry.objects.filter(cache_key="a" * 64).update(last_accessed_at=timezone.now() - timedelta(hours=2))
+        PDFConversionCacheEntry.objects.filter(cache_key="b" * 64).update(last_accessed_at=timezone.now() - timedelta(hours=1))
+        # 访问a后，b成为最久未访问的条目
+        self.assertIsNotNone(self.result_cache.get("a" * 64))
+        self.result_cache.put_content("c" * 64, "pdf-to-text", "pdf_to_text", b"x" * 100)
+
+        self.assertEqual(set(PDFConversionCacheEntry.objects.values_list("cache_key", flat=True)), {"a" * 64, "c" * 64})
+        self.assertFalse(default_storage.exists(f"converted/{'b' * 32}_pdf_to_text.txt"))
+        self.assertEqual(self.result_cache.get_stats()["evictions"], 1)
+
+    def test_missing_file_is_a_miss(self):
+        """测试结果文件被删除后条目失效"""
+        stored = self.result_cache.put_content("d" * 64, "pdf-to-text", "pdf_to_text", b"data")
+        default_storage.delete(f"converted/{stored['filename']}")
+
+        self.assertIsNone(self.result_cache.get("d" * 64))
+        self.assertFalse(PDFConversionCacheEntry.objects.filter(cache_key="d" * 64).exists())
+
+
+@pytest.mark.django_db
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class TestConverterAPICache(TestCase):
+    """同步转换接口复用缓存测试"""
+
+    def test_repeat_conversion_is_served_from_cache(self):
+        cache.clear()
+        self.client.force_login(User.objects.create_user(username="cacheuser", password="testpass123"))
+
+        responses = [
+            self.client.post(
+                "/tools/api/pdf-converter/",
+                {"type": "txt-to-pdf", "file": SimpleUploadedFile(name, "同一份文本内容".encode("utf-8"))},
+            ).json()
+            for name in ("first.txt", "second.txt")
+        ]
+
+        self.assertTrue(responses[0]["success"], responses[0])
+        self.assertFalse(responses[0]["cached"])
+        self.assertTrue(responses[1]["cached"])
+        self.assertEqual(responses[0]["filename"], responses[1]["filename"])
+        self.assertEqual(PDFConversionRecord.objects.filter(status="success").count(), 2)
+
+        stats = self.client.get("/tools/api/pdf-converter/stats/").json()["stats"]["conversion_cache"]
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["entries"], 1)
@@ -0,0 +1,103 @@
+"""
+PDF转换任务测试
+测试任务提交、逐页进度、按内容哈希去重以及转换记录的耗时统计
+"""
+
+import os
+import tempfile
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+
+import pytest
+
+fitz = pytest.importorskip("fitz")
+
+from apps.tools.models.legacy_models import PDFConversionRecord  # noqa: E402
+from apps.tools.services.pdf_conversion_jobs import PDFConversionJobManager, compute_input_hash  # noqa: E402
+
+
+def make_pdf(pages=3, marker="hello"):
+    """生成指定页数的PDF字节"""
+    doc = fitz.open()
+    for i in range(pages):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"{marker} page {i + 1} - some text content for extraction")
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+@pytest.mark.django_db
+@override_settings(PDF_CONVERSION_JOBS_EAGER=True, MEDIA_ROOT=tempfile.mkdtemp())
+class TestPDFConversionJobs(TestCase):
+    """PDF转换任务测试"""
+
+    def setUp(self):
+        cache.clear()
+        self.manager = PDFConversionJobManager()
+        self.user = User.objects.create_user(username="pdfuser", password="testpass123")
+
+    def test_input_hash_depends_on_type_and_params(self):
+        """测试内容哈希包含转换类型和参数"""
+        data = make_pdf(1)
+        self.assertEqual(compute_input_hash(data, "pdf-to-text"), compute_input_hash(data, "pdf-to-text"))
+        self.assertNotEqual(compute_input_hash(data, "pdf-to-text"), compute_input_hash(data, "pdf-to-image"))
+        self.assertNotEqual(
+            compute_input_hash(data, "pdf-to-image", {"dpi": 72}), compute_input_hash(data, "pdf-to-image", {"dpi": 150})
+        )
+
+    def test_pdf_to_image_job_reports_page_progress(self):
+        """测试PDF转图片任务逐页汇报进度并记录耗时"""
+        upload = SimpleUploadedFile("doc.pdf", make_pdf(3), content_type="application/pdf")
+        job = self.manager.submit(upload, "pdf-to-image", user=self.user, params={"dpi": 72})
+
+        self.assertEqual(job["status"], "completed")
+        self.assertEqual(job["progress"], 100)
+        self.assertEqual(job["total_pages"], 3)
+        self.assertTrue(job["download_url"].endswith("_images.zip/"))
+
+        record = PDFConversionRecord.objects.get(job_id=job["id"])
+        self.assertEqual(record.status, "success")
+        self.assertEqual(record.page_count, 3)
+        self.assertIsNotNone(record.started_at)
+        self.assertIsNotNone(record.completed_at)
+        self.assertGreaterEqual(record.conversion_time, 0)
+
+    def test_same_content_is_converted_once(self):
+        """测试相同内容重复提交时复用已有结果"""
+        data = make_pdf(2, marker="dedupe")
+        first = self.manager.submit(SimpleUploadedFile("a.pdf", data), "pdf-to-text", user=self.user)
+        second = self.manager.submit(SimpleUploadedFile("b.pdf", data), "pdf-to-text", user=self.user)
+
+        self.assertFalse(first["cached"])
+        self.assertTrue(second["cached"])
+        self.assertEqual(first["filename"], second["filename"])
+        self.assertEqual(PDFConversionRecord.objects.filter(input_hash=first["input_hash"]).count(), 2)
+
+    def test_failed_job_records_error(self):
+        """测试转换失败时任务和记录都标记为失败"""
+        upload = SimpleUploadedFile("broken.pdf", b"not a pdf", content_type="application/pdf")
+        job = self.manager.submit(upload, "pdf-to-text", user=self.user)
+
+        self.assertEqual(job["status"], "failed")
+        self.assertTrue(job["error"])
+        self.assertEqual(PDFConversionRecord.objects.get(job_id=job["id"]).status, "failed")
+
+    def test_submit_and_status_api(self):
+        """测试任务提交与状态查询接口"""
+        self.client.force_login(self.user)
+        upload = SimpleUploadedFile("doc.pdf", make_pdf(2, marker="api"), content_type="application/pdf")
+        response = self.client.post("/tools/api/pdf-converter/jobs/", {"type": "pdf-to-text", "file": upload})
+        self.assertIn(response.status_code, (200, 202))
+        job_id = response.json()["job_id"]
+
+        status_response = self.client.get(f"/tools/api/pdf-converter/jobs/{job_id}/")
+        self.assertEqual(status_response.status_code, 200)
+        payload = status_response.json()
+        self.assertEqual(payload["status"], "completed")
+        self.assertTrue(os.path.basename(payload["download_url"].rstrip("/")).endswith(".txt"))
+
+        self.assertEqual(self.client.get("/tools/api/pdf-converter/jobs/missing/").status_code, 404)
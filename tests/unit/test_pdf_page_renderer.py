@@ -0,0 +1,138 @@
+"""
+PDF页面渲染测试
+测试页区间切分、多进程渲染结果与顺序渲染一致、按需渲染单页接口，以及上传文档的限制和淘汰
+"""
+
+import os
+import tempfile
+import time
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+
+import pytest
+
+fitz = pytest.importorskip("fitz")
+
+from apps.tools.services.pdf_page_renderer import (  # noqa: E402
+    evict_page_documents,
+    normalize_render_options,
+    render_pdf_pages,
+    split_page_ranges,
+)
+
+
+def make_pdf_file(pages=8):
+    doc = fitz.open()
+    for i in range(pages):
+        doc.new_page().insert_text((72, 72), f"render page {i + 1}")
+    fd, path = tempfile.mkstemp(suffix=".pdf")
+    os.close(fd)
+    doc.save(path)
+    doc.close()
+    return path
+
+
+class TestPageRanges(TestCase):
+    """页区间切分测试"""
+
+    def test_split_covers_all_pages_in_order(self):
+        ranges = split_page_ranges(range(1, 11), 3)
+        self.assertEqual(ranges, [[1, 2, 3, 4], [5, 6, 7], [8, 9, 10]])
+
+    def test_split_never_creates_empty_ranges(self):
+        self.assertEqual(split_page_ranges([1, 2], 8), [[1], [2]])
+
+    def test_render_options_are_clamped(self):
+        self.assertEqual(normalize_render_options(1200, "JPG", 150), (600, "jpeg", 100))
+        with self.assertRaises(ValueError):
+            normalize_render_options(150, "gif", 80)
+
+
+class TestRenderPdfPages(TestCase):
+    """页面渲染测试"""
+
+    def setUp(self):
+        self.pdf_path = make_pdf_file(8)
+        self.addCleanup(os.unlink, self.pdf_path)
+
+    def test_parallel_matches_sequential(self):
+        with tempfile.TemporaryDirectory() as seq_dir, tempfile.TemporaryDirectory() as par_dir:
+            progress = []
+            sequential = render_pdf_pages(
+                self.pdf_path, seq_dir, dpi=72, workers=1, progress_callback=lambda d, t: progress.append((d, t))
+            )
+            parallel = render_pdf_pages(self.pdf_path, par_dir, dpi=72, workers=2)
+
+            self.assertEqual([p["page"] for p in parallel], list(range(1, 9)))
+            self.assertEqual(
+                [(p["filename"], p["width"], p["height"]) for p in sequential],
+                [(p["filename"], p["width"], p["height"]) for p in parallel],
+            )
+            self.assertEqual(progress[-1], (8, 8))
+            for page in parallel:
+                with open(os.path.join(par_dir, page["filename"]), "rb") as fp:
+                    self.assertEqual(fp.read(8), b"\x89PNG\r\n\x1a\n")
+
+    def test_webp_output(self):
+        with tempfile.TemporaryDirectory() as out_dir:
+            pages = render_pdf_pages(self.pdf_path, out_dir, dpi=72, image_format="webp", quality=60, page_numbers=[3])
+            self.assertEqual(pages[0]["filename"], "page_0003.webp")
+            with open(os.path.join(out_dir, pages[0]["filename"]), "rb") as fp:
+                self.assertEqual(fp.read(12)[8:], b"WEBP")
+
+
+@pytest.mark.django_db
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class TestPageImageAPI(TestCase):
+    """逐页图片接口测试"""
+
+    def test_lazy_upload_then_render_on_demand(self):
+        self.client.force_login(User.objects.create_user(username="pageuser", password="testpass123"))
+        pdf_path = make_pdf_file(3)
+        self.addCleanup(os.unlink, pdf_path)
+        with open(pdf_path, "rb") as fp:
+            upload = SimpleUploadedFile("doc.pdf", fp.read(), content_type="application/pdf")
+
+        response = self.client.post("/tools/api/pdf-converter/pages/", {"file": upload, "dpi": 72})
+        payload = response.json()
+        self.assertTrue(payload["success"])
+        self.assertEqual(payload["total_pages"], 3)
+        self.assertNotIn("size", payload["pages"][0])
+
+        image_response = self.client.get(payload["pages"][1]["url"])
+        self.assertEqual(image_response.status_code, 200)
+        self.assertEqual(image_response["Content-Type"], "image/png")
+        image_response.close()
+
+        out_of_range = payload["pages"][0]["url"].replace("/1/?", "/9/?")
+        self.assertEqual(self.client.get(out_of_range).status_code, 404)
+
+    @override_settings(PDF_PAGES_MAX_UPLOAD_BYTES=1024)
+    def test_upload_requires_login_and_size_limit(self):
+        pdf_path = make_pdf_file(40)
+        self.addCleanup(os.unlink, pdf_path)
+        with open(pdf_path, "rb") as fp:
+            content = fp.read()
+
+        response = self.client.post("/tools/api/pdf-converter/pages/", {"file": SimpleUploadedFile("doc.pdf", content)})
+        self.assertEqual(response.status_code, 302)
+
+        self.client.force_login(User.objects.create_user(username="bigpdf", password="testpass123"))
+        response = self.client.post("/tools/api/pdf-converter/pages/", {"file": SimpleUploadedFile("doc.pdf", content)})
+        self.assertEqual(response.status_code, 413)
+
+    def test_evicts_expired_and_least_recently_used_documents(self):
+        root = tempfile.mkdtemp()
+        now = time.time()
+        for name, age, size in (("old", 7200, 10), ("lru", 600, 600), ("recent", 60, 600), ("current", 3600, 600)):
+            os.makedirs(os.path.join(root, name, "72_85"))
+            with open(os.path.join(root, name, "source.pdf"), "wb") as fp:
+                fp.write(b"x" * size)
+            os.utime(os.path.join(root, name, "source.pdf"), (now - age, now - age))
+
+        # old 超过保留时间；其余 1800 字节超过 1500 上限，淘汰最久未访问的 lru；current 正在使用不淘汰
+        self.assertEqual(evict_page_documents(root, max_age=3000, max_bytes=1500, protect="current"), 2)
+        self.assertEqual(sorted(os.listdir(root)), ["current", "recent"])
+        self.assertEqual(evict_page_documents(root, max_age=3000, max_bytes=1500, protect="current"), 0)
@@ -0,0 +1,109 @@
+"""
+读写分离路由测试
+三个本地 SQLite 别名分别充当主库和两个副本，每个库写入不同的数据以区分读取落在哪个库上
+"""
+
+from datetime import date
+from unittest.mock import patch
+
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from apps.tools.models import DailyStat
+from apps.tools.services.database_sharding import (
+    PrimaryPinningMiddleware,
+    ReplicaLagMonitor,
+    ShardManager,
+    ShardRouter,
+    reset_routing_state,
+)
+
+from .shard_harness import sqlite_aliases
+
+PRIMARY = "rw_primary"
+REPLICAS = ["rw_replica_1", "rw_replica_2"]
+
+
+class FakeLagMonitor(ReplicaLagMonitor):
+    def __init__(self):
+        super().__init__(check_interval=0)
+        self.lags = {}
+
+    def measure(self, alias):
+        return self.lags.get(alias, 0.0)
+
+
+class ReplicaRoutingTest(SimpleTestCase):
+    databases = {"default", PRIMARY, *REPLICAS}
+
+    @classmethod
+    def setUpClass(cls):
+        cls.enterClassContext(sqlite_aliases([PRIMARY, *REPLICAS], models=[DailyStat]))
+        super().setUpClass()
+
+    def setUp(self):
+        manager = ShardManager()
+        manager.shard_configs = {DailyStat._meta.db_table: {"type": "horizontal", "shards": [PRIMARY], "key_field": "metric"}}
+        self.lag_monitor = FakeLagMonitor()
+        self.router = ShardRouter(manager, lag_monitor=self.lag_monitor)
+        settings_override = override_settings(
+            DATABASE_ROUTERS=[self.router],
+            DATABASE_REPLICAS={PRIMARY: REPLICAS},
+            REPLICA_MAX_LAG_SECONDS=5,
+            PRIMARY_STICKY_SECONDS=30,
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        for alias in (PRIMARY, *REPLICAS):
+            DailyStat.objects.using(alias).create(date=date(2026, 1, 1), metric=alias)
+            self.addCleanup(DailyStat.objects.using(alias).all().delete)
+        reset_routing_state()
+        self.addCleanup(reset_routing_state)
+
+    def read_from(self):
+        return DailyStat.objects.get(date=date(2026, 1, 1)).metric
+
+    def test_reads_go_to_replicas_and_writes_to_primary(self):
+        self.assertEqual({self.read_from() for _ in range(40)}, set(REPLICAS))
+
+        DailyStat.objects.create(date=date(2026, 1, 2), metric="written")
+
+        self.assertTrue(DailyStat.objects.using(PRIMARY).filter(metric="written").exists())
+        self.assertFalse(any(DailyStat.objects.using(alias).filter(metric="written").exists() for alias in REPLICAS))
+
+    def test_reads_stick_to_primary_after_write(self):
+        DailyStat.objects.create(date=date(2026, 1, 2), metric="written")
+        self.assertEqual(self.read_from(), PRIMARY)
+
+        with patch("apps.tools.services.database_sharding.time.time", return_value=10**10):
+            self.assertIn(self.read_from(), REPLICAS)
+
+    def test_lagging_replicas_fall_back_to_primary(self):
+        self.lag_monitor.lags = {"rw_replica_1": 30.0}
+        self.assertEqual({self.read_from() for _ in range(20)}, {"rw_replica_2"})
+
+        self.lag_monitor.lags = {"rw_replica_1": 30.0, "rw_replica_2": float("inf")}
+        self.assertEqual(self.read_from(), PRIMARY)
+        self.assertFalse(self.router.allow_migrate("rw_replica_1", "tools"))
+        self.assertTrue(self.router.allow_migrate(PRIMARY, "tools"))
+
+    def test_pin_cookie_carries_across_requests(self):
+        def write_view(request):
+            DailyStat.objects.create(date=date(2026, 1, 2), metric="written")
+            return HttpResponse("ok")
+
+        def read_view(request):
+            return HttpResponse(self.read_from())
+
+        factory = RequestFactory()
+        response = PrimaryPinningMiddleware(write_view)(factory.post("/"))
+        cookie = response.cookies[PrimaryPinningMiddleware.COOKIE_NAME]
+        self.assertEqual(cookie["max-age"], 30)
+        # 请求结束后线程状态被重置
+        self.assertIn(self.read_from(), REPLICAS)
+
+        request = factory.get("/")
+        request.COOKIES[PrimaryPinningMiddleware.COOKIE_NAME] = cookie.value
+        self.assertEqual(PrimaryPinningMiddleware(read_view)(request).content.decode(), PRIMARY)
+        self.assertIn(PrimaryPinningMiddleware(read_view)(factory.get("/")).content.decode(), REPLICAS)
@@ -0,0 +1,124 @@
+"""
+聊天室在线用户测试
+测试查询次数不随房间人数增长、成员来自 ChatRoomMember、结果按房间缓存以及在线状态和成员变化时缓存失效
+"""
+
+import json
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+
+import pytest
+
+from apps.tools.legacy_views import get_online_users_api
+from apps.tools.models import ChatRoom, ChatRoomMember, UserOnlineStatus
+from apps.users.models import Profile
+
+
+@pytest.mark.django_db
+class TestRoomPresence(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create_user("presence_owner", password="x")
+        self.guest = User.objects.create_user("presence_guest", password="x")
+        Profile.objects.create(user=self.guest, avatar="avatars/guest.png")
+        UserOnlineStatus.objects.create(user=self.owner, status="online", is_online=True)
+        self.small = ChatRoom.objects.create(user1=self.owner, user2=self.guest, room_type="private")
+        self.large = ChatRoom.objects.create(user1=self.owner, room_type="group", max_members=500)
+
+        members = User.objects.bulk_create([User(username=f"presence_member{i:03d}") for i in range(498)])
+        ChatRoomMember.objects.bulk_create([ChatRoomMember(room=self.large, user=user) for user in members])
+        UserOnlineStatus.objects.bulk_create(
+            [
+                UserOnlineStatus(user=user, status="online" if i % 2 else "away", is_online=bool(i % 2))
+                for i, user in enumerate(members)
+            ]
+        )
+        cache.clear()
+
+    def _get(self, room):
+        request = RequestFactory().get(f"/tools/api/chat/{room.room_id}/online_users/")
+        request.user = self.owner
+        with CaptureQueriesContext(connection) as queries:
+            response = get_online_users_api(request, room.room_id)
+        return json.loads(response.content), len(queries)
+
+    def test_query_count_is_flat_from_2_to_500_members(self):
+        small, small_queries = self._get(self.small)
+        large, large_queries = self._get(self.large)
+
+        self.assertEqual(len(small["online_users"]), 2)
+        self.assertEqual(len(large["online_users"]), 499)
+        # 房间一条 + 成员在线状态一条
+        self.assertEqual(small_queries, 2)
+        self.assertEqual(large_queries, small_queries)
+        self.assertEqual(sum(user["is_online"] for user in large["online_users"]), 1 + 249)
+
+        owner, guest = small["online_users"]
+        self.assertEqual((owner["username"], owner["is_online"]), ("presence_owner", True))
+        self.assertEqual((guest["is_online"], guest["last_seen"]), (False, None))
+        self.assertTrue(guest["avatar"].endswith("avatars/guest.png"))
+
+    def test_cached_per_room_and_invalidated_on_status_change(self):
+        self._get(self.small)
+        _, cached_queries = self._get(self.small)
+        # 缓存命中时只查询房间
+        self.assertEqual(cached_queries, 1)
+
+        UserOnlineStatus.objects.create(user=self.guest, status="online", is_online=True)
+        data, queries = self._get(self.small)
+        self.assertEqual(queries, 2)
+        self.assertTrue(data["online_users"][1]["is_online"])
+
+    def test_membership_changes_invalidate_the_room(self):
+        self._get(self.large)
+        member = ChatRoomMember.objects.create(room=self.large, user=self.guest)
+        data, _ = self._get(self.large)
+        self.assertIn("presence_guest", [user["username"] for user in data["online_users"]])
+
+        member.is_banned = True
+        member.save()
+        data, _ = self._get(self.large)
+        self.assertNotIn("presence_guest", [user["username"] for user in data["online_users"]])
+
+    def test_heartbeat_save_skips_room_lookup(self):
+        status = UserOnlineStatus.objects.get(user=self.owner)
+        self._get(self.small)
+        # 进入房间、心跳只改 current_room 和 last_seen，不影响成员列表
+        status.current_room = self.large
+        with CaptureQueriesContext(connection) as queries:
+            status.save()
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(self._get(self.small)[1], 1)
+
+        status.status = "busy"
+        status.save()
+        data, queries = self._get(self.small)
+        self.assertEqual(queries, 2)
+        self.assertFalse(data["online_users"][0]["is_online"])
+
+    def test_bulk_update_invalidates_through_user_ids(self):
+        from apps.tools.services.room_presence import invalidate_users
+
+        self._get(self.small)
+        # 定时任务批量置为离线（queryset.update 不发信号）
+        UserOnlineStatus.objects.filter(user=self.owner).update(status="offline", is_online=False)
+        invalidate_users([self.owner.id])
+        data, queries = self._get(self.small)
+        self.assertEqual(queries, 2)
+        self.assertFalse(data["online_users"][0]["is_online"])
+
+    def test_permission_uses_the_member_list(self):
+        request = RequestFactory().get("/")
+        request.user = User.objects.create_user("presence_stranger", password="x")
+        self.assertEqual(get_online_users_api(request, self.small.room_id).status_code, 403)
+
+        # 只设置 current_room 不算成员
+        UserOnlineStatus.objects.create(user=request.user, status="online", current_room=self.large)
+        self.assertEqual(get_online_users_api(request, self.large.room_id).status_code, 403)
+
+        ChatRoomMember.objects.create(room=self.large, user=request.user)
+        self.assertEqual(get_online_users_api(request, self.large.room_id).status_code, 200)
@@ -0,0 +1,155 @@
+"""
+一致性哈希与分片迁移测试
+测试扩容时只有约 1/N 的键改变归属、迁移只复制归属改变的行、可分批从断点继续、迁移期间的双读、
+清理前新拓扑已持久化以及迁移期间删除的行不会被复制回来
+"""
+
+from datetime import date
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from apps.tools.models import DailyStat, ShardMigration, ShardTombstone
+from apps.tools.services.database_sharding import (
+    ConsistentHashRing,
+    ShardedQuerySet,
+    ShardManager,
+    track_shard_deletions,
+)
+from apps.tools.services.shard_rebalancer import ShardRebalancer
+
+from .shard_harness import sqlite_aliases
+
+OLD = ["ring_shard_1", "ring_shard_2", "ring_shard_3", "ring_shard_4"]
+NEW = OLD + ["ring_shard_5"]
+STATE_DB = "ring_meta"
+TABLE = DailyStat._meta.db_table
+
+
+class ConsistentHashRingTest(SimpleTestCase):
+    def test_adding_a_node_moves_about_one_nth_of_keys(self):
+        old, new = ConsistentHashRing(OLD), ConsistentHashRing(NEW)
+        keys = range(20000)
+
+        moved = [key for key in keys if old.get_node(key) != new.get_node(key)]
+
+        self.assertAlmostEqual(len(moved) / len(keys), 0.2, delta=0.03)
+        # 只会迁往新分片，原分片之间没有数据流动
+        self.assertEqual({new.get_node(key) for key in moved}, {"ring_shard_5"})
+        self.assertAlmostEqual(old.moved_fraction(new), 0.2, delta=0.03)
+        self.assertEqual({new_node for _, _, _, new_node in old.moved_ranges(new)}, {"ring_shard_5"})
+
+
+class ShardRebalancerTest(SimpleTestCase):
+    databases = {"default", STATE_DB, *NEW}
+
+    @classmethod
+    def setUpClass(cls):
+        cls.enterClassContext(sqlite_aliases(NEW, models=[DailyStat]))
+        cls.enterClassContext(sqlite_aliases([STATE_DB], models=[ShardMigration, ShardTombstone]))
+        super().setUpClass()
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.manager = self.fresh_manager()
+        for pk in range(1, 201):
+            metric = f"user-{pk}"
+            DailyStat(id=pk, date=date(2026, 1, 1), metric=metric, value=pk).save(
+                using=self.manager.get_shard_for_key(TABLE, metric)
+            )
+        for alias in NEW:
+            self.addCleanup(DailyStat.objects.using(alias).all().delete)
+        self.addCleanup(ShardMigration.objects.using(STATE_DB).all().delete)
+        self.addCleanup(ShardTombstone.objects.using(STATE_DB).all().delete)
+
+    def fresh_manager(self):
+        """相当于新启动的进程：分片列表为代码中的默认配置"""
+        manager = ShardManager()
+        manager.state_db = STATE_DB
+        manager.shard_configs = {TABLE: {"type": "horizontal", "shards": list(OLD), "key_field": "metric", "strategy": "hash"}}
+        return manager
+
+    def placement(self):
+        return {row.metric: alias for alias in NEW for row in DailyStat.objects.using(alias).all()}
+
+    def test_only_moved_keys_are_copied(self):
+        before = self.placement()
+        ring = ConsistentHashRing(NEW)
+        expected_moves = {metric for metric in before if ring.get_node(metric) != before[metric]}
+
+        result = ShardRebalancer(DailyStat, TABLE, NEW, manager=self.manager, batch_size=16, state_db=STATE_DB).run()
+
+        self.assertTrue(result["finished"])
+        self.assertEqual(result["copied_rows"], len(expected_moves))
+        self.assertEqual(result["deleted_rows"], len(expected_moves))
+        after = self.placement()
+        self.assertEqual(len(after), 200)
+        self.assertEqual({metric for metric in after if after[metric] != before[metric]}, expected_moves)
+        self.assertEqual({after[metric] for metric in expected_moves}, {"ring_shard_5"})
+        self.assertEqual(self.manager.shard_configs[TABLE]["shards"], NEW)
+        self.assertFalse(self.manager.is_migrating(TABLE))
+
+    def test_resume_and_dual_read(self):
+        rebalancer = ShardRebalancer(DailyStat, TABLE, NEW, manager=self.manager, batch_size=16, state_db=STATE_DB)
+        moved = next(m for m, alias in self.placement().items() if ConsistentHashRing(NEW).get_node(m) != alias)
+
+        progress = rebalancer.run(max_batches=1)
+        self.assertFalse(progress["finished"])
+        self.assertEqual(progress["status"], "copying")
+        # 迁移期间写入按新拓扑路由，读取先查新分片再查原分片
+        self.assertEqual(self.manager.get_shard_for_key(TABLE, moved), "ring_shard_5")
+        self.assertEqual(len(self.manager.get_read_shards_for_key(TABLE, moved)), 2)
+        rows = ShardedQuerySet(DailyStat, self.manager).order_by("value").execute()
+        self.assertEqual([row.value for row in rows], list(range(1, 201)))
+
+        progress = rebalancer.run(max_batches=3)
+        self.assertFalse(progress["finished"])
+        self.assertEqual(ShardMigration.objects.using(STATE_DB).count(), 1)
+
+        result = ShardRebalancer(DailyStat, TABLE, NEW, manager=self.manager, batch_size=16, state_db=STATE_DB).run()
+        self.assertTrue(result["finished"])
+        self.assertEqual(result["copied_rows"], result["deleted_rows"])
+        self.assertEqual(len(self.placement()), 200)
+        self.assertEqual(self.manager.get_read_shards_for_key(TABLE, moved), ["ring_shard_5"])
+
+    def test_topology_is_persisted_before_cleanup(self):
+        rebalancer = ShardRebalancer(DailyStat, TABLE, NEW, manager=self.manager, batch_size=16, state_db=STATE_DB)
+        delete = rebalancer._delete
+        seen = []
+
+        def checked_delete(state, shard, rows):
+            # 缓存中的迁移登记丢失、进程重启后仍按新拓扑路由
+            cache.clear()
+            seen.append(self.fresh_manager().get_all_shards(TABLE))
+            delete(state, shard, rows)
+
+        rebalancer._delete = checked_delete
+        rebalancer.run(max_batches=20)
+
+        self.assertTrue(seen)
+        self.assertTrue(all(shards == NEW for shards in seen))
+        # 清理中断后，新进程以迁移记录中的原分片继续
+        result = ShardRebalancer(DailyStat, TABLE, NEW, manager=self.fresh_manager(), batch_size=16, state_db=STATE_DB).run()
+        self.assertTrue(result["finished"])
+        self.assertEqual(len(self.placement()), 200)
+
+    def test_rows_deleted_during_migration_are_not_copied(self):
+        self.addCleanup(track_shard_deletions(self.manager, [DailyStat]))
+        before = self.placement()
+        moved = sorted(m for m, alias in before.items() if ConsistentHashRing(NEW).get_node(m) != alias)[-1]
+        rebalancer = ShardRebalancer(DailyStat, TABLE, NEW, manager=self.manager, batch_size=16, state_db=STATE_DB)
+        rebalancer.run(max_batches=0)
+
+        # 按双读找到原分片上的行，按新拓扑删除（新分片上还没有这一行）
+        row = DailyStat.objects.using(before[moved]).get(metric=moved)
+        row.delete(using=self.manager.get_shard_for_key(TABLE, moved))
+        rows = ShardedQuerySet(DailyStat, self.manager).execute()
+        self.assertNotIn(moved, [row.metric for row in rows])
+
+        result = rebalancer.run()
+        self.assertTrue(result["finished"])
+        after = self.placement()
+        self.assertNotIn(moved, after)
+        self.assertEqual(len(after), 199)
+        self.assertFalse(ShardTombstone.objects.using(STATE_DB).exists())
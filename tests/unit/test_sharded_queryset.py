@@ -0,0 +1,93 @@
+"""
+分片查询集测试
+测试各分片并发执行、LIMIT 下推以及多字段 k 路归并与单库排序结果一致
+"""
+
+import threading
+from datetime import date, timedelta
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+
+from apps.tools.models import DailyStat
+from apps.tools.services.database_sharding import ShardedQuerySet, ShardManager
+
+from .shard_harness import sqlite_aliases
+
+SHARDS = ["stat_shard_1", "stat_shard_2", "stat_shard_3"]
+
+
+class ShardedQuerySetTest(SimpleTestCase):
+    databases = {"default", *SHARDS}
+
+    @classmethod
+    def setUpClass(cls):
+        # 别名需要在 SimpleTestCase 检查 databases 之前注册
+        cls.enterClassContext(sqlite_aliases(SHARDS, models=[DailyStat]))
+        super().setUpClass()
+
+    def setUp(self):
+        self.manager = ShardManager()
+        self.manager.shard_configs = {
+            DailyStat._meta.db_table: {"type": "horizontal", "shards": SHARDS, "key_field": "metric", "strategy": "hash"}
+        }
+        self.rows = []
+        start = date(2026, 1, 1)
+        for i in range(60):
+            row = DailyStat(date=start + timedelta(days=i % 7), metric=f"m{i:02d}", value=(i * 37) % 11)
+            row.save(using=SHARDS[i % 3])
+            self.rows.append(row)
+        for shard in SHARDS:
+            self.addCleanup(DailyStat.objects.using(shard).all().delete)
+
+    def query(self):
+        return ShardedQuerySet(DailyStat, self.manager)
+
+    def test_merge_matches_global_order(self):
+        expected = sorted(self.rows, key=lambda r: r.metric)
+        expected = sorted(expected, key=lambda r: r.value, reverse=True)
+
+        result = self.query().order_by("-value", "metric").offset(5).limit(10).execute()
+
+        self.assertEqual([r.metric for r in result], [r.metric for r in expected[5:15]])
+        self.assertEqual(len(self.query().filter(value__gte=5).execute()), sum(r.value >= 5 for r in self.rows))
+
+    def test_limit_is_pushed_down_to_each_shard(self):
+        queryset = self.query().order_by("date", "-metric").offset(3).limit(4)
+
+        sql = str(queryset._shard_queryset(SHARDS[0]).query)
+        self.assertIn("ORDER BY", sql)
+        self.assertIn("LIMIT 7", sql)
+
+        expected = sorted(sorted(self.rows, key=lambda r: r.metric, reverse=True), key=lambda r: r.date)
+        self.assertEqual([r.metric for r in queryset.execute()], [r.metric for r in expected[3:7]])
+
+    def test_shards_run_in_worker_threads(self):
+        threads = set()
+        original = ShardedQuerySet._execute_on_shard
+
+        def record(queryset, shard):
+            threads.add(threading.get_ident())
+            return original(queryset, shard)
+
+        with patch.object(ShardedQuerySet, "_execute_on_shard", record):
+            result = self.query().order_by("metric").execute()
+
+        self.assertEqual(len(result), 60)
+        self.assertNotIn(threading.get_ident(), threads)
+
+    def test_failed_shard_is_skipped(self):
+        original = ShardedQuerySet._execute_on_shard
+
+        def flaky(queryset, shard):
+            if shard == SHARDS[1]:
+                raise RuntimeError("shard down")
+            return original(queryset, shard)
+
+        with (
+            patch.object(ShardedQuerySet, "_execute_on_shard", flaky),
+            self.assertLogs("apps.tools.services.database_sharding", "ERROR"),
+        ):
+            result = self.query().order_by("metric").limit(100).execute()
+
+        self.assertEqual([r.metric for r in result], sorted(r.metric for i, r in enumerate(self.rows) if i % 3 != 1))
@@ -0,0 +1,102 @@
+"""
+分享数据汇总测试
+测试数据库聚合结果与逐行累加一致、已结束日期只聚合一次以及接口权限
+"""
+
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+
+import pytest
+
+from apps.share.models import ShareAnalytics
+from apps.share.summaries import analytics_summary
+
+
+@pytest.mark.django_db
+class TestShareAnalyticsSummary(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # 分享应用模型的 app_label 与应用不一致，测试库中不会自动建表
+        with connection.schema_editor() as editor:
+            editor.create_model(ShareAnalytics)
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        with connection.schema_editor() as editor:
+            editor.delete_model(ShareAnalytics)
+
+    def setUp(self):
+        cache.clear()
+        self.today = timezone.localdate()
+        self.rows = [
+            ShareAnalytics(date=self.today - timedelta(days=d), platform=p, share_count=d + i, click_count=3 * d + i)
+            for d in range(40)
+            for i, p in enumerate(["wechat", "weibo", "link"])
+            if (d + i) % 4
+        ]
+        ShareAnalytics.objects.bulk_create(self.rows)
+
+    def test_summary_matches_row_by_row_totals(self):
+        start = self.today - timedelta(days=29)
+        summary = analytics_summary(start, self.today)
+
+        in_window = [r for r in self.rows if r.date >= start]
+        expected_daily = {}
+        expected_platform = {}
+        for r in in_window:
+            day = expected_daily.setdefault(r.date.strftime("%Y-%m-%d"), {"shares": 0, "clicks": 0})
+            day["shares"] += r.share_count
+            day["clicks"] += r.click_count
+            platform = expected_platform.setdefault(r.get_platform_display(), {"shares": 0, "clicks": 0})
+            platform["shares"] += r.share_count
+            platform["clicks"] += r.click_count
+
+        self.assertEqual(summary["daily_summary"], expected_daily)
+        self.assertEqual(summary["platform_summary"], expected_platform)
+        self.assertEqual(len(summary["analytics"]), len(in_window))
+        # 明细与原来的 values() 一样带记录ID
+        by_key = {(r.date, r.platform): r for r in ShareAnalytics.objects.filter(date__gte=start)}
+        for row in summary["analytics"]:
+            record = by_key[row["date"], row["platform"]]
+            self.assertEqual(
+                row,
+                {
+                    "id": record.id,
+                    "date": record.date,
+                    "platform": record.platform,
+                    "share_count": record.share_count,
+                    "click_count": record.click_count,
+                },
+            )
+
+    def test_closed_days_are_cached(self):
+        start = self.today - timedelta(days=29)
+        analytics_summary(start, self.today)
+
+        ShareAnalytics.objects.filter(date=self.today - timedelta(days=3)).update(click_count=10**6)
+        ShareAnalytics.objects.create(date=self.today, platform="qq", share_count=7, click_count=9)
+        with self.assertNumQueries(1):
+            summary = analytics_summary(start, self.today)
+
+        # 已结束的日期来自缓存，当天重新聚合
+        self.assertLess(summary["daily_summary"][(self.today - timedelta(days=3)).strftime("%Y-%m-%d")]["clicks"], 10**6)
+        self.assertEqual(summary["platform_summary"]["QQ"], {"shares": 7, "clicks": 9})
+
+    def test_endpoint_requires_staff(self):
+        user = User.objects.create_user("viewer", password="x")
+        self.client.force_login(user)
+        self.assertEqual(self.client.get("/share/analytics/").status_code, 403)
+
+        user.is_staff = True
+        user.save()
+        response = self.client.get("/share/analytics/?days=7")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["daily_summary"]), 7)
+        self.assertEqual(self.client.get("/share/analytics/?days=abc").status_code, 400)
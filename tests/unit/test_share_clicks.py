@@ -0,0 +1,101 @@
+"""
+分享链接点击计数测试
+测试点击只写内存、批量写回的语句数量以及并发点击不丢失计数
+"""
+
+import threading
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+import pytest
+
+from apps.share.counters import ClickBuffer, click_buffer
+from apps.share.models import ShareAnalytics, ShareLink
+
+SHARE_MODELS = [ShareLink, ShareAnalytics]
+
+
+@pytest.mark.django_db
+@override_settings(SHARE_CLICKS_EAGER=False, SHARE_CLICK_FLUSH_INTERVAL=0)
+class TestShareClickBuffer(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # 分享应用模型的 app_label 与应用不一致，测试库中不会自动建表
+        with connection.schema_editor() as editor:
+            for model in SHARE_MODELS:
+                editor.create_model(model)
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        with connection.schema_editor() as editor:
+            for model in SHARE_MODELS:
+                editor.delete_model(model)
+
+    def setUp(self):
+        self.links = [
+            ShareLink.objects.create(original_url=f"https://example.com/{i}", short_code=f"code{i}", title=str(i))
+            for i in range(3)
+        ]
+        click_buffer._drain()
+
+    def test_click_redirects_without_writes(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/share/s/code1/")
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(response["Location"], "https://example.com/1")
+        self.assertEqual([q["sql"].split()[0] for q in queries.captured_queries], ["SELECT"])
+        self.assertEqual(click_buffer.pending(), 1)
+        self.assertEqual(self.client.get("/share/s/missing/").status_code, 404)
+
+        click_buffer.flush()
+        self.assertEqual(ShareLink.objects.get(short_code="code1").click_count, 1)
+        self.assertEqual(ShareAnalytics.objects.get(date=timezone.localdate(), platform="link").click_count, 1)
+
+    def test_concurrent_clicks_are_not_lost(self):
+        buffer = ClickBuffer()
+        today = timezone.localdate()
+        ShareAnalytics.objects.create(date=today, platform="link", click_count=5)
+
+        def click(worker):
+            for i in range(500):
+                link = self.links[(worker + i) % 3]
+                buffer.record(link.id, platform="link" if i % 2 else "wechat", day=today - timedelta(days=i % 2))
+
+        threads = [threading.Thread(target=click, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        with CaptureQueriesContext(connection) as queries:
+            result = buffer.flush()
+
+        self.assertEqual(result["clicks"], 4000)
+        self.assertEqual(sum(ShareLink.objects.values_list("click_count", flat=True)), 4000)
+        self.assertEqual(ShareAnalytics.objects.get(date=today - timedelta(days=1), platform="link").click_count, 2000)
+        self.assertEqual(ShareAnalytics.objects.get(date=today, platform="wechat").click_count, 2000)
+        self.assertEqual(ShareAnalytics.objects.get(date=today, platform="link").click_count, 5)
+        # 4000 次点击：链接一条 UPDATE，统计一条 INSERT 和一条 UPDATE（另有事务保存点语句）
+        writes = [q for q in queries.captured_queries if q["sql"].split()[0] in ("INSERT", "UPDATE")]
+        self.assertEqual(len(writes), 3)
+
+    def test_failed_flush_keeps_counts(self):
+        buffer = ClickBuffer()
+        buffer.record(self.links[0].id)
+        buffer.record(self.links[0].id)
+
+        with patch.object(ShareLink.objects, "filter", side_effect=RuntimeError("db down")):
+            with self.assertRaises(RuntimeError):
+                buffer.flush()
+
+        self.assertEqual(buffer.pending(), 2)
+        buffer.flush()
+        self.assertEqual(ShareLink.objects.get(pk=self.links[0].pk).click_count, 2)
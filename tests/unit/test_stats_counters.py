@@ -0,0 +1,77 @@
+"""
+计数统计服务测试
+测试用户总数由信号增量维护、已结束日期的统计只计算一次、当天统计短时间缓存
+"""
+
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+
+import pytest
+
+from apps.tools.models import DailyStat, RowCounter, ToolUsageLog
+from apps.tools.services.database_cleanup import get_cleanup_stats
+from apps.tools.services.stats_counters import daily_stat, estimated_count, exact_count
+
+
+@pytest.mark.django_db
+class TestStatsCounters(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user("counter_user", password="x")
+
+    def test_exact_count_tracks_creates_and_deletes(self):
+        self.assertEqual(exact_count(User), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            User.objects.create_user("second", password="x")
+            User.objects.create_user("third", password="x")
+        with self.captureOnCommitCallbacks(execute=True):
+            User.objects.filter(username="second").delete()
+
+        self.assertEqual(RowCounter.objects.get(key="auth.user").value, 2)
+        with self.assertNumQueries(1):
+            self.assertEqual(exact_count(User), 2)
+
+    def test_closed_days_are_computed_once(self):
+        yesterday = timezone.localdate() - timedelta(days=1)
+        log = ToolUsageLog.objects.create(user=self.user, tool_type="PDF_CONVERTER", input_data="{}")
+        ToolUsageLog.objects.filter(pk=log.pk).update(created_at=timezone.now() - timedelta(days=1))
+
+        self.assertEqual(daily_stat("tool_usage", yesterday), 1)
+        self.assertTrue(DailyStat.objects.get(date=yesterday, metric="tool_usage").is_final)
+
+        ToolUsageLog.objects.all().delete()
+        with self.assertNumQueries(1):
+            self.assertEqual(daily_stat("tool_usage", yesterday), 1)
+
+    def test_today_is_cached(self):
+        ToolUsageLog.objects.create(user=self.user, tool_type="PDF_CONVERTER", input_data="{}")
+        self.assertEqual(daily_stat("tool_usage"), 1)
+
+        ToolUsageLog.objects.create(user=self.user, tool_type="PDF_CONVERTER", input_data="{}")
+        with self.assertNumQueries(0):
+            self.assertEqual(daily_stat("tool_usage"), 1)
+        self.assertFalse(DailyStat.objects.get(date=timezone.localdate(), metric="tool_usage").is_final)
+
+        with self.assertRaises(ValueError):
+            daily_stat("unknown")
+
+    def test_cleanup_stats_use_estimated_counts(self):
+        ToolUsageLog.objects.create(user=self.user, tool_type="PDF_CONVERTER", input_data="{}")
+        # SQLite 没有估算行数，回退为精确计数
+        self.assertEqual(estimated_count(ToolUsageLog), 1)
+
+        with (
+            patch("apps.tools.services.stats_counters.estimated_count", return_value=12345) as estimate,
+            patch("apps.tools.services.database_cleanup.SocialMediaSubscription"),
+        ):
+            stats = get_cleanup_stats()
+
+        self.assertEqual(estimate.call_count, 3)
+        self.assertEqual(stats["tool_usage_logs"]["total_count"], 12345)
+        self.assertEqual(stats["tool_usage_logs"]["old_count"], 0)
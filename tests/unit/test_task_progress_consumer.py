@@ -0,0 +1,81 @@
+"""
+任务进度推送测试
+测试连接时按 last_event_id 回放历史事件、实时推送新事件，以及任务结束后关闭连接
+"""
+
+import json
+from unittest.mock import patch
+
+from django.test import TestCase
+
+import pytest
+from asgiref.sync import sync_to_async
+from asgiref.testing import ApplicationCommunicator
+
+from apps.tools.async_task_manager import AsyncTaskManager
+from apps.tools.consumers import TaskProgressConsumer
+from apps.tools.models.legacy_models import BackgroundTaskEvent
+
+
+def connect(task_id, last_event_id=0):
+    scope = {
+        "type": "websocket",
+        "path": f"/ws/tasks/{task_id}/",
+        "query_string": f"last_event_id={last_event_id}".encode(),
+        "url_route": {"args": (), "kwargs": {"task_id": task_id}},
+        "headers": [],
+    }
+    return ApplicationCommunicator(TaskProgressConsumer.as_asgi(), scope)
+
+
+async def receive_event(communicator):
+    message = await communicator.receive_output(2)
+    assert message["type"] == "websocket.send", message
+    return json.loads(message["text"])["event"]
+
+
+@pytest.mark.django_db
+class TestTaskProgressConsumer(TestCase):
+    """任务进度推送测试"""
+
+    def setUp(self):
+        self.manager = AsyncTaskManager()
+
+    @patch("apps.tools.async_task_manager.DeepSeekClient")
+    async def test_replay_after_last_event_id(self, client_class):
+        """测试重连时只回放未收到的事件，任务结束后关闭连接"""
+        client_class.return_value.generate_test_cases.return_value = "结果"
+        task_id = await sync_to_async(self.manager.create_task)("需求", "提示词")
+        await sync_to_async(self.manager._execute_task)(task_id)
+        event_ids = await sync_to_async(list)(BackgroundTaskEvent.objects.filter(task_id=task_id).values_list("id", flat=True))
+
+        communicator = connect(task_id, last_event_id=event_ids[1])
+        await communicator.send_input({"type": "websocket.connect"})
+        self.assertEqual((await communicator.receive_output(2))["type"], "websocket.accept")
+
+        replayed = [await receive_event(communicator), await receive_event(communicator)]
+        self.assertEqual([event["id"] for event in replayed], event_ids[2:])
+        self.assertEqual((replayed[-1]["status"], replayed[-1]["progress"]), ("completed", 100))
+        self.assertEqual((await communicator.receive_output(2))["type"], "websocket.close")
+
+    async def test_live_progress_is_pushed(self):
+        """测试连接后新追加的事件被实时推送"""
+        task_id = await sync_to_async(self.manager.create_task)("需求", "提示词")
+
+        communicator = connect(task_id)
+        await communicator.send_input({"type": "websocket.connect"})
+        self.assertEqual((await communicator.receive_output(2))["type"], "websocket.accept")
+        self.assertEqual((await receive_event(communicator))["status"], "pending")
+
+        await sync_to_async(self.manager._append_event)(task_id, "running", 40, "生成测试用例")
+        event = await receive_event(communicator)
+
+        self.assertEqual((event["progress"], event["step"]), (40, "生成测试用例"))
+        await communicator.send_input({"type": "websocket.disconnect", "code": 1000})
+
+    async def test_unknown_task_is_rejected(self):
+        """测试任务不存在时拒绝连接"""
+        communicator = connect("00000000-0000-0000-0000-000000000000")
+        await communicator.send_input({"type": "websocket.connect"})
+
+        self.assertEqual(await communicator.receive_output(2), {"type": "websocket.close", "code": 4404})